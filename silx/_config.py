@@ -28,7 +28,7 @@
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
-__date__ = "09/11/2018"
+__date__ = "17/10/2026"
 
 
 class Config(object):
@@ -84,6 +84,21 @@ class Config(object):
     .. versionadded:: 0.8
     """
 
+    DEFAULT_PLOT_IMAGE_DOWNSAMPLING = 'stride'
+    """Default downsampling of large images displayed by matplotlib backend.
+
+    Only the visible part of large images is colormapped and displayed
+    at roughly the screen resolution.
+
+    This attribute can be set with:
+
+    - 'stride' (default), which displays one pixel every n pixels.
+    - 'mean', which displays the mean of blocks of n x n pixels.
+      Downsampled images are computed once per image data.
+
+    .. versionadded:: 0.14
+    """
+
     DEFAULT_PLOT_CURVE_COLORS = ['#000000',  # black
                                  '#0000ff',  # blue
                                  '#ff0000',  # red
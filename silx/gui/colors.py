@@ -29,7 +29,7 @@ from __future__ import absolute_import
 
 __authors__ = ["T. Vincent", "H.Payno"]
 __license__ = "MIT"
-__date__ = "29/01/2019"
+__date__ = "17/10/2026"
 
 import numpy
 import logging
@@ -351,11 +351,14 @@ class _NormalizationMixIn:
         else:
             return True
 
-    def autoscale(self, data, mode):
+    def autoscale(self, data, mode, minMax=None):
         """Returns range for given data and autoscale mode.
 
         :param Union[None,numpy.ndarray] data:
         :param str mode: Autoscale mode, see :class:`Colormap`
+        :param minMax: Result of
+            `min_max(data, min_positive=True, finite=True)` to reuse
+            for 'minmax' autoscale mode, if already computed.
         :returns: Range as (min, max)
         :rtype: Tuple[float,float]
         """
@@ -364,7 +367,10 @@ class _NormalizationMixIn:
             return self.DEFAULT_RANGE
 
         if mode == Colormap.MINMAX:
-            vmin, vmax = self.autoscaleMinMax(data)
+            if minMax is None:
+                vmin, vmax = self.autoscaleMinMax(data)
+            else:
+                vmin, vmax = self._rangeFromMinMax(minMax)
         elif mode == Colormap.STDDEV3:
             vmin, vmax = self.autoscaleMean3Std(data)
         else:
@@ -386,10 +392,18 @@ class _NormalizationMixIn:
         :returns: (vmin, vmax)
         :rtype: Tuple[float,float]
         """
-        data = data[self.isValid(data)]
-        if data.size == 0:
-            return None, None
-        result = min_max(data, min_positive=False, finite=True)
+        result = min_max(data, min_positive=True, finite=True)
+        return self._rangeFromMinMax(result)
+
+    def _rangeFromMinMax(self, result):
+        """Returns the min/max range of valid values from min_max result.
+
+        Override in subclass with a restricted valid range.
+
+        :param result: `min_max(data, min_positive=True, finite=True)`
+        :returns: (vmin, vmax)
+        :rtype: Tuple[float,float]
+        """
         return result.minimum, result.maximum
 
     def autoscaleMean3Std(self, data):
@@ -405,11 +419,13 @@ class _NormalizationMixIn:
         """
         # Use [0, 1] as data range for normalization not using range
         normdata = self.apply(data, 0., 1.)
-        if normdata.dtype.kind == 'f':  # Replaces inf by NaN
-            normdata[numpy.isfinite(normdata) == False] = numpy.nan
         if normdata.size == 0:  # Fallback
             return None, None
-        mean, std = numpy.nanmean(normdata), numpy.nanstd(normdata)
+        # Mean and std of finite values in a single pass
+        result = min_max(normdata, finite=True, stats=True)
+        if result.mean is None:
+            return None, None
+        mean, std = result.mean, result.std
         return self.revert(mean - 3 * std, 0., 1.), self.revert(mean + 3 * std, 0., 1.)
 
 
@@ -425,12 +441,13 @@ class _LinearNormalizationMixIn(_NormalizationMixIn):
         :returns: (vmin, vmax)
         :rtype: Tuple[float,float]
         """
-        if data.dtype.kind == 'f':  # Replaces inf by NaN
-            data = numpy.array(data, copy=True)  # Work on a copy
-            data[numpy.isfinite(data) == False] = numpy.nan
         if data.size == 0:  # Fallback
             return None, None
-        mean, std = numpy.nanmean(data), numpy.nanstd(data)
+        # Mean and std of finite values in a single pass
+        result = min_max(data, finite=True, stats=True)
+        if result.mean is None:
+            return None, None
+        mean, std = result.mean, result.std
         return mean - 3 * std, mean + 3 * std
 
 
@@ -453,8 +470,7 @@ class _LogarithmicNormalization(_colormap.LogarithmicNormalization, _Normalizati
     def isValid(self, value):
         return value > 0.
 
-    def autoscaleMinMax(self, data):
-        result = min_max(data, min_positive=True, finite=True)
+    def _rangeFromMinMax(self, result):
         return result.min_positive, result.maximum
 
 
@@ -470,6 +486,16 @@ class _SqrtNormalization(_colormap.SqrtNormalization, _NormalizationMixIn):
     def isValid(self, value):
         return value >= 0.
 
+    def _rangeFromMinMax(self, result):
+        if result.minimum is None or result.maximum < 0.:
+            return None, None
+        if result.minimum >= 0.:
+            return result.minimum, result.maximum
+        # Negative values are discarded: lowest valid value is 0 or min positive
+        if result.min_positive is None or result.has_zero:
+            return 0., result.maximum
+        return result.min_positive, result.maximum
+
 
 class _GammaNormalization(_colormap.PowerNormalization, _LinearNormalizationMixIn):
     """Gamma correction normalization:
@@ -863,14 +889,16 @@ class Colormap(qt.QObject):
         else:
             return self._BASIC_NORMALIZATIONS[normalization]
 
-    def _computeAutoscaleRange(self, data):
+    def _computeAutoscaleRange(self, data, minMax=None):
         """Compute the data range which will be used in autoscale mode.
 
         :param numpy.ndarray data: The data for which to compute the range
+        :param minMax: Result of
+            `min_max(data, min_positive=True, finite=True)` if available.
         :return: (vmin, vmax) range
         """
         return self._getNormalizer().autoscale(
-            data, mode=self.getAutoscaleMode())
+            data, mode=self.getAutoscaleMode(), minMax=minMax)
 
     def getColormapRange(self, data=None):
         """Return (vmin, vmax) the range of the colormap for the given data or item.
@@ -1070,7 +1098,7 @@ class Colormap(qt.QObject):
         vmin, vmax = self.getColormapRange(reference)
 
         if hasattr(data, "getColormappedData"):  # Use item's data
-            data = data.getColormappedData()
+            data = data.getColormappedData(copy=False)
 
         return _colormap.cmap(
             data,
@@ -28,10 +28,11 @@ Module containing widgets displaying stats from items of a plot.
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "24/07/2018"
+__date__ = "17/10/2026"
 
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import logging
 import weakref
@@ -47,6 +48,7 @@ from silx.gui.widgets.TableWidget import TableWidget
 from silx.gui.plot.stats.statshandler import StatsHandler, StatFormatter
 from silx.gui.plot.items.core import ItemChangedType
 from silx.gui.widgets.FlowLayout import FlowLayout
+from silx.gui.utils.concurrent import submitToQtMainThread
 from . import PlotWidget
 from . import items as plotitems
 
@@ -327,16 +329,36 @@ class _Container(object):
         return self._obj
 
 
+_statsExecutor = None
+"""Executor computing statistics of large items in a worker thread"""
+
+
+def _getStatsExecutor():
+    """Returns the executor shared by all widgets to compute statistics
+
+    :rtype: ThreadPoolExecutor
+    """
+    global _statsExecutor
+    if _statsExecutor is None:  # Lazy-loading
+        _statsExecutor = ThreadPoolExecutor(max_workers=1)
+    return _statsExecutor
+
+
 class _StatsWidgetBase(object):
     """
     Base class for all widgets which want to display statistics
     """
 
+    _ASYNC_MIN_SIZE = 1024 * 1024
+    """Number of values from which statistics are computed in a worker thread
+    """
+
     def __init__(self, statsOnVisibleData, displayOnlyActItem):
         self._displayOnlyActItem = displayOnlyActItem
         self._statsOnVisibleData = statsOnVisibleData
         self._statsHandler = None
         self._updateMode = UpdateMode.AUTO
+        self.__pendingStats = {}
 
         self.__default_skipped_events = (
             ItemChangedType.ALPHA,
@@ -440,6 +462,69 @@ class _StatsWidgetBase(object):
             else:
                 signal.disconnect(slot)
 
+    def _computeStats(self, item, callback):
+        """Compute the statistics of an item and pass them to callback.
+
+        Statistics of items with less than :attr:`_ASYNC_MIN_SIZE` values are
+        computed right away.
+        Otherwise, they are computed in a worker thread and callback is
+        called later on from the Qt main thread.
+        A pending computation for the same item is cancelled.
+
+        :param item: The plot item
+        :param callable callback:
+            Function called with the item and the dict of formatted
+            statistics as arguments.
+        """
+        self._cancelStats(item)
+
+        statsHandler = self.getStatsHandler()
+        context = statsHandler.stats.createContext(
+            item, self.getPlot(), self._statsOnVisibleData)
+
+        if (context.values is None or
+                numpy.size(context.values) < self._ASYNC_MIN_SIZE):
+            callback(item, statsHandler.calculateFromContext(context))
+            return
+
+        future = _getStatsExecutor().submit(
+            statsHandler.calculateFromContext, context)
+        self.__pendingStats[item] = future
+        future.add_done_callback(
+            functools.partial(self.__statsComputed, item, callback))
+
+    def __statsComputed(self, item, callback, future):
+        """Handle the end of the computation in the worker thread"""
+        if not future.cancelled():
+            submitToQtMainThread(self.__statsReady, item, callback, future)
+
+    def __statsReady(self, item, callback, future):
+        """Pass computed statistics to callback in the Qt main thread"""
+        if self.__pendingStats.get(item) is not future:
+            return  # Cancelled or superseded by another computation
+        del self.__pendingStats[item]
+
+        try:
+            stats = future.result()
+        except Exception:
+            _logger.error("Error while computing statistics", exc_info=True)
+        else:
+            callback(item, stats)
+
+    def _cancelStats(self, item=None):
+        """Cancel pending computation of statistics.
+
+        :param item: The plot item or None (default) for all items
+        """
+        if item is None:
+            items = list(self.__pendingStats.keys())
+        else:
+            items = [item]
+        for item in items:
+            future = self.__pendingStats.pop(item, None)
+            if future is not None:
+                future.cancel()
+
     def _updateItemObserve(self, *args):
         """Reload table depending on mode"""
         raise NotImplementedError('Base class')
@@ -833,11 +918,13 @@ class StatsTable(_StatsWidgetBase, TableWidget):
             if kind in statsmdl.BASIC_COMPATIBLE_KINDS:
                 _logger.error("Removing item that is not in table: %s", str(item))
             return
+        self._cancelStats(item)
         item.sigItemChanged.disconnect(self._plotItemChanged)
         self.removeRow(row)
 
     def _removeAllItems(self):
         """Remove content of the table"""
+        self._cancelStats()
         for row in range(self.rowCount()):
             tableItem = self.item(row, 0)
             item = self._tableItemToItem(tableItem)
@@ -862,12 +949,19 @@ class StatsTable(_StatsWidgetBase, TableWidget):
             _logger.error("This item is not in the table: %s", str(item))
             return
 
-        statsHandler = self.getStatsHandler()
-        if statsHandler is not None:
-            stats = statsHandler.calculate(
-                item, plot, self._statsOnVisibleData)
+        if self.getStatsHandler() is not None:
+            self._computeStats(item, self._setStats)
         else:
-            stats = {}
+            self._setStats(item, {})
+
+    def _setStats(self, item, stats):
+        """Display the statistics of a plot item
+
+        :param item: The plot item
+        :param dict stats: The formatted statistics
+        """
+        if self._itemToRow(item) is None:
+            return  # Item was removed
 
         with self._disableSorting():
             for name, tableItem in self._itemToTableItems(item).items():
@@ -1243,8 +1337,8 @@ DEFAULT_STATS = StatsHandler((
     (statsmdl.StatMax(), StatFormatter()),
     statsmdl.StatCoordMax(),
     statsmdl.StatCOM(),
-    (('mean', numpy.mean), StatFormatter()),
-    (('std', numpy.std), StatFormatter()),
+    (statsmdl.StatMean(), StatFormatter()),
+    (statsmdl.StatStd(), StatFormatter()),
 ))
 
 
@@ -1393,6 +1487,8 @@ class _BaseLineStatsWidget(_StatsWidgetBase, qt.QWidget):
         return self._item_kind
 
     def _setItem(self, item):
+        # Only one item is displayed: drop results of previous one
+        self._cancelStats()
         if item is None:
             for stat_name, stat_widget in self._statQlineEdit.items():
                 stat_widget.setText('')
@@ -1400,11 +1496,16 @@ class _BaseLineStatsWidget(_StatsWidgetBase, qt.QWidget):
                 self._statsHandler.stats) > 0):
             plot = self.getPlot()
             if plot is not None:
-                statsValDict = self._statsHandler.calculate(item,
-                                                            plot,
-                                                            self._statsOnVisibleData)
-                for statName, statVal in list(statsValDict.items()):
-                    self._statQlineEdit[statName].setText(statVal)
+                self._computeStats(item, self._setStats)
+
+    def _setStats(self, item, statsValDict):
+        """Display the statistics of the plot item
+
+        :param item: The plot item
+        :param dict statsValDict: The formatted statistics
+        """
+        for statName, statVal in list(statsValDict.items()):
+            self._statQlineEdit[statName].setText(statVal)
 
     def _updateItemObserve(self, *argv):
         if self.getUpdateMode() is UpdateMode.MANUAL:
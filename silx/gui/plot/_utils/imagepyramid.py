@@ -0,0 +1,165 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2020 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ###########################################################################*/
+"""Multi-resolution images used to display only the visible part of large
+images at screen resolution.
+"""
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "17/10/2026"
+
+
+import threading
+import weakref
+
+import numpy
+
+
+def meanBinning(data):
+    """Returns the mean of 2x2 blocks of pixels of an image.
+
+    Last row and column are averaged over available pixels when
+    the image has an odd size.
+    NaNs are ignored unless all pixels of a block are NaNs.
+
+    :param numpy.ndarray data: Image (height, width) or (height, width, nch)
+    :rtype: numpy.ndarray
+    """
+    height, width = data.shape[:2]
+    rows = numpy.arange(0, height, 2)
+    columns = numpy.arange(0, width, 2)
+
+    if data.dtype.kind == 'f':
+        valid = numpy.isfinite(data)
+        data = numpy.where(valid, data, 0)
+        counts = numpy.add.reduceat(
+            numpy.add.reduceat(valid, rows, axis=0, dtype=numpy.int32),
+            columns, axis=1)
+    else:
+        counts = numpy.add.reduceat(
+            numpy.add.reduceat(numpy.ones(data.shape[:2], dtype=numpy.int32),
+                               rows, axis=0),
+            columns, axis=1)
+        if data.ndim == 3:
+            counts = counts[:, :, numpy.newaxis]
+
+    sums = numpy.add.reduceat(
+        numpy.add.reduceat(data, rows, axis=0, dtype=numpy.float64),
+        columns, axis=1)
+    with numpy.errstate(invalid='ignore'):
+        mean = sums / counts  # All NaNs blocks gives NaN
+    if data.dtype.kind in 'iu':
+        return numpy.round(mean).astype(data.dtype)
+    return mean.astype(numpy.promote_types(data.dtype, numpy.float32))
+
+
+class ImagePyramid(object):
+    """Downsampled versions of an image by successive factors of 2.
+
+    :param numpy.ndarray data: Image (height, width) or (height, width, nch)
+    :param str mode:
+        Downsampling mode:
+
+        - 'stride': Take one pixel every factor pixels (no copy)
+        - 'mean': Average blocks of factor x factor pixels
+          (computed once and stored)
+    :param Union[List[numpy.ndarray],None] levels:
+        List where to store downsampled images of 'mean' mode,
+        it can be shared by pyramids of the same data.
+    """
+
+    MODES = 'stride', 'mean'
+    """Supported downsampling modes"""
+
+    def __init__(self, data, mode='stride', levels=None):
+        assert mode in self.MODES
+        self.__data = data
+        self.__mode = mode
+        self.__levels = [] if levels is None else levels
+
+    def getMode(self):
+        """Returns the downsampling mode (str)"""
+        return self.__mode
+
+    def getLevel(self, level):
+        """Returns the image downsampled by a factor 2**level
+
+        :param int level: Downsampling level (0 for full resolution)
+        :rtype: numpy.ndarray
+        """
+        if level <= 0:
+            return self.__data
+        if self.__mode == 'stride':
+            factor = 2 ** level
+            return self.__data[::factor, ::factor]
+
+        with _lock:
+            while len(self.__levels) < level:
+                previous = self.__levels[-1] if self.__levels else self.__data
+                self.__levels.append(meanBinning(previous))
+            return self.__levels[level - 1]
+
+
+_lock = threading.RLock()
+"""Lock protecting computation of 'mean' downsampled images"""
+
+_meanLevels = {}
+"""Cache of 'mean' downsampled images: {id(data): (weakref(data), levels)}"""
+
+
+def getPyramid(data, mode):
+    """Returns the pyramid of an image, sharing 'mean' downsampled images.
+
+    Images downsampled with 'mean' mode are stored for as long as the data
+    array is alive, so the same data can be displayed again without
+    computing the downsampled images again.
+    Data MUST not be modified in place.
+
+    :param numpy.ndarray data: Image (height, width) or (height, width, nch)
+    :param str mode: Downsampling mode: 'stride' or 'mean'
+    :rtype: ImagePyramid
+    """
+    if mode != 'mean':
+        return ImagePyramid(data, mode)
+
+    key = id(data)
+    with _lock:
+        cached = _meanLevels.get(key)
+        if cached is not None and cached[0]() is data:
+            return ImagePyramid(data, mode, levels=cached[1])
+
+        def removeFromCache(ref):
+            with _lock:
+                cached = _meanLevels.get(key)
+                if cached is not None and cached[0] is ref:
+                    del _meanLevels[key]
+
+        try:
+            ref = weakref.ref(data, removeFromCache)
+        except TypeError:  # Data cannot be weak referenced
+            return ImagePyramid(data, mode)
+        levels = []
+        _meanLevels[key] = ref, levels
+    return ImagePyramid(data, mode, levels=levels)
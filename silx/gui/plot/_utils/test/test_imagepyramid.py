@@ -0,0 +1,122 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2020 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ###########################################################################*/
+"""Tests of the imagepyramid module"""
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "17/10/2026"
+
+
+import gc
+import unittest
+
+import numpy
+
+from silx.utils.testutils import ParametricTestCase
+from silx.gui.plot._utils import imagepyramid
+
+
+class TestMeanBinning(ParametricTestCase):
+    """Test meanBinning function"""
+
+    def testShapes(self):
+        """Test binning of even and odd sizes"""
+        for shape in ((4, 6), (5, 7), (1, 1), (1, 5)):
+            with self.subTest(shape=shape):
+                data = numpy.arange(numpy.prod(shape),
+                                    dtype=numpy.float32).reshape(shape)
+                result = imagepyramid.meanBinning(data)
+                self.assertEqual(result.shape,
+                                 ((shape[0] + 1) // 2, (shape[1] + 1) // 2))
+                self.assertEqual(result.dtype, numpy.float32)
+                self.assertAlmostEqual(result[0, 0],
+                                       numpy.mean(data[:2, :2]))
+                self.assertAlmostEqual(result[-1, -1],
+                                       numpy.mean(data[-(shape[0] % 2 or 2):,
+                                                       -(shape[1] % 2 or 2):]))
+
+    def testNaN(self):
+        """Test that NaNs are ignored unless all pixels are NaNs"""
+        data = numpy.array(((1., numpy.nan, numpy.nan, numpy.nan),
+                            (3., numpy.nan, numpy.nan, numpy.nan)))
+        result = imagepyramid.meanBinning(data)
+        self.assertEqual(result[0, 0], 2.)
+        self.assertTrue(numpy.isnan(result[0, 1]))
+
+    def testRGBA(self):
+        """Test binning of uint8 RGBA images"""
+        data = numpy.zeros((3, 3, 4), dtype=numpy.uint8)
+        data[0, 0] = 255, 0, 0, 255
+        data[0, 1] = 0, 0, 255, 255
+        result = imagepyramid.meanBinning(data)
+        self.assertEqual(result.shape, (2, 2, 4))
+        self.assertEqual(result.dtype, numpy.uint8)
+        self.assertEqual(tuple(result[0, 0]), (64, 0, 64, 128))
+
+
+class TestImagePyramid(ParametricTestCase):
+    """Test ImagePyramid and getPyramid"""
+
+    def testLevels(self):
+        """Test downsampled images of each mode"""
+        data = numpy.random.random((37, 64)).astype(numpy.float32)
+        for mode in imagepyramid.ImagePyramid.MODES:
+            with self.subTest(mode=mode):
+                pyramid = imagepyramid.ImagePyramid(data, mode)
+                self.assertEqual(pyramid.getMode(), mode)
+                self.assertIs(pyramid.getLevel(0), data)
+                self.assertEqual(pyramid.getLevel(1).shape, (19, 32))
+                self.assertEqual(pyramid.getLevel(3).shape, (5, 8))
+
+        stride = imagepyramid.ImagePyramid(data, 'stride')
+        numpy.testing.assert_array_equal(stride.getLevel(2), data[::4, ::4])
+
+        mean = imagepyramid.ImagePyramid(data, 'mean')
+        self.assertAlmostEqual(mean.getLevel(2)[0, 0],
+                               numpy.mean(data[:4, :4]), places=5)
+
+    def testMeanCache(self):
+        """Test that 'mean' downsampled images are shared and released"""
+        data = numpy.random.random((16, 16))
+        level = imagepyramid.getPyramid(data, 'mean').getLevel(1)
+        self.assertIs(imagepyramid.getPyramid(data, 'mean').getLevel(1), level)
+
+        key = id(data)
+        self.assertIn(key, imagepyramid._meanLevels)
+        del data
+        gc.collect()
+        self.assertNotIn(key, imagepyramid._meanLevels)
+
+
+def suite():
+    testsuite = unittest.TestSuite()
+    for testClass in (TestMeanBinning, TestImagePyramid):
+        testsuite.addTest(
+            unittest.defaultTestLoader.loadTestsFromTestCase(testClass))
+    return testsuite
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,7 +31,7 @@ This API is a simplified version of PyMca PlotBackend API.
 
 __authors__ = ["V.A. Sole", "T. Vincent"]
 __license__ = "MIT"
-__date__ = "21/12/2018"
+__date__ = "17/10/2026"
 
 import weakref
 from ... import qt
@@ -321,6 +321,24 @@ class BackendBase(object):
         """
         pass
 
+    def appendCurveData(self, curve, x, y, nbAppended, nbDropped):
+        """Update a curve after points were appended to its data.
+
+        To override in backends that can update a curve without
+        creating it again.
+
+        :param curve: The curve handle
+        :param numpy.ndarray x: All x coordinates of the curve
+        :param numpy.ndarray y: All y coordinates of the curve
+        :param int nbAppended: Number of new points at the end of x and y
+        :param int nbDropped:
+            Number of points dropped from the start of the previous data
+        :return: True if the curve was updated,
+            False if it must be removed and added again
+        :rtype: bool
+        """
+        return False
+
     # Misc.
 
     def getWidgetHandle(self):
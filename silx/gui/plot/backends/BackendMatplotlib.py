@@ -28,7 +28,7 @@ from __future__ import division
 
 __authors__ = ["V.A. Sole", "T. Vincent, H. Payno"]
 __license__ = "MIT"
-__date__ = "21/12/2018"
+__date__ = "17/10/2026"
 
 
 import logging
@@ -61,7 +61,9 @@ from matplotlib import path as mpath
 
 from . import BackendBase
 from .. import items
+from .... import config
 from .._utils import FLOAT32_MINPOS
+from .._utils import imagepyramid
 from .._utils.dtime_ticklayout import calcTicks, bestFormatString, timestamp
 
 _PATCH_LINESTYLE = {
@@ -424,6 +426,9 @@ class _DoubleColoredLinePatch(matplotlib.patches.Patch):
 class Image(AxesImage):
     """An AxesImage with a fast path for uint8 RGBA images.
 
+    It can also display only the visible part of an image at roughly the
+    screen resolution, see :meth:`set_silx_data`.
+
     :param List[float] silx_origin: (ox, oy) Offset of the image.
     :param List[float] silx_scale: (sx, sy) Scale of the image.
     """
@@ -435,6 +440,102 @@ class Image(AxesImage):
         super().__init__(*args, **kwargs)
         self.__silx_origin = silx_origin
         self.__silx_scale = silx_scale
+        self.__silx_pyramid = None
+        self.__silx_shape = None
+        self.__silx_colorize = None
+        self.__silx_view = None  # (level, rows, columns) of displayed data
+        self.__silx_extent = None
+
+    def set_silx_data(self, data, colorize, downsampling='stride'):
+        """Set data of which only the visible part is displayed.
+
+        At each draw, data is cropped to the visible area (with a margin)
+        and downsampled by a power of 2 so that its resolution is close to
+        the screen resolution.
+        Only this part of the image is converted to RGBA.
+
+        :param numpy.ndarray data: Image in its original orientation
+        :param callable colorize: Function converting an image to RGBA
+        :param str downsampling: Downsampling mode: 'stride' or 'mean'
+        """
+        self.__silx_pyramid = imagepyramid.getPyramid(data, downsampling)
+        self.__silx_shape = data.shape[:2]
+        self.__silx_colorize = colorize
+        self.__silx_view = None
+        self.__silx_extent = None
+
+    def __silx_update_view(self):
+        """Update displayed data according to axes limits and size.
+
+        :return: False if the image is not visible, True otherwise
+        :rtype: bool
+        """
+        height, width = self.__silx_shape
+        ox, oy = self.__silx_origin
+        sx, sy = self.__silx_scale
+
+        # Visible part of the image in pixels of the image
+        columns = sorted((numpy.array(self.axes.get_xbound()) - ox) / sx)
+        rows = sorted((numpy.array(self.axes.get_ybound()) - oy) / sy)
+        column0 = max(0, int(numpy.floor(columns[0])))
+        column1 = min(width, int(numpy.ceil(columns[1])))
+        row0 = max(0, int(numpy.floor(rows[0])))
+        row1 = min(height, int(numpy.ceil(rows[1])))
+        if column0 >= column1 or row0 >= row1:
+            return False
+
+        # Downsampling level to get roughly the screen resolution
+        bbox = self.axes.get_window_extent()
+        ratio = min((column1 - column0) / max(1., bbox.width),
+                    (row1 - row0) / max(1., bbox.height))
+        level = max(0, int(numpy.floor(numpy.log2(max(ratio, 1.)))))
+        factor = 2 ** level
+
+        # Visible part of the downsampled image
+        visibleRows = row0 // factor, -(-row1 // factor)
+        visibleColumns = column0 // factor, -(-column1 // factor)
+
+        if self.__silx_view is not None:
+            viewLevel, viewRows, viewColumns = self.__silx_view
+            if (viewLevel == level and
+                    viewRows[0] <= visibleRows[0] and
+                    viewRows[1] >= visibleRows[1] and
+                    viewColumns[0] <= visibleColumns[0] and
+                    viewColumns[1] >= visibleColumns[1]):
+                return True  # Displayed data covers the visible area
+
+        # Add margins of half the visible area to limit updates while panning
+        levelHeight, levelWidth = -(-height // factor), -(-width // factor)
+        rowMargin = (visibleRows[1] - visibleRows[0]) // 2
+        columnMargin = (visibleColumns[1] - visibleColumns[0]) // 2
+        viewRows = (max(0, visibleRows[0] - rowMargin),
+                    min(levelHeight, visibleRows[1] + rowMargin))
+        viewColumns = (max(0, visibleColumns[0] - columnMargin),
+                       min(levelWidth, visibleColumns[1] + columnMargin))
+
+        data = self.__silx_pyramid.getLevel(level)
+        self.set_data(self.__silx_colorize(data[
+            viewRows[0]:viewRows[1], viewColumns[0]:viewColumns[1]]))
+        self.__silx_view = level, viewRows, viewColumns
+
+        # Extent of the displayed part, negative scale flips the image
+        self.__silx_extent = (
+            ox + sx * viewColumns[0] * factor,
+            ox + sx * min(width, viewColumns[1] * factor),
+            oy + sy * viewRows[0] * factor,
+            oy + sy * min(height, viewRows[1] * factor))
+        return True
+
+    def get_extent(self):
+        if self.__silx_extent is not None:
+            return self.__silx_extent
+        return super().get_extent()
+
+    def draw(self, renderer, *args, **kwargs):
+        """Overridden to update displayed data according to the view"""
+        if self.__silx_pyramid is not None and not self.__silx_update_view():
+            return  # Nothing to display
+        super().draw(renderer, *args, **kwargs)
 
     def contains(self, mouseevent):
         """Overridden to fill 'ind' with row and column"""
@@ -443,7 +544,10 @@ class Image(AxesImage):
             x, y = mouseevent.xdata, mouseevent.ydata
             ox, oy = self.__silx_origin
             sx, sy = self.__silx_scale
-            height, width = self.get_size()
+            if self.__silx_shape is not None:
+                height, width = self.__silx_shape
+            else:
+                height, width = self.get_size()
             column = numpy.clip(int((x - ox) / sx), 0, width - 1)
             row = numpy.clip(int((y - oy) / sy), 0, height - 1)
             info['ind'] = (row,), (column,)
@@ -468,6 +572,10 @@ class BackendMatplotlib(BackendBase.BackendBase):
     See :class:`BackendBase.BackendBase` for public API documentation.
     """
 
+    _IMAGE_DOWNSAMPLING_MIN_SIZE = 1024 * 1024
+    """Number of pixels from which only the visible part of images is
+    displayed at screen resolution, see :meth:`Image.set_silx_data`"""
+
     def __init__(self, plot, parent=None):
         super(BackendMatplotlib, self).__init__(plot, parent)
 
@@ -722,6 +830,20 @@ class BackendMatplotlib(BackendBase.BackendBase):
 
         image.set_extent((xmin, xmax, ymin, ymax))
 
+        if height * width >= self._IMAGE_DOWNSAMPLING_MIN_SIZE:
+            # Only colormap the visible part of the image
+            if data.ndim == 2:
+                if colormap.isAutoscale():  # Use range of the whole image
+                    colormap = colormap.copy()
+                    colormap.setVRange(*colormap.getColormapRange(data))
+                colorize = colormap.applyToData
+            else:
+                colorize = self.__normalizeRgba
+            image.set_silx_data(
+                data, colorize, config.DEFAULT_PLOT_IMAGE_DOWNSAMPLING)
+            self.ax.add_artist(image)
+            return image
+
         # Set image data
         if scale[0] < 0. or scale[1] < 0.:
             # For negative scale, step by -1
@@ -731,15 +853,22 @@ class BackendMatplotlib(BackendBase.BackendBase):
 
         if data.ndim == 2:  # Data image, convert to RGBA image
             data = colormap.applyToData(data)
-        elif data.dtype == numpy.uint16:
-            # Normalize uint16 data to have a similar behavior as opengl backend
-            data = data.astype(numpy.float32)
-            data /= 65535
-        
+        else:
+            data = self.__normalizeRgba(data)
+
         image.set_data(data)
         self.ax.add_artist(image)
         return image
 
+    @staticmethod
+    def __normalizeRgba(data):
+        """Returns RGB(A) image data in a format supported by matplotlib"""
+        if data.dtype == numpy.uint16:
+            # Normalize uint16 data to have a similar behavior as opengl backend
+            data = data.astype(numpy.float32)
+            data /= 65535
+        return data
+
     def addTriangles(self, x, y, triangles, color, alpha):
         for parameter in (x, y, triangles, color, alpha):
             assert parameter is not None
@@ -967,6 +1096,14 @@ class BackendMatplotlib(BackendBase.BackendBase):
                 _logger.warning(
                     'setActiveCurve ignoring artist %s', str(artist))
 
+    def appendCurveData(self, curve, x, y, nbAppended, nbDropped):
+        # Only a plain line can be updated in place
+        artists = curve.get_children()
+        if len(artists) != 1 or not isinstance(artists[0], Line2D):
+            return False
+        artists[0].set_data(x, y)
+        return True
+
     # Misc.
 
     def getWidgetHandle(self):
@@ -28,7 +28,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "21/12/2018"
+__date__ = "17/10/2026"
 
 import logging
 import weakref
@@ -1106,6 +1106,24 @@ class BackendOpenGL(BackendBase.BackendBase, glu.OpenGLWidget):
     def setCurveColor(self, curve, color):
         pass  # TODO
 
+    def appendCurveData(self, curve, x, y, nbAppended, nbDropped):
+        if not isinstance(curve, glutils.GLPlotCurve2D):
+            return False
+
+        isYLog = self._plotFrame.yAxis.isLog if curve.yaxis == 'left' \
+            else self._plotFrame.y2Axis.isLog
+        if self._plotFrame.xAxis.isLog or isYLog:
+            return False
+
+        # Data offset is only set when float32 is not enough
+        if (curve.offset == (0., 0.) and
+                (self._castArrayTo(x) is not numpy.float32 or
+                 self._castArrayTo(y) is not numpy.float32)):
+            return False
+
+        start = len(x) - nbAppended
+        return curve.appendData(x[start:], y[start:], nbDropped)
+
     # Misc.
 
     def getWidgetHandle(self):
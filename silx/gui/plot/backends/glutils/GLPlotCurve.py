@@ -30,7 +30,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "03/04/2017"
+__date__ = "17/10/2026"
 
 
 import math
@@ -1119,6 +1119,15 @@ class GLPlotCurve2D(GLPlotItem):
             self.offset = 0., 0.
             self.xData = xData
             self.yData = yData
+
+        # Storage with extra capacity used by appendData:
+        # xData and yData are views of it starting at index _start
+        self._xStorage, self._yStorage = None, None
+        self._start = 0
+        self._vboStorage = None  # The storage the VBO was created from
+        self._vboOffsets = None  # Offsets of the storage in the VBO
+        self._uploadedEnd = 0  # End of the storage uploaded to the VBO
+
         if fillColor is not None:
             def deduce_baseline(baseline):
                 if baseline is None:
@@ -1194,8 +1203,91 @@ class GLPlotCurve2D(GLPlotItem):
         GLLines2D.init()
         _Points2D.init()
 
+    def appendData(self, xData, yData, nbDropped=0):
+        """Append points at the end of the curve.
+
+        Points are stored with extra capacity,
+        so that only the new points are uploaded to the vertex buffer
+        until the capacity is exceeded.
+
+        :param numpy.ndarray xData: X coordinates of the new points
+        :param numpy.ndarray yData: Y coordinates of the new points
+        :param int nbDropped: Number of points to remove from the start
+        :return: True if points were appended,
+            False if the curve does not support it
+        :rtype: bool
+        """
+        if (self.colorData is not None or self.fill is not None or
+                self._errorBars._xData is not None or
+                self.lineStyle in (DASHED, DASHDOT, DOTTED) or
+                nbDropped > len(self.xData)):
+            return False
+
+        if len(xData) > 0:
+            # Bounds are only used for picking: do not shrink them
+            xMin, xMax = min_max(xData, min_positive=False)
+            yMin, yMax = min_max(yData, min_positive=False)
+            self.xMin = numpy.fmin(self.xMin, xMin)
+            self.xMax = numpy.fmax(self.xMax, xMax)
+            self.yMin = numpy.fmin(self.yMin, yMin)
+            self.yMax = numpy.fmax(self.yMax, yMax)
+
+        xData = (xData - self.offset[0]).astype(numpy.float32)
+        yData = (yData - self.offset[1]).astype(numpy.float32)
+
+        length = len(self.xData) - nbDropped + len(xData)
+        end = self._start + len(self.xData)
+        if (self._xStorage is not None and
+                end + len(xData) <= len(self._xStorage)):
+            # Enough capacity: write after existing points
+            self._xStorage[end:end + len(xData)] = xData
+            self._yStorage[end:end + len(yData)] = yData
+            self._start += nbDropped
+        else:  # Allocate new storage
+            capacity = max(2 * length, 16)
+            xStorage = numpy.empty(capacity, dtype=numpy.float32)
+            yStorage = numpy.empty(capacity, dtype=numpy.float32)
+            kept = length - len(xData)
+            xStorage[:kept] = self.xData[nbDropped:]
+            xStorage[kept:length] = xData
+            yStorage[:kept] = self.yData[nbDropped:]
+            yStorage[kept:length] = yData
+            self._xStorage, self._yStorage = xStorage, yStorage
+            self._start = 0
+
+        self.xData = self._xStorage[self._start:self._start + length]
+        self.yData = self._yStorage[self._start:self._start + length]
+        return True
+
+    def _prepareAppendedData(self):
+        """Upload points appended to the storage since last rendering"""
+        if self._vboStorage is not self._xStorage:
+            # Storage was reallocated: create the vertex buffer again
+            self.xVboData.vbo.discard()
+            self.xVboData = None
+            self.yVboData = None
+            self.colorVboData = None
+            self.distVboData = None
+            self._vboStorage = None
+            return
+
+        end = self._start + len(self.xData)
+        attribs = ((self.xVboData, self._xStorage, self._vboOffsets[0]),
+                   (self.yVboData, self._yStorage, self._vboOffsets[1]))
+        for attrib, storage, offset in attribs:
+            if self._uploadedEnd < end:
+                attrib.vbo.update(
+                    storage[self._uploadedEnd:end],
+                    offset=offset + self._uploadedEnd * attrib.itemsize)
+            attrib.offset = offset + self._start * attrib.itemsize
+            attrib.size = len(self.xData)
+        self._uploadedEnd = end
+
     def prepare(self):
         """Rendering preparation: build indices and bounding box vertices"""
+        if self.xVboData is not None and self._xStorage is not None:
+            self._prepareAppendedData()
+
         if self.xVboData is None:
             xAttrib, yAttrib, cAttrib, dAttrib = None, None, None, None
             if self.lineStyle in (DASHED, DASHDOT, DOTTED):
@@ -1206,6 +1298,16 @@ class GLPlotCurve2D(GLPlotItem):
                 else:
                     xAttrib, yAttrib, cAttrib, dAttrib = vertexBuffer(
                         (self.xData, self.yData, self.colorData, dists))
+            elif self._xStorage is not None:
+                # Upload the whole storage to keep its extra capacity
+                xAttrib, yAttrib = vertexBuffer(
+                    (self._xStorage, self._yStorage))
+                self._vboStorage = self._xStorage
+                self._vboOffsets = xAttrib.offset, yAttrib.offset
+                self._uploadedEnd = self._start + len(self.xData)
+                for attrib in (xAttrib, yAttrib):
+                    attrib.offset += self._start * attrib.itemsize
+                    attrib.size = len(self.xData)
             elif self.colorData is None:
                 xAttrib, yAttrib = vertexBuffer((self.xData, self.yData))
             else:
@@ -1244,6 +1346,7 @@ class GLPlotCurve2D(GLPlotItem):
         self.yVboData = None
         self.colorVboData = None
         self.distVboData = None
+        self._vboStorage = None
 
         self._errorBars.discard()
         if self.fill is not None:
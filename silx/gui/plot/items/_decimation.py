@@ -0,0 +1,237 @@
+# coding: utf-8
+# /*##########################################################################
+#
+# Copyright (c) 2020 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ###########################################################################*/
+"""This module provides view-dependent decimation of curves.
+
+For each pixel column of the plot area, only the first, last, minimum and
+maximum points are kept (M4 aggregation): this is visually lossless for a
+line while the number of points sent to the backend only depends on the
+plot width.
+"""
+
+__authors__ = ["T. Vincent"]
+__license__ = "MIT"
+__date__ = "17/10/2026"
+
+
+import numpy
+
+from ....math.combo import min_max
+
+
+def isMonotonic(data, chunkSize=2**20):
+    """Returns True if data is sorted in increasing order.
+
+    It returns False if data contains NaNs.
+
+    :param numpy.ndarray data: 1D array to check
+    :param int chunkSize: Number of elements to process at once
+    :rtype: bool
+    """
+    data = numpy.asarray(data)
+    for start in range(0, len(data) - 1, chunkSize):
+        chunk = data[start:start + chunkSize + 1]
+        if not numpy.all(chunk[1:] >= chunk[:-1]):
+            return False
+    return True
+
+
+class MinMaxPyramid(object):
+    """Multi-resolution min/max of a 1D array.
+
+    Level 0 stores the min/max of blocks of :attr:`BLOCK_SIZE` elements and
+    each following level merges :attr:`FACTOR` blocks of the previous level.
+    Stored indices are indices in the original array (-1 for all-NaN blocks).
+
+    :param numpy.ndarray data: 1D array of values
+    """
+
+    BLOCK_SIZE = 64
+    """Number of elements per block of the first level"""
+
+    FACTOR = 4
+    """Number of blocks merged from one level to the next"""
+
+    def __init__(self, data):
+        data = numpy.asarray(data)
+        self._levels = []  # List of (blockSize, min, argmin, max, argmax)
+
+        # First level from data
+        nfull = (len(data) // self.BLOCK_SIZE) * self.BLOCK_SIZE
+        blocks = [data[:nfull].reshape(-1, self.BLOCK_SIZE)]
+        if nfull < len(data):  # Last incomplete block
+            blocks.append(data[nfull:].reshape(1, -1))
+
+        offset = 0
+        minima, argmins, maxima, argmaxs = [], [], [], []
+        for block in blocks:
+            if block.size == 0:
+                continue
+            result = min_max(block, axis=1)
+            minimum = numpy.asarray(result.minimum, dtype=numpy.float64)
+            maximum = numpy.asarray(result.maximum, dtype=numpy.float64)
+            starts = offset + self.BLOCK_SIZE * numpy.arange(len(block))
+            # Blocks with only NaNs have NaN min/max
+            isnan = numpy.isnan(minimum)
+            minima.append(minimum)
+            maxima.append(maximum)
+            argmins.append(numpy.where(isnan, -1, result.argmin + starts))
+            argmaxs.append(numpy.where(isnan, -1, result.argmax + starts))
+            offset += block.size
+
+        if not minima:
+            return  # Empty data
+        level = (self.BLOCK_SIZE,
+                 numpy.concatenate(minima),
+                 numpy.concatenate(argmins),
+                 numpy.concatenate(maxima),
+                 numpy.concatenate(argmaxs))
+        self._levels.append(level)
+
+        # Following levels from previous ones
+        while len(level[1]) > self.FACTOR:
+            blockSize = level[0] * self.FACTOR
+            minimum, argmin = self._merge(level[1], level[2], isMin=True)
+            maximum, argmax = self._merge(level[3], level[4], isMin=False)
+            level = blockSize, minimum, argmin, maximum, argmax
+            self._levels.append(level)
+
+    @classmethod
+    def _merge(cls, values, indices, isMin):
+        """Merge :attr:`FACTOR` consecutive blocks together
+
+        :param numpy.ndarray values: min or max of each block
+        :param numpy.ndarray indices: Corresponding indices in data
+        :param bool isMin: True for min, False for max
+        :return: (values, indices) of merged blocks
+        """
+        padding = (-len(values)) % cls.FACTOR
+        if padding:
+            values = numpy.append(values, numpy.full(padding, numpy.nan))
+            indices = numpy.append(indices, numpy.full(padding, -1))
+        values = values.reshape(-1, cls.FACTOR)
+        indices = indices.reshape(-1, cls.FACTOR)
+
+        result = min_max(values, axis=1)
+        argext = result.argmin if isMin else result.argmax
+        merged = result.minimum if isMin else result.maximum
+        mergedIndices = numpy.take_along_axis(
+            indices, argext[:, numpy.newaxis], axis=1)[:, 0]
+        mergedIndices[numpy.isnan(merged)] = -1
+        return merged, mergedIndices
+
+    def getLevel(self, maxBlockSize):
+        """Returns the coarsest level with blocks not larger than maxBlockSize
+
+        :param int maxBlockSize: Maximum number of elements per block
+        :return: (blockSize, min, argmin, max, argmax) or None if
+            even the first level has too large blocks.
+        """
+        result = None
+        for level in self._levels:
+            if level[0] > maxBlockSize:
+                break
+            result = level
+        return result
+
+
+def _segmentArgExtremum(values, indices, starts, isMin):
+    """Returns indices of the min or max of each segment of values
+
+    :param numpy.ndarray values: 1D array of values
+    :param numpy.ndarray indices: Data indices corresponding to values
+    :param numpy.ndarray starts: Start of each segment, strictly increasing
+    :param bool isMin: True for min, False for max
+    :return: Data indices of the extremum of non all-NaN segments
+    :rtype: numpy.ndarray
+    """
+    ufunc = numpy.fmin if isMin else numpy.fmax
+    extremum = ufunc.reduceat(values, starts)
+    counts = numpy.diff(numpy.append(starts, len(values)))
+    positions = numpy.where(
+        values == numpy.repeat(extremum, counts),
+        numpy.arange(len(values)),
+        len(values))
+    positions = numpy.minimum.reduceat(positions, starts)
+    return indices[positions[positions < len(values)]]
+
+
+def decimate(x, y, pyramid, xmin, xmax, width, logx=False):
+    """Returns the indices of the points to display for the given view.
+
+    Points are grouped by pixel column of the plot area and for each column
+    the first, last, minimum and maximum points are kept.
+    Points just outside [xmin, xmax] are kept so that lines reach the border
+    of the plot area.
+
+    :param numpy.ndarray x: X coordinates, sorted in increasing order
+    :param numpy.ndarray y: Y coordinates
+    :param MinMaxPyramid pyramid: Min/max pyramid of y
+    :param float xmin: Minimum of the visible X range
+    :param float xmax: Maximum of the visible X range
+    :param int width: Width of the plot area in pixels
+    :param bool logx: True if the X axis is in log scale
+    :return: Sorted indices of points to display
+    :rtype: numpy.ndarray
+    """
+    first = max(0, numpy.searchsorted(x, xmin, side='left') - 1)
+    end = min(len(x), numpy.searchsorted(x, xmax, side='right') + 1)
+    count = end - first
+    if count <= 4 * width:  # Not worth decimating
+        return numpy.arange(first, end)
+
+    # Start index of each pixel column
+    if logx:
+        edges = numpy.logspace(
+            numpy.log10(xmin), numpy.log10(xmax), width + 1)[1:-1]
+    else:
+        edges = numpy.linspace(xmin, xmax, width + 1)[1:-1]
+    starts = numpy.clip(
+        numpy.searchsorted(x, edges, side='left'), first, end)
+    starts = numpy.unique(numpy.concatenate(((first,), starts)))
+    starts = starts[starts < end]
+    ends = numpy.append(starts[1:], end)
+
+    # Blocks are assigned to the column they start in
+    level = pyramid.getLevel(count // (16 * width))
+    if level is None:  # Use data directly
+        indices = numpy.arange(first, end)
+        minima = maxima = numpy.asarray(y[first:end], dtype=numpy.float64)
+        argmins = argmaxs = indices
+        segments = starts - first
+    else:
+        blockSize, minima, argmins, maxima, argmaxs = level
+        blockFirst = first // blockSize
+        blockEnd = -(-end // blockSize)
+        minima = minima[blockFirst:blockEnd]
+        argmins = argmins[blockFirst:blockEnd]
+        maxima = maxima[blockFirst:blockEnd]
+        argmaxs = argmaxs[blockFirst:blockEnd]
+        segments = numpy.unique(starts // blockSize - blockFirst)
+
+    return numpy.unique(numpy.concatenate((
+        starts,
+        ends - 1,
+        _segmentArgExtremum(minima, argmins, segments, isMin=True),
+        _segmentArgExtremum(maxima, argmaxs, segments, isMin=False))))
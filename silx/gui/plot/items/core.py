@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "29/01/2019"
+__date__ = "17/10/2026"
 
 import collections
 try:
@@ -37,7 +37,6 @@ except ImportError:  # Python2 support
 from copy import deepcopy
 import logging
 import enum
-import warnings
 import weakref
 
 import numpy
@@ -48,6 +47,7 @@ from ....utils.enum import Enum as _Enum
 from ... import qt
 from ... import colors
 from ...colors import Colormap
+from ....math.combo import min_max
 from ._pick import PickingResult
 
 from silx import config
@@ -473,6 +473,7 @@ class ColormapMixIn(ItemMixInBase):
         self._colormap.sigChanged.connect(self._colormapChanged)
         self.__data = None
         self.__cacheColormapRange = {}  # Store {normalization: range}
+        self.__cacheMinMax = None  # Store min_max result shared by normalizations
 
     def getColormap(self):
         """Return the used colormap"""
@@ -515,6 +516,7 @@ class ColormapMixIn(ItemMixInBase):
         """
         self.__data = None if data is None else numpy.array(data, copy=copy)
         self.__cacheColormapRange = {}  # Reset cache
+        self.__cacheMinMax = None
 
         # Fill-up colormap range cache if values are provided
         if max_ is not None and numpy.isfinite(max_):
@@ -559,7 +561,15 @@ class ColormapMixIn(ItemMixInBase):
         key = normalization, autoscaleMode
         vRange = self.__cacheColormapRange.get(key, None)
         if vRange is None:
-            vRange = colormap._computeAutoscaleRange(data)
+            if autoscaleMode == Colormap.MINMAX:
+                # Single data scan shared by all normalizations
+                if self.__cacheMinMax is None and data.size > 0:
+                    self.__cacheMinMax = min_max(
+                        data, min_positive=True, finite=True)
+                vRange = colormap._computeAutoscaleRange(
+                    data, minMax=self.__cacheMinMax)
+            else:
+                vRange = colormap._computeAutoscaleRange(data)
             self.__cacheColormapRange[key] = vRange
         return vRange
 
@@ -1191,6 +1201,79 @@ class ScatterVisualizationMixIn(ItemMixInBase):
         return self.getVisualizationParameter(parameter)
 
 
+class _PointsBuffer(object):
+    """Array growing along its last dimension with amortized appends.
+
+    Storage is over-allocated so that appending does not copy existing data.
+    Existing data is never overwritten, so arrays previously returned by
+    :attr:`data` are left unchanged by :meth:`append`.
+
+    :param numpy.ndarray array: Initial data (not copied)
+    """
+
+    _MIN_CAPACITY = 16
+    """Minimum number of elements to allocate"""
+
+    def __init__(self, array):
+        self.__storage = array
+        self.__start = 0
+        self.__end = array.shape[-1]
+        self.data = array
+        """Current data: a view of the storage (do not modify!)"""
+
+    def append(self, data, maxLength=None):
+        """Append data and drop the oldest elements exceeding maxLength.
+
+        :param numpy.ndarray data: Data to append along the last dimension
+        :param Union[int,None] maxLength:
+            Maximum number of elements to keep or None for no limit
+        :return: The dropped elements of the previous data
+        :rtype: numpy.ndarray
+        """
+        if maxLength is not None and data.shape[-1] > maxLength:
+            data = data[..., -maxLength:]
+        length = self.__end - self.__start
+        size = data.shape[-1]
+        if maxLength is None:
+            nbDropped = 0
+        else:
+            nbDropped = max(0, length + size - maxLength)
+        dropped = self.__storage[..., self.__start:self.__start + nbDropped]
+
+        dtype = numpy.result_type(self.__storage, data)
+        if (dtype == self.__storage.dtype and
+                self.__storage is not self.data and
+                self.__end + size <= self.__storage.shape[-1]):
+            # Enough capacity: write after existing data
+            self.__storage[..., self.__end:self.__end + size] = data
+            self.__start += nbDropped
+            self.__end += size
+        else:  # Allocate new storage
+            kept = self.__storage[..., self.__start + nbDropped:self.__end]
+            length = kept.shape[-1] + size
+            if maxLength is None:
+                capacity = 2 * length
+            else:
+                capacity = 2 * maxLength
+            capacity = max(capacity, self._MIN_CAPACITY)
+            self.__storage = numpy.empty(
+                data.shape[:-1] + (capacity,), dtype=dtype)
+            self.__storage[..., :kept.shape[-1]] = kept
+            self.__storage[..., kept.shape[-1]:length] = data
+            self.__start, self.__end = 0, length
+
+        self.data = self.__storage[..., self.__start:self.__end]
+        return dropped
+
+
+def _mergeRange(vmin, vmax, newMin, newMax):
+    """Returns the union of two ranges, ignoring NaNs.
+
+    :rtype: Tuple[float,float]
+    """
+    return numpy.fmin(vmin, newMin), numpy.fmax(vmax, newMax)
+
+
 class PointsBase(Item, SymbolMixIn, AlphaMixIn):
     """Base class for :class:`Curve` and :class:`Scatter`"""
     # note: _logFilterData must be overloaded if you overload
@@ -1217,6 +1300,12 @@ class PointsBase(Item, SymbolMixIn, AlphaMixIn):
         # key is (isXPositiveFilter, isYPositiveFilter)
         self._boundsCache = {}
 
+        # Buffers used by appendData: {name: _PointsBuffer}
+        self._buffers = {}
+        self.__maxLength = None
+        # (nbAppended, nbDropped) not yet sent to the backend
+        self.__appended = None
+
     @staticmethod
     def _logFilterError(value, error):
         """Filter/convert error values if they go <= 0.
@@ -1347,15 +1436,10 @@ class PointsBase(Item, SymbolMixIn, AlphaMixIn):
             else:
                 x, y, _xerror, _yerror = data
 
-            with warnings.catch_warnings():
-                warnings.simplefilter('ignore', category=RuntimeWarning)
-                # Ignore All-NaN slice encountered
-                self._boundsCache[(xPositive, yPositive)] = (
-                    numpy.nanmin(x),
-                    numpy.nanmax(x),
-                    numpy.nanmin(y),
-                    numpy.nanmax(y)
-                )
+            # Single pass on each array, ignoring NaNs
+            xmin, xmax = min_max(x)
+            ymin, ymax = min_max(y)
+            self._boundsCache[(xPositive, yPositive)] = xmin, xmax, ymin, ymax
         return self._boundsCache[(xPositive, yPositive)]
 
     def _getCachedData(self):
@@ -1476,6 +1560,7 @@ class PointsBase(Item, SymbolMixIn, AlphaMixIn):
         self._boundsCache = {}  # Reset cached bounds
         self._filteredCache = {}  # Reset cached filtered data
         self._clippedCache = {}  # Reset cached clipped bool array
+        self._buffers = {}  # Reset appendData buffers
 
         # TODO hackish data range implementation
         if self.isVisible():
@@ -1484,6 +1569,213 @@ class PointsBase(Item, SymbolMixIn, AlphaMixIn):
                 plot._invalidateDataRange()
         self._updated(ItemChangedType.DATA)
 
+    def getMaxLength(self):
+        """Returns the maximum number of points kept by :meth:`appendData`.
+
+        :rtype: Union[int,None]
+        """
+        return self.__maxLength
+
+    def setMaxLength(self, length):
+        """Set the maximum number of points kept by :meth:`appendData`.
+
+        When appending data makes the number of points exceed this length,
+        the oldest points are dropped (i.e., it behaves as a ring buffer).
+        This does not affect data set with :meth:`setData`
+        until data is appended.
+
+        :param Union[int,None] length: Number of points or None for no limit
+        """
+        if length is not None:
+            length = int(length)
+            if length <= 0:
+                raise ValueError("Max length must be strictly positive")
+        self.__maxLength = length
+
+    def _appendToBuffer(self, name, current, data):
+        """Append data to the buffer storing current array.
+
+        :param str name: Name of the buffer
+        :param numpy.ndarray current: The current array
+        :param numpy.ndarray data: Array to append along the last dimension
+        :return: (new array, dropped elements of current array)
+        """
+        buffer_ = self._buffers.get(name)
+        if buffer_ is None or buffer_.data is not current:
+            buffer_ = _PointsBuffer(current)
+            self._buffers[name] = buffer_
+        dropped = buffer_.append(data, self.getMaxLength())
+        return buffer_.data, dropped
+
+    def _appendError(self, name, current, error, size):
+        """Append error values to the current error.
+
+        :param str name: Name of the buffer
+        :param current: Current error: None, float or array
+        :param error: Error of the new points
+        :param int size: Number of new points
+        :return: (new error, dropped errors or None)
+        :raises ValueError: If error is not consistent with current one
+        """
+        if not isinstance(current, numpy.ndarray):
+            if error is not None:
+                raise ValueError(
+                    "Cannot append error when data has no error array")
+            return current, None  # None or float
+
+        if error is None:
+            raise ValueError("Missing error for appended data")
+        if (current.ndim == 2 and current.shape[1] == 1 and
+                len(self._x) != 1):
+            current = numpy.ravel(current)  # Convert Nx1 to N
+        error = numpy.array(error, copy=False)
+        if error.ndim == 0:
+            error = numpy.full(current.shape[:-1] + (size,), error)
+        elif current.ndim == 1 and error.ndim == 2 and error.shape[1] == 1:
+            error = numpy.ravel(error)  # Convert Nx1 to N
+        if error.shape != current.shape[:-1] + (size,):
+            raise ValueError("Appended error shape is not consistent")
+        return self._appendToBuffer(name, current, error)
+
+    @staticmethod
+    def _computeBounds(x, y, xPositive, yPositive):
+        """Returns the bounds of points, ignoring NaNs.
+
+        :param numpy.ndarray x: X coordinates
+        :param numpy.ndarray y: Y coordinates
+        :param bool xPositive: True to ignore points with x <= 0.
+        :param bool yPositive: True to ignore points with y <= 0.
+        :return: (xmin, xmax, ymin, ymax), NaNs if there is no point
+        """
+        if xPositive or yPositive:
+            with numpy.errstate(invalid='ignore'):  # Ignore NaN warnings
+                clipped = numpy.zeros(x.shape, dtype=bool)
+                if xPositive:
+                    clipped |= x <= 0
+                if yPositive:
+                    clipped |= y <= 0
+            x = numpy.where(clipped, numpy.nan, x)
+            y = numpy.where(clipped, numpy.nan, y)
+        xmin, xmax = min_max(x)
+        ymin, ymax = min_max(y)
+        return xmin, xmax, ymin, ymax
+
+    def _appendData(self, x, y, xerror=None, yerror=None):
+        """Append points and update caches.
+
+        This does not notify the change, see :meth:`_dataAppended`.
+
+        :return: The number of dropped points
+        :rtype: int
+        """
+        x = numpy.array(x, copy=False, ndmin=1)
+        y = numpy.array(y, copy=False, ndmin=1)
+        assert len(x) == len(y)
+        assert x.ndim == y.ndim == 1
+
+        previousX, previousY = self.getXData(False), self.getYData(False)
+        if previousX.size == 0:  # No data to append to
+            previousX = numpy.array((), dtype=x.dtype)
+            previousY = numpy.array((), dtype=y.dtype)
+
+        xerror, _ = self._appendError(
+            'xerror', self._xerror, xerror, len(x))
+        yerror, _ = self._appendError(
+            'yerror', self._yerror, yerror, len(x))
+        self._x, droppedX = self._appendToBuffer('x', previousX, x)
+        self._y, droppedY = self._appendToBuffer('y', previousY, y)
+        self._xerror, self._yerror = xerror, yerror
+
+        # Update bounds with appended points only,
+        # unless a dropped point was on the bounds
+        if len(self._x) < len(x):
+            x, y = x[-len(self._x):], y[-len(self._x):]
+        for key, bounds in list(self._boundsCache.items()):
+            if len(droppedX) > 0:
+                droppedBounds = self._computeBounds(
+                    droppedX, droppedY, *key)
+                if (droppedBounds[0] <= bounds[0] or
+                        droppedBounds[1] >= bounds[1] or
+                        droppedBounds[2] <= bounds[2] or
+                        droppedBounds[3] >= bounds[3]):
+                    del self._boundsCache[key]
+                    continue
+            newBounds = self._computeBounds(x, y, *key)
+            self._boundsCache[key] = (
+                _mergeRange(bounds[0], bounds[1], newBounds[0], newBounds[1]) +
+                _mergeRange(bounds[2], bounds[3], newBounds[2], newBounds[3]))
+
+        # Data filtered for log scale is computed on demand
+        self._filteredCache = {}
+        self._clippedCache = {}
+        return len(droppedX)
+
+    def _dataAppended(self, nbAppended, nbDropped):
+        """Notify that data was appended
+
+        If the item is already displayed, only the appended points are
+        sent to the backend on next update (see
+        :meth:`_appendToBackendRenderer`).
+
+        :param int nbAppended: Number of points appended
+        :param int nbDropped: Number of previous points dropped
+        """
+        plot = self.getPlot()
+        if self.isVisible() and plot is not None:
+            plot._invalidateDataRange()
+            if not self._dirty and self._backendRenderer is not None:
+                if self.__appended is not None:
+                    nbAppended += self.__appended[0]
+                    nbDropped += self.__appended[1]
+                self.__appended = nbAppended, nbDropped
+                plot._itemRequiresUpdate(self)
+                self.sigItemChanged.emit(ItemChangedType.DATA)
+                return
+        self._updated(ItemChangedType.DATA)
+
+    def _appendToBackendRenderer(self, backend, nbAppended, nbDropped):
+        """Override in subclass to append points to the backend renderer.
+
+        :param BackendBase backend: The backend to update
+        :param int nbAppended: Number of points appended since last update
+        :param int nbDropped:
+            Number of points dropped from the start since last update
+        :return: True if the renderer was updated,
+            False if it must be created again
+        :rtype: bool
+        """
+        return False
+
+    def _update(self, backend):
+        appended, self.__appended = self.__appended, None
+        if (not self._dirty and appended is not None and
+                self._backendRenderer is not None):
+            nbAppended, nbDropped = appended
+            nbAppended = min(nbAppended, len(self._x))
+            if not self._appendToBackendRenderer(
+                    backend, nbAppended, nbDropped):
+                self._dirty = True  # Create the renderer again
+        super(PointsBase, self)._update(backend)
+
+    def appendData(self, x, y, xerror=None, yerror=None):
+        """Append points to the data.
+
+        Data is stored in over-allocated buffers, so that appending points
+        does not copy existing ones and bounds are updated from
+        the new points only.
+        If :meth:`getMaxLength` is not None, only this number of the last
+        points are kept.
+
+        :param numpy.ndarray x: The x coordinates of the new points.
+        :param numpy.ndarray y: The y coordinates of the new points.
+        :param xerror: The uncertainties on x of the new points.
+            It must be provided if and only if data has an array of errors.
+        :param yerror: The uncertainties on y of the new points. See xerror.
+        :raises ValueError: If errors are not consistent with the data
+        """
+        nbDropped = self._appendData(x, y, xerror, yerror)
+        self._dataAppended(numpy.size(x), nbDropped)
+
 
 class BaselineMixIn(object):
     """Base class for Baseline mix-in"""
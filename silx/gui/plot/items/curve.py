@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "24/04/2018"
+__date__ = "17/10/2026"
 
 
 import logging
@@ -40,6 +40,8 @@ from ... import colors
 from .core import (PointsBase, LabelsMixIn, ColorMixIn, YAxisMixIn,
                    FillMixIn, LineMixIn, SymbolMixIn, ItemChangedType,
                    BaselineMixIn, HighlightedMixIn, _Style)
+from ._decimation import MinMaxPyramid, decimate, isMonotonic
+from ._pick import PickingResult
 
 
 _logger = logging.getLogger(__name__)
@@ -173,6 +175,13 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
 
     _DEFAULT_BASELINE = None
 
+    _DECIMATION_MIN_SIZE = 1024 * 1024
+    """Number of points from which the displayed curve is decimated.
+
+    Large curves with increasing x coordinates and no error bars are
+    displayed with the first, last, min and max points of each pixel column.
+    """
+
     def __init__(self):
         PointsBase.__init__(self)
         ColorMixIn.__init__(self)
@@ -185,6 +194,10 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
 
         self._setBaseline(Curve._DEFAULT_BASELINE)
 
+        self.__decimationPyramid = None  # Lazy-loaded min/max of y
+        self.__isMonotonic = None  # Lazy-loaded x ordering check
+        self.__decimatedIndices = None  # Indices of displayed points
+
         self.sigItemChanged.connect(self.__itemChanged)
 
     def __itemChanged(self, event):
@@ -194,6 +207,53 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
             if plot is not None:
                 plot._invalidateDataRange()
 
+    def _setPlot(self, plot):
+        previousPlot = self.getPlot()
+        if previousPlot is not None:
+            previousPlot.getXAxis().sigLimitsChanged.disconnect(
+                self.__xLimitsChanged)
+        super(Curve, self)._setPlot(plot)
+        if plot is not None:
+            plot.getXAxis().sigLimitsChanged.connect(self.__xLimitsChanged)
+
+    def __xLimitsChanged(self, vmin, vmax):
+        """Handle change of X axis limits: update decimation"""
+        if self.__isDecimable():
+            self._updated()
+
+    def __isDecimable(self):
+        """Returns True if the curve is displayed decimated
+
+        :rtype: bool
+        """
+        if (len(self._x) < self._DECIMATION_MIN_SIZE or
+                self._xerror is not None or self._yerror is not None):
+            return False
+        if self.__isMonotonic is None:
+            self.__isMonotonic = isMonotonic(self._x)
+        return self.__isMonotonic
+
+    def __getDecimatedIndices(self):
+        """Returns indices of the points to display or None for all points
+
+        :rtype: Union[numpy.ndarray,None]
+        """
+        plot = self.getPlot()
+        if plot is None or not self.__isDecimable():
+            return None
+
+        width = plot.getPlotBoundsInPixels()[2]
+        if width <= 0:
+            return None
+
+        if self.__decimationPyramid is None:
+            self.__decimationPyramid = MinMaxPyramid(self._y)
+
+        xAxis = plot.getXAxis()
+        xmin, xmax = xAxis.getLimits()
+        return decimate(self._x, self._y, self.__decimationPyramid,
+                        xmin, xmax, width, logx=xAxis._isLogarithmic())
+
     def _addBackendRenderer(self, backend):
         """Update backend renderer"""
         # Filter-out values <= 0
@@ -203,6 +263,16 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
         if len(xFiltered) == 0 or not numpy.any(numpy.isfinite(xFiltered)):
             return None  # No data to display, do not add renderer to backend
 
+        baseline = self.getBaseline(copy=False)
+
+        self.__decimatedIndices = self.__getDecimatedIndices()
+        if self.__decimatedIndices is not None:
+            xFiltered = xFiltered[self.__decimatedIndices]
+            yFiltered = yFiltered[self.__decimatedIndices]
+            if (isinstance(baseline, numpy.ndarray) and
+                    baseline.shape == self._x.shape):
+                baseline = baseline[self.__decimatedIndices]
+
         style = self.getCurrentStyle()
 
         return backend.addCurve(xFiltered, yFiltered,
@@ -216,7 +286,28 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
                                 fill=self.isFill(),
                                 alpha=self.getAlpha(),
                                 symbolsize=style.getSymbolSize(),
-                                baseline=self.getBaseline(copy=False))
+                                baseline=baseline)
+
+    def _appendToBackendRenderer(self, backend, nbAppended, nbDropped):
+        """Append points to the backend renderer when displayed as is"""
+        plot = self.getPlot()
+        if (plot is None or self.__decimatedIndices is not None or
+                self.__isDecimable() or self.isFill() or
+                self._xerror is not None or self._yerror is not None or
+                plot.getXAxis()._isLogarithmic() or
+                plot.getYAxis(self.getYAxis())._isLogarithmic()):
+            return False
+        return backend.appendCurveData(self._backendRenderer,
+                                       self._x, self._y,
+                                       nbAppended, nbDropped)
+
+    def pick(self, x, y):
+        result = super(Curve, self).pick(x, y)
+        if result is not None and self.__decimatedIndices is not None:
+            # Convert indices of displayed points to indices of data
+            indices = result.getIndices(copy=False)
+            result = PickingResult(self, self.__decimatedIndices[indices])
+        return result
 
     def __getitem__(self, item):
         """Compatibility with PyMca and silx <= 0.4.0"""
@@ -344,6 +435,48 @@ class Curve(PointsBase, ColorMixIn, YAxisMixIn, FillMixIn, LabelsMixIn,
         :param bool copy: True make a copy of the data (default),
                           False to use provided arrays.
         """
+        self.__decimationPyramid = None
+        self.__isMonotonic = None
         PointsBase.setData(self, x=x, y=y, xerror=xerror, yerror=yerror,
                            copy=copy)
         self._setBaseline(baseline=baseline)
+
+    def appendData(self, x, y, xerror=None, yerror=None, baseline=None):
+        """Append points to the curve.
+
+        See :meth:`PointsBase.appendData`.
+
+        :param numpy.ndarray x: The x coordinates of the new points.
+        :param numpy.ndarray y: The y coordinates of the new points.
+        :param xerror: The uncertainties on x of the new points.
+        :param yerror: The uncertainties on y of the new points.
+        :param baseline: The baseline of the new points.
+            It must be provided if and only if the curve baseline is an array.
+        :raises ValueError: If errors or baseline are not consistent
+        """
+        previousX = self.getXData(copy=False)
+        hasBaselineArray = (isinstance(self._baseline, numpy.ndarray) and
+                            self._baseline.shape == previousX.shape and
+                            previousX.size > 0)
+        if hasBaselineArray != (baseline is not None):
+            raise ValueError("Appended baseline is not consistent")
+
+        nbDropped = self._appendData(x, y, xerror, yerror)
+
+        if hasBaselineArray:
+            baseline = numpy.array(baseline, copy=False, ndmin=1)
+            if baseline.shape != numpy.shape(x):
+                baseline = numpy.broadcast_to(baseline, numpy.shape(x))
+            self._baseline, _ = self._appendToBuffer(
+                'baseline', self._baseline, baseline)
+
+        # Update decimation information
+        self.__decimationPyramid = None
+        if self.__isMonotonic:
+            # Check new points and the last previous one
+            self.__isMonotonic = isMonotonic(
+                self._x[-(numpy.size(x) + 1):])
+        elif nbDropped > 0:
+            self.__isMonotonic = None  # Check again when needed
+
+        self._dataAppended(numpy.size(x), nbDropped)
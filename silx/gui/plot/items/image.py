@@ -28,18 +28,25 @@ of the :class:`Plot`.
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "20/10/2017"
+__date__ = "17/10/2026"
 
 
 try:
     from collections import abc
 except ImportError:  # Python2 support
     import collections as abc
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
+import threading
 
 import numpy
 
+from ....io.url import DataUrl
+from ....io.utils import get_data
 from ....utils.proxy import docstring
+from ...utils.concurrent import submitToQtMainThread
 from .core import (Item, LabelsMixIn, DraggableMixIn, ColormapMixIn,
                    AlphaMixIn, ItemChangedType)
 
@@ -460,53 +467,250 @@ class MaskImageData(ImageData):
     pass
 
 
+class _LazyFrameLoader(object):
+    """Load frames of a stack on demand in a background thread.
+
+    Loaded frames are kept in a least-recently-used cache.
+
+    :param stack: A 3D h5py-like dataset or a sequence of frames,
+        each frame being either a 2D array or a :class:`DataUrl`.
+    :param int cacheSize: Maximum number of frames kept in memory
+    """
+
+    def __init__(self, stack, cacheSize):
+        self.__stack = stack
+        self.__cacheSize = max(1, int(cacheSize))
+        self.__cache = OrderedDict()  # {index: frame}
+        self.__futures = {}  # {index: Future} of pending loads
+        self.__lock = threading.RLock()
+        self.__executor = None  # Started on first load request
+
+    def __len__(self):
+        return len(self.__stack)
+
+    def setCacheSize(self, size):
+        """Set the maximum number of frames kept in memory
+
+        :param int size:
+        """
+        with self.__lock:
+            self.__cacheSize = max(1, int(size))
+            self.__evict()
+
+    def getFrame(self, index):
+        """Returns the frame at index if it is in the cache, else None.
+
+        :param int index:
+        :rtype: Union[numpy.ndarray,None]
+        """
+        with self.__lock:
+            frame = self.__cache.get(index, None)
+            if frame is not None:
+                self.__cache.move_to_end(index)
+            return frame
+
+    def request(self, indices, callback):
+        """Load given frames in background if not yet cached.
+
+        Pending loads of frames which are not in indices are cancelled.
+
+        :param List[int] indices: Frame indices ordered by priority
+        :param callable callback:
+            Function called with the frame index once it is loaded.
+            It is called from the loading thread.
+        """
+        size = len(self)
+        with self.__lock:
+            indices = [i for i in indices if 0 <= i < size]
+            indices = indices[:self.__cacheSize]
+            for index, future in list(self.__futures.items()):
+                if index not in indices and future.cancel():
+                    self.__futures.pop(index, None)
+
+            for index in indices:
+                if index not in self.__cache and index not in self.__futures:
+                    if self.__executor is None:
+                        self.__executor = ThreadPoolExecutor(max_workers=1)
+                    future = self.__executor.submit(self._readFrame, index)
+                    self.__futures[index] = future
+                    future.add_done_callback(
+                        functools.partial(self.__loaded, index, callback))
+
+    def cancel(self):
+        """Cancel all pending loads"""
+        self.request((), None)
+
+    def close(self):
+        """Cancel all pending loads and stop the loading thread.
+
+        The thread is started again by the next call to :meth:`request`.
+        """
+        with self.__lock:
+            self.cancel()
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+    def _readFrame(self, index):
+        """Read a frame from the stack.
+
+        :param int index:
+        :rtype: numpy.ndarray
+        """
+        frame = self.__stack[index]
+        if isinstance(frame, DataUrl):
+            frame = get_data(frame)
+        frame = numpy.array(frame, copy=False)
+        assert frame.ndim == 2
+        return frame
+
+    def __loaded(self, index, callback, future):
+        """Handle the end of the loading of a frame"""
+        with self.__lock:
+            if self.__futures.get(index, None) is future:
+                del self.__futures[index]
+            if future.cancelled():
+                return
+            try:
+                frame = future.result()
+            except Exception:
+                _logger.error("Failed to load frame %d", index, exc_info=True)
+                return
+            self.__cache[index] = frame
+            self.__cache.move_to_end(index)
+            self.__evict()
+        callback(index)
+
+    def __evict(self):
+        """Remove least recently used frames exceeding cache size"""
+        while len(self.__cache) > self.__cacheSize:
+            self.__cache.popitem(last=False)
+
+
 class ImageStack(ImageData):
     """Item to store a stack of images and to show it in the plot as one
     of the images of the stack.
 
     The stack is a 3D array ordered this way: `frame id, y, x`.
     So the first image of the stack can be reached this way: `stack[0, :, :]`
+
+    The stack can also be loaded lazily (see :meth:`setStackData`):
+    Frames are then read on demand in a background thread, the last used
+    frames are kept in a cache and the next frames in the browsing
+    direction are prefetched.
     """
 
+    _DEFAULT_CACHE_SIZE = 10
+    """Default number of frames kept in memory for lazy stacks"""
+
+    _DEFAULT_N_PREFETCH = 2
+    """Default number of frames to prefetch for lazy stacks"""
+
     def __init__(self):
         ImageData.__init__(self)
         self.__stack = None
         """A 3D numpy array (or a mimic one, see ListOfImages)"""
         self.__stackPosition = None
         """Displayed position in the cube"""
-
-    def setStackData(self, stack, position=None, copy=True):
+        self.__loader = None
+        """Frame loader used for lazy stacks"""
+        self.__cacheSize = self._DEFAULT_CACHE_SIZE
+        self.__nPrefetch = self._DEFAULT_N_PREFETCH
+        self.__browsingStep = 1
+        """Direction of the last stack position change"""
+
+    def setStackData(self, stack, position=None, copy=True, lazy=False):
         """Set the stack data
 
         :param stack: A 3D numpy array like
         :param int position: The position of the displayed image in the stack
         :param bool copy: True (Default) to get a copy,
                           False to use internal representation (do not modify!)
+        :param bool lazy: True to read frames on demand in a background
+            thread instead of loading the whole stack in memory.
+            In this case, stack can also be a sequence of :class:`DataUrl`
+            and copy is ignored.
         """
         if self.__stack is stack:
             return
-        if copy:
-            stack = numpy.array(stack)
-        assert stack.ndim == 3
+        if self.__loader is not None:
+            self.__loader.close()
+            self.__loader = None
+
+        if lazy:
+            assert getattr(stack, 'ndim', 3) == 3
+            self.__loader = _LazyFrameLoader(stack, self.__cacheSize)
+        else:
+            if copy:
+                stack = numpy.array(stack)
+            assert stack.ndim == 3
         self.__stack = stack
         if position is not None:
             self.__stackPosition = position
         if self.__stackPosition is None:
             self.__stackPosition = 0
-        self.__updateDisplayedData()
+        self.__updateDisplayedData(stackChanged=True)
+
+    def _setPlot(self, plot):
+        if plot is None and self.__loader is not None:
+            self.__loader.close()  # Release loading thread when removed
+        super(ImageStack, self)._setPlot(plot)
 
     def getStackData(self, copy=True):
         """Get the stored stack array.
 
+        For lazy stacks, this returns the stack as provided to
+        :meth:`setStackData` and copy is ignored.
+
         :param bool copy: True (Default) to get a copy,
                           False to use internal representation (do not modify!)
         :rtype: A 3D numpy array, or numpy array like
         """
-        if copy:
+        if copy and not self.isLazy():
             return numpy.array(self.__stack)
         else:
             return self.__stack
 
+    def isLazy(self):
+        """Returns True if the frames of the stack are loaded on demand.
+
+        :rtype: bool
+        """
+        return self.__loader is not None
+
+    def setCacheSize(self, size):
+        """Set the maximum number of frames kept in memory for lazy stacks.
+
+        :param int size: Number of frames (at least 1)
+        """
+        self.__cacheSize = max(1, int(size))
+        if self.__loader is not None:
+            self.__loader.setCacheSize(self.__cacheSize)
+
+    def getCacheSize(self):
+        """Returns the maximum number of frames kept in memory for lazy stacks.
+
+        :rtype: int
+        """
+        return self.__cacheSize
+
+    def setNPrefetch(self, n):
+        """Set the number of frames to prefetch for lazy stacks.
+
+        Frames are prefetched in the browsing direction.
+        This is limited by the cache size.
+
+        :param int n: Number of frames to prefetch
+        """
+        self.__nPrefetch = max(0, int(n))
+
+    def getNPrefetch(self):
+        """Returns the number of frames to prefetch for lazy stacks.
+
+        :rtype: int
+        """
+        return self.__nPrefetch
+
     def setStackPosition(self, pos):
         """Set the displayed position on the stack.
 
@@ -517,6 +721,8 @@ class ImageStack(ImageData):
         """
         if self.__stackPosition == pos:
             return
+        if self.__stackPosition is not None:
+            self.__browsingStep = -1 if pos < self.__stackPosition else 1
         self.__stackPosition = pos
         self.__updateDisplayedData()
 
@@ -527,13 +733,49 @@ class ImageStack(ImageData):
         """
         return self.__stackPosition
 
-    def __updateDisplayedData(self):
+    def __updateDisplayedData(self, stackChanged=False):
         """Update the displayed frame whenever the stack or the stack
-        position are updated."""
+        position are updated.
+
+        :param bool stackChanged: True if the stack has changed
+        """
         if self.__stack is None or self.__stackPosition is None:
             empty = numpy.array([]).reshape(0, 0)
             self.setData(empty, copy=False)
             return
         size = len(self.__stack)
-        self.__stackPosition = numpy.clip(self.__stackPosition, 0, size)
-        self.setData(self.__stack[self.__stackPosition], copy=False)
+        self.__stackPosition = int(numpy.clip(self.__stackPosition, 0, size - 1))
+
+        if self.__loader is None:
+            self.setData(self.__stack[self.__stackPosition], copy=False)
+            return
+
+        position = self.__stackPosition
+        frame = self.__loader.getFrame(position)
+        if frame is not None:
+            self.setData(frame, copy=False)
+        elif stackChanged:  # Do not display a frame of the previous stack
+            self.setData(numpy.array([]).reshape(0, 0), copy=False)
+        # Otherwise keep previous frame until the requested one is loaded
+
+        nPrefetch = min(self.__nPrefetch, self.__cacheSize - 1)
+        indices = [position + self.__browsingStep * i
+                   for i in range(nPrefetch + 1)]
+        loader = self.__loader
+        self.__loader.request(
+            indices,
+            lambda index: submitToQtMainThread(
+                self.__frameLoaded, loader, index))
+
+    def __frameLoaded(self, loader, index):
+        """Display a loaded frame if it is the current one.
+
+        This is called in the main thread.
+
+        :param _LazyFrameLoader loader: The loader of the frame
+        :param int index: Index of the loaded frame
+        """
+        if loader is self.__loader and index == self.__stackPosition:
+            frame = loader.getFrame(index)
+            if frame is not None:
+                self.setData(frame, copy=False)
@@ -30,7 +30,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "29/03/2017"
+__date__ = "17/10/2026"
 
 
 from collections import namedtuple
@@ -304,6 +304,9 @@ class Scatter(PointsBase, ColormapMixIn, ScatterVisualizationMixIn):
         self.__cacheRegularGridInfo = None
         self.__cacheHistogramInfo = None
 
+        # Cache finite (min, min positive, max) of values for appendData
+        self.__valueRange = None
+
     def _updateColormappedData(self):
         """Update the colormapped data, to be called when changed"""
         if self.getVisualization() is self.Visualization.BINNED_STATISTIC:
@@ -924,6 +927,23 @@ class Scatter(PointsBase, ColormapMixIn, ScatterVisualizationMixIn):
         assert value.ndim == 1
         assert len(x) == len(value)
 
+        self.__resetCaches()
+        self.__valueRange = None
+
+        self._value = value
+        self._updateColormappedData()
+
+        if alpha is not None:
+            alpha = self.__checkAlpha(alpha, len(x), copy)
+        self.__alpha = alpha
+
+        # set x, y, xerror, yerror
+
+        # call self._updated + plot._invalidateDataRange()
+        PointsBase.setData(self, x, y, xerror, yerror, copy)
+
+    def __resetCaches(self):
+        """Reset information computed from the data"""
         # Reset triangulation and interpolator
         if self.__delaunayFuture is not None:
             self.__delaunayFuture.cancel()
@@ -936,21 +956,88 @@ class Scatter(PointsBase, ColormapMixIn, ScatterVisualizationMixIn):
         self.__cacheRegularGridInfo = None
         self.__cacheHistogramInfo = None
 
-        self._value = value
-        self._updateColormappedData()
+    @staticmethod
+    def __checkAlpha(alpha, length, copy=True):
+        """Make sure alpha is an array of float in [0, 1]"""
+        alpha = numpy.array(alpha, copy=copy)
+        assert alpha.ndim == 1
+        assert length == len(alpha)
+        if alpha.dtype.kind != 'f':
+            alpha = alpha.astype(numpy.float32)
+        if numpy.any(numpy.logical_or(alpha < 0., alpha > 1.)):
+            alpha = numpy.clip(alpha, 0., 1.)
+        return alpha
 
+    @staticmethod
+    def __computeValueRange(value):
+        """Returns finite (min, min positive, max) of value, NaN if none"""
+        if value.size == 0:
+            return numpy.nan, numpy.nan, numpy.nan
+        result = min_max(value, min_positive=True, finite=True)
+        return tuple(numpy.nan if v is None else v for v in
+                     (result.minimum, result.min_positive, result.maximum))
+
+    def appendData(self, x, y, value, xerror=None, yerror=None, alpha=None):
+        """Append points to the scatter.
+
+        See :meth:`PointsBase.appendData`.
+        The autoscale range of the colormap is also updated from
+        the new points only.
+
+        :param numpy.ndarray x: The x coordinates of the new points.
+        :param numpy.ndarray y: The y coordinates of the new points.
+        :param numpy.ndarray value: The values of the new points.
+        :param xerror: The uncertainties on x of the new points.
+        :param yerror: The uncertainties on y of the new points.
+        :param alpha: The transparency of the new points.
+            It must be provided if and only if the scatter has alpha values.
+        :raises ValueError: If errors or alpha are not consistent
+        """
+        value = numpy.array(value, copy=False, ndmin=1)
+        assert value.ndim == 1
+        assert numpy.size(x) == len(value)
+        if (self.__alpha is None) != (alpha is None):
+            raise ValueError("Appended alpha is not consistent")
+
+        previousValue = self.getValueData(copy=False)
+        if previousValue.size == 0:
+            previousValue = numpy.array((), dtype=value.dtype)
         if alpha is not None:
-            # Make sure alpha is an array of float in [0, 1]
-            alpha = numpy.array(alpha, copy=copy)
-            assert alpha.ndim == 1
-            assert len(x) == len(alpha)
-            if alpha.dtype.kind != 'f':
-                alpha = alpha.astype(numpy.float32)
-            if numpy.any(numpy.logical_or(alpha < 0., alpha > 1.)):
-                alpha = numpy.clip(alpha, 0., 1.)
-        self.__alpha = alpha
+            alpha = self.__checkAlpha(alpha, len(value), copy=False)
 
-        # set x, y, xerror, yerror
+        nbDropped = self._appendData(x, y, xerror, yerror)
+        self._value, dropped = self._appendToBuffer(
+            'value', previousValue, value)
+        if alpha is not None:
+            self.__alpha, _ = self._appendToBuffer(
+                'alpha', self.__alpha, alpha)
+
+        self.__resetCaches()
+
+        # Update range of values
+        if len(self._value) < len(value):
+            value = value[-len(self._value):]
+        if self.__valueRange is not None and len(dropped) > 0:
+            vmin, vminPos, vmax = self.__valueRange
+            droppedMin, droppedMinPos, droppedMax = \
+                self.__computeValueRange(dropped)
+            if (droppedMin <= vmin or droppedMinPos <= vminPos or
+                    droppedMax >= vmax):
+                self.__valueRange = None
+        if self.__valueRange is None:
+            self.__valueRange = self.__computeValueRange(self._value)
+        else:
+            vmin, vminPos, vmax = self.__valueRange
+            newMin, newMinPos, newMax = self.__computeValueRange(value)
+            self.__valueRange = (numpy.fmin(vmin, newMin),
+                                 numpy.fmin(vminPos, newMinPos),
+                                 numpy.fmax(vmax, newMax))
 
-        # call self._updated + plot._invalidateDataRange()
-        PointsBase.setData(self, x, y, xerror, yerror, copy)
+        if self.getVisualization() is self.Visualization.BINNED_STATISTIC:
+            self._updateColormappedData()
+        else:
+            vmin, vminPos, vmax = self.__valueRange
+            self._setColormappedData(self._value, copy=False, min_=vmin,
+                                     minPositive=vminPos, max_=vmax)
+
+        self._dataAppended(len(value), nbDropped)
@@ -27,7 +27,7 @@
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "06/06/2018"
+__date__ = "17/10/2026"
 
 
 from collections import OrderedDict
@@ -72,6 +72,24 @@ class Stats(OrderedDict):
         :return dict: dictionary with :class:`Stat` name as ket and result
                       of the calculation as value
         """
+        context = self.createContext(item, plot, onlimits)
+        return self.calculateFromContext(context)
+
+    @staticmethod
+    def createContext(item, plot, onlimits):
+        """Create the context providing the data of the item to the
+        statistics.
+
+        The context does not copy the data of the item.
+        This must be called from the Qt main thread.
+
+        :param item: the item for which we want statistics
+        :param plot: plot containing the item
+        :param bool onlimits: True if we want to apply statistic only on
+                              visible data.
+        :rtype: _StatsContext
+        :raises ValueError: if the item type is not managed
+        """
         context = None
         # Check for PlotWidget items
         if isinstance(item, items.Curve):
@@ -93,7 +111,19 @@ class Stats(OrderedDict):
 
         if context is None:
                 raise ValueError('Item type not managed')
+        return context
+
+    def calculateFromContext(self, context):
+        """Call all :class:`Stat` object registered on a context created
+        with :meth:`createContext`.
 
+        This does not access the item nor the plot, so it can be run from
+        a worker thread.
+
+        :param _StatsContext context:
+        :return dict: dictionary with :class:`Stat` name as key and result
+                      of the calculation as value
+        """
         res = {}
         for statName, stat in list(self.items()):
             if context.kind not in stat.compatibleKinds:
@@ -133,9 +163,8 @@ class _StatsContext(object):
         assert plot
         assert type(onlimits) is bool
         self.kind = kind
-        self.min = None
-        self.max = None
         self.data = None
+        self.__minMaxResult = None
 
         self.values = None
         """The array of data"""
@@ -156,6 +185,32 @@ class _StatsContext(object):
     def createContext(self, item, plot, onlimits):
         raise NotImplementedError("Base class")
 
+    def _getMinMaxResult(self):
+        """Returns min, max, their indices, mean and std of the values.
+
+        They are computed in a single pass over the values the first time
+        it is called. NaNs are ignored.
+
+        :rtype: Union[silx.math.combo._MinMaxResult,None]
+        """
+        if self.__minMaxResult is None:
+            if self.values is None or numpy.size(self.values) == 0:
+                return None
+            self.__minMaxResult = min_max(self.values, stats=True)
+        return self.__minMaxResult
+
+    @property
+    def min(self):
+        """Minimum of the values or None if there is no value"""
+        result = self._getMinMaxResult()
+        return None if result is None else result.minimum
+
+    @property
+    def max(self):
+        """Maximum of the values or None if there is no value"""
+        result = self._getMinMaxResult()
+        return None if result is None else result.maximum
+
     def isStructuredData(self):
         """Returns True if data as an array-like structure.
 
@@ -199,7 +254,7 @@ class _CurveContext(_StatsContext):
                                plot=plot, onlimits=onlimits)
 
     def createContext(self, item, plot, onlimits):
-        xData, yData = item.getData(copy=True)[0:2]
+        xData, yData = item.getData(copy=False)[0:2]
 
         if onlimits:
             minX, maxX = plot.getXAxis().getLimits()
@@ -209,10 +264,6 @@ class _CurveContext(_StatsContext):
 
         self.xData = xData
         self.yData = yData
-        if len(yData) > 0:
-            self.min, self.max = min_max(yData)
-        else:
-            self.min, self.max = None, None
         self.data = (xData, yData)
         self.values = yData
         self.axes = (xData,)
@@ -232,7 +283,7 @@ class _HistogramContext(_StatsContext):
                                plot=plot, onlimits=onlimits)
 
     def createContext(self, item, plot, onlimits):
-        yData, edges = item.getData(copy=True)[0:2]
+        yData, edges = item.getData(copy=False)[0:2]
         xData = item._revertComputeEdges(x=edges, histogramType=item.getAlignment())
         if onlimits:
             minX, maxX = plot.getXAxis().getLimits()
@@ -242,10 +293,6 @@ class _HistogramContext(_StatsContext):
 
         self.xData = xData
         self.yData = yData
-        if len(yData) > 0:
-            self.min, self.max = min_max(yData)
-        else:
-            self.min, self.max = None, None
         self.data = (xData, yData)
         self.values = yData
         self.axes = (xData,)
@@ -266,9 +313,9 @@ class _ScatterContext(_StatsContext):
                                onlimits=onlimits)
 
     def createContext(self, item, plot, onlimits):
-        valueData = item.getValueData(copy=True)
-        xData = item.getXData(copy=True)
-        yData = item.getYData(copy=True)
+        valueData = item.getValueData(copy=False)
+        xData = item.getXData(copy=False)
+        yData = item.getYData(copy=False)
 
         if onlimits:
             minX, maxX = plot.getXAxis().getLimits()
@@ -283,10 +330,6 @@ class _ScatterContext(_StatsContext):
             xData = xData[(minY <= yData) & (yData <= maxY)]
             yData = yData[(minY <= yData) & (yData <= maxY)]
 
-        if len(valueData) > 0:
-            self.min, self.max = min_max(valueData)
-        else:
-            self.min, self.max = None, None
         self.data = (xData, yData, valueData)
         self.values = valueData
         self.axes = (xData, yData)
@@ -310,7 +353,7 @@ class _ImageContext(_StatsContext):
         self.origin = item.getOrigin()
         self.scale = item.getScale()
 
-        self.data = item.getData(copy=True)
+        self.data = item.getData(copy=False)
 
         if onlimits:
             minX, maxX = plot.getXAxis().getLimits()
@@ -329,10 +372,6 @@ class _ImageContext(_StatsContext):
             else:
                 self.data = self.data[YMinBound:YMaxBound + 1,
                                       XMinBound:XMaxBound + 1]
-        if self.data.size > 0:
-            self.min, self.max = min_max(self.data)
-        else:
-            self.min, self.max = None, None
         self.values = self.data
 
         if self.values is not None:
@@ -367,12 +406,9 @@ class _plot3DScatterContext(_StatsContext):
             if self.values.ndim == 3:
                 axes.append(item.getZData(copy=False))
             self.axes = tuple(axes)
-
-            self.min, self.max = min_max(self.values)
         else:
             self.values = None
             self.axes = None
-            self.min, self.max = None, None
 
 
 class _plot3DArrayContext(_StatsContext):
@@ -399,11 +435,9 @@ class _plot3DArrayContext(_StatsContext):
         if values is not None and len(values) > 0:
             self.values = values
             self.axes = tuple([numpy.arange(size) for size in self.values.shape])
-            self.min, self.max = min_max(self.values)
         else:
             self.values = None
             self.axes = None
-            self.min, self.max = None, None
 
 
 BASIC_COMPATIBLE_KINDS = 'curve', 'image', 'scatter', 'histogram'
@@ -494,6 +528,27 @@ class StatDelta(StatBase):
         return context.max - context.min
 
 
+class StatMean(StatBase):
+    """Compute the mean of the data, ignoring NaNs"""
+    def __init__(self):
+        StatBase.__init__(self, name='mean')
+
+    def calculate(self, context):
+        result = context._getMinMaxResult()
+        return None if result is None else result.mean
+
+
+class StatStd(StatBase):
+    """Compute the standard deviation of the data, ignoring NaNs"""
+    def __init__(self):
+        StatBase.__init__(self, name='std',
+                          description='Standard deviation')
+
+    def calculate(self, context):
+        result = context._getMinMaxResult()
+        return None if result is None else result.std
+
+
 class _StatCoord(StatBase):
     """Base class for argmin and argmax stats"""
 
@@ -525,8 +580,10 @@ class StatCoordMin(_StatCoord):
         if context.values is None or not context.isScalarData():
             return None
 
-        index = numpy.argmin(context.values)
-        return self._indexToCoordinates(context, index)
+        result = context._getMinMaxResult()
+        if result is None:
+            return None
+        return self._indexToCoordinates(context, result.argmin)
 
     def getToolTip(self, kind):
         return "Coordinates of the first minimum value of the data"
@@ -541,8 +598,10 @@ class StatCoordMax(_StatCoord):
         if context.values is None or not context.isScalarData():
             return None
 
-        index = numpy.argmax(context.values)
-        return self._indexToCoordinates(context, index)
+        result = context._getMinMaxResult()
+        if result is None:
+            return None
+        return self._indexToCoordinates(context, result.argmax)
 
     def getToolTip(self, kind):
         return "Coordinates of the first maximum value of the data"
@@ -557,19 +616,27 @@ class StatCOM(StatBase):
         if context.values is None or not context.isScalarData():
             return None
 
-        values = numpy.array(context.values, dtype=numpy.float64)
-        sum_ = numpy.sum(values)
-        if sum_ == 0.:
-            return (numpy.nan,) * len(context.axes)
+        values = numpy.asarray(context.values)
 
         if context.isStructuredData():
-            centerofmass = []
-            for index, axis in enumerate(context.axes):
+            # Sum is taken from the first projection rather than from the
+            # whole data
+            projections = []
+            for index in range(len(context.axes)):
                 axes = tuple([i for i in range(len(context.axes)) if i != index])
-                centerofmass.append(
-                    numpy.sum(axis * numpy.sum(values, axis=axes)) / sum_)
+                projections.append(
+                    numpy.sum(values, axis=axes, dtype=numpy.float64))
+            sum_ = numpy.sum(projections[0])
+            if sum_ == 0.:
+                return (numpy.nan,) * len(context.axes)
+            centerofmass = [numpy.sum(axis * projection) / sum_
+                            for axis, projection in zip(context.axes, projections)]
             return tuple(reversed(centerofmass))
         else:
+            values = numpy.asarray(values, dtype=numpy.float64)
+            sum_ = numpy.sum(values)
+            if sum_ == 0.:
+                return (numpy.nan,) * len(context.axes)
             return tuple(
                 numpy.sum(axis * values) / sum_ for axis in context.axes)
 
@@ -27,7 +27,7 @@
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "05/06/2018"
+__date__ = "17/10/2026"
 
 
 import logging
@@ -190,7 +190,21 @@ class StatsHandler(object):
         :return: list of formatted statistics (as str)
         :rtype: dict
         """
-        res = self.stats.calculate(item, plot, onlimits)
+        context = self.stats.createContext(item, plot, onlimits)
+        return self.calculateFromContext(context)
+
+    def calculateFromContext(self, context):
+        """
+        compute all statistic registered on a context created with
+        :meth:`Stats.createContext` and return the formatted results.
+
+        This can be called from a worker thread.
+
+        :param context: the context providing the data of the item
+        :return: list of formatted statistics (as str)
+        :rtype: dict
+        """
+        res = self.stats.calculateFromContext(context)
         for resName, resValue in list(res.items()):
             res[resName] = self.format(resName, res[resName])
         return res
@@ -26,15 +26,24 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "01/09/2017"
+__date__ = "17/10/2026"
 
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import h5py
 import numpy
 
-from silx.gui.utils.testutils import SignalListener
+from silx.gui.utils.testutils import SignalListener, TestCaseQt
+from silx.gui.plot import PlotWidget, items
 from silx.gui.plot.items import ItemChangedType
+from silx.gui.plot.items import _decimation
+from silx.gui.plot.backends.BackendBase import BackendBase
+from silx.gui.plot.backends.glutils import GLPlotCurve2D
+from silx.io.url import DataUrl
 from .utils import PlotWidgetTestCase
 
 
@@ -242,11 +251,365 @@ class TestSymbol(PlotWidgetTestCase):
         self.assertEqual('Diamond', name)
 
 
+class TestLazyImageStack(TestCaseQt):
+    """Test ImageStack item with frames loaded on demand"""
+
+    def setUp(self):
+        super(TestLazyImageStack, self).setUp()
+        self.stack = numpy.arange(20 * 3 * 4, dtype=numpy.float32)
+        self.stack.shape = 20, 3, 4
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'stack.h5')
+        with h5py.File(self.filename, 'w') as h5f:
+            h5f['stack'] = self.stack
+            for index, frame in enumerate(self.stack):
+                h5f['frame%d' % index] = frame
+        self.h5f = h5py.File(self.filename, 'r')
+
+    def tearDown(self):
+        self.h5f.close()
+        shutil.rmtree(self.folder)
+        super(TestLazyImageStack, self).tearDown()
+
+    def _waitForFrame(self, item, index):
+        """Wait until the item displays the frame at index"""
+        for _ in range(100):
+            data = item.getData(copy=False)
+            if data.shape == self.stack[index].shape and numpy.array_equal(
+                    data, self.stack[index]):
+                return
+            self.qWait(20)
+        self.fail('Frame %d not displayed' % index)
+
+    def _testBrowse(self, stack):
+        item = items.ImageStack()
+        item.setCacheSize(4)
+        item.setNPrefetch(2)
+        item.setStackData(stack, position=5, lazy=True)
+        self.assertTrue(item.isLazy())
+        self.assertIs(item.getStackData(copy=False), stack)
+        self._waitForFrame(item, 5)
+
+        for position in (6, 7, 3, 19, 0):
+            with self.subTest(position=position):
+                item.setStackPosition(position)
+                self.assertEqual(item.getStackPosition(), position)
+                self._waitForFrame(item, position)
+
+    def testDataset(self):
+        """Test lazy ImageStack with a HDF5 dataset"""
+        self._testBrowse(self.h5f['stack'])
+
+    def testUrls(self):
+        """Test lazy ImageStack with a list of DataUrl"""
+        urls = [DataUrl(file_path=self.filename,
+                        data_path='/frame%d' % index,
+                        scheme='silx')
+                for index in range(len(self.stack))]
+        self._testBrowse(urls)
+
+    def testPrefetchAndCache(self):
+        """Test prefetch in browsing direction and cache size"""
+        item = items.ImageStack()
+        item.setCacheSize(3)
+        item.setNPrefetch(2)
+        item.setStackData(self.h5f['stack'], position=10, lazy=True)
+        self._waitForFrame(item, 10)
+        self.qWait(100)
+
+        loader = item._ImageStack__loader
+        for index in (10, 11, 12):
+            self.assertIsNotNone(loader.getFrame(index))
+
+        item.setStackPosition(9)  # Browse backward
+        self._waitForFrame(item, 9)
+        self.qWait(100)
+        for index in (9, 8, 7):
+            self.assertIsNotNone(loader.getFrame(index))
+        for index in (10, 11, 12):  # Evicted from the cache
+            self.assertIsNone(loader.getFrame(index))
+
+    def testClose(self):
+        """Test loading thread is stopped and restarted on demand"""
+        item = items.ImageStack()
+        item.setStackData(self.h5f['stack'], position=2, lazy=True)
+        self._waitForFrame(item, 2)
+        loader = item._ImageStack__loader
+        executor = loader._LazyFrameLoader__executor
+
+        item._setPlot(None)  # As done when removed from the plot
+        self.assertTrue(executor._shutdown)
+        self.assertIsNone(loader._LazyFrameLoader__executor)
+
+        item.setStackPosition(15)
+        self._waitForFrame(item, 15)
+        executor = loader._LazyFrameLoader__executor
+        self.assertIsNotNone(executor)
+
+        item.setStackData(self.stack, position=3)
+        self.assertTrue(executor._shutdown)
+
+    def testNotLazy(self):
+        """Test switching back to a stack fully in memory"""
+        item = items.ImageStack()
+        item.setStackData(self.h5f['stack'], position=2, lazy=True)
+        item.setStackData(self.stack, position=3)
+        self.assertFalse(item.isLazy())
+        self.assertTrue(numpy.array_equal(
+            item.getData(copy=False), self.stack[3]))
+
+
+class TestAppendData(TestCaseQt):
+    """Test appendData of Curve and Scatter items"""
+
+    def _checkBounds(self, item):
+        x, y = item.getXData(copy=False), item.getYData(copy=False)
+        self.assertEqual(item.getBounds(),
+                         (numpy.nanmin(x), numpy.nanmax(x),
+                          numpy.nanmin(y), numpy.nanmax(y)))
+
+    def testCurve(self):
+        """Test appending points to a curve"""
+        curve = items.Curve()
+        curve.setData((0, 1), (1., 2.))
+        listener = SignalListener()
+        curve.sigItemChanged.connect(listener.partial())
+
+        curve.getBounds()  # Fill bounds cache
+        for index in range(2, 100):
+            curve.appendData((index,), (numpy.sin(index),))
+        self.assertEqual(listener.arguments(),
+                         [(ItemChangedType.DATA,)] * 98)
+        self.assertTrue(numpy.array_equal(
+            curve.getXData(copy=False), numpy.arange(100)))
+        self._checkBounds(curve)
+
+    def testCurveMaxLength(self):
+        """Test a curve keeping only the last points"""
+        curve = items.Curve()
+        curve.setData(numpy.arange(10), numpy.arange(10.))
+        curve.setMaxLength(5)
+        curve.getBounds()  # Fill bounds cache
+
+        data = curve.getYData(copy=False)
+        curve.appendData((10, 11), (-1., 100.))
+        self.assertTrue(numpy.array_equal(
+            curve.getXData(copy=False), (7, 8, 9, 10, 11)))
+        self._checkBounds(curve)
+        # Previously returned data is not modified
+        self.assertTrue(numpy.array_equal(data, numpy.arange(10.)))
+
+        curve.appendData(numpy.arange(12, 32), numpy.arange(20.))
+        self.assertTrue(numpy.array_equal(
+            curve.getXData(copy=False), numpy.arange(27, 32)))
+        self._checkBounds(curve)
+
+    def testCurveErrors(self):
+        """Test appending points to a curve with errors and baseline"""
+        curve = items.Curve()
+        curve.setData((0, 1), (1, 2),
+                      yerror=((0.1, 0.2), (0.3, 0.4)), baseline=(0, 1))
+        curve.appendData((2,), (3,), yerror=((0.5,), (0.6,)), baseline=(2,))
+        self.assertTrue(numpy.array_equal(
+            curve.getYErrorData(copy=False),
+            ((0.1, 0.2, 0.5), (0.3, 0.4, 0.6))))
+        self.assertTrue(numpy.array_equal(curve.getBaseline(), (0, 1, 2)))
+
+        with self.assertRaises(ValueError):
+            curve.appendData((3,), (4,), baseline=(3,))  # Missing yerror
+        with self.assertRaises(ValueError):
+            curve.appendData((3,), (4,), xerror=1, yerror=1, baseline=(3,))
+
+    def testScatter(self):
+        """Test appending points to a scatter"""
+        scatter = items.Scatter()
+        scatter.setData((0, 1), (0, 1), (1., 2.), alpha=(0.5, 1.))
+        scatter.setMaxLength(3)
+        for index in range(2, 6):
+            scatter.appendData((index,), (index,), (float(index),),
+                               alpha=(1.,))
+        self.assertTrue(numpy.array_equal(
+            scatter.getValueData(copy=False), (3., 4., 5.)))
+        self.assertTrue(numpy.array_equal(
+            scatter.getAlphaData(copy=False), (1., 1., 1.)))
+        self._checkBounds(scatter)
+        self.assertEqual(scatter._getColormapAutoscaleRange(), (3., 5.))
+
+        scatter.appendData((6,), (6,), (-1.,), alpha=(1.,))
+        self.assertEqual(scatter._getColormapAutoscaleRange(), (-1., 5.))
+
+        with self.assertRaises(ValueError):
+            scatter.appendData((7,), (7,), (7.,))  # Missing alpha
+
+
+class _AppendCurveDataBackend(BackendBase):
+    """Backend recording curve creations and appended points"""
+
+    def __init__(self, plot, parent=None):
+        super(_AppendCurveDataBackend, self).__init__(plot, parent)
+        self.nbCurvesAdded = 0
+        self.appended = []
+
+    def addCurve(self, *args, **kwargs):
+        self.nbCurvesAdded += 1
+        return object()
+
+    def appendCurveData(self, curve, x, y, nbAppended, nbDropped):
+        self.appended.append((numpy.array(x), nbAppended, nbDropped))
+        return True
+
+
+class TestAppendDataInPlot(TestCaseQt):
+    """Test appendData of items displayed in a plot"""
+
+    def testCurveRenderer(self):
+        """Test that appending points updates the backend curve in place"""
+        plot = PlotWidget(backend=_AppendCurveDataBackend)
+        backend = plot._backend
+        curve = items.Curve()
+        curve.setData((0., 1.), (1., 2.))
+        plot.addItem(curve)
+        plot.replot()
+        self.assertEqual(backend.nbCurvesAdded, 1)
+
+        # Points appended between updates are sent at once
+        curve.appendData((2., 3.), (3., 4.))
+        curve.appendData((4.,), (5.,))
+        plot.replot()
+        self.assertEqual(backend.nbCurvesAdded, 1)
+        self.assertEqual(len(backend.appended), 1)
+        x, nbAppended, nbDropped = backend.appended[-1]
+        self.assertTrue(numpy.array_equal(x, numpy.arange(5.)))
+        self.assertEqual((nbAppended, nbDropped), (3, 0))
+        self.assertEqual(plot.getDataRange().x, (0., 4.))
+
+        curve.setMaxLength(3)
+        curve.appendData((5., 6.), (6., 7.))
+        plot.replot()
+        x, nbAppended, nbDropped = backend.appended[-1]
+        self.assertTrue(numpy.array_equal(x, (4., 5., 6.)))
+        self.assertEqual((nbAppended, nbDropped), (2, 4))
+
+        # Other changes create the curve again
+        curve.appendData((7.,), (8.,))
+        curve.setFill(True)
+        plot.replot()
+        self.assertEqual(backend.nbCurvesAdded, 2)
+        self.assertEqual(len(backend.appended), 2)
+
+        # A filled curve is not updated in place
+        curve.appendData((8.,), (9.,))
+        plot.replot()
+        self.assertEqual(backend.nbCurvesAdded, 3)
+        self.assertEqual(len(backend.appended), 2)
+
+    def testGLPlotCurve2D(self):
+        """Test appending points to an OpenGL curve"""
+        glCurve = GLPlotCurve2D(numpy.arange(3, dtype=numpy.float32),
+                                numpy.arange(3, dtype=numpy.float32))
+        for index in range(3, 40):
+            self.assertTrue(glCurve.appendData(
+                numpy.array((index,), dtype=numpy.float32),
+                numpy.array((-index,), dtype=numpy.float32),
+                nbDropped=1 if index >= 20 else 0))
+        self.assertTrue(numpy.array_equal(glCurve.xData, numpy.arange(20, 40)))
+        self.assertTrue(numpy.array_equal(glCurve.yData, -glCurve.xData))
+        self.assertEqual((glCurve.xMax, glCurve.yMin), (39., -39.))
+
+        # Curves with extra vertices data are not supported
+        glCurve = GLPlotCurve2D(numpy.arange(3, dtype=numpy.float32),
+                                numpy.arange(3, dtype=numpy.float32),
+                                fillColor=(1., 0., 0., 1.))
+        self.assertFalse(glCurve.appendData(
+            numpy.array((3.,)), numpy.array((3.,))))
+
+
+def _createDecimationData():
+    """Returns x, y data used to test curve decimation"""
+    x = numpy.arange(100000, dtype=numpy.float64)
+    y = numpy.random.random(len(x))
+    y[12345] = 10.
+    y[54321] = -10.
+    y[1000:2000] = numpy.nan
+    return x, y
+
+
+class TestDecimation(unittest.TestCase):
+    """Test min/max decimation of curves"""
+
+    def setUp(self):
+        self.x, self.y = _createDecimationData()
+
+    def testDecimate(self):
+        """Test M4 decimation against per-column min/max"""
+        pyramid = _decimation.MinMaxPyramid(self.y)
+        for xmin, xmax in ((0, 99999), (10000, 60000), (100, 300)):
+            with self.subTest(xmin=xmin, xmax=xmax):
+                indices = _decimation.decimate(
+                    self.x, self.y, pyramid, xmin, xmax, width=100)
+                self.assertLessEqual(len(indices), 4 * 100 + 2)
+                self.assertTrue(numpy.all(numpy.diff(indices) > 0))
+
+                visible = self.y[int(xmin):int(xmax) + 1]
+                self.assertEqual(numpy.nanmax(self.y[indices]),
+                                 numpy.nanmax(visible))
+                self.assertEqual(numpy.nanmin(self.y[indices]),
+                                 numpy.nanmin(visible))
+
+    def testPyramid(self):
+        """Test min/max levels of the pyramid"""
+        pyramid = _decimation.MinMaxPyramid(self.y)
+        blockSize, minimum, argmin, maximum, argmax = pyramid.getLevel(256)
+        self.assertEqual(blockSize, 256)
+        self.assertEqual(len(minimum), -(-len(self.y) // 256))
+        self.assertTrue(numpy.array_equal(self.y[argmax[:3]], maximum[:3]))
+        self.assertEqual(argmax[12345 // 256], 12345)
+        self.assertEqual(argmin[54321 // 256], 54321)
+        self.assertTrue(numpy.all(argmin[1024 // 256:1792 // 256] == -1))
+        self.assertIsNone(pyramid.getLevel(10))
+
+
+class TestCurveDecimation(PlotWidgetTestCase):
+    """Test view-dependent decimation of large curves"""
+
+    def setUp(self):
+        super(TestCurveDecimation, self).setUp()
+        self.x, self.y = _createDecimationData()
+
+    def testCurve(self):
+        """Test decimation of a curve in the plot"""
+        curve = items.Curve()
+        curve._DECIMATION_MIN_SIZE = 1000
+        curve.setData(self.x, self.y)
+        self.plot.addItem(curve)
+        self.plot.resetZoom()
+        self.qapp.processEvents()
+
+        self.assertEqual(curve.getBounds(), (0., 99999., -10., 10.))
+        indices = curve._Curve__decimatedIndices
+        self.assertIsNotNone(indices)
+        self.assertLess(len(indices), len(self.x))
+        self.assertIn(12345, indices)
+        self.assertIn(54321, indices)
+
+        # Zooming decimates visible range only
+        self.plot.getXAxis().setLimits(50000, 50100)
+        self.qapp.processEvents()
+        indices = curve._Curve__decimatedIndices
+        self.assertEqual(indices[0], 49999)
+        self.assertEqual(indices[-1], 50101)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestSigItemChangedSignal))
     test_suite.addTest(loadTests(TestSymbol))
+    test_suite.addTest(loadTests(TestLazyImageStack))
+    test_suite.addTest(loadTests(TestAppendData))
+    test_suite.addTest(loadTests(TestAppendDataInPlot))
+    test_suite.addTest(loadTests(TestDecimation))
+    test_suite.addTest(loadTests(TestCurveDecimation))
     return test_suite
 
 
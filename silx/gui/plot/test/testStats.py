@@ -26,7 +26,7 @@
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "07/03/2018"
+__date__ = "17/10/2026"
 
 
 from silx.gui import qt
@@ -199,6 +199,27 @@ class TestStats(TestCaseQt):
         self.assertEqual(_stats['com'].calculate(self.scatterContext),
                          (comx, comy))
 
+    def testMeanStd(self):
+        """Test single-pass mean and std against numpy"""
+        for context, data in ((self.curveContext, numpy.arange(20)),
+                              (self.imageContext, self.imageData),
+                              (self.scatterContext, self.valuesScatterData)):
+            self.assertAlmostEqual(stats.StatMean().calculate(context),
+                                   numpy.mean(data))
+            self.assertAlmostEqual(stats.StatStd().calculate(context),
+                                   numpy.std(data))
+
+    def testCalculateFromContext(self):
+        """Test that all stats are computed from one context"""
+        _stats = stats.Stats((stats.StatMin(), stats.StatMax(),
+                              stats.StatMean()))
+        context = _stats.createContext(
+            self.plot2d.getImage(self._imgLgd), self.plot2d, False)
+        self.assertEqual(_stats.calculateFromContext(context),
+                         {'min': 0,
+                          'max': 128 * 32 - 1,
+                          'mean': numpy.mean(self.imageData)})
+
     def testKindNotManagedByStat(self):
         """Make sure an exception is raised if we try to execute calculate
         of the base class"""
@@ -602,6 +623,20 @@ class TestStatsWidgetWithImages(TestCaseQt):
         self.assertEqual(tableItems['coords min'].text(), '0.0, 0.0')
         self.assertEqual(tableItems['coords max'].text(), '127.0, 127.0')
 
+    def testAsync(self):
+        """Test statistics computed in a worker thread"""
+        self.widget._ASYNC_MIN_SIZE = 1
+        image = self.plot.getImage(self.IMAGE_LEGEND)
+        image.setData(numpy.arange(64 * 64).reshape(64, 64))
+
+        tableItems = self.widget._itemToTableItems(image)
+        for _ in range(100):  # Wait for the result to be displayed
+            if tableItems['max'].text() == '4095.000':
+                break
+            self.qWait(10)
+        self.assertEqual(tableItems['max'].text(), '4095.000')
+        self.assertEqual(tableItems['coords max'].text(), '63.0, 63.0')
+
     def testItemHidden(self):
         """Test if an item is hide, then the associated stats item is also
         hide"""
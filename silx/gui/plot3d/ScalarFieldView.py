@@ -32,7 +32,7 @@ from __future__ import absolute_import
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "14/06/2018"
+__date__ = "17/10/2026"
 
 import re
 import logging
@@ -45,7 +45,7 @@ from silx.gui import qt, icons
 from silx.gui.colors import rgba
 from silx.gui.colors import Colormap
 
-from silx.math.marchingcubes import MarchingCubes
+from silx.math.marchingcubes import marching_cubes
 from silx.math.combo import min_max
 
 from .scene import axes, cutplane, interaction, primitives, transform
@@ -209,7 +209,7 @@ class Isosurface(qt.QObject):
                 return
 
             st = time.time()
-            vertices, normals, indices = MarchingCubes(
+            vertices, normals, indices = marching_cubes(
                 self._data,
                 isolevel=self._level)
             _logger.info('Computed iso-surface in %f s.', time.time() - st)
@@ -29,20 +29,22 @@ from __future__ import absolute_import
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "24/04/2018"
+__date__ = "17/10/2026"
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import time
 import numpy
 
 from silx.math.combo import min_max
-from silx.math.marchingcubes import MarchingCubes
+from silx.math.marchingcubes import MarchingCubes, marching_cubes
 from silx.math.interpolate import interp3d
 
 from ....utils.proxy import docstring
 from ... import _glutils as glu
 from ... import qt
 from ...colors import rgba
+from ...utils.concurrent import submitToQtMainThread
 
 from ..scene import cutplane, function, primitives, transform, utils
 
@@ -209,18 +211,38 @@ class CutPlane(Item3D, ColormapMixIn, InterpolationMixIn, PlaneMixIn):
             return None
 
 
+_isosurfaceExecutor = None
+"""Executor computing iso-surfaces of large data sets in a worker thread"""
+
+
+def _getIsosurfaceExecutor():
+    """Returns the executor shared by all iso-surfaces
+
+    :rtype: ThreadPoolExecutor
+    """
+    global _isosurfaceExecutor
+    if _isosurfaceExecutor is None:  # Lazy-loading
+        _isosurfaceExecutor = ThreadPoolExecutor(max_workers=1)
+    return _isosurfaceExecutor
+
+
 class Isosurface(Item3D):
     """Class representing an iso-surface in a :class:`ScalarField3D` item.
 
     :param parent: The DataItem3D this iso-surface belongs to
     """
 
+    _ASYNC_MIN_SIZE = 128 ** 3
+    """Number of voxels from which the iso-surface is computed in a worker
+    thread"""
+
     def __init__(self, parent):
         Item3D.__init__(self, parent=None)
         self._data = None
         self._level = float('nan')
         self._autoLevelFunction = None
         self._color = rgba('#FFD700FF')
+        self.__pendingIsosurface = None
         self.setParent(parent)
 
     def _syncDataWithParent(self):
@@ -327,60 +349,81 @@ class Isosurface(Item3D):
             self._updateColor(self._color)
             self._updated(ItemChangedType.COLOR)
 
-    def _computeIsosurface(self):
-        """Compute isosurface for current state.
+    def _updateAutoLevel(self, data):
+        """Update the level with the auto-level function if any.
 
-        :return: (vertices, normals, indices) arrays
-        :rtype: List[Union[None,numpy.ndarray]]
+        :param Union[numpy.ndarray,None] data: The 3D data set
         """
-        data = self.getData(copy=False)
+        if not self.isAutoLevel():
+            return
 
         if data is None:
-            if self.isAutoLevel():
-                self._level = float('nan')
+            self._level = float('nan')
+            return
+
+        st = time.time()
+        try:
+            level = float(self.getAutoLevelFunction()(data))
+
+        except Exception:
+            module_ = self.getAutoLevelFunction().__module__
+            name = self.getAutoLevelFunction().__name__
+            _logger.error(
+                "Error while executing iso level function %s.%s",
+                module_,
+                name,
+                exc_info=True)
+            level = float('nan')
 
         else:
-            if self.isAutoLevel():
-                st = time.time()
-                try:
-                    level = float(self.getAutoLevelFunction()(data))
-
-                except Exception:
-                    module_ = self.getAutoLevelFunction().__module__
-                    name = self.getAutoLevelFunction().__name__
-                    _logger.error(
-                        "Error while executing iso level function %s.%s",
-                        module_,
-                        name,
-                        exc_info=True)
-                    level = float('nan')
-
-                else:
-                    _logger.info(
-                        'Computed iso-level in %f s.', time.time() - st)
-
-                if level != self._level:
-                    self._level = level
-                    self._updated(Item3DChangedType.ISO_LEVEL)
-
-            if numpy.isfinite(self._level):
-                st = time.time()
-                vertices, normals, indices = MarchingCubes(
-                    data,
-                    isolevel=self._level)
-                _logger.info('Computed iso-surface in %f s.', time.time() - st)
-
-                if len(vertices) != 0:
-                    return vertices, normals, indices
+            _logger.info(
+                'Computed iso-level in %f s.', time.time() - st)
+
+        if level != self._level:
+            self._level = level
+            self._updated(Item3DChangedType.ISO_LEVEL)
+
+    @staticmethod
+    def _marchingCubes(data, level):
+        """Compute isosurface of data at given level.
+
+        This can be called from a worker thread.
+
+        :param numpy.ndarray data: The 3D data set
+        :param float level: The iso-level
+        :return: (vertices, normals, indices) arrays
+        :rtype: List[Union[None,numpy.ndarray]]
+        """
+        if data is not None and numpy.isfinite(level):
+            st = time.time()
+            vertices, normals, indices = marching_cubes(data, isolevel=level)
+            _logger.info('Computed iso-surface in %f s.', time.time() - st)
+
+            if len(vertices) != 0:
+                return vertices, normals, indices
 
         return None, None, None
 
-    def _updateScenePrimitive(self):
-        """Update underlying mesh"""
-        self._getScenePrimitive().children = []
+    def _computeIsosurface(self):
+        """Compute isosurface for current state.
+
+        :return: (vertices, normals, indices) arrays
+        :rtype: List[Union[None,numpy.ndarray]]
+        """
+        data = self.getData(copy=False)
+        self._updateAutoLevel(data)
+        return self._marchingCubes(data, self._level)
+
+    def _setMesh(self, vertices, normals, indices):
+        """Set the mesh displaying the iso-surface
 
-        vertices, normals, indices = self._computeIsosurface()
-        if vertices is not None:
+        :param Union[None,numpy.ndarray] vertices:
+        :param Union[None,numpy.ndarray] normals:
+        :param Union[None,numpy.ndarray] indices:
+        """
+        if vertices is None:
+            self._getScenePrimitive().children = []
+        else:
             mesh = primitives.Mesh3D(vertices,
                                      colors=self._color,
                                      normals=normals,
@@ -389,6 +432,50 @@ class Isosurface(Item3D):
                                      copy=False)
             self._getScenePrimitive().children = [mesh]
 
+    def _updateScenePrimitive(self):
+        """Update underlying mesh.
+
+        The iso-surface of data sets with at least :attr:`_ASYNC_MIN_SIZE`
+        voxels is computed in a worker thread and displayed once available.
+        """
+        self._getScenePrimitive().children = []
+        self._cancelIsosurface()
+
+        data = self.getData(copy=False)
+        if data is None or data.size < self._ASYNC_MIN_SIZE:
+            self._setMesh(*self._computeIsosurface())
+            return
+
+        self._updateAutoLevel(data)
+        future = _getIsosurfaceExecutor().submit(
+            self._marchingCubes, data, self._level)
+        self.__pendingIsosurface = future
+        future.add_done_callback(self.__isosurfaceComputed)
+
+    def __isosurfaceComputed(self, future):
+        """Handle the end of the computation in the worker thread"""
+        if not future.cancelled():
+            submitToQtMainThread(self.__isosurfaceReady, future)
+
+    def __isosurfaceReady(self, future):
+        """Display computed iso-surface in the Qt main thread"""
+        if future is not self.__pendingIsosurface:
+            return  # Cancelled or superseded by another computation
+        self.__pendingIsosurface = None
+
+        try:
+            result = future.result()
+        except Exception:
+            _logger.error("Error while computing iso-surface", exc_info=True)
+        else:
+            self._setMesh(*result)
+
+    def _cancelIsosurface(self):
+        """Cancel pending computation of the iso-surface if any"""
+        if self.__pendingIsosurface is not None:
+            self.__pendingIsosurface.cancel()
+            self.__pendingIsosurface = None
+
     def _pickFull(self, context):
         """Perform picking in this item at given widget position.
 
@@ -770,6 +857,7 @@ class ComplexIsosurface(Isosurface, ComplexMixIn, ColormapMixIn):
 
         else:  # Specific display for colormapped isosurface
             self._getScenePrimitive().children = []
+            self._cancelIsosurface()
 
             values = self.getColormappedData(copy=False)
             if values is not None:
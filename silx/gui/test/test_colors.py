@@ -29,7 +29,7 @@ from __future__ import absolute_import
 
 __authors__ = ["H.Payno"]
 __license__ = "MIT"
-__date__ = "09/11/2018"
+__date__ = "17/10/2026"
 
 import unittest
 import numpy
@@ -584,6 +584,12 @@ class TestAutoscaleRange(ParametricTestCase):
             # With negative
             (Colormap.LOGARITHM, Colormap.MINMAX, numpy.array([10, 50, 100, -50]), (10, 100)),
             (Colormap.LOGARITHM, Colormap.STDDEV3, numpy.array([10, 100, -10]), (1, 1000)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([4, 9, 25]), (4, 25)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([4, 25, -1, nan]), (4, 25)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([4, 25, -1, 0]), (0, 25)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([0, 25]), (0, 25)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([0, -1]), (0, 0)),
+            (Colormap.SQRT, Colormap.MINMAX, numpy.array([-4, -1]), (0, 1)),
         ]
         for norm, mode, array, expectedRange in data:
             with self.subTest(norm=norm, mode=mode, array=array):
@@ -597,6 +603,43 @@ class TestAutoscaleRange(ParametricTestCase):
                     self.assertAlmostEqual(vRange[0], expectedRange[0])
                     self.assertAlmostEqual(vRange[1], expectedRange[1])
 
+    def testItemCache(self):
+        """Test that item's data is scanned once for all normalizations"""
+        from silx.gui.plot.items import core
+
+        calls = []
+
+        def min_max(*args, **kwargs):
+            calls.append(args)
+            return minMaxFunction(*args, **kwargs)
+
+        minMaxFunction = core.min_max
+        core.min_max = min_max
+        try:
+            image = items.ImageData()
+            image.setData(numpy.array([[-1., 0.], [10., 100.]]))
+            colormap = image.getColormap()
+            expected = {
+                Colormap.LINEAR: (-1, 100),
+                Colormap.LOGARITHM: (10, 100),
+                Colormap.SQRT: (0, 100),
+                Colormap.GAMMA: (-1, 100),
+                Colormap.ARCSINH: (-1, 100),
+            }
+            for _ in range(2):
+                for norm, expectedRange in expected.items():
+                    with self.subTest(norm=norm):
+                        colormap.setNormalization(norm)
+                        self.assertEqual(
+                            colormap.getColormapRange(image), expectedRange)
+            self.assertEqual(len(calls), 1)
+
+            image.setData(numpy.array([[1., 2.]]))  # Reset cache
+            self.assertEqual(colormap.getColormapRange(image), (1, 2))
+            self.assertEqual(len(calls), 2)
+        finally:
+            core.min_max = minMaxFunction
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
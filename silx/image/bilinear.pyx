@@ -25,17 +25,63 @@
 
 __authors__ = ["J. Kieffer"]
 __license__ = "MIT"
-__date__ = "15/09/2016"
+__date__ = "17/10/2026"
 __doc__ = "Bilinear interpolator, peak finder, line-profile for images"
 
 import cython
 from cython.view cimport array as cvarray
+from cython.parallel import prange
 import numpy
 from libc.math cimport floor, ceil, sin, cos, sqrt, atan2
+from libc.stdint cimport int64_t
 import logging
 logger = logging.getLogger(__name__)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline float _bilinear_interpolation(const float *data,
+                                          size_t height,
+                                          size_t width,
+                                          float x,
+                                          float y) nogil:
+    """Bilinear interpolation of a C-contiguous image at (x, y).
+
+    :param data: Pointer to the first pixel of the image
+    :param height: Number of rows of the image
+    :param width: Number of columns of the image
+    :param x (float): column coordinate
+    :param y (float): row coordinate
+    :return: Interpolated signal from the image (nearest for outside)
+    """
+    cdef:
+        float d0 = min(max(y, 0.0), (height - 1.0))
+        float d1 = min(max(x, 0.0), (width - 1.0))
+        int i0, i1, j0, j1
+        float x0, x1, y0, y1, res
+
+    x0 = floor(d0)
+    x1 = ceil(d0)
+    y0 = floor(d1)
+    y1 = ceil(d1)
+    i0 = < int > x0
+    i1 = < int > x1
+    j0 = < int > y0
+    j1 = < int > y1
+    if (i0 == i1) and (j0 == j1):
+        res = data[i0 * width + j0]
+    elif i0 == i1:
+        res = (data[i0 * width + j0] * (y1 - d1)) + (data[i0 * width + j1] * (d1 - y0))
+    elif j0 == j1:
+        res = (data[i0 * width + j0] * (x1 - d0)) + (data[i1 * width + j0] * (d0 - x0))
+    else:
+        res = (data[i0 * width + j0] * (x1 - d0) * (y1 - d1))  \
+            + (data[i1 * width + j0] * (d0 - x0) * (y1 - d1))  \
+            + (data[i0 * width + j1] * (x1 - d0) * (d1 - y0))  \
+            + (data[i1 * width + j1] * (d0 - x0) * (d1 - y0))
+    return res
+
+
 cdef class BilinearImage:
     """Bilinear interpolator for images ... or any data on a regular grid
     """
@@ -85,32 +131,7 @@ cdef class BilinearImage:
 
         Cython only function due to NOGIL
         """
-        cdef:
-            float d0 = min(max(y, 0.0), (self.height - 1.0))
-            float d1 = min(max(x, 0.0), (self.width - 1.0))
-            int i0, i1, j0, j1
-            float x0, x1, y0, y1, res
-
-        x0 = floor(d0)
-        x1 = ceil(d0)
-        y0 = floor(d1)
-        y1 = ceil(d1)
-        i0 = < int > x0
-        i1 = < int > x1
-        j0 = < int > y0
-        j1 = < int > y1
-        if (i0 == i1) and (j0 == j1):
-            res = self.data[i0, j0]
-        elif i0 == i1:
-            res = (self.data[i0, j0] * (y1 - d1)) + (self.data[i0, j1] * (d1 - y0))
-        elif j0 == j1:
-            res = (self.data[i0, j0] * (x1 - d0)) + (self.data[i1, j0] * (d0 - x0))
-        else:
-            res = (self.data[i0, j0] * (x1 - d0) * (y1 - d1))  \
-                + (self.data[i1, j0] * (d0 - x0) * (y1 - d1))  \
-                + (self.data[i0, j1] * (x1 - d0) * (d1 - y0))  \
-                + (self.data[i1, j1] * (d0 - x0) * (d1 - y0))
-        return res
+        return _bilinear_interpolation(&self.data[0, 0], self.height, self.width, x, y)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -340,3 +361,238 @@ cdef class BilinearImage:
 
         # Ensures the result is exported as numpy array and not memory view.
         return numpy.asarray(result)
+
+    def profile_lines(self, src, dst, linewidth=1, method='mean'):
+        """Return the mean or sum of intensity profiles of the image measured
+        along many scan lines at once.
+
+        Each profile is the same as the one returned by :meth:`profile_line`.
+        Use :class:`ProfileLines` directly to reuse the sampling of the lines
+        on many images.
+
+        :param src: The start points of the scan lines as (row, column)
+        :type src: array-like of shape (N, 2)
+        :param dst: The end points of the scan lines as (row, column)
+        :type dst: array-like of shape (N, 2)
+        :param linewidth: Width of the scanlines (unit image pixel),
+            either one for all lines or one per line.
+        :type linewidth: int or array-like of N int
+        :param str method: 'mean' or 'sum' depending if we want to compute the
+            mean intensity along the lines or the sum.
+        :return: The intensity profiles as a (N, max length) array,
+            shorter profiles are padded with NaN.
+        :rtype: 2d array
+        """
+        lines = ProfileLines((self.height, self.width), src, dst, linewidth)
+        return lines.profiles(self.data, method=method)
+
+
+cdef class ProfileLines:
+    """Sampling of many scan lines on images of a given shape
+
+    The sampling coordinates of the scan lines are computed once, so that
+    profiles can be extracted from many images of the same shape
+    (e.g., the frames of a stack) without computing them again.
+    The sampling is the same as :meth:`BilinearImage.profile_line`.
+
+    :param shape: The shape of the images as (height, width)
+    :param src: The start points of the scan lines as (row, column)
+    :type src: array-like of shape (N, 2)
+    :param dst: The end points of the scan lines as (row, column)
+    :type dst: array-like of shape (N, 2)
+    :param linewidth: Width of the scanlines (unit image pixel),
+        either one for all lines or one per line.
+    :type linewidth: int or array-like of N int
+    """
+    cdef:
+        readonly size_t width, height
+        readonly int max_length
+        int[::1] _lengths
+        int64_t[::1] _profile_offsets
+        int64_t[::1] _point_offsets
+        float[::1] _rows, _cols
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def __cinit__(self, shape, src, dst, linewidth=1):
+        cdef:
+            float[:, ::1] c_src, c_dst
+            int[::1] c_linewidth
+            float src_row, src_col, dst_row, dst_col, d_row, d_col
+            float length, col_width, row_width, row, col, new_row, new_col
+            float f_width, f_height
+            int lengt, i, j, k, nb_lines, line_width
+            int64_t point, sample, nb_points, max_samples
+            int64_t[::1] point_offsets
+            float[::1] rows, cols
+
+        self.height, self.width = shape
+        src = numpy.atleast_2d(numpy.asarray(src, dtype=numpy.float32))
+        dst = numpy.atleast_2d(numpy.asarray(dst, dtype=numpy.float32))
+        if src.ndim != 2 or src.shape[1] != 2 or src.shape != dst.shape:
+            raise ValueError(
+                "src and dst must be arrays of the same shape (N, 2)")
+        c_src = numpy.ascontiguousarray(src)
+        c_dst = numpy.ascontiguousarray(dst)
+        nb_lines = src.shape[0]
+        c_linewidth = numpy.array(numpy.broadcast_to(
+            numpy.asarray(linewidth, dtype=numpy.int32), (nb_lines,)))
+        f_width = <float> self.width
+        f_height = <float> self.height
+
+        # First pass: length of the profiles
+        self._lengths = numpy.empty(nb_lines, dtype=numpy.int32)
+        self._profile_offsets = numpy.empty(nb_lines + 1, dtype=numpy.int64)
+        self._profile_offsets[0] = 0
+        nb_points = 0
+        max_samples = 0
+        for i in range(nb_lines):
+            d_row = c_dst[i, 0] - c_src[i, 0]
+            d_col = c_dst[i, 1] - c_src[i, 1]
+            if d_row == 0 and d_col == 0:
+                logger.warning("Source and destination points are the same")
+                lengt = 1
+                max_samples += 1
+            else:
+                length = sqrt(d_row * d_row + d_col * d_col)
+                lengt = <int> ceil(length + 1)
+                max_samples += lengt * max(c_linewidth[i], 0)
+            self._lengths[i] = lengt
+            nb_points += lengt
+            self._profile_offsets[i + 1] = nb_points
+        self.max_length = numpy.max(self._lengths) if nb_lines > 0 else 0
+
+        # Second pass: coordinates of the samples inside the image
+        point_offsets = numpy.empty(nb_points + 1, dtype=numpy.int64)
+        rows = numpy.empty(max_samples, dtype=numpy.float32)
+        cols = numpy.empty(max_samples, dtype=numpy.float32)
+        point_offsets[0] = 0
+        point = 0
+        sample = 0
+        for i in range(nb_lines):
+            src_row = c_src[i, 0]
+            src_col = c_src[i, 1]
+            dst_row = c_dst[i, 0]
+            dst_col = c_dst[i, 1]
+            if (src_row == dst_row) and (src_col == dst_col):
+                # Single value interpolated at src, even outside the image
+                rows[sample] = src_row
+                cols[sample] = src_col
+                sample += 1
+                point += 1
+                point_offsets[point] = sample
+                continue
+
+            line_width = c_linewidth[i]
+            d_row = dst_row - src_row
+            d_col = dst_col - src_col
+
+            # Offsets to deal with linewidth
+            length = sqrt(d_row * d_row + d_col * d_col)
+            row_width = d_col / length
+            col_width = - d_row / length
+
+            lengt = <int> ceil(length + 1)
+            d_row /= <float> (lengt -1)
+            d_col /= <float> (lengt -1)
+
+            # Offset position to the center of the bottom pixels of the profile
+            src_row -= row_width * (line_width - 1) / 2.
+            src_col -= col_width * (line_width - 1) / 2.
+
+            for k in range(lengt):
+                row = src_row + k * d_row
+                col = src_col + k * d_col
+
+                for j in range(line_width):
+                    new_row = row + j * row_width
+                    new_col = col + j * col_width
+                    if ((new_col >= 0) and (new_col < f_width) and
+                            (new_row >= 0) and (new_row < f_height)):
+                        rows[sample] = new_row
+                        cols[sample] = new_col
+                        sample += 1
+                point += 1
+                point_offsets[point] = sample
+
+        self._point_offsets = point_offsets
+        self._rows = numpy.array(rows[:sample], copy=True)
+        self._cols = numpy.array(cols[:sample], copy=True)
+
+    def __len__(self):
+        return self._lengths.shape[0]
+
+    property lengths:
+        """Number of points of each profile (numpy.ndarray of int)"""
+        def __get__(self):
+            return numpy.array(self._lengths, copy=True)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    def profiles(self, data, method='mean'):
+        """Return the mean or sum of intensity profiles along the scan lines
+        of an image or of each image of a stack.
+
+        Profiles are computed in parallel.
+
+        :param data: An image or a stack of images
+        :type data: 2d array of shape (height, width) or
+            3d array of shape (nb_frames, height, width)
+        :param str method: 'mean' or 'sum' depending if we want to compute the
+            mean intensity along the lines or the sum.
+        :return: The intensity profiles as a (N, max length) array for an
+            image or a (nb_frames, N, max length) array for a stack.
+            Shorter profiles are padded with NaN.
+        :rtype: numpy.ndarray of float32
+        """
+        cdef:
+            const float[:, :, ::1] c_data
+            float[:, :, ::1] result
+            int[::1] lengths = self._lengths
+            int64_t[::1] profile_offsets = self._profile_offsets
+            int64_t[::1] point_offsets = self._point_offsets
+            float[::1] rows = self._rows
+            float[::1] cols = self._cols
+            bint compute_mean
+            size_t height = self.height, width = self.width
+            Py_ssize_t nb_frames, nb_lines, index, frame, line
+            int64_t point, sample
+            int k, cnt
+            float total
+            const float *frame_data
+
+        data = numpy.asarray(data)
+        if data.ndim not in (2, 3) or data.shape[-2:] != (height, width):
+            raise ValueError(
+                "data must be an image or a stack of images of shape %s" %
+                str((height, width)))
+        c_data = numpy.ascontiguousarray(
+            data.reshape(-1, height, width), dtype=numpy.float32)
+        nb_frames = c_data.shape[0]
+        nb_lines = lengths.shape[0]
+        result = numpy.full((nb_frames, nb_lines, self.max_length),
+                            numpy.nan, dtype=numpy.float32)
+        compute_mean = (method == 'mean')
+
+        for index in prange(nb_frames * nb_lines, nogil=True):
+            frame = index // nb_lines
+            line = index % nb_lines
+            frame_data = &c_data[frame, 0, 0]
+            for k in range(lengths[line]):
+                point = profile_offsets[line] + k
+                total = 0
+                for sample in range(point_offsets[point],
+                                    point_offsets[point + 1]):
+                    total = total + _bilinear_interpolation(
+                        frame_data, height, width, cols[sample], rows[sample])
+                cnt = <int> (point_offsets[point + 1] - point_offsets[point])
+                if cnt and compute_mean:
+                    result[frame, line, k] = total / cnt
+                else:
+                    result[frame, line, k] = total
+
+        if data.ndim == 2:
+            return numpy.asarray(result[0])
+        # Ensures the result is exported as numpy array and not memory view.
+        return numpy.asarray(result)
@@ -34,11 +34,13 @@ Utilitary functions are provided as facade for simple use.
 main signature as `find_contours` from `skimage`, but supporting mask.
 And :meth:`find_pixels` which returns a set of pixel coords containing the
 points of the iso contours.
+:meth:`find_multi_contours` and :meth:`find_multi_pixels` do the same for many
+levels at once, reading the image a single time.
 """
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
-__date__ = "02/07/2018"
+__date__ = "17/10/2026"
 
 
 from ._mergeimpl import MarchingSquaresMergeImpl
@@ -115,3 +117,58 @@ def find_contours(image, level, mask=None):
     engine = "merge"
     impl = _factory(engine, image, mask)
     return impl.find_contours(level)
+
+
+def find_multi_pixels(image, levels, mask=None):
+    """
+    Find the pixels following the iso contours of many `levels`.
+
+    The image is processed a single time for all the levels, which is faster
+    than calling :meth:`find_pixels` for each level.
+
+    :param numpy.ndarray image: Image to process
+    :param levels: Levels of the requested iso contours.
+    :type levels: Union[List[float],numpy.ndarray]
+    :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
+        the pixels of the image)
+    :returns: For each level, an array of coordinates in y/x
+    :rtype: List[numpy.ndarray]
+    """
+    assert(image is not None)
+    if mask is not None:
+        assert(image.shape == mask.shape)
+    engine = "merge"
+    impl = _factory(engine, image, mask)
+    return impl.find_multi_pixels(levels)
+
+
+def find_multi_contours(image, levels, mask=None):
+    """
+    Find the iso contours of many `levels`.
+
+    The image is processed a single time for all the levels, which is faster
+    than calling :meth:`find_contours` for each level.
+
+    .. code-block:: python
+
+        image = numpy.random.random((1000, 1000))
+        levels = numpy.linspace(0.1, 0.9, 20)
+        results = silx.image.marchingsquares.find_multi_contours(image, levels)
+        for level, polygons in zip(levels, results):
+            print(level, len(polygons))
+
+    :param numpy.ndarray image: Image to process
+    :param levels: Levels of the requested iso contours.
+    :type levels: Union[List[float],numpy.ndarray]
+    :param numpy.ndarray mask: An optional mask (a non-zero value invalidate
+        the pixels of the image)
+    :returns: For each level, a list of array containing y-x coordinates
+        of points
+    :rtype: List[List[numpy.ndarray]]
+    """
+    assert(image is not None)
+    if mask is not None:
+        assert(image.shape == mask.shape)
+    engine = "merge"
+    impl = _factory(engine, image, mask)
+    return impl.find_multi_contours(levels)
@@ -27,7 +27,7 @@ Marching squares implementation based on a merge of segements and polygons.
 
 __authors__ = ["Almar Klein", "Jerome Kieffer", "Valentin Valls"]
 __license__ = "MIT"
-__date__ = "23/04/2018"
+__date__ = "17/10/2026"
 
 import numpy
 cimport numpy as cnumpy
@@ -58,6 +58,44 @@ from libc.float cimport DBL_MAX
 cdef double INFINITY = DBL_MAX + DBL_MAX
 # from libc.math cimport INFINITY
 
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline int bisect_left(cnumpy.float64_t *values,
+                            int begin,
+                            int end,
+                            cnumpy.float64_t value) nogil:
+    """Returns the index of the first element of the sorted `values` from
+    `begin` to `end` which is greater or equal to `value`."""
+    cdef int middle
+    while begin < end:
+        middle = (begin + end) // 2
+        if values[middle] < value:
+            begin = middle + 1
+        else:
+            end = middle
+    return begin
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline int bisect_right(cnumpy.float64_t *values,
+                             int begin,
+                             int end,
+                             cnumpy.float64_t value) nogil:
+    """Returns the index of the first element of the sorted `values` from
+    `begin` to `end` which is greater than `value`."""
+    cdef int middle
+    while begin < end:
+        middle = (begin + end) // 2
+        if values[middle] <= value:
+            begin = middle + 1
+        else:
+            end = middle
+    return begin
+
 cdef extern from "include/patterns.h":
     cdef unsigned char EDGE_TO_POINT[][2]
     cdef unsigned char CELL_TO_EDGE[][5]
@@ -186,6 +224,189 @@ cdef class _MarchingSquaresAlgorithm(object):
         libc.stdlib.free(valid_contexts)
         libc.stdlib.free(contexts)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void marching_squares_levels(self,
+                                      cnumpy.float64_t *levels,
+                                      int nb_levels,
+                                      TileContext **final_contexts) nogil:
+        """
+        Execute the marching squares for many levels at once.
+
+        Each tile is read a single time for all the levels included in its
+        min/max range. Tiles are processed in parallel, then the contexts of
+        each level are reduced like with :meth:`marching_squares`.
+
+        The min/max cache have to be available.
+
+        :param levels: The requested levels sorted in increasing order
+        :param nb_levels: Number of requested levels
+        :param final_contexts: Array receiving the resulting context of each
+            level. A context can be `NULL` if there is no result.
+        """
+        cdef:
+            TileContext** contexts
+            TileContext* context
+            int *tiles
+            int *tile_begins
+            int *tile_ends
+            int dim_x, dim_y, nb_tiles, nb_valid_tiles
+            int i, x, y, itile, ilevel, begin, end
+
+        dim_x = self._dim_x // self._group_size + (self._dim_x % self._group_size > 0)
+        dim_y = self._dim_y // self._group_size + (self._dim_y % self._group_size > 0)
+        nb_tiles = dim_x * dim_y
+
+        # Contexts are stored level by level
+        contexts = <TileContext **>libc.stdlib.malloc(nb_levels * nb_tiles * sizeof(TileContext*))
+        libc.string.memset(contexts, 0, nb_levels * nb_tiles * sizeof(TileContext*))
+        tiles = <int *>libc.stdlib.malloc(nb_tiles * sizeof(int))
+        tile_begins = <int *>libc.stdlib.malloc(nb_tiles * sizeof(int))
+        tile_ends = <int *>libc.stdlib.malloc(nb_tiles * sizeof(int))
+
+        # Only create the contexts of the levels inside the tile range
+        nb_valid_tiles = 0
+        y = 0
+        while y < self._dim_y - 1:
+            x = 0
+            while x < self._dim_x - 1:
+                itile = (y // self._group_size) * dim_x + x // self._group_size
+                begin = bisect_left(levels, 0, nb_levels, self._min_cache[itile])
+                end = bisect_right(levels, begin, nb_levels, self._max_cache[itile])
+                if begin < end:
+                    for ilevel in range(begin, end):
+                        context = self.create_context(x, y, self._group_size, self._group_size)
+                        contexts[ilevel * nb_tiles + itile] = context
+                    tiles[nb_valid_tiles] = itile
+                    tile_begins[nb_valid_tiles] = begin
+                    tile_ends[nb_valid_tiles] = end
+                    nb_valid_tiles += 1
+                x += self._group_size
+            y += self._group_size
+
+        # openmp
+        for i in prange(nb_valid_tiles, nogil=True):
+            self.marching_squares_levels_mp(contexts + tiles[i],
+                                            nb_tiles,
+                                            levels,
+                                            tile_begins[i],
+                                            tile_ends[i])
+
+        for ilevel in range(nb_levels):
+            self._final_context = NULL
+            if self._force_sequencial_reduction:
+                self.sequencial_reduction(nb_tiles, contexts + ilevel * nb_tiles)
+            else:
+                self.reduction_2d(dim_x, dim_y, contexts + ilevel * nb_tiles)
+            final_contexts[ilevel] = self._final_context
+        self._final_context = NULL
+
+        libc.stdlib.free(tile_ends)
+        libc.stdlib.free(tile_begins)
+        libc.stdlib.free(tiles)
+        libc.stdlib.free(contexts)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void marching_squares_levels_mp(self,
+                                         TileContext **contexts,
+                                         int stride,
+                                         cnumpy.float64_t *levels,
+                                         int begin,
+                                         int end) nogil:
+        """
+        Entry of the marching squares algorithm for each threads processing
+        many levels.
+
+        For each 4-pixels, only the levels between the minimum and the
+        maximum of the pixels are processed.
+
+        :param contexts: Contexts of the tile for each level
+        :param stride: Distance between contexts of consecutive levels
+        :param levels: The requested levels sorted in increasing order
+        :param begin: Index of the first level to process
+        :param end: Index after the last level to process
+        """
+        cdef:
+            int x, y, i, pattern, ilevel
+            cnumpy.float64_t level, tmpf, minimum, maximum
+            cnumpy.float32_t values[4]
+            cnumpy.float32_t *image_ptr
+            cnumpy.int8_t *mask_ptr
+            TileContext *context
+
+        context = contexts[begin * stride]
+        image_ptr = self._image_ptr + (context.pos_y * self._dim_x + context.pos_x)
+        if self._mask_ptr != NULL:
+            mask_ptr = self._mask_ptr + (context.pos_y * self._dim_x + context.pos_x)
+        else:
+            mask_ptr = NULL
+
+        for y in range(context.pos_y, context.pos_y + context.dim_y):
+            for x in range(context.pos_x, context.pos_x + context.dim_x):
+                if mask_ptr != NULL:
+                    if (mask_ptr[0] > 0 or mask_ptr[1] > 0 or
+                            mask_ptr[self._dim_x] > 0 or mask_ptr[self._dim_x + 1] > 0):
+                        image_ptr += 1
+                        mask_ptr += 1
+                        continue
+                    mask_ptr += 1
+
+                values[0] = image_ptr[0]
+                values[1] = image_ptr[1]
+                values[2] = image_ptr[self._dim_x + 1]
+                values[3] = image_ptr[self._dim_x]
+
+                # NaN is never above a level
+                minimum = INFINITY
+                maximum = -INFINITY
+                for i in range(4):
+                    if values[i] != values[i]:
+                        minimum = -INFINITY
+                        continue
+                    if values[i] < minimum:
+                        minimum = values[i]
+                    if values[i] > maximum:
+                        maximum = values[i]
+
+                # Levels with pixels above and pixels below or equal
+                ilevel = bisect_left(levels, begin, end, minimum)
+                while ilevel < end and levels[ilevel] < maximum:
+                    level = levels[ilevel]
+                    pattern = 0
+                    if values[0] > level:
+                        pattern += 1
+                    if values[1] > level:
+                        pattern += 2
+                    if values[2] > level:
+                        pattern += 4
+                    if values[3] > level:
+                        pattern += 8
+
+                    # Resolve ambiguity
+                    if pattern == 5 or pattern == 10:
+                        tmpf = 0.25 * (values[0] + values[1] + values[2] + values[3])
+                        if tmpf <= level:
+                            if pattern == 5:
+                                pattern = 10
+                            else:
+                                pattern = 5
+
+                    self.insert_pattern(contexts[ilevel * stride], x, y, pattern, level)
+                    ilevel += 1
+
+                image_ptr += 1
+
+            # There is a missing pixel at the end of each rows
+            image_ptr += self._dim_x - context.dim_x
+            if mask_ptr != NULL:
+                mask_ptr += self._dim_x - context.dim_x
+
+        for ilevel in range(begin, end):
+            self.after_marching_squares(contexts[ilevel * stride])
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
@@ -443,19 +664,17 @@ cdef class _MarchingSquaresAlgorithm(object):
         libc.string.memset(contexts, 0, context_size * sizeof(TileContext*))
 
         valid_contexts = 0
-        icontext = 0
         y = 0
         while y < self._dim_y - 1:
             x = 0
             while x < self._dim_x - 1:
+                icontext = (y // self._group_size) * context_dim_x + x // self._group_size
                 if self._use_minmax_cache:
                     if level < self._min_cache[icontext] or level > self._max_cache[icontext]:
-                        icontext += 1
                         x += self._group_size
                         continue
                 context = self.create_context(x, y, self._group_size, self._group_size)
                 contexts[icontext] = context
-                icontext += 1
                 valid_contexts += 1
                 x += self._group_size
             y += self._group_size
@@ -1058,7 +1277,9 @@ cdef class MarchingSquaresMergeImpl(object):
 
     Finally the implementation provides an implementation to reach polygons
     (:meth:`find_contours`) or pixels (:meth:`find_pixels`) from the iso-valued
-    data.
+    data. :meth:`find_multi_contours` and :meth:`find_multi_pixels` process
+    many levels with a single read of the image, always using the min/max
+    cache.
 
     .. code-block:: python
 
@@ -1081,6 +1302,15 @@ cdef class MarchingSquaresMergeImpl(object):
         for level in levels:
             polygons = ms.find_contours(level=level)
 
+    .. code-block:: python
+
+        # Many levels processed at once
+        shape = 1000, 1000
+        image = numpy.random.random(shape)
+        ms = MarchingSquaresMergeImpl(image)
+        levels = numpy.arange(0, 1, 0.05)
+        results = ms.find_multi_contours(levels)
+
     .. code-block:: python
 
         # Efficient cache using multi requests
@@ -1212,7 +1442,10 @@ cdef class MarchingSquaresMergeImpl(object):
                         mask_ptr += 1
                         continue
                 value = image_ptr[0]
-                if value < minimum:
+                if value != value:
+                    # NaN is never above a level
+                    minimum = -INFINITY
+                elif value < minimum:
                     minimum = value
                 if value > maximum:
                     maximum = value
@@ -1249,6 +1482,69 @@ cdef class MarchingSquaresMergeImpl(object):
             context_y = icontext // context_dim_x
             self._compute_minmax_on_block(context_x, context_y, icontext)
 
+    cdef void _init_algo(self, _MarchingSquaresAlgorithm algo):
+        """
+        Initialize an algorithm with the image description.
+        """
+        algo._image_ptr = self._image_ptr
+        algo._mask_ptr = self._mask_ptr
+        algo._dim_x = self._dim_x
+        algo._dim_y = self._dim_y
+        algo._group_size = self._group_size
+        algo._use_minmax_cache = self._use_minmax_cache
+        algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
+        algo._min_cache = self._min_cache
+        algo._max_cache = self._max_cache
+
+    cdef _MarchingSquaresContours _get_contours_algo(self):
+        """
+        Returns the algorithm finding contours.
+        """
+        if self._use_minmax_cache and self._min_cache == NULL:
+            self._create_minmax_cache()
+        if self._contours_algo is None:
+            self._contours_algo = _MarchingSquaresContours()
+        self._init_algo(self._contours_algo)
+        return self._contours_algo
+
+    cdef _MarchingSquaresPixels _get_pixels_algo(self):
+        """
+        Returns the algorithm finding pixels.
+        """
+        if self._use_minmax_cache and self._min_cache == NULL:
+            self._create_minmax_cache()
+        if self._pixels_algo is None:
+            self._pixels_algo = _MarchingSquaresPixels()
+        self._init_algo(self._pixels_algo)
+        return self._pixels_algo
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef TileContext** _marching_squares_levels(self,
+                                                _MarchingSquaresAlgorithm algo,
+                                                cnumpy.float64_t[::1] levels):
+        """
+        Execute the marching squares for many levels.
+
+        :param algo: The algorithm to use
+        :param levels: The requested levels sorted in increasing order
+        :returns: An array of the final context of each level. It have to be
+            released.
+        """
+        cdef:
+            TileContext **final_contexts
+            int nb_levels
+
+        if self._min_cache == NULL:
+            self._create_minmax_cache()
+            self._init_algo(algo)
+
+        nb_levels = levels.shape[0]
+        final_contexts = <TileContext **>libc.stdlib.malloc(nb_levels * sizeof(TileContext*))
+        if nb_levels > 0:
+            algo.marching_squares_levels(&levels[0], nb_levels, final_contexts)
+        return final_contexts
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
@@ -1261,25 +1557,7 @@ cdef class MarchingSquaresMergeImpl(object):
         :returns: An array of y-x coordinates.
         :rtype: numpy.ndarray
         """
-        if self._use_minmax_cache and self._min_cache == NULL:
-            self._create_minmax_cache()
-
-        if self._pixels_algo is None:
-            algo = _MarchingSquaresPixels()
-            algo._image_ptr = self._image_ptr
-            algo._mask_ptr = self._mask_ptr
-            algo._dim_x = self._dim_x
-            algo._dim_y = self._dim_y
-            algo._group_size = self._group_size
-            algo._use_minmax_cache = self._use_minmax_cache
-            algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
-            if self._use_minmax_cache:
-                algo._min_cache = self._min_cache
-                algo._max_cache = self._max_cache
-            self._pixels_algo = algo
-        else:
-            algo = self._pixels_algo
-
+        algo = self._get_pixels_algo()
         algo.marching_squares(level)
         pixels = algo.extract_pixels()
         return pixels
@@ -1295,25 +1573,94 @@ cdef class MarchingSquaresMergeImpl(object):
         :returns: A list of array containg y-x coordinates of points
         :rtype: List[numpy.ndarray]
         """
-        if self._use_minmax_cache and self._min_cache == NULL:
-            self._create_minmax_cache()
-
-        if self._contours_algo is None:
-            algo = _MarchingSquaresContours()
-            algo._image_ptr = self._image_ptr
-            algo._mask_ptr = self._mask_ptr
-            algo._dim_x = self._dim_x
-            algo._dim_y = self._dim_y
-            algo._group_size = self._group_size
-            algo._use_minmax_cache = self._use_minmax_cache
-            algo._force_sequencial_reduction = COMPILED_WITH_OPENMP == 0
-            if self._use_minmax_cache:
-                algo._min_cache = self._min_cache
-                algo._max_cache = self._max_cache
-            self._contours_algo = algo
-        else:
-            algo = self._contours_algo
-
+        algo = self._get_contours_algo()
         algo.marching_squares(level)
         polygons = algo.extract_polygons()
         return polygons
+
+    def find_multi_pixels(self, levels):
+        """
+        Compute the pixels from the image over the iso contours of many
+        levels.
+
+        The image is read a single time for all the levels, using the
+        min/max cache to skip the tiles and the levels which are not needed.
+        It is faster than calling :meth:`find_pixels` for each level.
+
+        :param levels: Levels of the requested iso contours.
+        :type levels: Union[float,List[float],numpy.ndarray]
+        :returns: An array of y-x coordinates for each level.
+        :rtype: List[numpy.ndarray]
+        """
+        cdef:
+            _MarchingSquaresPixels algo
+            TileContext **final_contexts
+            int i
+
+        algo = self._get_pixels_algo()
+        levels = numpy.atleast_1d(numpy.asarray(levels, dtype=numpy.float64))
+        if levels.ndim != 1:
+            raise ValueError("Only 1D array of levels is supported.")
+        order = numpy.argsort(levels, kind='stable')
+        final_contexts = self._marching_squares_levels(
+            algo, numpy.ascontiguousarray(levels[order]))
+        result = [None] * len(order)
+        try:
+            for i in range(len(order)):
+                algo._final_context = final_contexts[i]
+                final_contexts[i] = NULL
+                result[order[i]] = algo.extract_pixels()
+        finally:
+            for i in range(len(order)):
+                if final_contexts[i] != NULL:
+                    del final_contexts[i]
+            libc.stdlib.free(final_contexts)
+        return result
+
+    def find_multi_contours(self, levels):
+        """
+        Compute the list of polygons of the iso contours of many levels.
+
+        The image is read a single time for all the levels, using the
+        min/max cache to skip the tiles and the levels which are not needed.
+        It is faster than calling :meth:`find_contours` for each level.
+
+        .. code-block:: python
+
+            shape = 1000, 1000
+            image = numpy.random.random(shape)
+            ms = MarchingSquaresMergeImpl(image)
+            levels = numpy.arange(0, 1, 0.05)
+            for level, polygons in zip(levels, ms.find_multi_contours(levels)):
+                print(level, len(polygons))
+
+        :param levels: Levels of the requested iso contours.
+        :type levels: Union[float,List[float],numpy.ndarray]
+        :returns: A list of array containg y-x coordinates of points for
+            each level.
+        :rtype: List[List[numpy.ndarray]]
+        """
+        cdef:
+            _MarchingSquaresContours algo
+            TileContext **final_contexts
+            int i
+
+        algo = self._get_contours_algo()
+        levels = numpy.atleast_1d(numpy.asarray(levels, dtype=numpy.float64))
+        if levels.ndim != 1:
+            raise ValueError("Only 1D array of levels is supported.")
+        order = numpy.argsort(levels, kind='stable')
+        final_contexts = self._marching_squares_levels(
+            algo, numpy.ascontiguousarray(levels[order]))
+        result = [None] * len(order)
+        try:
+            for i in range(len(order)):
+                algo._final_context = final_contexts[i]
+                final_contexts[i] = NULL
+                result[order[i]] = algo.extract_polygons()
+        finally:
+            for i in range(len(order)):
+                if final_contexts[i] != NULL:
+                    del final_contexts[i]
+            libc.stdlib.free(final_contexts)
+        return result
@@ -25,7 +25,7 @@
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
-__date__ = "17/04/2018"
+__date__ = "17/10/2026"
 
 import unittest
 import numpy
@@ -50,6 +50,14 @@ class MockMarchingSquares(object):
         self.events.append(("find_contours", level))
         return None
 
+    def find_multi_pixels(self, levels):
+        self.events.append(("find_multi_pixels", levels))
+        return None
+
+    def find_multi_contours(self, levels):
+        self.events.append(("find_multi_contours", levels))
+        return None
+
 
 class TestFunctionalApi(unittest.TestCase):
     """Test that the default functional API is called using the right
@@ -91,6 +99,26 @@ class TestFunctionalApi(unittest.TestCase):
         self.assertEqual(events[2][0], "find_pixels")
         self.assertEqual(events[2][1], level)
 
+    def test_default_find_multi_contours(self):
+        image = numpy.ones((2, 2), dtype=numpy.float32)
+        levels = [1.5, 2.5]
+        silx.image.marchingsquares.find_multi_contours(image=image, levels=levels)
+        events = MockMarchingSquares.last.events
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[1], ("mask", None))
+        self.assertEqual(events[2][0], "find_multi_contours")
+        self.assertEqual(events[2][1], levels)
+
+    def test_default_find_multi_pixels(self):
+        image = numpy.ones((2, 2), dtype=numpy.float32)
+        levels = [1.5, 2.5]
+        silx.image.marchingsquares.find_multi_pixels(image=image, levels=levels)
+        events = MockMarchingSquares.last.events
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[1], ("mask", None))
+        self.assertEqual(events[2][0], "find_multi_pixels")
+        self.assertEqual(events[2][1], levels)
+
 
 def suite():
     test_suite = unittest.TestSuite()
@@ -25,7 +25,7 @@
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
-__date__ = "18/04/2018"
+__date__ = "17/10/2026"
 
 import unittest
 import numpy
@@ -264,9 +264,74 @@ class TestMergeImplContours(unittest.TestCase):
         self.assertEqual(self.count_closed_polygons(polygons), 3)
 
 
+class TestMergeImplMultiLevels(unittest.TestCase):
+
+    def setUp(self):
+        # example from skimage
+        x, y = numpy.ogrid[-numpy.pi:numpy.pi:101j, -numpy.pi:numpy.pi:133j]
+        self.image = numpy.sin(numpy.exp((numpy.sin(x)**3 + numpy.cos(y)**2)))
+        self.levels = [0.9, 0.1, 0.5, 0.5, -0.3, 5]
+
+    def tearDown(self):
+        self.image = None
+        self.levels = None
+
+    @staticmethod
+    def normalize_polygons(polygons):
+        """Returns polygons as comparable objects"""
+        return sorted((len(p), sorted(map(tuple, p.tolist()))) for p in polygons)
+
+    def check_contours(self, mask=None, group_size=256):
+        ms = MarchingSquaresMergeImpl(
+            self.image, mask, group_size=group_size)
+        results = ms.find_multi_contours(self.levels)
+        self.assertEqual(len(results), len(self.levels))
+        for level, polygons in zip(self.levels, results):
+            expected = MarchingSquaresMergeImpl(
+                self.image, mask, group_size=group_size).find_contours(level)
+            self.assertEqual(self.normalize_polygons(polygons),
+                             self.normalize_polygons(expected))
+
+    def test_contours(self):
+        self.check_contours()
+
+    def test_contours_tiled(self):
+        self.check_contours(group_size=7)
+
+    def test_contours_masked(self):
+        mask = numpy.zeros(self.image.shape, dtype=numpy.int8)
+        mask[::7, ::3] = 1
+        self.check_contours(mask=mask, group_size=50)
+
+    def test_pixels(self):
+        ms = MarchingSquaresMergeImpl(self.image, group_size=50)
+        results = ms.find_multi_pixels(self.levels)
+        self.assertEqual(len(results), len(self.levels))
+        for level, pixels in zip(self.levels, results):
+            expected = ms.find_pixels(level)
+            self.assertEqual(sorted(map(tuple, pixels.tolist())),
+                             sorted(map(tuple, expected.tolist())))
+
+    def test_no_levels(self):
+        ms = MarchingSquaresMergeImpl(self.image)
+        self.assertEqual(ms.find_multi_contours([]), [])
+        self.assertEqual(ms.find_multi_pixels([]), [])
+
+    def test_minmax_cache_tile_index(self):
+        """Image size is a multiple of the tile size plus one"""
+        ms = MarchingSquaresMergeImpl(self.image[:, :101], group_size=50,
+                                      use_minmax_cache=True)
+        polygons = ms.find_contours(0.1)
+        expected = MarchingSquaresMergeImpl(self.image[:, :101],
+                                            group_size=50).find_contours(0.1)
+        self.assertEqual(self.normalize_polygons(polygons),
+                         self.normalize_polygons(expected))
+
+
 def suite():
     test_suite = unittest.TestSuite()
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
     test_suite.addTest(loadTests(TestMergeImplApi))
     test_suite.addTest(loadTests(TestMergeImplContours))
+    test_suite.addTest(loadTests(TestMergeImplMultiLevels))
     return test_suite
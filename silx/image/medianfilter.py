@@ -24,12 +24,12 @@
 
 """
 This module provides :func:`medfilt2d`, a 2D median filter function
-with the choice between 2 implementations: 'cpp' and 'opencl'.
+with the choice between 3 implementations: 'cpp', 'histogram' and 'opencl'.
 """
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "04/05/2017"
+__date__ = "17/10/2026"
 
 
 import logging
@@ -45,7 +45,7 @@ else:  # No OpenCL device or pyopencl not installed
 _logger = logging.getLogger(__name__)
 
 
-MEDFILT_ENGINES = ['cpp', 'opencl']
+MEDFILT_ENGINES = ['cpp', 'histogram', 'opencl']
 
 
 def medfilt2d(image, kernel_size=3, engine='cpp'):
@@ -65,7 +65,10 @@ def medfilt2d(image, kernel_size=3, engine='cpp'):
         Default: (3, 3)
     :type kernel_size: A int or a list of 2 int (kernel_height, kernel_width)
     :param engine: the type of implementation to use.
-        Valid values are: 'cpp' (default) and 'opencl'
+        Valid values are: 'cpp' (default), 'histogram' and 'opencl'.
+        'histogram' is a cpp implementation using a sliding window
+        histogram which is much faster for large kernels but only
+        supports uint8, int16 and uint16 images.
 
     :returns: the array with the median value for each pixel.
 
@@ -85,6 +88,11 @@ def medfilt2d(image, kernel_size=3, engine='cpp'):
         return medianfilter_cpp.medfilt(data=image,
                                         kernel_size=kernel_size,
                                         conditional=False)
+    elif engine == 'histogram':
+        return medianfilter_cpp.medfilt(data=image,
+                                        kernel_size=kernel_size,
+                                        conditional=False,
+                                        method='histogram')
     elif engine == 'opencl':
         if medfilt_opencl is None:
             wrn = 'opencl median filter not available. '
@@ -31,19 +31,24 @@
 
 The :class:`Polygon` class provides checking if a point is inside a polygon.
 
+The :class:`PolygonsRasterizer` class rasterizes many polygons at once as
+run-length encoded masks, a label image or per-polygon sums of an image,
+and updates them incrementally when polygons are edited.
+
 The whole module uses the (row, col) (i.e., (y, x))) convention
 for 2D coordinates.
 """
 
 __authors__ = ["Jérôme Kieffer", "T. Vincent"]
 __license__ = "MIT"
-__date__ = "15/02/2019"
+__date__ = "17/10/2026"
 __status__ = "dev"
 
 
 cimport cython
 import numpy
-from libc.math cimport ceil, fabs
+from libc.math cimport ceil, fabs, floor
+from libc.stdlib cimport malloc, free, qsort
 
 
 cdef class Polygon(object):
@@ -190,6 +195,321 @@ def polygon_fill_mask(vertices, shape):
     return Polygon(vertices).make_mask(shape[0], shape[1])
 
 
+ctypedef fused _label_t:
+    unsigned char
+    int
+
+
+cdef int _compare_int(const void *a, const void *b) nogil:
+    """Comparison function of int for qsort"""
+    return (<int *> a)[0] - (<int *> b)[0]
+
+
+@cython.cdivision(True)
+@cython.wraparound(False)
+@cython.boundscheck(False)
+cdef int _polygon_runs(float[:, :] vertices,
+                       int row_min,
+                       int row_max,
+                       int width,
+                       int *crossings,
+                       int[:, :] runs) nogil:
+    """Compute the runs of a filled polygon for a range of rows
+
+    It uses the same rule as :meth:`Polygon.make_mask`: a pixel is inside
+    if an odd number of segments are crossed on its left.
+
+    :param vertices: (N, 2) (row, col) corners of the polygon
+    :param int row_min: First row to process
+    :param int row_max: Row after the last one to process
+    :param int width: Width of the image
+    :param crossings: Buffer of at least N int
+    :param runs: Buffer of (row, start col, stop col) where to store the runs
+    :return: Number of stored runs
+    """
+    cdef int nvert = vertices.shape[0]
+    cdef int nruns = 0
+    cdef int ncrossings, row, index, start, stop
+    cdef float pt1x, pt1y, pt2x, pt2y
+
+    for row in range(row_min, row_max):
+        ncrossings = 0
+        pt1x = vertices[nvert-1, 1]
+        pt1y = vertices[nvert-1, 0]
+        for index in range(nvert):
+            pt2x = vertices[index, 1]
+            pt2y = vertices[index, 0]
+
+            if ((pt1y <= row and row < pt2y) or
+                    (pt2y <= row and row < pt1y)):
+                # Intersection casted to int so that ]x, x+1] => x
+                # and clipped to [-1, width]
+                crossings[ncrossings] = max(-1, min(width, (<int>ceil(
+                    pt1x + (row - pt1y) * (pt2x - pt1x) / (pt2y - pt1y))) - 1))
+                ncrossings += 1
+
+            pt1x, pt1y = pt2x, pt2y
+
+        qsort(crossings, ncrossings, sizeof(int), _compare_int)
+
+        # Pixels in ]crossings[2*i], crossings[2*i+1]] are inside
+        for index in range(0, ncrossings - 1, 2):
+            start = max(crossings[index] + 1, 0)
+            stop = min(crossings[index + 1] + 1, width)
+            if start < stop:
+                runs[nruns, 0] = row
+                runs[nruns, 1] = start
+                runs[nruns, 2] = stop
+                nruns += 1
+
+    return nruns
+
+
+def _compute_runs(Polygon polygon, int row_min, int row_max, int width):
+    """Returns the runs of a polygon for a range of rows
+
+    :param Polygon polygon:
+    :param int row_min: First row to process
+    :param int row_max: Row after the last one to process
+    :param int width: Width of the image
+    :return: (M, 3) array of (row, start col, stop col)
+    :rtype: numpy.ndarray
+    """
+    cdef int nruns
+    cdef int *crossings
+    cdef int[:, :] runs
+
+    if row_max <= row_min or width <= 0:
+        return numpy.zeros((0, 3), dtype=numpy.int32)
+
+    runs = numpy.empty(
+        ((row_max - row_min) * (polygon.nvert // 2), 3), dtype=numpy.int32)
+    crossings = <int *> malloc(polygon.nvert * sizeof(int))
+    if crossings == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            nruns = _polygon_runs(polygon.vertices, row_min, row_max, width,
+                                  crossings, runs)
+    finally:
+        free(crossings)
+
+    return numpy.array(runs[:nruns], copy=True)
+
+
+def _row_range(vertices, int height):
+    """Returns the range of image rows a set of vertices can intersect
+
+    :param numpy.ndarray vertices: (N, 2) (row, col) points
+    :param int height: Height of the image
+    :return: (first row, row after the last one)
+    :rtype: 2-tuple of int
+    """
+    vertices = numpy.asarray(vertices)
+    if vertices.size == 0:
+        return 0, 0
+    return (max(int(floor(numpy.min(vertices[:, 0]))), 0),
+            min(int(ceil(numpy.max(vertices[:, 0]))) + 1, height))
+
+
+class PolygonsRasterizer(object):
+    """Rasterize many polygons in an image at once.
+
+    Each polygon is stored as a run-length encoded mask: a (M, 3) array of
+    (row, start column, stop column) runs sorted by row.
+    Runs follow the same pixel inclusion rule as
+    :meth:`Polygon.make_mask` and are cached, so editing a polygon only
+    rasterizes this polygon again, and moving a single vertex only
+    rasterizes the rows spanned by the two segments sharing this vertex.
+
+    >>> rasterizer = PolygonsRasterizer((100, 100), [triangle, square])
+    >>> rasterizer.set_vertex(0, 1, row=50., col=20.)
+    >>> sums = rasterizer.sums(image)
+
+    :param shape: Shape of the image as (height, width)
+    :param polygons: Sequence of (N, 2) arrays of (row, col) vertices
+    """
+
+    def __init__(self, shape, polygons=()):
+        height, width = shape
+        self._shape = int(height), int(width)
+        self._vertices = []
+        self._polygons = []
+        self._runs = []
+        for vertices in polygons:
+            self.add_polygon(vertices)
+
+    @property
+    def shape(self):
+        """Shape of the image as (height, width) (tuple of 2 int)"""
+        return self._shape
+
+    def __len__(self):
+        return len(self._polygons)
+
+    def _rasterize(self, vertices, polygon):
+        """Returns the runs of a whole polygon"""
+        row_min, row_max = _row_range(vertices, self._shape[0])
+        return _compute_runs(polygon, row_min, row_max, self._shape[1])
+
+    def add_polygon(self, vertices):
+        """Append a polygon.
+
+        :param vertices: (N, 2) array of (row, col) corners of the polygon
+        :return: Index of the added polygon
+        :rtype: int
+        """
+        vertices = numpy.array(vertices, dtype=numpy.float32)
+        polygon = Polygon(vertices)
+        self._vertices.append(vertices)
+        self._polygons.append(polygon)
+        self._runs.append(self._rasterize(vertices, polygon))
+        return len(self._polygons) - 1
+
+    def set_polygon(self, int index, vertices):
+        """Replace a polygon.
+
+        :param int index: Index of the polygon to replace
+        :param vertices: (N, 2) array of (row, col) corners of the polygon
+        """
+        vertices = numpy.array(vertices, dtype=numpy.float32)
+        polygon = Polygon(vertices)
+        self._runs[index] = self._rasterize(vertices, polygon)
+        self._vertices[index] = vertices
+        self._polygons[index] = polygon
+
+    def remove_polygon(self, int index):
+        """Remove a polygon.
+
+        Indices of following polygons are decreased by one.
+
+        :param int index: Index of the polygon to remove
+        """
+        del self._vertices[index]
+        del self._polygons[index]
+        del self._runs[index]
+
+    def get_vertices(self, int index):
+        """Returns the vertices of a polygon.
+
+        :param int index: Index of the polygon
+        :return: (N, 2) array of (row, col) vertices
+        :rtype: numpy.ndarray
+        """
+        return self._vertices[index].copy()
+
+    def set_vertex(self, int index, int vertex, float row, float col):
+        """Move a single vertex of a polygon.
+
+        Only the rows spanned by the segments sharing this vertex
+        are rasterized again.
+
+        :param int index: Index of the polygon
+        :param int vertex: Index of the vertex in the polygon
+        :param float row: New row of the vertex
+        :param float col: New column of the vertex
+        """
+        vertices = self.get_vertices(index)
+        nvert = len(vertices)
+        vertex = vertex % nvert
+        # Rows where crossings can change: those of both adjacent segments
+        # before and after the move
+        affected = numpy.array(
+            (vertices[vertex - 1], vertices[(vertex + 1) % nvert],
+             vertices[vertex], (row, col)))
+        vertices[vertex] = row, col
+        polygon = Polygon(vertices)
+
+        row_min, row_max = _row_range(affected, self._shape[0])
+        runs = self._runs[index]
+        self._runs[index] = numpy.concatenate((
+            runs[runs[:, 0] < row_min],
+            _compute_runs(polygon, row_min, row_max, self._shape[1]),
+            runs[runs[:, 0] >= row_max]))
+        self._vertices[index] = vertices
+        self._polygons[index] = polygon
+
+    def get_runs(self, int index):
+        """Returns the run-length encoded mask of a polygon.
+
+        :param int index: Index of the polygon
+        :return: (M, 3) array of (row, start col, stop col) sorted by row.
+            Pixels [start, stop[ of the row are inside the polygon.
+        :rtype: numpy.ndarray
+        """
+        return self._runs[index].copy()
+
+    def get_mask(self, int index):
+        """Returns the mask of a polygon.
+
+        :param int index: Index of the polygon
+        :return: 2D (height, width) uint8 array, 1 inside the polygon
+        :rtype: numpy.ndarray
+        """
+        mask = numpy.zeros(self._shape, dtype=numpy.uint8)
+        _fill_runs(mask, self._runs[index], 1)
+        return mask
+
+    def get_labels(self):
+        """Returns an image of the polygons labels.
+
+        Where polygons overlap, the one with the highest index is kept.
+
+        :return: 2D (height, width) int32 array with the index of the polygon
+            each pixel belongs to, -1 for pixels outside all polygons
+        :rtype: numpy.ndarray
+        """
+        labels = numpy.full(self._shape, -1, dtype=numpy.int32)
+        for index, runs in enumerate(self._runs):
+            _fill_runs(labels, runs, index)
+        return labels
+
+    def counts(self):
+        """Returns the number of pixels inside each polygon.
+
+        :rtype: numpy.ndarray of int64
+        """
+        return numpy.array([numpy.sum(runs[:, 2] - runs[:, 1], dtype=numpy.int64)
+                            for runs in self._runs], dtype=numpy.int64)
+
+    def sums(self, image):
+        """Returns the sum of the image pixels inside each polygon.
+
+        :param numpy.ndarray image: 2D image of the rasterizer shape
+        :return: The sum for each polygon
+        :rtype: numpy.ndarray of float64
+        """
+        image = numpy.ascontiguousarray(image, dtype=numpy.float64)
+        if image.shape != self._shape:
+            raise ValueError("Image shape does not match rasterizer shape")
+        return numpy.array([_sum_runs(image, runs) for runs in self._runs],
+                           dtype=numpy.float64)
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def _fill_runs(_label_t[:, :] image, int[:, :] runs, _label_t value):
+    """Set pixels of given runs of an image to value"""
+    cdef int index, col
+    with nogil:
+        for index in range(runs.shape[0]):
+            for col in range(runs[index, 1], runs[index, 2]):
+                image[runs[index, 0], col] = value
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+def _sum_runs(double[:, :] image, int[:, :] runs):
+    """Returns the sum of pixels of given runs of an image"""
+    cdef int index, col
+    cdef double result = 0.
+    with nogil:
+        for index in range(runs.shape[0]):
+            for col in range(runs[index, 1], runs[index, 2]):
+                result += image[runs[index, 0], col]
+    return result
+
+
 @cython.wraparound(False)
 @cython.boundscheck(False)
 def draw_line(int row0, int col0, int row1, int col1, int width=1):
@@ -24,13 +24,13 @@
 
 __authors__ = ["J. Kieffer"]
 __license__ = "MIT"
-__date__ = "02/08/2016"
+__date__ = "17/10/2026"
 
 import unittest
 import numpy
 import logging
 logger = logging.getLogger(__name__)
-from ..bilinear import BilinearImage
+from ..bilinear import BilinearImage, ProfileLines
 
 
 class TestBilinear(unittest.TestCase):
@@ -131,6 +131,50 @@ class TestBilinear(unittest.TestCase):
         self.assertLess(abs(res_ver - expected_profile).max(), 1e-5,
                         "correct vertical profile")
 
+    def test_profile_lines(self):
+        """Compare profile_lines with many calls to profile_line"""
+        numpy.random.seed(0)
+        img = numpy.random.random((50, 70))
+        b = BilinearImage(img)
+        nb_lines = 20
+        src = numpy.random.uniform(-10, 80, (nb_lines, 2))
+        dst = numpy.random.uniform(-10, 80, (nb_lines, 2))
+        linewidth = numpy.random.randint(1, 5, nb_lines)
+
+        for method in ('mean', 'sum'):
+            res = b.profile_lines(src, dst, linewidth, method=method)
+            self.assertEqual(res.shape[0], nb_lines)
+            for i in range(nb_lines):
+                expected = b.profile_line(
+                    tuple(src[i]), tuple(dst[i]), int(linewidth[i]), method)
+                length = len(expected)
+                self.assertTrue(numpy.array_equal(res[i, :length], expected))
+                self.assertTrue(numpy.all(numpy.isnan(res[i, length:])))
+
+    def test_profile_lines_stack(self):
+        """Test ProfileLines with a stack of images"""
+        N = 40
+        stack = numpy.random.random((5, N, N)).astype(numpy.float32)
+        src = [(0, 0), (N // 2, 0), (0, N - 1)]
+        dst = [(N - 1, N - 1), (N // 2, N - 1), (N - 1, 0)]
+        lines = ProfileLines(stack.shape[1:], src, dst, linewidth=3)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines.max_length, numpy.max(lines.lengths))
+
+        res = lines.profiles(stack)
+        self.assertEqual(res.shape, (5, 3, lines.max_length))
+        for index, image in enumerate(stack):
+            b = BilinearImage(image)
+            self.assertTrue(numpy.array_equal(
+                res[index], lines.profiles(image), equal_nan=True))
+            for i in range(3):
+                expected = b.profile_line(src[i], dst[i], linewidth=3)
+                self.assertTrue(numpy.array_equal(
+                    res[index, i, :lines.lengths[i]], expected))
+
+        with self.assertRaises(ValueError):
+            lines.profiles(numpy.zeros((N, N + 1)))
+
 
 def suite():
     testsuite = unittest.TestSuite()
@@ -139,4 +183,6 @@ def suite():
     testsuite.addTest(TestBilinear("test_map"))
     testsuite.addTest(TestBilinear("test_profile_grad"))
     testsuite.addTest(TestBilinear("test_profile_gaus"))
+    testsuite.addTest(TestBilinear("test_profile_lines"))
+    testsuite.addTest(TestBilinear("test_profile_lines_stack"))
     return testsuite
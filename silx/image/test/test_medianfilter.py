@@ -54,6 +54,15 @@ class TestMedianFilterEngines(unittest.TestCase):
             engine='cpp')
         self.assertTrue(numpy.array_equal(res, TestMedianFilterEngines.IMG))
 
+    def testHistogramMedFilt2d(self):
+        """test histogram engine for medfilt2d"""
+        image = TestMedianFilterEngines.IMG.astype(numpy.uint16)
+        res = medianfilter.medfilt2d(
+            image=image,
+            kernel_size=TestMedianFilterEngines.KERNEL,
+            engine='histogram')
+        self.assertTrue(numpy.array_equal(res, image))
+
     @unittest.skipUnless(ocl, "PyOpenCl is missing")
     def testOpenCLMedFilt2d(self):
         """test cpp engine for medfilt2d"""
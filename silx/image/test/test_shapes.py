@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "15/02/2019"
+__date__ = "17/10/2026"
 
 
 import logging
@@ -354,9 +354,99 @@ class TestEllipseFill(unittest.TestCase):
         numpy.testing.assert_allclose(cols, expected_cols + 50)
 
 
+class TestPolygonsRasterizer(ParametricTestCase):
+    """Tests for PolygonsRasterizer"""
+
+    SHAPE = 40, 50
+
+    def setUp(self):
+        random = numpy.random.RandomState(0)
+        self.polygons = [
+            random.random_sample((random.randint(3, 9), 2)) * (60, 70) - 10
+            for _ in range(20)]
+        self.polygons.append([(1, 1), (1, 3), (3, 3), (3, 1)])
+        self.rasterizer = shapes.PolygonsRasterizer(self.SHAPE, self.polygons)
+
+    def tearDown(self):
+        self.polygons = None
+        self.rasterizer = None
+
+    def ref_mask(self, vertices):
+        return shapes.polygon_fill_mask(vertices, self.SHAPE)
+
+    def test_masks(self):
+        """Test masks and runs against polygon_fill_mask"""
+        self.assertEqual(len(self.rasterizer), len(self.polygons))
+        for index, vertices in enumerate(self.polygons):
+            with self.subTest(index=index):
+                ref_mask = self.ref_mask(vertices)
+                self.assertTrue(numpy.array_equal(
+                    self.rasterizer.get_mask(index), ref_mask))
+
+                mask = numpy.zeros(self.SHAPE, dtype=numpy.uint8)
+                for row, start, stop in self.rasterizer.get_runs(index):
+                    self.assertTrue(start < stop)
+                    mask[row, start:stop] += 1
+                self.assertTrue(numpy.array_equal(mask, ref_mask))
+
+    def test_labels(self):
+        """Test label image with overlapping polygons"""
+        ref_labels = numpy.full(self.SHAPE, -1, dtype=numpy.int32)
+        for index, vertices in enumerate(self.polygons):
+            ref_labels[self.ref_mask(vertices) != 0] = index
+        self.assertTrue(numpy.array_equal(
+            self.rasterizer.get_labels(), ref_labels))
+
+    def test_statistics(self):
+        """Test counts and sums"""
+        image = numpy.random.random(self.SHAPE)
+        masks = [self.ref_mask(vertices) != 0 for vertices in self.polygons]
+
+        self.assertTrue(numpy.array_equal(
+            self.rasterizer.counts(), [numpy.sum(mask) for mask in masks]))
+        self.assertTrue(numpy.allclose(
+            self.rasterizer.sums(image), [image[mask].sum() for mask in masks]))
+
+        with self.assertRaises(ValueError):
+            self.rasterizer.sums(numpy.ones((2, 2)))
+
+    def test_edit(self):
+        """Test incremental updates of the polygons"""
+        random = numpy.random.RandomState(1)
+        for _ in range(100):
+            index = random.randint(len(self.polygons))
+            vertices = numpy.array(self.polygons[index], dtype=numpy.float32)
+            vertex = random.randint(len(vertices))
+            row, col = random.random_sample(2) * (60, 70) - 10
+            vertices[vertex] = row, col
+            self.polygons[index] = vertices
+
+            self.rasterizer.set_vertex(index, vertex, row, col)
+            self.assertTrue(numpy.array_equal(
+                self.rasterizer.get_vertices(index), vertices))
+            self.assertTrue(numpy.array_equal(
+                self.rasterizer.get_runs(index),
+                shapes.PolygonsRasterizer(
+                    self.SHAPE, [vertices]).get_runs(0)))
+
+        self.rasterizer.set_polygon(0, [(0, 0), (0, 5), (5, 5)])
+        self.assertTrue(numpy.array_equal(
+            self.rasterizer.get_mask(0),
+            self.ref_mask([(0, 0), (0, 5), (5, 5)])))
+
+        self.rasterizer.remove_polygon(0)
+        self.assertEqual(len(self.rasterizer), len(self.polygons) - 1)
+        self.assertTrue(numpy.array_equal(
+            self.rasterizer.get_mask(0), self.ref_mask(self.polygons[1])))
+
+        index = self.rasterizer.add_polygon(self.polygons[0])
+        self.assertEqual(index, len(self.polygons) - 1)
+
+
 def suite():
     test_suite = unittest.TestSuite()
-    for testClass in (TestPolygonFill, TestDrawLine, TestCircleFill, TestEllipseFill):
+    for testClass in (TestPolygonFill, TestDrawLine, TestCircleFill,
+                      TestEllipseFill, TestPolygonsRasterizer):
         test_suite.addTest(
             unittest.defaultTestLoader.loadTestsFromTestCase(testClass))
     return test_suite
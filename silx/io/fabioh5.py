@@ -33,10 +33,12 @@
 """
 
 import collections
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import logging
 import numbers
 import os
+import threading
 
 import fabio.file_series
 import numpy
@@ -92,6 +94,86 @@ class _FileSeries(fabio.file_series.file_series):
         return self[self._current]
 
 
+class _FrameCache(object):
+    """Least recently used cache of decoded frames, limited by the
+    size in bytes of the frames.
+
+    :param int max_size: Maximum size in bytes of the cached frames
+    """
+
+    def __init__(self, max_size):
+        self.__frames = collections.OrderedDict()
+        self.__size = 0
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+
+    def get_max_size(self):
+        """Returns the maximum size in bytes of the cached frames.
+
+        :rtype: int
+        """
+        return self.__max_size
+
+    def set_max_size(self, max_size):
+        """Set the maximum size in bytes of the cached frames.
+
+        Least recently used frames are discarded if needed.
+
+        :param int max_size: Size in bytes, 0 to disable the cache
+        """
+        with self.__lock:
+            self.__max_size = max_size
+            self.__shrink()
+
+    def get(self, index):
+        """Returns a frame from the cache, or None if it is not cached.
+
+        :param int index: Index of the frame
+        :rtype: Union[numpy.ndarray,None]
+        """
+        with self.__lock:
+            frame = self.__frames.pop(index, None)
+            if frame is not None:
+                # Mark it as the most recently used
+                self.__frames[index] = frame
+            return frame
+
+    def put(self, index, frame):
+        """Store a frame in the cache.
+
+        :param int index: Index of the frame
+        :param numpy.ndarray frame: Data of the frame
+        :return: The read-only frame stored in the cache,
+            or frame if it is too large to be cached
+        :rtype: numpy.ndarray
+        """
+        if frame.nbytes > self.__max_size:
+            return frame
+        # Cached frames are shared: make them read-only
+        frame = frame.view()
+        frame.flags.writeable = False
+        with self.__lock:
+            previous = self.__frames.pop(index, None)
+            if previous is not None:
+                self.__size -= previous.nbytes
+            self.__frames[index] = frame
+            self.__size += frame.nbytes
+            self.__shrink()
+        return frame
+
+    def clear(self):
+        """Remove all the frames from the cache."""
+        with self.__lock:
+            self.__frames.clear()
+            self.__size = 0
+
+    def __shrink(self):
+        """Discard least recently used frames until the size fits"""
+        while self.__size > self.__max_size:
+            _index, frame = self.__frames.popitem(last=False)
+            self.__size -= frame.nbytes
+
+
 class FrameData(commonh5.LazyLoadableDataset):
     """Expose a cube of image from a Fabio file using `FabioReader` as
     cache."""
@@ -114,10 +196,10 @@ class FrameData(commonh5.LazyLoadableDataset):
                       fabio.file_series.file_series):
             # Reading all the files is taking too much time
             # Reach the information from the only first frame
-            first_image = self.__fabio_reader.fabio_file().first_image()
-            self._dtype = first_image.data.dtype
+            first_frame = self.__fabio_reader.get_frame(0)
+            self._dtype = first_frame.dtype
             shape0 = self.__fabio_reader.frame_count()
-            shape1, shape2 = first_image.data.shape
+            shape1, shape2 = first_frame.shape
             self._shape = shape0, shape1, shape2
         else:
             self._dtype = super(commonh5.LazyLoadableDataset, self).dtype
@@ -135,20 +217,60 @@ class FrameData(commonh5.LazyLoadableDataset):
             self._update_cache()
         return self._shape
 
+    def __len__(self):
+        return self.shape[0]
+
     def __iter__(self):
-        for frame in self.__fabio_reader.iter_frames():
-            yield frame.data
+        if self.__fabio_reader.is_file_series():
+            # Decode the files by chunks using the thread pool
+            chunk_size = max(1, self.__fabio_reader.DECODING_WORKERS)
+            for start in range(0, len(self), chunk_size):
+                indices = range(start, min(start + chunk_size, len(self)))
+                for frame in self.__fabio_reader.decode_frames(indices):
+                    yield frame
+        else:
+            for frame in self.__fabio_reader.iter_frames():
+                yield frame.data
+
+    def _normalize_frame(self, frame):
+        """Returns a frame with the shape and dtype of the frames of the
+        dataset, padding it with 0 or cropping it if needed.
+
+        :param numpy.ndarray frame: Data of a frame
+        :rtype: numpy.ndarray
+        """
+        shape = self.shape[1:]
+        if frame.shape == shape and frame.dtype == self.dtype:
+            return frame
+        normalized = numpy.zeros(shape, dtype=self.dtype)
+        location = tuple(slice(0, min(size, frame_size))
+                         for size, frame_size in zip(shape, frame.shape))
+        normalized[location] = frame[location]
+        return normalized
 
     def __getitem__(self, item):
-        # optimization for fetching a single frame if data not already loaded
-        if not self._is_initialized:
-            if isinstance(item, six.integer_types) and \
-                    isinstance(self.__fabio_reader.fabio_file(),
-                               fabio.file_series.file_series):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self.__fabio_reader.fabio_file().jump_image(item).data
+        # optimization for fetching frames if data not already loaded
+        if not self._is_initialized and self.__fabio_reader.is_file_series():
+            if not isinstance(item, tuple):
+                item = (item, )
+            if len(item) > 0 and isinstance(
+                    item[0], (slice, six.integer_types, numpy.integer)):
+                frame_key, image_key = item[0], item[1:]
+                indices = numpy.arange(len(self))[frame_key]
+                if isinstance(frame_key, slice):
+                    frames = self.__fabio_reader.get_frames(indices)
+                    data = numpy.empty((len(frames), ) + self.shape[1:],
+                                       dtype=self.dtype)
+                    for index, frame in enumerate(frames):
+                        data[index] = self._normalize_frame(frame)
+                    return data[(slice(None), ) + image_key]
+                else:
+                    frame = self.__fabio_reader.get_frame(int(indices))
+                    data = self._normalize_frame(frame)[image_key]
+                    if isinstance(data, numpy.ndarray):
+                        # Do not expose the cached frame
+                        data = data.copy()
+                    return data
         return super(FrameData, self).__getitem__(item)
 
 
@@ -346,6 +468,12 @@ class FabioReader(object):
     COUNTER = 1
     POSITIONER = 2
 
+    FRAME_CACHE_SIZE = 256 * 1024 ** 2
+    """Default maximum size in bytes of the decoded frames kept in cache"""
+
+    DECODING_WORKERS = min(8, os.cpu_count() or 1)
+    """Number of threads used to decode the files of a file series"""
+
     def __init__(self, file_name=None, fabio_image=None, file_series=None):
         """
         Constructor
@@ -366,8 +494,12 @@ class FabioReader(object):
         self.__measurements = {}
         self.__key_filters = set([])
         self.__data = None
+        self.__frame_cache = _FrameCache(self.FRAME_CACHE_SIZE)
+        self.__executor = None
         self.__frame_count = self.frame_count()
-        self._read()
+        # Metadata is read on first access
+        self.__metadata_read = False
+        self.__metadata_lock = threading.Lock()
 
     def __load(self, file_name=None, fabio_image=None, file_series=None):
         if file_name is not None and fabio_image:
@@ -402,6 +534,10 @@ class FabioReader(object):
         After calling this method, attempts to use the object (and children)
         may fail.
         """
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+        self.__frame_cache.clear()
         if self.__must_be_closed:
             # Make sure the API of fabio provide it a 'close' method
             # TODO the test can be removed if fabio version >= 0.8
@@ -412,6 +548,104 @@ class FabioReader(object):
     def fabio_file(self):
         return self.__fabio_file
 
+    def is_file_series(self):
+        """Returns true if the frames are read from a file series.
+
+        :rtype: bool
+        """
+        return isinstance(self.__fabio_file, fabio.file_series.file_series)
+
+    def get_frame_cache_size(self):
+        """Returns the maximum size in bytes of the decoded frames kept in
+        cache.
+
+        :rtype: int
+        """
+        return self.__frame_cache.get_max_size()
+
+    def set_frame_cache_size(self, size):
+        """Set the maximum size in bytes of the decoded frames kept in
+        cache.
+
+        :param int size: Size in bytes, 0 to disable the cache
+        """
+        self.__frame_cache.set_max_size(size)
+
+    def _decode_frame(self, frame_id):
+        """Returns the data of a frame.
+
+        Files of a file series are opened independently, so that they can
+        be decoded from different threads.
+
+        :param int frame_id: Index of the frame
+        :rtype: numpy.ndarray
+        """
+        if self.is_file_series():
+            with fabio.open(self.__fabio_file[frame_id]) as fabio_image:
+                # return the first frame only
+                assert(fabio_image.nframes == 1)
+                return fabio_image.data
+        elif self.__fabio_file.nframes == 1:
+            return self.__fabio_file.data
+        else:
+            return self.__fabio_file.getframe(frame_id).data
+
+    def decode_frames(self, frame_ids):
+        """Returns the data of frames without using the cache.
+
+        The files of a file series are decoded by a thread pool.
+
+        :param List[int] frame_ids: Indices of the frames
+        :rtype: List[numpy.ndarray]
+        """
+        frame_ids = list(frame_ids)
+        if (not self.is_file_series() or len(frame_ids) <= 1 or
+                self.DECODING_WORKERS <= 1):
+            return [self._decode_frame(frame_id) for frame_id in frame_ids]
+
+        return list(self.__get_executor().map(self._decode_frame, frame_ids))
+
+    def __get_executor(self):
+        """Returns the thread pool used to read the files of a file series.
+
+        :rtype: ThreadPoolExecutor
+        """
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.DECODING_WORKERS)
+        return self.__executor
+
+    def get_frames(self, frame_ids):
+        """Returns the data of frames.
+
+        Only the frames which are not in cache are decoded.
+        Cached frames are returned as read-only arrays.
+
+        :param List[int] frame_ids: Indices of the frames
+        :rtype: List[numpy.ndarray]
+        """
+        frame_ids = [int(frame_id) for frame_id in frame_ids]
+        frames = [self.__frame_cache.get(frame_id) for frame_id in frame_ids]
+
+        missing_ids = sorted(set(
+            frame_id for frame_id, frame in zip(frame_ids, frames)
+            if frame is None))
+        decoded = dict(zip(missing_ids, self.decode_frames(missing_ids)))
+        for frame_id in missing_ids:
+            decoded[frame_id] = self.__frame_cache.put(
+                frame_id, decoded[frame_id])
+
+        return [decoded[frame_id] if frame is None else frame
+                for frame_id, frame in zip(frame_ids, frames)]
+
+    def get_frame(self, frame_id):
+        """Returns the data of a frame, using the cache.
+
+        :param int frame_id: Index of the frame
+        :rtype: numpy.ndarray
+        """
+        return self.get_frames([frame_id])[0]
+
     def frame_count(self):
         """Returns the number of frames available."""
         if isinstance(self.__fabio_file, fabio.file_series.file_series):
@@ -449,9 +683,7 @@ class FabioReader(object):
 
         The computation is cached into the class, and only done ones.
         """
-        images = []
-        for fabio_frame in self.iter_frames():
-            images.append(fabio_frame.data)
+        images = self.decode_frames(range(self.__frame_count))
 
         # returns the data without extra dim in case of single frame
         if len(images) == 1:
@@ -482,6 +714,11 @@ class FabioReader(object):
 
     def __get_dict(self, kind):
         """Returns a dictionary from according to an expected kind"""
+        with self.__metadata_lock:
+            if not self.__metadata_read:
+                self._read()
+                self.__metadata_read = True
+
         if kind == self.DEFAULT:
             return self.__measurements
         elif kind == self.COUNTER:
@@ -554,14 +791,29 @@ class FabioReader(object):
         """Read all metadata from the fabio file and store it into this
         object."""
 
-        file_series = isinstance(self.__fabio_file, fabio.file_series.file_series)
-        if not file_series:
+        if not self.is_file_series():
             self._enable_key_filters(self.__fabio_file)
+            for frame_id, fabio_frame in enumerate(self.iter_frames()):
+                self._read_frame(frame_id, fabio_frame.header)
+            return
+
+        frame_ids = range(self.__frame_count)
+        if self.__frame_count <= 1 or self.DECODING_WORKERS <= 1:
+            headers = map(self._read_header, frame_ids)
+        else:
+            headers = self.__get_executor().map(self._read_header, frame_ids)
+        for frame_id, (fabio_class, header) in enumerate(headers):
+            self._enable_key_filters(fabio_class)
+            self._read_frame(frame_id, header)
+
+    def _read_header(self, frame_id):
+        """Returns the header of a file of the file series.
 
-        for frame_id, fabio_frame in enumerate(self.iter_frames()):
-            if file_series:
-                self._enable_key_filters(fabio_frame)
-            self._read_frame(frame_id, fabio_frame.header)
+        :param int frame_id: Index of the file
+        :return: The fabio image class of the file and its header
+        """
+        with fabio.open(self.__fabio_file[frame_id]) as fabio_image:
+            return fabio_image.__class__, fabio_image.header
 
     def _is_filtered_key(self, key):
         """
@@ -788,6 +1040,7 @@ class EdfFabioReader(FabioReader):
     """
 
     def __init__(self, file_name=None, fabio_image=None, file_series=None):
+        self.__first_header = None
         FabioReader.__init__(self, file_name, fabio_image, file_series)
         self.__unit_cell_abc = None
         self.__unit_cell_alphabetagamma = None
@@ -852,13 +1105,15 @@ class EdfFabioReader(FabioReader):
                 raise Exception("State unexpected (base_key: %s)" % base_key)
 
     def _get_first_header(self):
-        """
-        ..note:: This function can be cached
-        """
-        fabio_file = self.fabio_file()
-        if isinstance(fabio_file, fabio.file_series.file_series):
-            return fabio_file.jump_image(0).header
-        return fabio_file.header
+        """Returns the header of the first frame"""
+        if self.__first_header is None:
+            fabio_file = self.fabio_file()
+            if isinstance(fabio_file, fabio.file_series.file_series):
+                with fabio.open(fabio_file[0]) as fabio_image:
+                    self.__first_header = fabio_image.header
+            else:
+                self.__first_header = fabio_file.header
+        return self.__first_header
 
     def has_ub_matrix(self):
         """Returns true if a UB matrix is available.
@@ -74,6 +74,13 @@ provided by :class:`Scan`::
     for mca_data in first_scan.mca:
         print(sum(mca_data))
 
+The index of a file which is still being written (e.g. during an
+acquisition) can be updated with the new scans and data lines without
+reopening the file::
+
+    if sf.update():
+        last_scan = sf[-1]
+
 Classes
 =======
 
@@ -105,7 +112,7 @@ Exceptions
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "11/08/2017"
+__date__ = "17/10/2026"
 
 import os.path
 import logging
@@ -116,7 +123,8 @@ import sys
 _logger = logging.getLogger(__name__)
 
 cimport cython
-from libc.stdlib cimport free
+from cython.view cimport array as cvarray
+from libc.stdlib cimport free, malloc
 
 cimport silx.io.specfile_wrapper as specfile_wrapper
 
@@ -124,6 +132,7 @@ cimport silx.io.specfile_wrapper as specfile_wrapper
 SF_ERR_NO_ERRORS = 0
 SF_ERR_FILE_OPEN = 2
 SF_ERR_SCAN_NOT_FOUND = 7
+SF_ERR_COL_NOT_FOUND = 14
 
 
 # custom errors
@@ -307,6 +316,20 @@ class MCA(object):
             yield self._scan._specfile.get_mca(self._scan.index, mca_index)
 
 
+def _increasing_slice(item, length):
+    """Convert a slice to a range of increasing indices.
+
+    :param slice item: Slice to convert
+    :param int length: Length of the sliced sequence
+    :return: (first index, step, number of indices, whether item is reversed)
+    """
+    start, stop, step = item.indices(length)
+    count = len(range(start, stop, step))
+    if step < 0:
+        return start + (count - 1) * step, -step, count, True
+    return start, step, count, False
+
+
 def _add_or_concatenate(dictionary, key, value):
     """If key doesn't exist in dictionary, create a new ``key: value`` pair.
     Else append/concatenate the new value to the existing one
@@ -566,23 +589,26 @@ class Scan(object):
         # specfile data (where detectors correspond to columns)
         return self.data[:, line_index]
 
-    def data_column_by_name(self, label):
+    def data_column_by_name(self, label, dtype=numpy.float64):
         """Returns a data column
 
         :param label: Label of data column to retrieve, as defined on the
             ``#L`` line of the scan header.
         :type label: str
+        :param dtype: Type of the returned data: numpy.float64 (default) or
+            numpy.float32
 
-        :return: Line data as a 1D array of doubles
+        :return: Line data as a 1D array
         :rtype: numpy.ndarray
         """
         try:
-            ret = self._specfile.data_column_by_name(self._index, label)
+            ret = self._specfile.data_column_by_name(
+                self._index, label, dtype=dtype)
         except SfErrLineNotFound:
             # Could be a "#C Scan aborted after 0 points"
             _logger.warning("Cannot get data column %s in scan %d.%d",
                             label, self.number, self.order)
-            ret = numpy.empty((0, ), numpy.double)
+            ret = numpy.empty((0, ), dtype)
         return ret
 
     def motor_position_by_name(self, name):
@@ -626,10 +652,20 @@ def is_specfile(filename):
     return False
 
 
+_INDEX_FILE_SUFFIX = ".sfidx"
+
+
 cdef class SpecFile(object):
     """
 
     :param filename: Path of the SpecFile to read
+    :param index_file: Path of a file where to persist the index of the
+        scans, True to use the path of the SpecFile with a ``.sfidx``
+        suffix, or None (the default) to not persist the index.
+        The index is loaded from this file when it was saved for the
+        current size and modification time of the SpecFile, else the
+        SpecFile is indexed and the index file is written (failing to
+        write it is silently ignored).
 
     This class wraps the main data and header access functions of the C
     SpecFile library.
@@ -639,13 +675,23 @@ cdef class SpecFile(object):
         specfile_wrapper.SpecFileHandle *handle
         str filename
 
-    def __cinit__(self, filename):
+    def __cinit__(self, filename, index_file=None):
         cdef int error = 0
         self.handle = NULL
 
         if is_specfile(filename):
+            if index_file is True:
+                if isinstance(filename, bytes):
+                    index_file = filename + _INDEX_FILE_SUFFIX.encode()
+                else:
+                    index_file = filename + _INDEX_FILE_SUFFIX
             filename = _string_to_char_star(filename)
-            self.handle = specfile_wrapper.SfOpen(filename, &error)
+            if index_file is None:
+                self.handle = specfile_wrapper.SfOpen(filename, &error)
+            else:
+                index_file = _string_to_char_star(index_file)
+                self.handle = specfile_wrapper.SfOpenIndexed(
+                    filename, index_file, &error)
             if error:
                 self._handle_error(error)
         else:
@@ -653,7 +699,7 @@ cdef class SpecFile(object):
             # this causes the destructor to be called
             self._handle_error(SF_ERR_FILE_OPEN)
 
-    def __init__(self, filename):
+    def __init__(self, filename, index_file=None):
         if not isinstance(filename, str):
             # decode bytes to str in python 3, str to unicode in python 2
             self.filename = filename.decode()
@@ -672,6 +718,28 @@ cdef class SpecFile(object):
                 _logger.warning("Error while closing SpecFile")
             self.handle = NULL
 
+    def update(self):
+        """Update the index of the scans with the content appended to the
+        file since it was opened or last updated.
+
+        Only the new bytes are parsed: the last scan is updated and the
+        new scans are added. The whole file is indexed again if it was
+        truncated.
+
+        :class:`Scan` objects created before the update are not updated,
+        they must be retrieved again from this :class:`SpecFile`.
+
+        :return: True if the file has changed, False otherwise
+        :rtype: bool
+        """
+        cdef int error = 0
+        cdef short updated
+
+        updated = specfile_wrapper.SfUpdate(self.handle, &error)
+        if error:
+            self._handle_error(error)
+        return bool(updated)
+
     def __len__(self):
         """Return the number of scans in the SpecFile
         """
@@ -856,29 +924,64 @@ cdef class SpecFile(object):
         # representation of the list
         return self._list()
 
-    def data(self, scan_index):
+    def data(self, scan_index, columns=None, dtype=numpy.float64):
         """Returns data for the specified scan index.
 
+        Data is parsed in a single contiguous buffer which is then used by
+        the returned array without any copy.
+
         :param scan_index: Unique scan index between ``0`` and
             ``len(self)-1``.
         :type scan_index: int
-
-        :return: Complete scan data as a 2D array of doubles
+        :param columns: Indices (starting with 0) of the data columns to
+            read (default: all columns).
+        :type columns: Union[List[int],None]
+        :param dtype: Type of the returned data: numpy.float64 (default) or
+            numpy.float32
+        :return: Complete scan data as a 2D array of shape
+            (nlines, ncolumns)
         :rtype: numpy.ndarray
         """
         cdef:
-            double** mydata
-            long* data_info
-            int i, j
+            void* mydata
+            long data_info[3]
+            long* c_columns = NULL
+            long ncolumns = 0
+            long i
             int error = SF_ERR_NO_ERRORS
-            long nlines, ncolumns, regular
-            double[:, :] ret_array
+            int as_float
+            long nlines
+            cvarray ret_array
+
+        dtype = numpy.dtype(dtype)
+        if dtype == numpy.float64:
+            as_float = 0
+        elif dtype == numpy.float32:
+            as_float = 1
+        else:
+            raise ValueError("Unsupported dtype: %s" % dtype)
+
+        if columns is not None:
+            columns = list(columns)
+            ncolumns = len(columns)
+            c_columns = <long*> malloc((ncolumns + 1) * sizeof(long))
+            if c_columns == NULL:
+                raise MemoryError()
+            for i in range(ncolumns):
+                c_columns[i] = columns[i]
+
+        try:
+            sfdata_error = specfile_wrapper.SfDataBuffer(self.handle,
+                                                         scan_index + 1,
+                                                         c_columns,
+                                                         ncolumns,
+                                                         as_float,
+                                                         &mydata,
+                                                         data_info,
+                                                         &error)
+        finally:
+            free(c_columns)
 
-        sfdata_error = specfile_wrapper.SfData(self.handle,
-                                               scan_index + 1,
-                                               &mydata,
-                                               &data_info,
-                                               &error)
         if sfdata_error == -1 and not error:
             # this has happened in some situations with empty scans (#1759)
             _logger.warning("SfData returned -1 without an error."
@@ -886,26 +989,27 @@ cdef class SpecFile(object):
 
         self._handle_error(error)
 
-        if <long>data_info != 0:
-            nlines = data_info[0]
-            ncolumns = data_info[1]
-            regular = data_info[2]
-        else:
-            nlines = 0
-            ncolumns = 0
-            regular = 0
-
-        ret_array = numpy.empty((nlines, ncolumns), dtype=numpy.double)
-
-        for i in range(nlines):
-            for j in range(ncolumns):
-                ret_array[i, j] = mydata[i][j]
-
-        specfile_wrapper.freeArrNZ(<void ***>&mydata, nlines)
-        free(data_info)
+        nlines = data_info[0]
+        if sfdata_error == -1 or mydata == NULL:
+            ncolumns = 0 if columns is None else ncolumns
+            free(mydata)
+            return numpy.empty((0, ncolumns), dtype=dtype)
+
+        if nlines == 0 or data_info[1] == 0:
+            free(mydata)
+            return numpy.empty((nlines, data_info[1]), dtype=dtype)
+
+        # Wrap the C buffer without copy, it is freed with the array
+        ret_array = cvarray(shape=(nlines, data_info[1]),
+                            itemsize=dtype.itemsize,
+                            format="f" if as_float else "d",
+                            mode="c",
+                            allocate_buffer=False)
+        ret_array.data = <char*> mydata
+        ret_array.callback_free_data = free
         return numpy.asarray(ret_array)
 
-    def data_column_by_name(self, scan_index, label):
+    def data_column_by_name(self, scan_index, label, dtype=numpy.float64):
         """Returns data column for the specified scan index and column label.
 
         :param scan_index: Unique scan index between ``0`` and
@@ -913,39 +1017,28 @@ cdef class SpecFile(object):
         :type scan_index: int
         :param label: Label of data column, as defined in the ``#L`` line
             of the scan header.
-        :type label: str
+        :type label: str or bytes
+        :param dtype: Type of the returned data: numpy.float64 (default) or
+            numpy.float32
 
-        :return: Data column as a 1D array of doubles
+        :return: Data column as a 1D array
         :rtype: numpy.ndarray
         """
-        cdef:
-            double* data_column
-            long i, nlines
-            int error = SF_ERR_NO_ERRORS
-            double[:] ret_array
-
-        label = _string_to_char_star(label)
-
-        nlines = specfile_wrapper.SfDataColByName(self.handle,
-                                                  scan_index + 1,
-                                                  label,
-                                                  &data_column,
-                                                  &error)
-        self._handle_error(error)
-
-        if nlines == -1:
+        labels = self.labels(scan_index)
+        if not labels:
             # this can happen on empty scans in some situations (see #1759)
             _logger.warning("SfDataColByName returned -1 without an error."
                             " Assuming aborted scan.")
-            nlines = 0
-
-        ret_array = numpy.empty((nlines,), dtype=numpy.double)
+            return numpy.empty((0,), dtype=dtype)
 
-        for i in range(nlines):
-            ret_array[i] = data_column[i]
+        if isinstance(label, bytes):
+            label = label.decode()
+        try:
+            column = labels.index(label)
+        except ValueError:
+            self._handle_error(SF_ERR_COL_NOT_FOUND)
 
-        free(data_column)
-        return numpy.asarray(ret_array)
+        return self.data(scan_index, columns=[column], dtype=dtype).reshape(-1)
 
     def scan_header(self, scan_index):
         """Return list of scan header lines.
@@ -1266,3 +1359,68 @@ cdef class SpecFile(object):
 
         free(mca_data)
         return numpy.asarray(ret_array)
+
+    def get_mca_array(self, scan_index, mca_indices=None, channels=None):
+        """Return several MCA spectra of a scan as a 2D array
+
+        The scan is parsed only once and only the requested spectra
+        and channels are converted.
+        Channels missing in a spectrum (e.g. a spectrum being written)
+        are set to NaN.
+
+        :param scan_index: Unique scan index between ``0`` and ``len(self)-1``.
+        :type scan_index: int
+        :param slice mca_indices: Indices of the MCA in the scan,
+            None (the default) for all MCA
+        :param slice channels: Channels to read,
+            None (the default) for all channels of the first MCA
+        :return: MCA spectra of shape (number of MCA, number of channels)
+        :rtype: 2D numpy array
+        """
+        cdef:
+            int error = SF_ERR_NO_ERRORS
+            long nread
+            double[:, ::1] ret_array
+
+        if mca_indices is None:
+            mca_indices = slice(None)
+        if channels is None:
+            channels = slice(None)
+        if not isinstance(mca_indices, slice) or not isinstance(channels, slice):
+            raise TypeError("mca_indices and channels must be slices")
+
+        number_of_mca = self.number_of_mca(scan_index)
+        mca_first, mca_step, count, mca_reversed = _increasing_slice(
+            mca_indices, number_of_mca)
+
+        if number_of_mca == 0:
+            nchannels = 0
+        else:
+            nchannels = len(self.get_mca(scan_index,
+                                         mca_first if count else 0))
+        first_channel, channel_step, channel_count, channel_reversed = _increasing_slice(
+            channels, nchannels)
+        no_channels = max(0, (channel_count - 1) * channel_step + 1)
+
+        array = numpy.full((count, no_channels), numpy.nan, dtype=numpy.float64)
+        if count > 0 and no_channels > 0:
+            ret_array = array
+            nread = specfile_wrapper.SfGetMcaBlock(self.handle,
+                                                   scan_index + 1,
+                                                   mca_first,
+                                                   mca_step,
+                                                   count,
+                                                   first_channel,
+                                                   no_channels,
+                                                   &ret_array[0, 0],
+                                                   &error)
+            self._handle_error(error)
+            if nread != count:
+                raise SfErrMcaNotFound("Failed to read MCA spectra")
+
+        array = array[:, ::channel_step]
+        if mca_reversed:
+            array = array[::-1]
+        if channel_reversed:
+            array = array[:, ::-1]
+        return array
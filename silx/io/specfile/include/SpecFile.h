@@ -138,6 +138,11 @@ typedef struct _SpecFile{
   long           *data_info;
   SfCursor        cursor;
   short           updating;
+  long            m_size;        /* file size when last read */
+  char           *indexname;     /* persistent index file or NULL */
+  ObjectList    **scans;         /* list items by scan index - 1 */
+  struct _SpecScan **sorted_scans; /* scans sorted by number and order */
+  long            no_sorted_scans;
 } SpecFile;
 
 typedef struct _SpecFileOut{
@@ -171,6 +176,8 @@ typedef struct _SpecScan {
  * init
  */
 DllExport extern    SpecFile  *SfOpen        ( char *name, int *error );
+DllExport extern    SpecFile  *SfOpenIndexed ( char *name, char *indexname,
+                                               int *error );
 DllExport extern    short      SfUpdate      ( SpecFile *sf,int *error );
 DllExport extern    int        SfClose       ( SpecFile *sf );
 
@@ -237,6 +244,9 @@ DllExport extern  double  SfMotorPosByName   ( SpecFile *sf, long index,
 DllExport extern  long  SfNoDataLines ( SpecFile *sf, long index, int *error );
 DllExport extern  int   SfData        ( SpecFile *sf, long index,
                                 double ***data, long **data_info, int *error );
+DllExport extern  int   SfDataBuffer  ( SpecFile *sf, long index,
+                                long *columns, long ncolumns, int as_float,
+                                void **data, long *data_info, int *error );
 DllExport extern  long  SfDataAsString ( SpecFile *sf, long index,
                                    char ***data, int *error );
 DllExport extern  long  SfDataLine      ( SpecFile *sf, long index, long line,
@@ -254,6 +264,10 @@ DllExport extern int  SfGetMca  ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport extern long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport extern long SfGetMcaBlock ( SpecFile *sf, long index, long first,
+                                      long step, long count,
+                                      long first_channel, long no_channels,
+                                      double *data, int *error );
 
   /*
    * Write and write related functions
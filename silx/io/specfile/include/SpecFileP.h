@@ -70,6 +70,8 @@
 extern  int        sfSetCurrent    ( SpecFile *sf,   long index, int *error);
 extern ObjectList *findScanByIndex ( ListHeader *list, long index );
 extern ObjectList *findScanByNo    ( ListHeader *list, long scan_no, long order );
+extern ObjectList *sfFindScanByIndex ( SpecFile *sf, long index );
+extern ObjectList *sfFindScanByNo    ( SpecFile *sf, long scan_no, long order );
 extern void        freeArr         ( void ***ptr, long lines );
 extern void        freeAllData     ( SpecFile *sf );
 extern long        mulstrtod       ( char *str, double **arr, int *error );
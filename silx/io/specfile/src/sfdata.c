@@ -95,6 +95,9 @@
 DllExport long SfNoDataLines  ( SpecFile *sf, long index, int *error );
 DllExport int  SfData         ( SpecFile *sf, long index, double ***retdata,
                                           long **retinfo, int *error );
+DllExport int  SfDataBuffer   ( SpecFile *sf, long index, long *columns,
+                                long ncolumns, int as_float, void **retdata,
+                                long *retinfo, int *error );
 DllExport long SfDataAsString ( SpecFile *sf, long index,
                                           char ***data, int *error );
 DllExport long SfDataLine     ( SpecFile *sf, long index, long line,
@@ -104,6 +107,9 @@ DllExport long SfDataCol      ( SpecFile *sf, long index, long col,
 DllExport long SfDataColByName( SpecFile *sf, long index,
                                   char *label, double **data_col, int *error );
 
+static    int  sfReadData     ( SpecFile *sf, long index, double **retbuffer,
+                                          long *dinfo, int *error );
+
 
 /*********************************************************************
  *   Function:        long SfNoDataLines( sf, index, error )
@@ -188,26 +194,8 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
 {
      long     *dinfo    = NULL;
      double  **data     = NULL;
-     double   *dataline = NULL;
-     long      headersize;
-
-     char *ptr,
-          *from,
-          *to;
-
-     char    strval[100];
-     double  val;
-     double  valline[512];
-     long    cols,
-             maxcol=512;
-     long    rows;
+     double   *buffer   = NULL;
      int     i;
-#ifndef _GNU_SOURCE
-#ifdef PYMCA_POSIX
-	char *currentLocaleBuffer;
-	char localeBuffer[21];
-#endif
-#endif
 
      if (index <= 0 ){
         return(-1);
@@ -244,6 +232,299 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
           return(-1);
      }
 
+     /*
+      * Alloc memory
+      */
+     if ( (dinfo = (long *) malloc(sizeof(long) * D_INFO) ) == (long *)NULL) {
+         *error = SF_ERR_MEMORY_ALLOC;
+          return(-1);
+     }
+
+     if (sfReadData(sf, index, &buffer, dinfo, error) == -1) {
+          free(dinfo);
+          return(-1);
+     }
+
+     /*
+      * split the contiguous buffer in lines
+      */
+     if ( (data = (double **) malloc (sizeof(double *) * (dinfo[ROW] + 1)) ) == (double **)NULL) {
+          free(buffer);
+          free(dinfo);
+         *error = SF_ERR_MEMORY_ALLOC;
+          return(-1);
+     }
+     for (i=0;i<dinfo[ROW];i++) {
+          data[i] = (double *)malloc (sizeof(double) * dinfo[COL]);
+          if (data[i] == (double *)NULL) {
+               while (i > 0) {
+                    free(data[--i]);
+               }
+               free(data);
+               free(buffer);
+               free(dinfo);
+              *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+          memcpy(data[i],buffer + i * dinfo[COL],sizeof(double) * dinfo[COL]);
+     }
+     free(buffer);
+
+    /*
+    * make a copy in specfile structure
+    */
+    if ( dinfo[ROW] != 0 && dinfo[REG] == 0) {
+        if (sf->data_info != (long *)NULL){
+            printf("I should not be here!/n");
+          sf->data_info[ROW] = dinfo[ROW];
+          sf->data_info[COL] = dinfo[COL];
+          sf->data_info[REG] = dinfo[REG];
+          for (i=0;i<dinfo[ROW];i++) {
+              sf->data[i]= (double *)realloc (sf->data[i],sizeof(double) * dinfo[COL]);
+              if (sf->data[i] == (double *) NULL){
+                printf("Realloc problem");
+                return (-1);
+              }
+              memcpy(sf->data[i],data[i],sizeof(double) * dinfo[COL]);
+          }
+          *retdata = data;
+          *retinfo = dinfo;
+          return(0);
+        }else{
+            sf->data_info = ( long * ) malloc ( sizeof(long) * D_INFO);
+            sf->data_info[ROW] = dinfo[ROW];
+            sf->data_info[COL] = dinfo[COL];
+            sf->data_info[REG] = dinfo[REG];
+            sf->data =  ( double **) malloc ( sizeof(double *) * dinfo[ROW]);
+            if (sf->data == (double **) NULL){
+                    printf("malloc1 problem");
+                    return (-1);
+            }
+            for (i=0;i<dinfo[ROW];i++) {
+                sf->data[i] = (double *)malloc (sizeof(double) * dinfo[COL]);
+                if (sf->data[i] == (double *) NULL){
+                    printf("malloc2 problem");
+                    return (-1);
+                }
+                memcpy(sf->data[i],data[i],sizeof(double) * dinfo[COL]);
+            }
+        }
+    } else {
+        if (dinfo[REG] == 0) {
+            ;
+            /*printf("Not Freeing data:!\n");*/
+            /* I can be in the case of an mca without scan points */
+            /*free(data);
+            return(-1);*/
+        }
+    }
+    *retinfo = dinfo;
+    *retdata = data;
+     return( 0 );
+}
+
+
+/*********************************************************************
+ *   Function:        int SfDataBuffer(sf, index, columns, ncolumns,
+ *                                     as_float, data, data_info, error)
+ *
+ *   Description:    Gets data as a single contiguous buffer.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *            (3) Indices (starting at 0) of the columns to get,
+ *                NULL to get all columns
+ *            (4) Number of column indices
+ *            (5) ( 0 ) => double data
+ *                ( 1 ) => float data
+ *        Output:
+ *            (6) Data buffer of no_lines * no_columns values,
+ *                stored line by line
+ *            (7) Data info : [0] => no_lines
+ *                    [1] => no_columns
+ *                    [2] = ( 0 ) => regular
+ *                          ( 1 ) => not regular !
+ *                Array of at least 3 long provided by the caller
+ *            (8) error number
+ *   Returns:
+ *            (  0 ) => OK
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *            SF_ERR_LINE_NOT_FOUND
+ *            SF_ERR_COL_NOT_FOUND
+ *
+ *   Remark:  Unlike SfData, data is parsed in place and not copied
+ *            line by line. The buffer should be freed by the application
+ *
+ *********************************************************************/
+DllExport int
+SfDataBuffer( SpecFile *sf, long index, long *columns, long ncolumns,
+              int as_float, void **retdata, long *retinfo, int *error )
+{
+     double  *buffer   = NULL;
+     double  *dataline = NULL;
+     char    *output;
+     long     dinfo[D_INFO];
+     long     rows, cols, outcols, i, j;
+     size_t   itemsize = as_float ? sizeof(float) : sizeof(double);
+     size_t   outsize;
+
+     *retdata = NULL;
+     retinfo[ROW] = retinfo[COL] = retinfo[REG] = 0;
+
+     if (index <= 0 ){
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     if (sf->data_info != (long *)NULL) {
+          /*
+           * Copy if already there
+           */
+          dinfo[ROW] = sf->data_info[ROW];
+          dinfo[COL] = sf->data_info[COL];
+          dinfo[REG] = sf->data_info[REG];
+          buffer = (double *) malloc (sizeof(double) * (dinfo[ROW] * dinfo[COL] + 1));
+          if (buffer == (double *)NULL) {
+              *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+          for (i=0;i<dinfo[ROW];i++) {
+              memcpy(buffer + i * dinfo[COL], sf->data[i], sizeof(double) * dinfo[COL]);
+          }
+     } else {
+          if ( ((SpecScan *)sf->current->contents)->data_offset == -1 ) {
+               return(-1);
+          }
+          if (sfReadData(sf, index, &buffer, dinfo, error) == -1) {
+               return(-1);
+          }
+     }
+
+     rows    = dinfo[ROW];
+     cols    = dinfo[COL];
+     outcols = (columns == (long *)NULL) ? cols : ncolumns;
+
+     if (rows > 0 && columns != (long *)NULL) {
+          for (j=0;j<ncolumns;j++) {
+              if (columns[j] < 0 || columns[j] >= cols) {
+                  free(buffer);
+                 *error = SF_ERR_COL_NOT_FOUND;
+                  return(-1);
+              }
+          }
+     }
+
+     outsize = itemsize * rows * outcols;
+
+     if (columns == (long *)NULL && !as_float) {
+          /* Nothing to convert */
+          output = (char *) buffer;
+
+     } else {
+          if ( (dataline = (double *) malloc (sizeof(double) * (cols + 1))) == (double *)NULL) {
+               free(buffer);
+              *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+
+          /*
+           * Convert in place when output lines are not larger than parsed
+           * lines: output line i ends before parsed line i+1 starts
+           */
+          if (itemsize * outcols <= sizeof(double) * cols) {
+               output = (char *) buffer;
+          } else if ( (output = (char *) malloc (outsize + 1)) == (char *)NULL) {
+               free(dataline);
+               free(buffer);
+              *error = SF_ERR_MEMORY_ALLOC;
+               return(-1);
+          }
+
+          for (i=0;i<rows;i++) {
+               memcpy(dataline, buffer + i * cols, sizeof(double) * cols);
+               for (j=0;j<outcols;j++) {
+                    if (as_float) {
+                         ((float *) output)[i * outcols + j] = (float) dataline[
+                              (columns == (long *)NULL) ? j : columns[j]];
+                    } else {
+                         ((double *) output)[i * outcols + j] = dataline[
+                              (columns == (long *)NULL) ? j : columns[j]];
+                    }
+               }
+          }
+          free(dataline);
+          if (output != (char *) buffer) {
+               free(buffer);
+          }
+     }
+
+     /* Release unused memory */
+     buffer = (double *) realloc (output, outsize + 1);
+     if (buffer != (double *)NULL) {
+          output = (char *) buffer;
+     }
+
+     retinfo[ROW] = rows;
+     retinfo[COL] = outcols;
+     retinfo[REG] = dinfo[REG];
+    *retdata = (void *) output;
+     return(0);
+}
+
+
+/*********************************************************************
+ *   Function:        int sfReadData(sf, index, buffer, data_info, error)
+ *
+ *   Description:    Parses data of the current scan.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *        Output:
+ *            (3) Contiguous buffer of no_lines * no_columns values,
+ *                stored line by line
+ *            (4) Data info (see SfData)
+ *            (5) error number
+ *   Returns:
+ *            (  0 ) => OK
+ *                ( -1 ) => errors occured
+ *
+ *   Remark:  sfSetCurrent must have been called before.
+ *            The buffer is grown geometrically, so that each data line
+ *            is not allocated separately.
+ *
+ *********************************************************************/
+static int
+sfReadData( SpecFile *sf, long index, double **retbuffer, long *dinfo, int *error )
+{
+     double   *data     = NULL;
+     double   *newdata  = NULL;
+     long      capacity = 0;
+     long      headersize;
+
+     char *ptr,
+          *from,
+          *to;
+
+     char    strval[100];
+     double  val;
+     double  valline[512];
+     long    cols,
+             maxcol=512;
+     long    rows;
+     int     i;
+#ifndef _GNU_SOURCE
+#ifdef PYMCA_POSIX
+	char *currentLocaleBuffer;
+	char localeBuffer[21];
+#endif
+#endif
+
      headersize = ((SpecScan *)sf->current->contents)->data_offset
                 - ((SpecScan *)sf->current->contents)->offset;
 
@@ -263,16 +544,12 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
      /*
       * Alloc memory
       */
-     if ( (data = (double **) malloc (sizeof(double *)) ) == (double **)NULL) {
+     capacity = 512;
+     if ( (data = (double *) malloc (sizeof(double) * capacity) ) == (double *)NULL) {
          *error = SF_ERR_MEMORY_ALLOC;
           return(-1);
      }
 
-     if ( (dinfo = (long *) malloc(sizeof(long) * D_INFO) ) == (long *)NULL) {
-          free(data);
-         *error = SF_ERR_MEMORY_ALLOC;
-          return(-1);
-     }
      ptr = from;
      dinfo[ROW] = dinfo[COL] = dinfo[REG] = 0;
 
@@ -342,7 +619,10 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
                 val = PyMcaAtof(strval);
                 valline[cols] = val;
                 cols++;
-                if (cols >= maxcol) return(-1);
+                if (cols >= maxcol) {
+                    free(data);
+                    return(-1);
+                }
                 while(*(ptr+1) == ' ' || *(ptr+1) == '\t') ptr++;
             } else {
                 if isnumber(*ptr){
@@ -360,7 +640,10 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
                 val = PyMcaAtof(strval);
                 valline[cols] = val;
                 cols++;
-                if (cols >= maxcol) return(-1);
+                if (cols >= maxcol) {
+                    free(data);
+                    return(-1);
+                }
                 /*while(*(ptr+1) == ' ' || *(ptr+1) == '\t') ptr++;*/
         }
         /*printf("%c",*ptr);*/
@@ -369,7 +652,10 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
         if ((ptr < to) && (cols >0)) {
         rows++;
         /*cols++;*/
-        if (cols >= maxcol) return(-1);
+        if (cols >= maxcol) {
+            free(data);
+            return(-1);
+        }
         /* printf("Adding a new row, nrows = %ld, ncols= %ld\n",rows,cols);*/
         /*printf("info col = %d cols = %d\n", dinfo[COL], cols);*/
         if (dinfo[COL] != 0 && cols != dinfo[COL]) {
@@ -380,10 +666,25 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
                     dinfo[COL] = cols;
         }
         if(dinfo[COL]==cols){
-              dataline = (double *)malloc(sizeof(double) * cols);
-              memcpy(dataline,valline,sizeof(double) * cols);
-              data = (double **) realloc ( data, sizeof(double) * (rows+1));
-              data[rows] = dataline;
+              if ((rows + 1) * cols > capacity) {
+                  capacity = 2 * capacity;
+                  if (capacity < (rows + 1) * cols) {
+                      capacity = (rows + 1) * cols;
+                  }
+                  newdata = (double *) realloc (data, sizeof(double) * capacity);
+                  if (newdata == (double *)NULL) {
+                      free(data);
+#ifndef _GNU_SOURCE
+#ifdef PYMCA_POSIX
+                      setlocale(LC_NUMERIC, localeBuffer);
+#endif
+#endif
+                     *error = SF_ERR_MEMORY_ALLOC;
+                      return(-1);
+                  }
+                  data = newdata;
+              }
+              memcpy(data + rows * cols,valline,sizeof(double) * cols);
               dinfo[ROW]=rows+1;
         }else{
               printf("Error on scan %d line %d\n", (int) index, (int) (rows+1));
@@ -399,60 +700,12 @@ SfData( SpecFile *sf, long index, double ***retdata, long **retinfo, int *error
     setlocale(LC_NUMERIC, localeBuffer);
 #endif
 #endif
-    /*
-    * make a copy in specfile structure
-    */
-    if ( dinfo[ROW] != 0 && dinfo[REG] == 0) {
-        if (sf->data_info != (long *)NULL){
-            printf("I should not be here!/n");
-          sf->data_info[ROW] = dinfo[ROW];
-          sf->data_info[COL] = dinfo[COL];
-          sf->data_info[REG] = dinfo[REG];
-          for (i=0;i<dinfo[ROW];i++) {
-              sf->data[i]= (double *)realloc (sf->data[i],sizeof(double) * dinfo[COL]);
-              if (sf->data[i] == (double *) NULL){
-                printf("Realloc problem");
-                return (-1);
-              }
-              memcpy(sf->data[i],data[i],sizeof(double) * dinfo[COL]);
-          }
-          *retdata = data;
-          *retinfo = dinfo;
-          return(0);
-        }else{
-            sf->data_info = ( long * ) malloc ( sizeof(long) * D_INFO);
-            sf->data_info[ROW] = dinfo[ROW];
-            sf->data_info[COL] = dinfo[COL];
-            sf->data_info[REG] = dinfo[REG];
-            sf->data =  ( double **) malloc ( sizeof(double *) * dinfo[ROW]);
-            if (sf->data == (double **) NULL){
-                    printf("malloc1 problem");
-                    return (-1);
-            }
-            for (i=0;i<dinfo[ROW];i++) {
-                sf->data[i] = (double *)malloc (sizeof(double) * dinfo[COL]);
-                if (sf->data[i] == (double *) NULL){
-                    printf("malloc2 problem");
-                    return (-1);
-                }
-                memcpy(sf->data[i],data[i],sizeof(double) * dinfo[COL]);
-            }
-        }
-    } else {
-        if (dinfo[REG] == 0) {
-            ;
-            /*printf("Not Freeing data:!\n");*/
-            /* I can be in the case of an mca without scan points */
-            /*free(data);
-            return(-1);*/
-        }
-    }
-    *retinfo = dinfo;
-    *retdata = data;
+
+    *retbuffer = data;
      return( 0 );
 }
 
-
+
 DllExport long
 SfDataCol ( SpecFile *sf, long index, long col, double **retdata, int *error )
 {
@@ -220,7 +220,7 @@ SfIndex( SpecFile *sf, long number, long order )
 {
      ObjectList		*ptr;
 
-     ptr = findScanByNo( &(sf->list), number, order );
+     ptr = sfFindScanByNo( sf, number, order );
      if ( ptr != (ObjectList *)NULL )
         return( ((SpecScan *)(ptr->contents))->index );
 
@@ -367,7 +367,7 @@ SfNumberOrder( SpecFile *sf, long index, long *number, long *order )
      /*
       * Find scan .
       */
-     list = findScanByIndex( &(sf->list), index );
+     list = sfFindScanByIndex( sf, index );
      if ( list == (ObjectList *)NULL ) return( -1 );
 
      *number = ((SpecScan *)list->contents)->scan_no;
@@ -398,7 +398,7 @@ SfNumber( SpecFile *sf, long index  )
      /*
       * Find scan .
       */
-     list = findScanByIndex( &(sf->list), index );
+     list = sfFindScanByIndex( sf, index );
      if ( list == (ObjectList *)NULL ) return( -1 );
 
      return( ((SpecScan *)list->contents)->scan_no );
@@ -427,7 +427,7 @@ SfOrder( SpecFile *sf, long index  )
      /*
       * Find scan .
       */
-     list = findScanByIndex( &(sf->list), index );
+     list = sfFindScanByIndex( sf, index );
      if ( list == (ObjectList *)NULL ) return( -1 );
 
      return( ((SpecScan *)list->contents)->order );
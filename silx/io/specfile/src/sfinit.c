@@ -105,11 +105,11 @@
 #include <fcntl.h>
 #include <ctype.h>
 
-#ifdef WIN32
 #include <stdio.h>
 #include <stdlib.h>
-#else
+#ifndef WIN32
 #include <unistd.h>
+#include <sys/mman.h>
 #endif
 
 #include <SpecFile.h>
@@ -123,7 +123,7 @@
 #define NEWLINE      1
 #define COMMENT      2
 
-#define SF_ISFX      ".sfI"
+#define SF_INDEX_SIGNATURE  "silx SfIndex 1"
 
 #define SF_INIT      0
 #define SF_READY     1
@@ -135,16 +135,25 @@
 
 DllExport SpecFile * SfOpen   ( char *name,int *error);
 DllExport SpecFile * SfOpen2  ( int fd, char *name,int *error);
+DllExport SpecFile * SfOpenIndexed ( char *name, char *indexname, int *error);
 DllExport int        SfClose  ( SpecFile *sf);
 DllExport short      SfUpdate ( SpecFile *sf, int *error);
 DllExport char     * SfError  ( int error);
 
 
-#ifdef linux
-char SF_SIGNATURE[] =  "Linux 2ruru Sf2.0";
-#else
-char SF_SIGNATURE[] =  "2ruru Sf2.0";
-#endif
+/*
+ * Header of the persistent index file.
+ * It is followed by the cursor and the array of scans.
+ */
+typedef struct _SfIndexHeader {
+     char      signature[16];
+     long      long_size;       /* sizeof(long) */
+     long      cursor_size;     /* sizeof(SfCursor) */
+     long      scan_size;       /* sizeof(SpecScan) */
+     long      file_size;       /* size of the indexed file */
+     long      m_time;          /* modification time of the indexed file */
+     long      no_scans;
+} SfIndexHeader;
 
 /*
  * Internal functions
@@ -156,13 +165,16 @@ static void  sfHeaderLine  ( SpecFile *sf, SfCursor *cursor, char c,int *error);
 static void  sfNewBlock    ( SpecFile *sf, SfCursor *cursor, short how,int *error);
 static void  sfSaveScan    ( SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfAssignScanNumbers (SpecFile *sf);
+static SpecFile *sfInit    ( int fd, char *name, SfCursor *cursor, int *error);
+static short sfScanBuffer  ( SpecFile *sf, SfCursor *cursor, short status, char *buffer, long bytesread, int *error);
+static long  sfParseScanNumber ( char *buffer, long size);
+static void  sfReadScanNumbers ( SpecFile *sf, char *buffer, long size);
+static int   sfCompareScans ( const void *scan1, const void *scan2);
 static void  sfReadFile    ( SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error);
-#ifdef SPECFILE_USE_INDEX_FILE
-static short sfOpenIndex   ( SpecFile *sf, SfCursor *cursor, int *error);
-static short sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error);
+static void  sfClearScans  ( SpecFile *sf, SfCursor *cursor);
+static short sfReadIndex   ( SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error);
-#endif
 
 /*
  * errors
@@ -227,6 +239,86 @@ SfOpen(char *name, int *error) {
 }
 
 
+/*********************************************************************
+ *   Function:          SpecFile *SfOpenIndexed( name, indexname, error)
+ *
+ *   Description:       Opens connection to Spec data file.
+ *                      Loads the index of scans from the index file if
+ *                      it matches the size and modification time of
+ *                      the file, else creates the index in memory and
+ *                      saves it in the index file.
+ *
+ *   Parameters:
+ *              Input :
+ *                      (1) Filename
+ *                      (2) Index filename
+ *              Output:
+ *                      (3) error number
+ *   Returns:
+ *                      SpecFile pointer.
+ *                      NULL if not successful.
+ *
+ *   Possible errors:
+ *                      SF_ERR_FILE_OPEN
+ *                      SF_ERR_MEMORY_ALLOC
+ *
+ *   Remark:            Failing to write the index file is not an error.
+ *
+ *********************************************************************/
+
+DllExport SpecFile *
+SfOpenIndexed(char *name, char *indexname, int *error) {
+
+   SpecFile   *sf;
+   int         fd;
+   short       idxret;
+   SfCursor    cursor;
+
+   fd   = open(name,SF_OPENFLAG);
+   sf   = sfInit(fd, name, &cursor, error);
+   if (sf == (SpecFile *)NULL) {
+      return(sf);
+   }
+
+   if (indexname != (char *)NULL) {
+      sf->indexname = (char *)strdup(indexname);
+   }
+
+  /*
+   * Check if index file
+   *   open it and continue from there
+   */
+   idxret = sfReadIndex(sf,&cursor,error);
+
+   switch(idxret) {
+      case SF_MODIFIED:
+          sfResumeRead(sf,&cursor,error);
+          sfReadFile(sf,&cursor,error);
+          break;
+
+      case SF_INIT:
+          sfReadFile(sf,&cursor,error);
+          break;
+
+      case SF_READY:
+          break;
+
+      default:
+          break;
+   }
+
+   sf->cursor = cursor;
+
+  /*
+   * Once is all done assign scan numbers and orders
+   */
+   sfAssignScanNumbers(sf);
+
+   if (idxret != SF_READY) sfWriteIndex(sf,&cursor,error);
+   return(sf);
+}
+
+
 
 /*********************************************************************
  *   Function:          SpecFile *SfOpen2( fd, name, error)
@@ -253,8 +345,36 @@ SfOpen(char *name, int *error) {
 DllExport SpecFile *
 SfOpen2(int fd, char *name,int *error) {
    SpecFile   *sf;
-   short       idxret;
    SfCursor      cursor;
+
+   sf = sfInit(fd, name, &cursor, error);
+   if (sf == (SpecFile *)NULL) {
+      return(sf);
+   }
+
+   sfReadFile(sf,&cursor,error);
+
+   sf->cursor = cursor;
+
+  /*
+   * Once is all done assign scan numbers and orders
+   */
+   sfAssignScanNumbers(sf);
+
+   return(sf);
+}
+
+
+/*********************************************************************
+ *   Function:          SpecFile *sfInit( fd, name, cursor, error)
+ *
+ *   Description:       Allocates and initializes SpecFile structure
+ *                      and cursor.
+ *
+ *********************************************************************/
+static SpecFile *
+sfInit(int fd, char *name, SfCursor *cursor, int *error) {
+   SpecFile   *sf;
    struct stat mystat;
 
    if ( fd == -1 ) {
@@ -276,7 +396,9 @@ SfOpen2(int fd, char *name,int *error) {
 
    sf->fd     = fd;
    sf->m_time = mystat.st_mtime;
+   sf->m_size = mystat.st_size;
    sf->sfname = (char *)strdup(name);
+   sf->indexname = (char *)NULL;
 
    sf->list.first      = (ObjectList *)NULL;
    sf->list.last       = (ObjectList *)NULL;
@@ -296,64 +418,28 @@ SfOpen2(int fd, char *name,int *error) {
    sf->data            = (double **)NULL;
    sf->data_info       = (long *)NULL;
    sf->updating        = 0;
+   sf->scans           = (ObjectList **)NULL;
+   sf->sorted_scans    = (SpecScan **)NULL;
+   sf->no_sorted_scans = 0;
 
   /*
    * Init cursor
    */
-   cursor.bytecnt      = 0;
-   cursor.cursor       = 0;
-   cursor.scanno       = 0;
-   cursor.hdafoffset   = -1;
-   cursor.dataoffset   = -1;
-   cursor.mcaspectra   = 0;
-   cursor.what         = 0;
-   cursor.data         = 0;
-   cursor.file_header  = 0;
-
-
-#ifdef SPECFILE_USE_INDEX_FILE
-  /*
-   * Check if index file
-   *   open it and continue from there
-   */
-   idxret = sfOpenIndex(sf,&cursor,error);
-#else
-   idxret = SF_INIT;
-#endif
-
-   switch(idxret) {
-      case SF_MODIFIED:
-          sfResumeRead(sf,&cursor,error);
-          sfReadFile(sf,&cursor,error);
-          break;
-
-      case SF_INIT:
-          sfReadFile(sf,&cursor,error);
-          break;
-
-      case SF_READY:
-          break;
-
-      default:
-          break;
-   }
-
-   sf->cursor = cursor;
-
-  /*
-   * Once is all done assign scan numbers and orders
-   */
-   sfAssignScanNumbers(sf);
+   cursor->bytecnt      = 0;
+   cursor->cursor       = 0;
+   cursor->scanno       = 0;
+   cursor->hdafoffset   = -1;
+   cursor->dataoffset   = -1;
+   cursor->mcaspectra   = 0;
+   cursor->what         = 0;
+   cursor->data         = 0;
+   cursor->file_header  = 0;
 
-#ifdef SPECFILE_USE_INDEX_FILE
-   if (idxret != SF_READY) sfWriteIndex(sf,&cursor,error);
-#endif
    return(sf);
 }
 
 
 
-
 /*********************************************************************
  *
  *   Function:		int SfClose( sf )
@@ -383,6 +469,12 @@ SfClose( SpecFile *sf )
      }
 
      free ((char *)sf->sfname);
+     if (sf->indexname != NULL)
+        free ((char *)sf->indexname);
+     if (sf->scans != NULL)
+        free (sf->scans);
+     if (sf->sorted_scans != NULL)
+        free (sf->sorted_scans);
      if (sf->scanbuffer != NULL)
         free ((char *)sf->scanbuffer);
 
@@ -425,29 +517,40 @@ DllExport short
 SfUpdate ( SpecFile *sf, int *error )
 {
     struct stat mystat;
-    long   mtime;
-   /*printf("In SfUpdate\n");
-   __asm("int3");*/
-    stat(sf->sfname,&mystat);
 
-    mtime = mystat.st_mtime;
-
-    if (sf->m_time != mtime)  {
-       sfResumeRead (sf,&(sf->cursor),error);
-       sfReadFile   (sf,&(sf->cursor),error);
+    if (stat(sf->sfname,&mystat) != 0) {
+       *error = SF_ERR_FILE_OPEN;
+       return(0);
+    }
 
-       sf->m_time = mtime;
-       sfAssignScanNumbers(sf);
-#ifdef SPECFILE_USE_INDEX_FILE
-       sfWriteIndex (sf,&(sf->cursor),error);
-#endif
-       return(1);
-    }else{
+    if (sf->m_time == mystat.st_mtime && sf->m_size == mystat.st_size) {
        return(0);
     }
+
+   /*
+    * The last scan may have grown: drop cached scan data
+    */
+    freeAllData(sf);
+    sf->current = (ObjectList *)NULL;
+
+    if (mystat.st_size < sf->m_size) {
+      /*
+       * File was truncated or rewritten: index it again
+       */
+       sfClearScans(sf,&(sf->cursor));
+    } else {
+       sfResumeRead(sf,&(sf->cursor),error);
+    }
+    sfReadFile   (sf,&(sf->cursor),error);
+
+    sf->m_time = mystat.st_mtime;
+    sf->m_size = mystat.st_size;
+    sfAssignScanNumbers(sf);
+    sfWriteIndex (sf,&(sf->cursor),error);
+    return(1);
 }
 
-
+
 /*********************************************************************
  *
  *   Function:		char *SfError( code )
@@ -469,19 +572,61 @@ SfError(int code ) {
 }
 
 
+/*****************************************************************************
+ *
+ *    Function:   static void sfReadFile()
+ *
+ *    Description:  indexes the file from the current file position.
+ *                  The file is memory mapped when possible,
+ *                  else it is read by chunks.
+ *
+ *****************************************************************************/
 static void
 sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
 
    int         fd;
 
-   char  *buffer,*ptr;
+   char  *buffer;
 
-   long  size,bytesread;
+   long  size,bytesread,start;
 
    short  status;
 
+#ifndef WIN32
+   struct stat mystat;
+#endif
+
    fd   = sf->fd;
 
+   status              = NEWLINE;
+
+#ifndef WIN32
+   start = lseek(fd,0,SEEK_CUR);
+   if (start >= 0 && fstat(fd,&mystat) == 0 && mystat.st_size - start >= 2) {
+      size   = mystat.st_size;
+      buffer = (char *) mmap(NULL, size, PROT_READ, MAP_PRIVATE, fd, 0);
+      if (buffer != (char *) MAP_FAILED) {
+#ifdef MADV_SEQUENTIAL
+         madvise(buffer, size, MADV_SEQUENTIAL);
+#endif
+         sfScanBuffer(sf,cursor,status,buffer + start,size - start,error);
+
+         sf->no_scans = cursor->scanno;
+         if (sf->no_scans > 0 && cursor->what == SCAN) {
+            /*
+             * Save last
+             */
+             sfSaveScan(sf,cursor,error);
+         }
+         sfReadScanNumbers(sf,buffer,size);
+
+         munmap(buffer, size);
+         lseek(fd,size,SEEK_SET);
+         return;
+      }
+   }
+#endif
+
    size = 1024*1024;
 
 
@@ -502,26 +647,14 @@ sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
          }
    }
 
-   status              = NEWLINE;
    while ((bytesread = read(fd,buffer,size)) > 0 ) {
-
-      sfStartBuffer(sf,cursor,status,buffer[0],buffer[1],error);
-
-      cursor->bytecnt++;
-      for (ptr=buffer+1;ptr < buffer + bytesread -1; ptr++,cursor->bytecnt++) {
-          if (*(ptr-1) == '\n' ) {
-             sfNewLine(sf,cursor,*ptr,*(ptr+1),error);
-          }
-      }
-
-      cursor->bytecnt++;
-      status = statusEnd(buffer[bytesread-2],buffer[bytesread-1]);
+      status = sfScanBuffer(sf,cursor,status,buffer,bytesread,error);
   }
 
   free(buffer);
 
   sf->no_scans = cursor->scanno;
-  if (sf->no_scans > 0) {
+  if (sf->no_scans > 0 && cursor->what == SCAN) {
      /*
       * Save last
       */
@@ -531,120 +664,248 @@ sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
 
 }
 
-
+
+/*****************************************************************************
+ *
+ *    Function:   static short sfScanBuffer()
+ *
+ *    Description:  analyzes the start of each line of a file buffer
+ *                  and returns the status of its end (see statusEnd)
+ *
+ *****************************************************************************/
+static short
+sfScanBuffer(SpecFile *sf,SfCursor *cursor,short status,char *buffer,long bytesread,int *error) {
+
+   char  *ptr,*end;
+   long   start;
+
+   start = cursor->bytecnt;
+
+   if (bytesread < 2) {
+      if (bytesread == 1) {
+         sfStartBuffer(sf,cursor,status,buffer[0],'\0',error);
+      }
+      cursor->bytecnt = start + bytesread;
+      return((bytesread == 1 && buffer[0] == '\n') ? NEWLINE : ANY);
+   }
+
+   sfStartBuffer(sf,cursor,status,buffer[0],buffer[1],error);
+
+  /*
+   * Jump from one new line to the next one.
+   * The last two characters are handled by the status of the buffer end.
+   */
+   end = buffer + bytesread - 2;
+   for (ptr=buffer; ptr < end; ptr++) {
+      ptr = (char *) memchr(ptr,'\n',end - ptr);
+      if (ptr == (char *)NULL) {
+         break;
+      }
+      cursor->bytecnt = start + (ptr + 1 - buffer);
+      sfNewLine(sf,cursor,*(ptr+1),*(ptr+2),error);
+   }
+
+   cursor->bytecnt = start + bytesread;
+   return(statusEnd(buffer[bytesread-2],buffer[bytesread-1]));
+}
+
+
+/*****************************************************************************
+ *
+ *    Function:   static void sfResumeRead()
+ *
+ *    Description:  rewinds the cursor to the start of the last block so
+ *                  that reading the file again updates the last scan
+ *                  and appends the new ones.
+ *
+ *****************************************************************************/
 static void
 sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error) {
+    if (cursor->what == SCAN) {
+        cursor->scanno--;
+        sf->updating = 1;
+    }
     cursor->bytecnt      = cursor->cursor;
     cursor->what         = 0;
     cursor->hdafoffset   = -1;
     cursor->dataoffset   = -1;
     cursor->mcaspectra   = 0;
     cursor->data         = 0;
-    cursor->scanno--;
-    sf->updating = 1;
     lseek(sf->fd,cursor->bytecnt,SEEK_SET);
     return;
 }
 
-
-#ifdef SPECFILE_USE_INDEX_FILE
-static short
-sfOpenIndex ( SpecFile *sf, SfCursor *cursor, int *error) {
-    char *idxname;
-    short namelength;
-    int   sfi;
-
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
-
-    idxname = (char *)malloc(sizeof(char) * namelength);
 
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
-
-    if ((sfi = open(idxname,SF_OPENFLAG)) == -1) {
-        free(idxname);
-        return(SF_INIT);
-    } else {
-        free(idxname);
-        return(sfReadIndex(sfi,sf,cursor,error));
+/*****************************************************************************
+ *
+ *    Function:   static void sfClearScans()
+ *
+ *    Description:  removes all scans from the index list and resets
+ *                  the cursor to the start of the file.
+ *
+ *****************************************************************************/
+static void
+sfClearScans  ( SpecFile *sf, SfCursor *cursor) {
+    register ObjectList  *ptr;
+    register ObjectList  *prevptr;
+
+    for( ptr=sf->list.last ; ptr ; ptr=prevptr ) {
+        free( (SpecScan *)ptr->contents );
+        prevptr = ptr->prev;
+        free( (ObjectList *)ptr );
+    }
+    sf->list.first = (ObjectList *)NULL;
+    sf->list.last  = (ObjectList *)NULL;
+    sf->no_scans   = 0;
+    sf->updating   = 0;
+
+    if (sf->filebuffer != (char *)NULL) {
+        free(sf->filebuffer);
+        sf->filebuffer = (char *)NULL;
     }
+    sf->filebuffersize = 0;
+
+    cursor->bytecnt      = 0;
+    cursor->cursor       = 0;
+    cursor->scanno       = 0;
+    cursor->hdafoffset   = -1;
+    cursor->dataoffset   = -1;
+    cursor->mcaspectra   = 0;
+    cursor->what         = 0;
+    cursor->data         = 0;
+    cursor->file_header  = 0;
+    lseek(sf->fd,0,SEEK_SET);
 }
 
 
+/*****************************************************************************
+ *
+ *    Function:   static short sfReadIndex()
+ *
+ *    Description:  reads the scans and cursor from the index file if
+ *                  it exists and matches the size and modification time
+ *                  of the file.
+ *
+ *    Returns:      SF_READY if the index was read, else SF_INIT
+ *
+ *****************************************************************************/
 static short
-sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error) {
-    SfCursor   filecurs;
-    char       buffer[200];
-    long       bytesread,i=0;
-    SpecScan   scan;
-    short      modif = 0;
-    long       mtime;
+sfReadIndex   ( SpecFile *sf, SfCursor *cursor, int *error) {
+    FILE          *sfi;
+    SfIndexHeader  header;
+    SfCursor       filecurs;
+    SpecScan      *scans;
+    long           i;
+
+    if (sf->indexname == (char *)NULL) {
+        return(SF_INIT);
+    }
 
-   /*
-    * read signature
-    */
-    bytesread = read(sfi,buffer,sizeof(SF_SIGNATURE));
-    if (strcmp(buffer,SF_SIGNATURE) || bytesread == 0 ) {
+    if ((sfi = fopen(sf->indexname,"rb")) == (FILE *)NULL) {
         return(SF_INIT);
     }
 
    /*
-    * read cursor and specfile structure
+    * read and check header
     */
-    if ( read(sfi,&mtime,   sizeof(long)) == 0)   return(SF_INIT);
-    if ( read(sfi,&filecurs, sizeof(SfCursor)) == 0) return(SF_INIT);
+    if ( fread(&header, sizeof(SfIndexHeader), 1, sfi) != 1 ||
+            strncmp(header.signature, SF_INDEX_SIGNATURE, sizeof(header.signature)) ||
+            header.long_size   != sizeof(long) ||
+            header.cursor_size != sizeof(SfCursor) ||
+            header.scan_size   != sizeof(SpecScan) ||
+            header.file_size   != sf->m_size ||
+            header.m_time      != sf->m_time ||
+            header.no_scans    <  0 ||
+            fread(&filecurs, sizeof(SfCursor), 1, sfi) != 1) {
+        fclose(sfi);
+        return(SF_INIT);
+    }
 
-    if (sf->m_time != mtime)  modif = 1;
+    scans = (SpecScan *) malloc(sizeof(SpecScan) * (header.no_scans + 1));
+    if (scans == (SpecScan *)NULL) {
+        fclose(sfi);
+        return(SF_INIT);
+    }
+    if ( fread(scans, sizeof(SpecScan), header.no_scans, sfi) != (size_t) header.no_scans) {
+        free(scans);
+        fclose(sfi);
+        return(SF_INIT);
+    }
+    fclose(sfi);
 
-    while(read(sfi,&scan, sizeof(SpecScan))) {
-        addToList(&(sf->list), (void *)&scan, (long)sizeof(SpecScan));
-        i++;
+    for (i=0; i<header.no_scans; i++) {
+        addToList(&(sf->list), (void *)&(scans[i]), (long)sizeof(SpecScan));
     }
-    sf->no_scans = i;
+    free(scans);
+    sf->no_scans = header.no_scans;
 
     memcpy(cursor,&filecurs,sizeof(SfCursor));
 
-    if (modif) return(SF_MODIFIED);
-
     return(SF_READY);
 }
 
-
+
+/*****************************************************************************
+ *
+ *    Function:   static void sfWriteIndex()
+ *
+ *    Description:  saves the scans and cursor in the index file if any.
+ *                  The index is written in a temporary file which
+ *                  then replaces the index file.
+ *                  Failing to write the index is silently ignored.
+ *
+ *****************************************************************************/
 static void
 sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error) {
 
-    int         fdi;
-    char       *idxname;
-    short       namelength;
-    ObjectList *obj;
-    long        mtime;
-
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
-
-    idxname = (char *)malloc(sizeof(char) * namelength);
+    FILE          *fdi;
+    char          *tmpname;
+    ObjectList    *obj;
+    SfIndexHeader  header;
+    int            ok;
 
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
+    if (sf->indexname == (char *)NULL) {
+        return;
+    }
 
-    /* if ((fdi = open(idxname,SF_WRITEFLAG,SF_UMASK)) == -1) { */
-    if ((fdi = open(idxname,O_CREAT | O_WRONLY,SF_UMASK)) == -1) {
-        printf("    - cannot open. Error: (%d)\n",errno);
-        free(idxname);
+    tmpname = (char *)malloc(sizeof(char) * (strlen(sf->indexname) + 5));
+    if (tmpname == (char *)NULL) {
         return;
-    } else {
-        mtime = sf->m_time;
-        write(fdi,SF_SIGNATURE,sizeof(SF_SIGNATURE));
- /*
-  * Swap bytes for linux
-  */
-        write(fdi, (void *) &mtime, sizeof(long));
-        write(fdi, (void *) cursor, sizeof(SfCursor));
-        for( obj = sf->list.first; obj ; obj = obj->next)
-           write(fdi,(void *) obj->contents, sizeof(SpecScan));
-        close(fdi);
-        free(idxname);
+    }
+    sprintf(tmpname,"%s.tmp",sf->indexname);
+
+    if ((fdi = fopen(tmpname,"wb")) == (FILE *)NULL) {
+        free(tmpname);
         return;
     }
-}
+
+    memset(&header, 0, sizeof(SfIndexHeader));
+    strncpy(header.signature, SF_INDEX_SIGNATURE, sizeof(header.signature));
+    header.long_size   = sizeof(long);
+    header.cursor_size = sizeof(SfCursor);
+    header.scan_size   = sizeof(SpecScan);
+    header.file_size   = sf->m_size;
+    header.m_time      = sf->m_time;
+    header.no_scans    = sf->no_scans;
+
+    ok = (fwrite(&header, sizeof(SfIndexHeader), 1, fdi) == 1 &&
+          fwrite(cursor, sizeof(SfCursor), 1, fdi) == 1);
+    for( obj = sf->list.first; obj && ok; obj = obj->next) {
+        ok = (fwrite(obj->contents, sizeof(SpecScan), 1, fdi) == 1);
+    }
+    ok = (fclose(fdi) == 0) && ok;
+
+    if (ok) {
+#ifdef WIN32
+        remove(sf->indexname);
 #endif
+        ok = (rename(tmpname, sf->indexname) == 0);
+    }
+    if (!ok) {
+        remove(tmpname);
+    }
+    free(tmpname);
+}
 
 
 /*****************************************************************************
@@ -769,6 +1030,8 @@ sfSaveScan(SpecFile *sf, SfCursor *cursor,int *error) {
     scan.hdafter_offset        = cursor->hdafoffset;
     scan.mcaspectra            = cursor->mcaspectra;
     scan.file_header           = cursor->file_header;
+    scan.scan_no               = -1;  /* Set by sfAssignScanNumbers */
+    scan.order                 = 1;
 
     if(sf->updating == 1){
         ptr = sf->list.last;
@@ -781,6 +1044,7 @@ sfSaveScan(SpecFile *sf, SfCursor *cursor,int *error) {
         oldscan->hdafter_offset=scan.hdafter_offset;
         oldscan->mcaspectra=scan.mcaspectra;
         oldscan->file_header=scan.file_header;
+        oldscan->scan_no=scan.scan_no;
         sf->updating=0;
     }else{
         addToList( &(sf->list), (void *)&scan, (long) sizeof(SpecScan));
@@ -788,36 +1052,157 @@ sfSaveScan(SpecFile *sf, SfCursor *cursor,int *error) {
 }
 
 
+/*****************************************************************************
+ *
+ *    Function:   static long sfParseScanNumber()
+ *
+ *    Description:  returns the scan number of a buffer starting
+ *                  with a #S line
+ *
+ *****************************************************************************/
+static long
+sfParseScanNumber(char *buffer, long size) {
+
+  int  i;
+  char *ptr;
+  char buffer2[50];
+
+  for ( ptr = buffer+3,i=0; ptr < buffer + size && *ptr != ' ' && i < 49;
+        ptr++,i++) buffer2[i] = *ptr;
+
+  buffer2[i] = '\0';
+
+  return(atol(buffer2));
+}
+
+
+/*****************************************************************************
+ *
+ *    Function:   static void sfReadScanNumbers()
+ *
+ *    Description:  sets the scan number of scans not having one from
+ *                  a buffer of the whole file
+ *
+ *****************************************************************************/
+static void
+sfReadScanNumbers(SpecFile *sf, char *buffer, long size) {
+
+  ObjectList *object;
+  SpecScan   *scan;
+
+  for ( object = (sf->list).last; object; object=object->prev) {
+        scan = (SpecScan *) object->contents;
+        if (scan->scan_no != -1) {
+            /* Only the last scans are new */
+            break;
+        }
+        if (scan->offset >= 0 && scan->offset < size) {
+            scan->scan_no = sfParseScanNumber(buffer + scan->offset,
+                                              size - scan->offset);
+        }
+  }
+}
+
+
+/*****************************************************************************
+ *
+ *    Function:   static int sfCompareScans()
+ *
+ *    Description:  qsort comparison of SpecScan pointers by scan number
+ *                  and index
+ *
+ *****************************************************************************/
+static int
+sfCompareScans(const void *scan1, const void *scan2) {
+
+  SpecScan *s1 = *(SpecScan **) scan1;
+  SpecScan *s2 = *(SpecScan **) scan2;
+
+  if (s1->scan_no != s2->scan_no) {
+      return((s1->scan_no < s2->scan_no) ? -1 : 1);
+  }
+  if (s1->index != s2->index) {
+      return((s1->index < s2->index) ? -1 : 1);
+  }
+  return(0);
+}
+
+
+/*****************************************************************************
+ *
+ *    Function:   static void sfAssignScanNumbers()
+ *
+ *    Description:  sets scan numbers not yet known, computes scan orders
+ *                  and builds the tables of scans by index and
+ *                  by number and order
+ *
+ *****************************************************************************/
 static void
 sfAssignScanNumbers(SpecFile *sf) {
 
-  int i;
-  char *ptr;
+  long i, no_scans, nbytes;
   char buffer[50];
-  char buffer2[50];
 
   register   ObjectList *object,
                         *object2;
   SpecScan              *scan,
                         *scan2;
 
+  no_scans = 0;
   for ( object = (sf->list).first; object; object=object->next) {
         scan = (SpecScan *) object->contents;
 
-        lseek(sf->fd,scan->offset,SEEK_SET);
-        read(sf->fd,buffer,sizeof(buffer));
-        buffer[49] = '\0';
-
-        for ( ptr = buffer+3,i=0; *ptr != ' ';ptr++,i++) buffer2[i] = *ptr;
-
-        buffer2[i] = '\0';
+        if (scan->scan_no == -1) {
+            lseek(sf->fd,scan->offset,SEEK_SET);
+            nbytes = read(sf->fd,buffer,sizeof(buffer) - 1);
+            scan->scan_no = sfParseScanNumber(buffer, (nbytes > 0) ? nbytes : 0);
+        }
+        no_scans++;
+  }
 
-        scan->scan_no = atol(buffer2);
+  if (sf->scans != (ObjectList **)NULL) free(sf->scans);
+  if (sf->sorted_scans != (SpecScan **)NULL) free(sf->sorted_scans);
+  sf->scans = (ObjectList **) malloc(sizeof(ObjectList *) * (no_scans + 1));
+  sf->sorted_scans = (SpecScan **) malloc(sizeof(SpecScan *) * (no_scans + 1));
+  sf->no_sorted_scans = no_scans;
+
+  if (sf->scans == (ObjectList **)NULL || sf->sorted_scans == (SpecScan **)NULL) {
+    /*
+     * Not enough memory for tables: lookups will walk the list
+     */
+     if (sf->scans != (ObjectList **)NULL) free(sf->scans);
+     if (sf->sorted_scans != (SpecScan **)NULL) free(sf->sorted_scans);
+     sf->scans = (ObjectList **)NULL;
+     sf->sorted_scans = (SpecScan **)NULL;
+     sf->no_sorted_scans = 0;
+
+     for ( object = (sf->list).first; object; object=object->next) {
+        scan = (SpecScan *) object->contents;
         scan->order   = 1;
         for ( object2 = (sf->list).first; object2 != object; object2=object2->next) {
             scan2 = (SpecScan *) object2->contents;
             if (scan2->scan_no == scan->scan_no) scan->order++;
         }
+     }
+     return;
+  }
+
+  for ( i=0, object = (sf->list).first; object; object=object->next, i++) {
+        sf->scans[i] = object;
+        sf->sorted_scans[i] = (SpecScan *) object->contents;
+  }
+
+ /*
+  * Order is the rank of the scan among scans with the same number
+  */
+  qsort(sf->sorted_scans, no_scans, sizeof(SpecScan *), sfCompareScans);
+  for ( i=0; i<no_scans; i++) {
+        scan = sf->sorted_scans[i];
+        if (i > 0 && sf->sorted_scans[i-1]->scan_no == scan->scan_no) {
+            scan->order = sf->sorted_scans[i-1]->order + 1;
+        } else {
+            scan->order = 1;
+        }
   }
 }
 
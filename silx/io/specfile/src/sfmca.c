@@ -65,6 +65,7 @@
 
 #include <ctype.h>
 #include <stdlib.h>
+#include <string.h>
 /*
  * Define macro
  */
@@ -84,6 +85,12 @@ DllExport int  SfGetMca   ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport long SfGetMcaBlock ( SpecFile *sf, long index, long first,
+                               long step, long count, long first_channel,
+                               long no_channels, double *retdata,
+                               int *error );
+
+static    double sfMcaValue  ( char *strval, int length );
 
 
 /*********************************************************************
@@ -339,3 +346,143 @@ SfMcaCalib ( SpecFile *sf, long index, double **calib, int *error )
      *calib = retdata;
      return(0);
 }
+
+
+/*********************************************************************
+ *   Function:        long SfGetMcaBlock(sf, index, first, step, count,
+ *                                   first_channel, no_channels,
+ *                                   data, error)
+ *
+ *   Description:    Gets a range of channels of several mca spectra,
+ *                   reading the scan only once.
+ *
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *            (3) Index (starting at 0) of the first spectrum
+ *            (4) Step between the indices of the spectra (>= 1)
+ *            (5) Number of spectra
+ *            (6) Index (starting at 0) of the first channel
+ *            (7) Number of channels
+ *        Output:
+ *            (8) Data array of count * no_channels values
+ *                provided by the caller, stored spectrum by spectrum.
+ *                Values missing in the file are left unchanged.
+ *            (9) error number
+ *   Returns:
+ *            Number of spectra read ,
+ *            ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_SCAN_NOT_FOUND
+ *            SF_ERR_MCA_NOT_FOUND
+ *********************************************************************/
+DllExport long
+SfGetMcaBlock( SpecFile *sf, long index, long first, long step, long count,
+               long first_channel, long no_channels, double *retdata,
+               int *error )
+{
+     long     headersize;
+     char    *ptr,
+             *from,
+             *to;
+     char     strval[100];
+     int      i;
+     long     spect_no, next, nread, vals;
+     double  *row;
+
+     if (first < 0 || step < 1 || count < 0 ||
+                first_channel < 0 || no_channels < 0) {
+        *error = SF_ERR_MCA_NOT_FOUND;
+         return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     headersize = ((SpecScan *)sf->current->contents)->data_offset
+                - ((SpecScan *)sf->current->contents)->offset;
+
+     from = sf->scanbuffer + headersize;
+     to   = sf->scanbuffer + ((SpecScan *)sf->current->contents)->size;
+
+     spect_no = -1;
+     next     = first;
+     nread    = 0;
+
+    /*
+     * Go from one line to the next one and parse
+     * the requested spectra (lines starting with @)
+     */
+     for ( ptr = from; ptr < to && nread < count; ptr++ ) {
+         if ( *ptr == '@' && ++spect_no == next ) {
+             row  = retdata + nread * no_channels;
+             vals = 0;
+             i    = 0;
+             /*
+              * skip @ and the following character (e.g. @A)
+              */
+             for ( ptr += 2; ptr < to; ptr++ ) {
+                 if ( *ptr == '\n' && *(ptr-1) != MCA_CONT ) {
+                     break;
+                 }
+                 if (*ptr == ' ' || *ptr == '\t' || *ptr == MCA_CONT || *ptr == '\n') {
+                     if ( i ) {
+                         if (vals >= first_channel) {
+                             row[vals - first_channel] = sfMcaValue(strval,i);
+                         }
+                         vals++;
+                         i = 0;
+                         if (vals >= first_channel + no_channels) break;
+                     }
+                 } else if (isnumber(*ptr) && i < (int) sizeof(strval) - 1) {
+                     strval[i] = *ptr;
+                     i++;
+                 }
+             }
+             if ( i && vals >= first_channel && vals < first_channel + no_channels ) {
+                 row[vals - first_channel] = sfMcaValue(strval,i);
+             }
+             nread++;
+             next += step;
+             if (ptr >= to) break;
+         }
+         ptr = (char *) memchr(ptr,'\n',to - ptr);
+         if (ptr == (char *)NULL) break;
+     }
+
+     return( nread );
+}
+
+
+/*********************************************************************
+ *   Function:        double sfMcaValue(strval, length)
+ *
+ *   Description:    Converts a mca value. Integers, the most common
+ *                   case, are converted without the locale handling
+ *                   of PyMcaAtof.
+ *
+ *********************************************************************/
+static double
+sfMcaValue( char *strval, int length )
+{
+     double  val  = 0;
+     int     i    = 0,
+             sign = 1;
+
+     if (strval[0] == '-' || strval[0] == '+') {
+         sign = (strval[0] == '-') ? -1 : 1;
+         i++;
+     }
+     if (i == length || length - i > 15) {
+         strval[length] = '\0';
+         return( PyMcaAtof(strval) );
+     }
+     for ( ; i < length; i++) {
+         if (!isdigit(strval[i])) {
+             strval[length] = '\0';
+             return( PyMcaAtof(strval) );
+         }
+         val = val * 10 + (strval[i] - '0');
+     }
+     return( sign * val );
+}
@@ -87,6 +87,8 @@ int         findFirst       ( void *scan,   void *file_offset );
 ObjectList *findScanByIndex ( ListHeader *list, long index );
 ObjectList *findFirstInFile ( ListHeader *list, long file_offset );
 ObjectList *findScanByNo    ( ListHeader *list, long scan_no, long order );
+ObjectList *sfFindScanByIndex ( SpecFile *sf, long index );
+ObjectList *sfFindScanByNo    ( SpecFile *sf, long scan_no, long order );
 
 long        mulstrtod       ( char *str,        double **arr, int *error );
 void        freeAllData     ( SpecFile *sf );
@@ -129,7 +131,7 @@ sfSetCurrent( SpecFile *sf, long index,int *error )
     /*
      * Find scan
      */
-     list = findScanByIndex(&(sf->list),index);
+     list = sfFindScanByIndex(sf,index);
 
      if (list == (ObjectList *)NULL) {
          *error = SF_ERR_SCAN_NOT_FOUND;
@@ -424,6 +426,80 @@ findScanByNo( ListHeader *list, long scan_no, long order )
 
 
 
+/*********************************************************************
+ *   Function:		ObjectList *sfFindScanByIndex( sf, index )
+ *
+ *   Description:	Looks for a scan in the scans table of the file.
+ *			Falls back to a list search if there is no table.
+ *
+ *   Parameters:
+ *		Input:	(1) SpecFile pointer
+ *			(2) scan index
+ *   Returns:
+ *			ObjectList pointer if found ,
+ *			NULL if not.
+ *
+ *********************************************************************/
+ObjectList *
+sfFindScanByIndex( SpecFile *sf, long index )
+{
+     ObjectList *ptr;
+
+     if (sf->scans != (ObjectList **)NULL &&
+             index >= 1 && index <= sf->no_sorted_scans) {
+          ptr = sf->scans[index - 1];
+          if (((SpecScan *)ptr->contents)->index == index)
+               return( ptr );
+     }
+     return( findScanByIndex( &(sf->list), index ) );
+}
+
+
+/*********************************************************************
+ *   Function:		ObjectList *sfFindScanByNo( sf, scan_no, order )
+ *
+ *   Description:	Looks for a scan by binary search in the scans
+ *			sorted by number and order.
+ *			Falls back to a list search if there is no table.
+ *
+ *   Parameters:
+ *		Input:	(1) SpecFile pointer
+ *			(2) scan number
+ *			(3) scan order
+ *   Returns:
+ *			ObjectList pointer if found ,
+ *			NULL if not.
+ *
+ *********************************************************************/
+ObjectList *
+sfFindScanByNo( SpecFile *sf, long scan_no, long order )
+{
+     long      low, high, middle;
+     SpecScan *scan;
+
+     if (sf->sorted_scans == (SpecScan **)NULL) {
+          return( findScanByNo( &(sf->list), scan_no, order ) );
+     }
+
+     low  = 0;
+     high = sf->no_sorted_scans - 1;
+     while (low <= high) {
+          middle = low + (high - low) / 2;
+          scan   = sf->sorted_scans[middle];
+          if (scan->scan_no < scan_no ||
+                  (scan->scan_no == scan_no && scan->order < order)) {
+               low = middle + 1;
+          } else if (scan->scan_no > scan_no ||
+                  (scan->scan_no == scan_no && scan->order > order)) {
+               high = middle - 1;
+          } else {
+               return( sfFindScanByIndex( sf, scan->index ) );
+          }
+     }
+     return( (ObjectList *)NULL );
+}
+
+
 /*********************************************************************
  *   Function:		ObjectList *findFirstInFile( list, file_offset )
  *
@@ -24,7 +24,7 @@
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "17/03/2016"
+__date__ = "17/10/2026"
 
 cimport cython
 
@@ -37,7 +37,9 @@ ctypedef _SpecFile SpecFileHandle
 cdef extern from "SpecFileCython.h":
     # sfinit
     SpecFileHandle* SfOpen(char*, int*)
+    SpecFileHandle* SfOpenIndexed(char*, char*, int*)
     int SfClose(SpecFileHandle*)
+    short SfUpdate(SpecFileHandle*, int*)
     char* SfError(int)
     
     # sfindex
@@ -49,6 +51,7 @@ cdef extern from "SpecFileCython.h":
     
     # sfdata
     int SfData(SpecFileHandle*, long, double***, long**, int*)
+    int SfDataBuffer(SpecFileHandle*, long, long*, long, int, void**, long*, int*)
     long SfDataLine(SpecFileHandle*, long, long, double**, int*)
     long SfDataColByName(SpecFileHandle*, long, char*, double**, int*)
     
@@ -74,4 +77,5 @@ cdef extern from "SpecFileCython.h":
     long SfNoMca(SpecFileHandle*, long, int*)
     int  SfGetMca(SpecFileHandle*, long, long , double**, int*)
     long SfMcaCalib(SpecFileHandle*, long, double**, int*)
+    long SfGetMcaBlock(SpecFileHandle*, long, long, long, long, long, long, double*, int*)
 
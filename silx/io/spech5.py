@@ -199,7 +199,7 @@ from . import commonh5
 
 __authors__ = ["P. Knobel", "D. Naudet"]
 __license__ = "MIT"
-__date__ = "17/07/2018"
+__date__ = "17/10/2026"
 
 logger1 = logging.getLogger(__name__)
 
@@ -217,6 +217,25 @@ def to_h5py_utf8(str_list):
     return numpy.array(str_list, dtype=text_dtype)
 
 
+def _get_data_column_by_name(scan, label):
+    """Returns a data column of a scan, sharing the parsing of scan data.
+
+    Unlike :meth:`Scan.data_column_by_name`, this does not parse the whole
+    scan data for each column: the column is taken from :attr:`Scan.data`.
+
+    :param scan: specfile.Scan object
+    :param str label: Label of data column to retrieve
+    :rtype: numpy.ndarray
+    """
+    # Scan.data is transposed
+    data = scan.data
+    column = scan.labels.index(label)
+    if column < data.shape[0]:
+        return data[column]
+    # Let specfile handle errors and aborted scans
+    return scan.data_column_by_name(label)
+
+
 def _get_number_of_mca_analysers(scan):
     """
     :param SpecFile sf: :class:`SpecFile` instance
@@ -440,12 +459,12 @@ def _demultiplex_mca(scan, analyser_index):
     number_of_spectra_per_analyser = number_of_spectra // number_of_analysers
     len_spectrum = len(scan.mca[analyser_index])
 
-    mca_array = numpy.empty((number_of_spectra_per_analyser, len_spectrum))
-
-    for i in range(number_of_spectra_per_analyser):
-        mca_array[i, :] = scan.mca[analyser_index + i * number_of_analysers]
-
-    return mca_array
+    mca_indices = slice(analyser_index,
+                        number_of_spectra_per_analyser * number_of_analysers,
+                        number_of_analysers)
+    return scan._specfile.get_mca_array(scan.index,
+                                        mca_indices=mca_indices,
+                                        channels=slice(0, len_spectrum))
 
 
 # Node classes
@@ -574,6 +593,36 @@ class SpecH5(commonh5.File, SpecH5Group):
             scan_group = ScanGroup(scan_key, parent=self, scan=scan)
             self.add_node(scan_group)
 
+    def update(self):
+        """Update the content with the scans and data lines appended to the
+        SPEC file since it was opened or last updated.
+
+        The group of the last scan is updated in place and groups of the
+        new scans are added. Datasets of scan data columns and MCA data
+        retrieved before the update give access to the new data lines.
+
+        :return: True if the file has changed, False otherwise
+        :rtype: bool
+        """
+        if not self._sf.update():
+            return False
+
+        items = self._get_items()
+        old_keys = list(items.keys())
+        scan_keys = self._sf.keys()
+        if old_keys != scan_keys[:len(old_keys)]:
+            # The file was rewritten
+            items.clear()
+            old_keys = []
+
+        for scan_key in scan_keys[max(len(old_keys) - 1, 0):]:
+            scan = self._sf[scan_key]
+            if scan_key in items:
+                items[scan_key]._update(scan)
+            else:
+                self.add_node(ScanGroup(scan_key, parent=self, scan=scan))
+        return True
+
     def close(self):
         self._sf.close()
         self._sf = None
@@ -589,6 +638,29 @@ class ScanGroup(commonh5.Group, SpecH5Group):
         """
         commonh5.Group.__init__(self, scan_key, parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXentry")})
+        self._create_nodes(scan)
+
+    def _update(self, scan):
+        """Update the content of the group with the one of an updated scan.
+
+        Existing datasets of scan data are updated in place,
+        nodes are only created for new data.
+
+        :param scan: specfile.Scan object
+        """
+        items = self._get_items()
+        items["instrument"]._update(scan)
+        items["measurement"]._update(scan)
+        if "sample" not in items and (
+                _unit_cell_in_scan(scan) or _ub_matrix_in_scan(scan)):
+            self.add_node(SampleGroup(parent=self, scan=scan))
+
+    def _create_nodes(self, scan):
+        """Create the children of the group.
+
+        :param scan: specfile.Scan object
+        """
+        scan_key = self.basename
 
         # take title in #S after stripping away scan number and spaces
         s_hdr_line = scan.scan_header_dict["S"]
@@ -649,6 +721,25 @@ class InstrumentGroup(commonh5.Group, SpecH5Group):
                                              analyser_index=anal_idx,
                                              scan=scan))
 
+    def _update(self, scan):
+        """Update the content of the group with the one of an updated scan.
+
+        :param scan: specfile.Scan object
+        """
+        items = self._get_items()
+        items["specfile"]._update(scan)
+        items["positioners"]._update(scan)
+
+        num_analysers = _get_number_of_mca_analysers(scan)
+        for anal_idx in range(num_analysers):
+            name = "mca_%d" % anal_idx
+            if name in items:
+                items[name]._update(scan)
+            else:
+                self.add_node(InstrumentMcaGroup(parent=self,
+                                                 analyser_index=anal_idx,
+                                                 scan=scan))
+
 
 class InstrumentSpecfileGroup(commonh5.Group, SpecH5Group):
     def __init__(self, parent, scan):
@@ -659,6 +750,13 @@ class InstrumentSpecfileGroup(commonh5.Group, SpecH5Group):
                 data=to_h5py_utf8(scan.file_header),
                 parent=self,
                 attrs={}))
+        self._update(scan)
+
+    def _update(self, scan):
+        """Update the scan header, which can get lines at the end of a scan.
+
+        :param scan: specfile.Scan object
+        """
         self.add_node(SpecH5NodeDataset(
                 name="scan_header",
                 data=to_h5py_utf8(scan.scan_header),
@@ -670,18 +768,33 @@ class PositionersGroup(commonh5.Group, SpecH5Group):
     def __init__(self, parent, scan):
         commonh5.Group.__init__(self, name="positioners", parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXcollection")})
+        self._update(scan)
+
+    def _update(self, scan):
+        """Add positioners or update the ones read from data columns.
+
+        :param scan: specfile.Scan object
+        """
+        items = self._get_items()
         for motor_name in scan.motor_names:
             safe_motor_name = motor_name.replace("/", "%")
+            node = items.get(safe_motor_name)
             if motor_name in scan.labels and scan.data.shape[0] > 0:
                 # return a data column if one has the same label as the motor
-                motor_value = scan.data_column_by_name(motor_name)
-            else:
+                if isinstance(node, ScanColumnDataset):
+                    node._update(scan)
+                else:
+                    self.add_node(ScanColumnDataset(name=safe_motor_name,
+                                                    label=motor_name,
+                                                    scan=scan,
+                                                    parent=self))
+            elif node is None:
                 # Take value from #P scan header.
                 # (may return float("inf") if #P line is missing from scan hdr)
                 motor_value = scan.motor_position_by_name(motor_name)
-            self.add_node(SpecH5NodeDataset(name=safe_motor_name,
-                                            data=motor_value,
-                                            parent=self))
+                self.add_node(SpecH5NodeDataset(name=safe_motor_name,
+                                                data=motor_value,
+                                                parent=self))
 
 
 class InstrumentMcaGroup(commonh5.Group, SpecH5Group):
@@ -739,6 +852,13 @@ class InstrumentMcaGroup(commonh5.Group, SpecH5Group):
                                             data=elapsed_time,
                                             parent=self))
 
+    def _update(self, scan):
+        """Update the MCA data with the one of an updated scan.
+
+        :param scan: specfile.Scan object
+        """
+        self._get_items()["data"]._update(scan)
+
 
 class McaDataDataset(SpecH5LazyNodeDataset):
     """Lazy loadable dataset for MCA data"""
@@ -754,6 +874,16 @@ class McaDataDataset(SpecH5LazyNodeDataset):
     def _create_data(self):
         return _demultiplex_mca(self._scan, self._analyser_index)
 
+    def _update(self, scan):
+        """Reload the data from an updated scan when it is needed.
+
+        :param scan: specfile.Scan object
+        """
+        self._scan = scan
+        self._shape = None
+        self._num_analysers = _get_number_of_mca_analysers(scan)
+        self._is_initialized = False
+
     @property
     def shape(self):
         if self._shape is None:
@@ -777,28 +907,76 @@ class McaDataDataset(SpecH5LazyNodeDataset):
         return self.shape[0]
 
     def __getitem__(self, item):
-        # optimization for fetching a single spectrum if data not already loaded
+        # optimization for fetching spectra if data not already loaded
         if not self._is_initialized:
-            if isinstance(item, six.integer_types):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self._scan.mca[self._analyser_index +
-                                      item * self._num_analysers]
-            # accessing a slice or element of a single spectrum [i, j:k]
-            try:
-                spectrum_idx, channel_idx_or_slice = item
-                assert isinstance(spectrum_idx, six.integer_types)
-            except (ValueError, TypeError, AssertionError):
-                pass
-            else:
-                if spectrum_idx < 0:
-                    item += len(self)
-                idx = self._analyser_index + spectrum_idx * self._num_analysers
-                return self._scan.mca[idx][channel_idx_or_slice]
+            if not isinstance(item, tuple):
+                item = (item, )
+            if len(item) == 1:
+                item = item + (slice(None), )
+            if len(item) == 2:
+                try:
+                    row_slice, row_is_index = self._get_key_slice(
+                        item[0], self.shape[0])
+                    channel_slice, channel_is_index = self._get_key_slice(
+                        item[1], self.shape[1])
+                except TypeError:
+                    pass
+                else:
+                    data = self._get_spectra(row_slice, channel_slice)
+                    if row_is_index and channel_is_index:
+                        return data[0, 0]
+                    elif row_is_index:
+                        return data[0]
+                    elif channel_is_index:
+                        return data[:, 0]
+                    return data
 
         return super(McaDataDataset, self).__getitem__(item)
 
+    @staticmethod
+    def _get_key_slice(key, length):
+        """Convert an index or a slice to a slice.
+
+        :param key: int or slice
+        :param int length: Length of the indexed dimension
+        :return: (slice, whether key is an index)
+        :raise TypeError: If key is neither an index nor a slice
+        """
+        if isinstance(key, slice):
+            return key, False
+        if isinstance(key, (six.integer_types, numpy.integer)):
+            index = int(key)
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("Index %d out of range" % key)
+            return slice(index, index + 1), True
+        raise TypeError("Unsupported key")
+
+    def _get_spectra(self, spectra, channels):
+        """Read a selection of spectra without loading the whole dataset.
+
+        :param slice spectra: Spectra of this analyser to read
+        :param slice channels: Channels to read
+        :rtype: 2D numpy.ndarray
+        """
+        start, stop, step = spectra.indices(len(self))
+        if step < 0 and stop < 0:
+            # Slice up to the first spectrum included
+            stop = None
+        else:
+            stop = self._analyser_index + stop * self._num_analysers
+        mca_indices = slice(self._analyser_index + start * self._num_analysers,
+                            stop,
+                            step * self._num_analysers)
+        start, stop, step = channels.indices(self.shape[1])
+        if step < 0 and stop < 0:
+            stop = None
+        return self._scan._specfile.get_mca_array(
+            self._scan.index,
+            mca_indices=mca_indices,
+            channels=slice(start, stop, step))
+
 
 class MeasurementGroup(commonh5.Group, SpecH5Group):
     def __init__(self, parent, scan):
@@ -809,15 +987,49 @@ class MeasurementGroup(commonh5.Group, SpecH5Group):
         """
         commonh5.Group.__init__(self, name="measurement", parent=parent,
                                 attrs={"NX_class": to_h5py_utf8("NXcollection"),})
+        self._update(scan)
+
+    def _update(self, scan):
+        """Add datasets for new data columns and update existing ones.
+
+        :param scan: specfile.Scan object
+        """
+        items = self._get_items()
         for label in scan.labels:
             safe_label = label.replace("/", "%")
-            self.add_node(SpecH5NodeDataset(name=safe_label,
-                                            data=scan.data_column_by_name(label),
-                                            parent=self))
+            if safe_label in items:
+                items[safe_label]._update(scan)
+            else:
+                self.add_node(ScanColumnDataset(name=safe_label,
+                                                label=label,
+                                                scan=scan,
+                                                parent=self))
 
         num_analysers = _get_number_of_mca_analysers(scan)
         for anal_idx in range(num_analysers):
-            self.add_node(MeasurementMcaGroup(parent=self, analyser_index=anal_idx))
+            if "mca_%d" % anal_idx not in items:
+                self.add_node(MeasurementMcaGroup(parent=self, analyser_index=anal_idx))
+
+
+class ScanColumnDataset(SpecH5LazyNodeDataset):
+    """Lazy loadable dataset for a data column of a scan"""
+    def __init__(self, name, label, scan, parent=None):
+        commonh5.LazyLoadableDataset.__init__(self, name=name, parent=parent)
+        self._label = label
+        self._scan = scan
+
+    def _create_data(self):
+        # use 32 bits floats, as SpecH5NodeDataset does
+        return numpy.asarray(_get_data_column_by_name(self._scan, self._label),
+                             dtype=numpy.float32)
+
+    def _update(self, scan):
+        """Reload the data from an updated scan when it is needed.
+
+        :param scan: specfile.Scan object
+        """
+        self._scan = scan
+        self._is_initialized = False
 
 
 class MeasurementMcaGroup(commonh5.Group, SpecH5Group):
@@ -25,7 +25,7 @@
 
 __authors__ = ["V. Valls"]
 __license__ = "MIT"
-__date__ = "02/07/2018"
+__date__ = "17/10/2026"
 
 import os
 import logging
@@ -614,6 +614,76 @@ class TestFabioH5WithFileSeries(unittest.TestCase):
         self.assertEqual(frameData.dtype.kind, "i")
         self.assertEqual(frameData.shape, (10, 3, 2))
 
+    def testFrameDataSlicing(self):
+        file_series = fabioh5._FileSeries(self.edf_filenames)
+        reader = fabioh5.FabioReader(file_series=file_series)
+        frameData = _TestableFrameData("foo", reader)
+        ref = numpy.array([[[i, 11], [12, 13], [14, 15]] for i in range(10)])
+        for item in (0, -1, numpy.int64(3), (2, 0), (2, slice(None), 1),
+                     slice(None), slice(2, 8, 3), slice(None, None, -1),
+                     (slice(1, 4), 0, 0), slice(5, 2)):
+            self.assertTrue(numpy.array_equal(frameData[item], ref[item]))
+        self.assertTrue(numpy.array_equal(list(frameData), ref))
+        reader.close()
+
+    def testLazyReading(self):
+        read_files = []
+        edf_read = fabio.edfimage.EdfImage.read
+
+        def read(image, fname, *args, **kwargs):
+            read_files.append(fname)
+            return edf_read(image, fname, *args, **kwargs)
+
+        fabio.edfimage.EdfImage.read = read
+        try:
+            h5_image = fabioh5.File(file_series=self.edf_filenames)
+            dataset = h5_image["/scan_0/instrument/detector_0/data"]
+            self.assertEqual(dataset.shape, (10, 3, 2))
+            self.assertEqual(dataset[5][0, 0], 5)
+            # Only the first file and the requested one were read
+            self.assertEqual(set(read_files),
+                             set(self.edf_filenames[i] for i in (0, 5)))
+
+            # Metadata is read on demand
+            dataset = h5_image["/scan_0/instrument/detector_0/others/image_id"]
+            self.assertEqual(list(dataset[...]), list(range(10)))
+            self.assertEqual(set(read_files), set(self.edf_filenames))
+            h5_image.close()
+        finally:
+            fabio.edfimage.EdfImage.read = edf_read
+
+    def testFrameCacheIsolation(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        frame = dataset[3]
+        frame[...] = 999
+        self.assertEqual(dataset[3][0, 0], 3)
+
+        reader = fabioh5.FabioReader(file_series=self.edf_filenames)
+        frame = reader.get_frame(3)
+        self.assertFalse(frame.flags.writeable)
+        reader.close()
+        h5_image.close()
+
+    def testFrameCache(self):
+        file_series = fabioh5._FileSeries(self.edf_filenames)
+        reader = fabioh5.FabioReader(file_series=file_series)
+        frame_size = reader.get_frame(0).nbytes
+        reader.set_frame_cache_size(3 * frame_size)
+        self.assertEqual(reader.get_frame_cache_size(), 3 * frame_size)
+
+        frames = reader.get_frames([0, 1, 2])
+        self.assertIs(reader.get_frame(1), frames[1])
+        # Frame 0 is the least recently used one
+        reader.get_frame(3)
+        self.assertIsNot(reader.get_frame(0), frames[0])
+        self.assertTrue(numpy.array_equal(reader.get_frame(0), frames[0]))
+        self.assertIs(reader.get_frame(1), frames[1])
+
+        reader.set_frame_cache_size(0)
+        self.assertIsNot(reader.get_frame(1), frames[1])
+        reader.close()
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
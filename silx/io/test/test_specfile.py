@@ -25,7 +25,7 @@
 
 __authors__ = ["P. Knobel", "V.A. Sole"]
 __license__ = "MIT"
-__date__ = "17/01/2018"
+__date__ = "17/10/2026"
 
 
 import locale
@@ -299,6 +299,30 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(self.scan1.data.shape, (3, 4))
         self.assertAlmostEqual(numpy.sum(self.scan1.data), 113.631)
 
+    def test_data_columns_dtype(self):
+        data = self.sf.data(0)
+        self.assertEqual(data.dtype, numpy.float64)
+        self.assertTrue(data.flags['C_CONTIGUOUS'])
+        self.assertTrue(numpy.array_equal(data.T, self.scan1.data))
+
+        data32 = self.sf.data(0, dtype=numpy.float32)
+        self.assertEqual(data32.dtype, numpy.float32)
+        self.assertTrue(numpy.array_equal(data32, data.astype(numpy.float32)))
+
+        selection = self.sf.data(0, columns=[2, 0], dtype=numpy.float32)
+        self.assertEqual(selection.shape, (4, 2))
+        self.assertTrue(numpy.array_equal(
+            selection, data[:, [2, 0]].astype(numpy.float32)))
+
+        with self.assertRaises(specfile.SfErrColNotFound):
+            self.sf.data(0, columns=[3])
+        with self.assertRaises(ValueError):
+            self.sf.data(0, dtype=numpy.int32)
+
+        column = self.scan25.data_column_by_name("col2", dtype=numpy.float32)
+        self.assertEqual(column.dtype, numpy.float32)
+        self.assertAlmostEqual(column[1], 1.2, places=6)
+
     def test_data_column_by_name(self):
         self.assertAlmostEqual(self.scan25.data_column_by_name("col2")[1],
                                1.2)
@@ -308,6 +332,13 @@ class TestSpecFile(unittest.TestCase):
         with self.assertRaises(specfile.SfErrColNotFound):
             self.scan25.data_column_by_name("ygfxgfyxg")
 
+    def test_data_column_by_name_bytes(self):
+        self.assertAlmostEqual(self.scan25.data_column_by_name(b"col2")[1],
+                               1.2)
+        self.assertTrue(numpy.array_equal(
+            self.sf.data_column_by_name(0, b"first column"),
+            self.sf.data_column_by_name(0, "first column")))
+
     def test_motors(self):
         self.assertEqual(len(self.scan1.motor_names), 6)
         self.assertEqual(len(self.scan1.motor_positions), 6)
@@ -361,6 +392,20 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(line_count, 3)
         self.assertAlmostEqual(total_sum, 36.8)
 
+    def test_mca_array(self):
+        sf = self.scan1_2._specfile
+        index = self.scan1_2.index
+        ref = numpy.array(list(self.scan1_2.mca))
+        self.assertTrue(numpy.array_equal(sf.get_mca_array(index), ref))
+        for mca_indices, channels in ((slice(1, None), slice(None)),
+                                      (slice(None, None, 2), slice(1, 3)),
+                                      (slice(None, None, -1), slice(None, None, -2)),
+                                      (slice(2, 1), slice(None))):
+            self.assertTrue(numpy.array_equal(
+                sf.get_mca_array(index, mca_indices, channels),
+                ref[mca_indices, channels]))
+        self.assertEqual(sf.get_mca_array(self.scan1.index).shape, (0, 0))
+
     def test_mca_header(self):
         self.assertEqual(self.scan1.mca_header_dict, {})
         self.assertEqual(len(self.scan1_2.mca_header_dict), 4)
@@ -420,12 +465,151 @@ class TestSFLocale(unittest.TestCase):
         self.crunch_data()
 
 
+class TestSpecFileIndexFile(unittest.TestCase):
+    """Test SpecFile with a persistent index file"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fname = os.path.join(self.tmpdir, "sf.dat")
+        with open(self.fname, "wb") as f:
+            f.write(bytes(sftext, 'ascii'))
+        self.index_fname = self.fname + ".sfidx"
+
+    def tearDown(self):
+        for name in os.listdir(self.tmpdir):
+            os.unlink(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def scans_info(self, sf):
+        return [(sf.number(index),
+                 sf.order(index),
+                 sf.index(sf.number(index), sf.order(index)),
+                 sf.scan_header(index))
+                for index in range(len(sf))]
+
+    def test_index_file(self):
+        ref_sf = SpecFile(self.fname)
+        ref_info = self.scans_info(ref_sf)
+        ref_sf.close()
+
+        # Write index
+        sf = SpecFile(self.fname, index_file=True)
+        self.assertTrue(os.path.isfile(self.index_fname))
+        self.assertEqual(self.scans_info(sf), ref_info)
+        sf.close()
+
+        # Read index
+        sf = SpecFile(self.fname, index_file=self.index_fname)
+        self.assertEqual(self.scans_info(sf), ref_info)
+        sf.close()
+
+    def test_outdated_index_file(self):
+        SpecFile(self.fname, index_file=True).close()
+        index_mtime = os.path.getmtime(self.index_fname)
+
+        with open(self.fname, "ab") as f:
+            f.write(b"\n#S 30 ascan\n#L a  b\n1 2\n")
+        stat = os.stat(self.fname)
+        os.utime(self.fname, (stat.st_atime, index_mtime + 10))
+
+        sf = SpecFile(self.fname, index_file=True)
+        self.assertEqual(sf.list()[-1], 30)
+        self.assertEqual(sf.index(30), len(sf) - 1)
+        sf.close()
+
+        # Index was rewritten with the new scan
+        sf = SpecFile(self.fname, index_file=True)
+        self.assertEqual(sf.list()[-1], 30)
+        sf.close()
+
+    def test_corrupted_index_file(self):
+        ref_sf = SpecFile(self.fname)
+        ref_info = self.scans_info(ref_sf)
+        ref_sf.close()
+
+        with open(self.index_fname, "wb") as f:
+            f.write(b"not an index")
+
+        sf = SpecFile(self.fname, index_file=True)
+        self.assertEqual(self.scans_info(sf), ref_info)
+        sf.close()
+
+
+class TestSpecFileUpdate(unittest.TestCase):
+    """Test SpecFile.update with a file being written"""
+
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp()
+        os.write(fd, b"#F /tmp/live.dat\n\n#S 1 ascan\n#L a  b\n1 2\n3 4\n")
+        os.close(fd)
+        self.sf = SpecFile(self.fname)
+
+    def tearDown(self):
+        self.sf.close()
+        os.unlink(self.fname)
+
+    def append(self, text):
+        with open(self.fname, "ab") as f:
+            f.write(text)
+
+    def test_not_modified(self):
+        self.assertFalse(self.sf.update())
+        self.assertEqual(len(self.sf), 1)
+
+    def test_new_lines(self):
+        self.assertEqual(self.sf.data(0).shape, (2, 2))
+        self.append(b"5 6\n")
+        self.assertTrue(self.sf.update())
+        self.assertEqual(len(self.sf), 1)
+        self.assertTrue(numpy.array_equal(self.sf.data(0),
+                                          [[1, 2], [3, 4], [5, 6]]))
+        self.assertFalse(self.sf.update())
+
+    def test_new_scans(self):
+        self.append(b"5 6\n\n#S 2 dscan\n#L c  d\n7 8\n")
+        self.assertTrue(self.sf.update())
+        self.assertEqual(self.sf.keys(), ["1.1", "2.1"])
+        self.assertEqual(self.sf.data(0).shape, (3, 2))
+        self.assertEqual(self.sf.labels(1), ["c", "d"])
+
+        self.append(b"9 10\n\n#S 2 dscan\n#L e\n11\n")
+        self.assertTrue(self.sf.update())
+        self.assertEqual(self.sf.keys(), ["1.1", "2.1", "2.2"])
+        self.assertEqual(self.sf.index(2, 2), 2)
+        self.assertTrue(numpy.array_equal(self.sf.data(1), [[7, 8], [9, 10]]))
+        self.assertEqual(self.sf.file_header(2), ["#F /tmp/live.dat"])
+
+        ref_sf = SpecFile(self.fname)
+        for index in range(len(ref_sf)):
+            self.assertEqual(self.sf.scan_header(index),
+                             ref_sf.scan_header(index))
+            self.assertTrue(numpy.array_equal(self.sf.data(index),
+                                              ref_sf.data(index)))
+        ref_sf.close()
+
+    def test_truncated_file(self):
+        self.append(b"\n#S 2 dscan\n#L c  d\n7 8\n")
+        self.assertTrue(self.sf.update())
+        self.assertEqual(len(self.sf), 2)
+
+        with open(self.fname, "wb") as f:
+            f.write(b"#S 5 ascan\n#L a\n1\n")
+        self.assertTrue(self.sf.update())
+        self.assertEqual(self.sf.list(), [5])
+        self.assertEqual(self.sf.labels(0), ["a"])
+        self.assertEqual(self.sf.file_header(0), [])
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecFile))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSFLocale))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecFileIndexFile))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecFileUpdate))
     return test_suite
 
 
@@ -41,7 +41,7 @@ import h5py
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "12/02/2018"
+__date__ = "17/10/2026"
 
 sftext = """#F /tmp/sf.dat
 #E 1455180875
@@ -462,6 +462,17 @@ class TestSpecH5(unittest.TestCase):
         # attrs
         self.assertEqual(mca_0_data.attrs, {"interpretation": "spectrum"})
 
+    def testMcaDataSlicing(self):
+        ref = self.sfh5["/1.2/measurement/mca_1/data"][()]
+        for item in (1, -1, (0, 2), (slice(None), 1),
+                     slice(1, None), (slice(None, None, -1), slice(0, 2))):
+            sfh5 = SpecH5(self.fname)
+            mca_1_data = sfh5["/1.2/instrument/mca_1/data"]
+            self.assertTrue(array_equal(mca_1_data[item], ref[item]))
+            # Data was not fully loaded
+            self.assertFalse(mca_1_data._is_initialized)
+            sfh5.close()
+
     def testMotorPosition(self):
         positioners_group = self.sfh5["/1.1/instrument/positioners"]
         # MRTSlit DOWN position is defined in #P0 san header line
@@ -862,6 +873,61 @@ class TestSpecH5SlashInLabels(unittest.TestCase):
                       self.sfh5["1.1/instrument/positioners"])
 
 
+class TestSpecH5Update(unittest.TestCase):
+    """Test SpecH5.update with a SPEC file being written"""
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp()
+        os.write(fd, b"#F /tmp/live.dat\n#D Thu Feb 11 09:54:35 2016\n\n"
+                     b"#S 1 ascan mot 0 1 2 0.1\n#L mot  det\n0 10\n")
+        os.close(fd)
+        self.sfh5 = SpecH5(self.fname)
+
+    def tearDown(self):
+        self.sfh5.close()
+        os.unlink(self.fname)
+
+    def append(self, text):
+        with open(self.fname, "ab") as f:
+            f.write(text)
+
+    def testNotModified(self):
+        self.assertFalse(self.sfh5.update())
+        self.assertEqual(list(self.sfh5.keys()), ["1.1"])
+
+    def testUpdate(self):
+        scan_group = self.sfh5["1.1"]
+        self.assertEqual(self.sfh5["1.1/measurement/det"].shape, (1,))
+
+        self.append(b"1 11\n2 12\n\n#S 2 dscan\n#L a\n5\n")
+        self.assertTrue(self.sfh5.update())
+        self.assertEqual(list(self.sfh5.keys()), ["1.1", "2.1"])
+        self.assertIs(self.sfh5["1.1"], scan_group)
+        self.assertEqual(list(self.sfh5["1.1/measurement/det"]),
+                         [10, 11, 12])
+        self.assertEqual(list(self.sfh5["2.1/measurement/a"]), [5])
+
+        self.append(b"6\n")
+        self.assertTrue(self.sfh5.update())
+        self.assertEqual(list(self.sfh5["2.1/measurement/a"]), [5, 6])
+        self.assertEqual(self.sfh5["2.1/title"][()], u"dscan")
+
+    def testUpdateDatasetReference(self):
+        det = self.sfh5["1.1/measurement/det"]
+        mot = self.sfh5["1.1/measurement/mot"]
+        self.assertEqual(list(det), [10])
+
+        self.append(b"1 11\n")
+        self.assertTrue(self.sfh5.update())
+        self.assertIs(self.sfh5["1.1/measurement/det"], det)
+        self.assertEqual(list(det), [10, 11])
+        self.assertEqual(det.shape, (2,))
+
+        self.append(b"2 12\n")
+        self.assertTrue(self.sfh5.update())
+        self.assertEqual(list(mot), [0, 1, 2])
+        self.assertEqual(list(det), [10, 11, 12])
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
@@ -874,6 +940,8 @@ def suite():
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5NoDataCols))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5SlashInLabels))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5Update))
     return test_suite
 
 
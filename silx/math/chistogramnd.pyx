@@ -24,7 +24,7 @@
 
 __authors__ = ["D. Naudet"]
 __license__ = "MIT"
-__date__ = "02/10/2017"
+__date__ = "17/10/2026"
 
 cimport numpy as cnumpy  # noqa
 cimport cython
@@ -42,7 +42,8 @@ def chistogramnd(sample,
                  last_bin_closed=False,
                  histo=None,
                  weighted_histo=None,
-                 wh_dtype=None):
+                 wh_dtype=None,
+                 num_threads=1):
     """Computes the multidimensional histogram of some data.
 
     :param sample:
@@ -144,6 +145,18 @@ def chistogramnd(sample,
         *weights*. Allowed values are : `numpu.double` and `numpy.float32`.
     :type wh_dtype: *optional*, numpy data type
 
+    :param num_threads: Number of threads used to compute the histogram,
+        or None to use the OpenMP default (i.e., all available cores
+        unless OMP_NUM_THREADS is set).
+        Each thread fills its own copy of the histograms which are summed at
+        the end, unless there are too many bins, in which case the threads
+        update the histograms with atomic operations.
+
+        .. note:: With more than one thread, the summation order of the
+            weights differs from the sequential computation, so the weighted
+            histogram might differ by rounding errors.
+    :type num_threads: *optional*, int or None
+
     :return: Histogram (bin counts, always returned), weighted histogram of
         the sample (or *None* if weights is *None*) and bin edges for each
         dimension.
@@ -151,6 +164,11 @@ def chistogramnd(sample,
         (:class:`numpy.array`, None, `tuple`)
     """
 
+    if num_threads is None:
+        num_threads = 0  # Use OpenMP default number of threads
+    elif num_threads < 1:
+        raise ValueError('<num_threads> must be a positive integer or None.')
+
     if wh_dtype is None:
         wh_dtype = np.double
     elif wh_dtype not in (np.double, np.float32):
@@ -343,7 +361,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -358,7 +377,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -373,7 +393,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -394,7 +415,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -409,7 +431,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -424,7 +447,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -445,7 +469,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -460,7 +485,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -475,7 +501,8 @@ def chistogramnd(sample,
                                                          bin_edges_c,
                                                          option_flags,
                                                          weight_min=weight_min,
-                                                         weight_max=weight_max)
+                                                         weight_max=weight_max,
+                                                         num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -502,7 +529,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -517,7 +545,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -532,7 +561,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -553,7 +583,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -568,7 +599,8 @@ def chistogramnd(sample,
                                                     bin_edges_c,
                                                     option_flags,
                                                     weight_min=weight_min,
-                                                    weight_max=weight_max)
+                                                    weight_max=weight_max,
+                                                    num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -583,7 +615,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -604,7 +637,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       num_threads=num_threads)
 
             elif weights_type == np.float32:
 
@@ -619,7 +653,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      num_threads=num_threads)
 
             elif weights_type == np.int32:
 
@@ -634,7 +669,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        num_threads=num_threads)
 
             else:
                 raise_unsupported_type()
@@ -683,7 +719,8 @@ cdef int _histogramnd_double_double_double(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max,
+                                           int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_double_double(&sample[0],
                                                           &weights[0],
@@ -696,7 +733,8 @@ cdef int _histogramnd_double_double_double(double[:] sample,
                                                           &bin_edges[0],
                                                           option_flags,
                                                           weight_min,
-                                                          weight_max)
+                                                          weight_max,
+                                                          num_threads)
 
 
 @cython.wraparound(False)
@@ -714,7 +752,8 @@ cdef int _histogramnd_double_float_double(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max,
+                                          int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_float_double(&sample[0],
                                                          &weights[0],
@@ -727,7 +766,8 @@ cdef int _histogramnd_double_float_double(double[:] sample,
                                                          &bin_edges[0],
                                                          option_flags,
                                                          weight_min,
-                                                         weight_max)
+                                                         weight_max,
+                                                         num_threads)
 
 
 @cython.wraparound(False)
@@ -745,7 +785,8 @@ cdef int _histogramnd_double_int32_t_double(double[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
+                                            cnumpy.int32_t weight_max,
+                                            int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_int32_t_double(&sample[0],
                                                            &weights[0],
@@ -758,7 +799,8 @@ cdef int _histogramnd_double_int32_t_double(double[:] sample,
                                                            &bin_edges[0],
                                                            option_flags,
                                                            weight_min,
-                                                           weight_max)
+                                                           weight_max,
+                                                           num_threads)
 
 
 # =====================
@@ -781,7 +823,8 @@ cdef int _histogramnd_float_double_double(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max,
+                                          int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_double_double(&sample[0],
                                                          &weights[0],
@@ -794,7 +837,8 @@ cdef int _histogramnd_float_double_double(float[:] sample,
                                                          &bin_edges[0],
                                                          option_flags,
                                                          weight_min,
-                                                         weight_max)
+                                                         weight_max,
+                                                         num_threads)
 
 
 @cython.wraparound(False)
@@ -812,7 +856,8 @@ cdef int _histogramnd_float_float_double(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max,
+                                         int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_float_double(&sample[0],
                                                         &weights[0],
@@ -825,7 +870,8 @@ cdef int _histogramnd_float_float_double(float[:] sample,
                                                         &bin_edges[0],
                                                         option_flags,
                                                         weight_min,
-                                                        weight_max)
+                                                        weight_max,
+                                                        num_threads)
 
 
 @cython.wraparound(False)
@@ -843,7 +889,8 @@ cdef int _histogramnd_float_int32_t_double(float[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max,
+                                           int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_int32_t_double(&sample[0],
                                                           &weights[0],
@@ -856,7 +903,8 @@ cdef int _histogramnd_float_int32_t_double(float[:] sample,
                                                           &bin_edges[0],
                                                           option_flags,
                                                           weight_min,
-                                                          weight_max)
+                                                          weight_max,
+                                                          num_threads)
 
 
 # =====================
@@ -879,7 +927,8 @@ cdef int _histogramnd_int32_t_double_double(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             double weight_min,
-                                            double weight_max) nogil:
+                                            double weight_max,
+                                            int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_double_double(&sample[0],
                                                            &weights[0],
@@ -892,7 +941,8 @@ cdef int _histogramnd_int32_t_double_double(cnumpy.int32_t[:] sample,
                                                            &bin_edges[0],
                                                            option_flags,
                                                            weight_min,
-                                                           weight_max)
+                                                           weight_max,
+                                                           num_threads)
 
 
 @cython.wraparound(False)
@@ -910,7 +960,8 @@ cdef int _histogramnd_int32_t_float_double(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            float weight_min,
-                                           float weight_max) nogil:
+                                           float weight_max,
+                                           int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_float_double(&sample[0],
                                                           &weights[0],
@@ -923,7 +974,8 @@ cdef int _histogramnd_int32_t_float_double(cnumpy.int32_t[:] sample,
                                                           &bin_edges[0],
                                                           option_flags,
                                                           weight_min,
-                                                          weight_max)
+                                                          weight_max,
+                                                          num_threads)
 
 
 @cython.wraparound(False)
@@ -941,7 +993,8 @@ cdef int _histogramnd_int32_t_int32_t_double(cnumpy.int32_t[:] sample,
                                              double[:] bin_edges,
                                              int option_flags,
                                              cnumpy.int32_t weight_min,
-                                             cnumpy.int32_t weight_max) nogil:
+                                             cnumpy.int32_t weight_max,
+                                             int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_int32_t_double(&sample[0],
                                                             &weights[0],
@@ -954,7 +1007,8 @@ cdef int _histogramnd_int32_t_int32_t_double(cnumpy.int32_t[:] sample,
                                                             &bin_edges[0],
                                                             option_flags,
                                                             weight_min,
-                                                            weight_max)
+                                                            weight_max,
+                                                            num_threads)
 
 
 # =====================
@@ -977,7 +1031,8 @@ cdef int _histogramnd_double_double_float(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max,
+                                          int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_double_float(&sample[0],
                                                          &weights[0],
@@ -990,7 +1045,8 @@ cdef int _histogramnd_double_double_float(double[:] sample,
                                                          &bin_edges[0],
                                                          option_flags,
                                                          weight_min,
-                                                         weight_max)
+                                                         weight_max,
+                                                         num_threads)
 
 
 @cython.wraparound(False)
@@ -1008,7 +1064,8 @@ cdef int _histogramnd_double_float_float(double[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max,
+                                         int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_float_float(&sample[0],
                                                         &weights[0],
@@ -1021,7 +1078,8 @@ cdef int _histogramnd_double_float_float(double[:] sample,
                                                         &bin_edges[0],
                                                         option_flags,
                                                         weight_min,
-                                                        weight_max)
+                                                        weight_max,
+                                                        num_threads)
 
 
 @cython.wraparound(False)
@@ -1039,7 +1097,8 @@ cdef int _histogramnd_double_int32_t_float(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max,
+                                           int num_threads) nogil:
 
     return histogramnd_c.histogramnd_double_int32_t_float(&sample[0],
                                                           &weights[0],
@@ -1052,7 +1111,8 @@ cdef int _histogramnd_double_int32_t_float(double[:] sample,
                                                           &bin_edges[0],
                                                           option_flags,
                                                           weight_min,
-                                                          weight_max)
+                                                          weight_max,
+                                                          num_threads)
 
 
 # =====================
@@ -1075,7 +1135,8 @@ cdef int _histogramnd_float_double_float(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          double weight_min,
-                                         double weight_max) nogil:
+                                         double weight_max,
+                                         int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_double_float(&sample[0],
                                                         &weights[0],
@@ -1088,7 +1149,8 @@ cdef int _histogramnd_float_double_float(float[:] sample,
                                                         &bin_edges[0],
                                                         option_flags,
                                                         weight_min,
-                                                        weight_max)
+                                                        weight_max,
+                                                        num_threads)
 
 
 @cython.wraparound(False)
@@ -1106,7 +1168,8 @@ cdef int _histogramnd_float_float_float(float[:] sample,
                                         double[:] bin_edges,
                                         int option_flags,
                                         float weight_min,
-                                        float weight_max) nogil:
+                                        float weight_max,
+                                        int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_float_float(&sample[0],
                                                        &weights[0],
@@ -1119,7 +1182,8 @@ cdef int _histogramnd_float_float_float(float[:] sample,
                                                        &bin_edges[0],
                                                        option_flags,
                                                        weight_min,
-                                                       weight_max)
+                                                       weight_max,
+                                                       num_threads)
 
 
 @cython.wraparound(False)
@@ -1137,7 +1201,8 @@ cdef int _histogramnd_float_int32_t_float(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           cnumpy.int32_t weight_min,
-                                          cnumpy.int32_t weight_max) nogil:
+                                          cnumpy.int32_t weight_max,
+                                          int num_threads) nogil:
 
     return histogramnd_c.histogramnd_float_int32_t_float(&sample[0],
                                                          &weights[0],
@@ -1150,7 +1215,8 @@ cdef int _histogramnd_float_int32_t_float(float[:] sample,
                                                          &bin_edges[0],
                                                          option_flags,
                                                          weight_min,
-                                                         weight_max)
+                                                         weight_max,
+                                                         num_threads)
 
 
 # =====================
@@ -1173,7 +1239,8 @@ cdef int _histogramnd_int32_t_double_float(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max,
+                                           int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_double_float(&sample[0],
                                                           &weights[0],
@@ -1186,7 +1253,8 @@ cdef int _histogramnd_int32_t_double_float(cnumpy.int32_t[:] sample,
                                                           &bin_edges[0],
                                                           option_flags,
                                                           weight_min,
-                                                          weight_max)
+                                                          weight_max,
+                                                          num_threads)
 
 
 @cython.wraparound(False)
@@ -1204,7 +1272,8 @@ cdef int _histogramnd_int32_t_float_float(cnumpy.int32_t[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max,
+                                          int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_float_float(&sample[0],
                                                          &weights[0],
@@ -1217,7 +1286,8 @@ cdef int _histogramnd_int32_t_float_float(cnumpy.int32_t[:] sample,
                                                          &bin_edges[0],
                                                          option_flags,
                                                          weight_min,
-                                                         weight_max)
+                                                         weight_max,
+                                                         num_threads)
 
 
 @cython.wraparound(False)
@@ -1235,7 +1305,8 @@ cdef int _histogramnd_int32_t_int32_t_float(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
+                                            cnumpy.int32_t weight_max,
+                                            int num_threads) nogil:
 
     return histogramnd_c.histogramnd_int32_t_int32_t_float(&sample[0],
                                                            &weights[0],
@@ -1248,4 +1319,5 @@ cdef int _histogramnd_int32_t_int32_t_float(cnumpy.int32_t[:] sample,
                                                            &bin_edges[0],
                                                            option_flags,
                                                            weight_min,
-                                                           weight_max)
+                                                           weight_max,
+                                                           num_threads)
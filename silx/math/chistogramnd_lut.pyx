@@ -24,13 +24,55 @@
 
 __authors__ = ["D. Naudet"]
 __license__ = "MIT"
-__date__ = "15/05/2016"
+__date__ = "17/10/2026"
 
 
+import os
+
 cimport numpy as cnumpy  # noqa
 cimport cython
+from cython.parallel import prange, threadid
 import numpy as np
 
+
+if hasattr(os, 'sched_getaffinity'):
+    _NUM_CPUS = len(os.sched_getaffinity(0))
+else:
+    _NUM_CPUS = os.cpu_count() or 1
+"""Number of CPUs available to the process"""
+
+_MAX_PRIVATE_BINS = 1 << 24
+"""Maximum total number of bins of the thread-private histograms"""
+
+
+def _check_num_threads(num_threads):
+    """Returns the number of threads to use.
+
+    :param num_threads: Requested number of threads or None for all CPUs
+    :rtype: int
+    """
+    if num_threads is None:
+        return _NUM_CPUS
+    elif num_threads < 1:
+        raise ValueError('<num_threads> must be a positive integer or None.')
+    return int(num_threads)
+
+
+def _get_num_threads(num_threads, n_bins, n_elems):
+    """Returns the number of threads to use with thread-private histograms.
+
+    The number of threads is reduced so that the thread-private histograms
+    fit in memory and are not larger than the sample.
+
+    :param num_threads: Requested number of threads or None for all CPUs
+    :param int n_bins: Total number of bins of the histogram
+    :param int n_elems: Number of elements of the sample
+    :rtype: int
+    """
+    num_threads = _check_num_threads(num_threads)
+    max_copies = min(_MAX_PRIVATE_BINS, n_elems) // max(n_bins, 1)
+    return int(max(1, min(num_threads, max_copies)))
+
 ctypedef fused sample_t:
     cnumpy.float64_t
     cnumpy.float32_t
@@ -54,11 +96,16 @@ ctypedef fused lut_t:
     cnumpy.int32_t
     cnumpy.int16_t
 
+ctypedef fused index_t:
+    cnumpy.int64_t
+    cnumpy.int32_t
+
 
 def histogramnd_get_lut(sample,
                         histo_range,
                         n_bins,
-                        last_bin_closed=False):
+                        last_bin_closed=False,
+                        num_threads=1):
     """TBD
 
     :param sample:
@@ -89,6 +136,10 @@ def histogramnd_get_lut(sample,
         the LAST bin to be closed.
     :type last_bin_closed: *optional*, :class:`python.boolean`
 
+    :param num_threads: Number of threads used to compute the LUT,
+        or None to use all available CPUs.
+    :type num_threads: *optional*, int or None
+
     :return: The indices for each sample and the histogram (bin counts).
     :rtype: tuple : (:class:`numpy.array`, :class:`numpy.array`)
     """
@@ -171,6 +222,13 @@ def histogramnd_get_lut(sample,
     histo_c = np.ascontiguousarray(histo.reshape((histo.size,)),
                                    dtype=histo.dtype.newbyteorder('N'))
 
+    num_threads = _get_num_threads(num_threads, histo_c.size, n_elem)
+    if num_threads == 1:
+        histo_threads = histo_c.reshape(1, -1)
+    else:
+        histo_threads = np.zeros((num_threads, histo_c.size),
+                                 dtype=histo_c.dtype)
+
     rc = 0
 
     try:
@@ -180,7 +238,7 @@ def histogramnd_get_lut(sample,
                                         histo_range_c,
                                         n_bins_c,
                                         lut_c,
-                                        histo_c,
+                                        histo_threads,
                                         last_bin_closed)
     except TypeError as ex:
         raise TypeError('Type not supported - sample : {0}'
@@ -190,6 +248,9 @@ def histogramnd_get_lut(sample,
         raise Exception('histogramnd returned an error : {0}'
                         ''.format(rc))
 
+    if num_threads > 1:
+        histo_c += histo_threads.sum(axis=0, dtype=histo_c.dtype)
+
     edges = []
     histo_range = histo_range.reshape(-1)
     for i_dim in range(n_dims):
@@ -208,17 +269,32 @@ def histogramnd_get_lut(sample,
 # =====================
 
 
-def histogramnd_from_lut(weights,
-                         histo_lut,
-                         histo=None,
-                         weighted_histo=None,
-                         shape=None,
-                         dtype=None,
-                         weight_min=None,
-                         weight_max=None):
-    """
-    dtype ignored if weighted_histo provided
+def _prepare_histograms(weights,
+                        lut_shape,
+                        histo,
+                        weighted_histo,
+                        shape,
+                        dtype):
+    """Checks the histograms related arguments of histogramnd_from_lut and
+    histogramnd_from_csr and creates the histograms if not provided.
+
+    weights is a stack if its first dimension is not part of the shape of
+    a set of weights, i.e., lut_shape, so that a stack of a single set of
+    weights gives a stack of a single histogram.
+
+    :return: (n_frames, histo, weighted_histo), where n_frames is None
+        for a single set of weights or the number of sets of weights
+        if weights is a stack.
     """
+    n_elems = np.prod(lut_shape)
+    if (weights.ndim >= 2 and weights.shape != tuple(lut_shape) and
+            np.prod(weights.shape[1:]) == n_elems):
+        n_frames = weights.shape[0]
+    elif weights.size == n_elems:
+        n_frames = None
+    else:
+        raise ValueError('The LUT and weights arrays must have the same '
+                         'number of elements.')
 
     if histo is None and weighted_histo is None:
         if shape is None:
@@ -227,6 +303,9 @@ def histogramnd_from_lut(weights,
                              '<weighted_histo>')
 
     if shape is not None:
+        if n_frames is not None:
+            shape = (n_frames,) + tuple(shape)
+
         if histo is not None and list(histo.shape) != list(shape):
             raise ValueError('The <shape> value does not match'
                              'the <histo> shape.')
@@ -255,11 +334,9 @@ def histogramnd_from_lut(weights,
     else:
         histo = np.zeros(shape, dtype=np.uint32)
 
-    w_dtype = weights.dtype
-
     if dtype is None:
         if weighted_histo is None:
-            dtype = w_dtype
+            dtype = weights.dtype
         else:
             dtype = weighted_histo.dtype
     elif weighted_histo is not None:
@@ -271,9 +348,61 @@ def histogramnd_from_lut(weights,
     if weighted_histo is None:
         weighted_histo = np.zeros(shape, dtype=dtype)
 
-    if histo_lut.size != weights.size:
-        raise ValueError('The LUT and weights arrays must have the same '
-                         'number of elements.')
+    return n_frames, histo, weighted_histo
+
+
+def _weights_filters(weights, weight_min, weight_max):
+    """Returns the weights filtering arguments of the histogram kernels.
+
+    :return: (filt_min_weights, weight_min, filt_max_weights, weight_max)
+    """
+    w_type = weights.dtype.type
+
+    if weight_min is None:
+        filt_min_weights = False
+        weight_min = 0
+    else:
+        filt_min_weights = True
+
+    if weight_max is None:
+        filt_max_weights = False
+        weight_max = 0
+    else:
+        filt_max_weights = True
+
+    return (filt_min_weights, w_type(weight_min),
+            filt_max_weights, w_type(weight_max))
+
+
+def histogramnd_from_lut(weights,
+                         histo_lut,
+                         histo=None,
+                         weighted_histo=None,
+                         shape=None,
+                         dtype=None,
+                         weight_min=None,
+                         weight_max=None,
+                         num_threads=1):
+    """
+    dtype ignored if weighted_histo provided
+
+    weights can also be a stack of K sets of weights, i.e., an array of
+    shape (K, ...) where each set has as many elements as the LUT.
+    In this case, the K histograms are computed at once (in parallel) and
+    the histograms have a shape (K,) + shape.
+
+    num_threads is the number of threads to use (None for all CPUs).
+    For a single set of weights, each thread fills its own copy of the
+    histograms which are summed at the end. The number of threads is reduced
+    if those copies would be too large.
+    """
+    n_frames, histo, weighted_histo = _prepare_histograms(weights,
+                                                          histo_lut.shape,
+                                                          histo,
+                                                          weighted_histo,
+                                                          shape,
+                                                          dtype)
+    filters = _weights_filters(weights, weight_min, weight_max)
 
     w_c = np.ascontiguousarray(weights.reshape((weights.size,)),
                                dtype=weights.dtype.newbyteorder('N'))
@@ -287,36 +416,143 @@ def histogramnd_from_lut(weights,
     h_lut_c = np.ascontiguousarray(histo_lut.reshape((histo_lut.size,)),
                                    histo_lut.dtype.newbyteorder('N'))
 
-    rc = 0
-
-    if weight_min is None:
-        weight_min = 0
-        filt_min_weights = False
+    if n_frames is not None:
+        try:
+            _histogramnd_from_lut_stack_fused(w_c.reshape(n_frames, -1),
+                                              h_lut_c,
+                                              h_c.reshape(n_frames, -1),
+                                              w_h_c.reshape(n_frames, -1),
+                                              *filters,
+                                              _check_num_threads(num_threads))
+        except TypeError:
+            raise TypeError('Case not supported - weights:{0} '
+                            'and histo:{1}.'
+                            ''.format(weights.dtype, weighted_histo.dtype))
+        return histo, weighted_histo
+
+    num_threads = _get_num_threads(num_threads, h_c.size, weights.size)
+    if num_threads == 1:
+        h_threads = h_c.reshape(1, -1)
+        w_h_threads = w_h_c.reshape(1, -1)
     else:
-        filt_min_weights = True
-
-    if weight_max is None:
-        weight_max = 0
-        filt_max_weights = False
-    else:
-        filt_max_weights = True
+        h_threads = np.zeros((num_threads, h_c.size), dtype=h_c.dtype)
+        w_h_threads = np.zeros((num_threads, w_h_c.size), dtype=w_h_c.dtype)
 
     try:
         _histogramnd_from_lut_fused(w_c,
                                     h_lut_c,
-                                    h_c,
-                                    w_h_c,
+                                    h_threads,
+                                    w_h_threads,
                                     weights.size,
-                                    filt_min_weights,
-                                    w_dtype.type(weight_min),
-                                    filt_max_weights,
-                                    w_dtype.type(weight_max))
+                                    *filters)
     except TypeError as ex:
         print(ex)
         raise TypeError('Case not supported - weights:{0} '
                         'and histo:{1}.'
                         ''.format(weights.dtype, histo.dtype))
 
+    if num_threads > 1:
+        h_c += h_threads.sum(axis=0, dtype=h_c.dtype)
+        w_h_c += w_h_threads.sum(axis=0, dtype=w_h_c.dtype)
+
+    return histo, weighted_histo
+
+
+def histogramnd_lut_to_csr(histo_lut, n_bins):
+    """Converts a LUT to its compressed sparse row (CSR) form.
+
+    The indices of the samples falling into the bin *i* are
+    ``indices[indptr[i]:indptr[i+1]]``, in increasing order.
+    Samples out of the histogram are not stored.
+
+    :param histo_lut: The bin index of each sample (negative if the sample
+        is not in the histogram), as returned by histogramnd_get_lut.
+    :type histo_lut: :class:`numpy.array`
+    :param int n_bins: The total number of bins of the histogram.
+    :return: (indptr, indices)
+    :rtype: tuple : (:class:`numpy.array` of int64, :class:`numpy.array`
+        of int32 or int64)
+    """
+    h_lut_c = np.ascontiguousarray(histo_lut.reshape((histo_lut.size,)),
+                                   histo_lut.dtype.newbyteorder('N'))
+
+    indptr = np.zeros(n_bins + 1, dtype=np.int64)
+    _histogramnd_lut_csr_count_fused(h_lut_c, indptr)
+    np.cumsum(indptr, out=indptr)
+
+    if h_lut_c.size < 2**31:
+        indices = np.empty(indptr[-1], dtype=np.int32)
+    else:
+        indices = np.empty(indptr[-1], dtype=np.int64)
+    offsets = indptr[:-1].copy()
+    _histogramnd_lut_csr_fill_fused(h_lut_c, offsets, indices)
+
+    return indptr, indices
+
+
+def histogramnd_from_csr(weights,
+                         indptr,
+                         indices,
+                         n_elems,
+                         histo=None,
+                         weighted_histo=None,
+                         shape=None,
+                         dtype=None,
+                         weight_min=None,
+                         weight_max=None,
+                         num_threads=1):
+    """Same as histogramnd_from_lut, but with a LUT in CSR form
+    (see histogramnd_lut_to_csr).
+
+    n_elems is the number of elements of the sample the LUT was computed
+    from, and so of each set of weights.
+
+    The histograms are computed in parallel over the bins (and the sets of
+    weights for a stack), so there is no thread-private copies of the
+    histograms, and weights are summed in the same order whatever the number
+    of threads.
+    """
+    n_frames, histo, weighted_histo = _prepare_histograms(weights,
+                                                          (n_elems,),
+                                                          histo,
+                                                          weighted_histo,
+                                                          shape,
+                                                          dtype)
+    if n_frames is None:
+        n_frames = 1
+
+    if indptr.size - 1 != histo.size // n_frames:
+        raise ValueError('The number of bins of the LUT does not match '
+                         'the histogram shape.')
+
+    filters = _weights_filters(weights, weight_min, weight_max)
+
+    w_c = np.ascontiguousarray(weights.reshape((n_frames, n_elems)),
+                               dtype=weights.dtype.newbyteorder('N'))
+
+    h_c = np.ascontiguousarray(histo.reshape((n_frames, -1)),
+                               dtype=histo.dtype.newbyteorder('N'))
+
+    w_h_c = np.ascontiguousarray(weighted_histo.reshape((n_frames, -1)),
+                                 dtype=weighted_histo.dtype.newbyteorder('N'))  # noqa
+
+    indptr_c = np.ascontiguousarray(indptr, dtype=np.int64)
+    indices_c = np.ascontiguousarray(indices,
+                                     dtype=indices.dtype.newbyteorder('N'))
+
+    try:
+        _histogramnd_from_csr_fused(w_c,
+                                    indptr_c,
+                                    indices_c,
+                                    h_c,
+                                    w_h_c,
+                                    *filters,
+                                    _check_num_threads(num_threads))
+    except TypeError:
+        raise TypeError('Case not supported - weights:{0} '
+                        'and histo:{1}.'
+                        ''.format(weights.dtype, weighted_histo.dtype))
+
     return histo, weighted_histo
 
 
@@ -331,22 +567,147 @@ def histogramnd_from_lut(weights,
 @cython.cdivision(True)
 def _histogramnd_from_lut_fused(weights_t[:] i_weights,
                                 lut_t[:] i_lut,
-                                cnumpy.uint32_t[:] o_histo,
-                                cumul_t[:] o_weighted_histo,
+                                cnumpy.uint32_t[:, ::1] o_histo,
+                                cumul_t[:, ::1] o_weighted_histo,
                                 int i_n_elems,
                                 bint i_filt_min_weights,
                                 weights_t i_weight_min,
                                 bint i_filt_max_weights,
                                 weights_t i_weight_max):
-    with nogil:
-        for i in range(i_n_elems):
+    # o_histo and o_weighted_histo hold one histogram per thread
+    cdef:
+        Py_ssize_t i
+        int thread_idx
+        int n_threads = o_histo.shape[0]
+
+    for i in prange(i_n_elems, nogil=True, num_threads=n_threads,
+                    schedule='static'):
+        if (i_lut[i] >= 0):
+            if i_filt_min_weights and i_weights[i] < i_weight_min:
+                continue
+            if i_filt_max_weights and i_weights[i] > i_weight_max:
+                continue
+            thread_idx = threadid()
+            o_histo[thread_idx, i_lut[i]] += 1
+            o_weighted_histo[thread_idx, i_lut[i]] += <cumul_t>i_weights[i]  # noqa
+
+
+# =====================
+# =====================
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def _histogramnd_from_lut_stack_fused(weights_t[:, ::1] i_weights,
+                                      lut_t[:] i_lut,
+                                      cnumpy.uint32_t[:, ::1] o_histo,
+                                      cumul_t[:, ::1] o_weighted_histo,
+                                      bint i_filt_min_weights,
+                                      weights_t i_weight_min,
+                                      bint i_filt_max_weights,
+                                      weights_t i_weight_max,
+                                      int num_threads):
+    # One histogram per row of i_weights, rows are processed in parallel
+    cdef:
+        Py_ssize_t frame, i
+
+    for frame in prange(i_weights.shape[0], nogil=True,
+                        num_threads=num_threads, schedule='dynamic'):
+        for i in range(i_weights.shape[1]):
             if (i_lut[i] >= 0):
-                if i_filt_min_weights and i_weights[i] < i_weight_min:
+                if i_filt_min_weights and i_weights[frame, i] < i_weight_min:
                     continue
-                if i_filt_max_weights and i_weights[i] > i_weight_max:
+                if i_filt_max_weights and i_weights[frame, i] > i_weight_max:
                     continue
-                o_histo[i_lut[i]] += 1
-                o_weighted_histo[i_lut[i]] += <cumul_t>i_weights[i]  # noqa
+                o_histo[frame, i_lut[i]] += 1
+                o_weighted_histo[frame, i_lut[i]] += <cumul_t>i_weights[frame, i]  # noqa
+
+
+# =====================
+# =====================
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def _histogramnd_from_csr_fused(weights_t[:, ::1] i_weights,
+                                cnumpy.int64_t[::1] i_indptr,
+                                index_t[::1] i_indices,
+                                cnumpy.uint32_t[:, ::1] o_histo,
+                                cumul_t[:, ::1] o_weighted_histo,
+                                bint i_filt_min_weights,
+                                weights_t i_weight_min,
+                                bint i_filt_max_weights,
+                                weights_t i_weight_max,
+                                int num_threads):
+    # One histogram per row of i_weights,
+    # (row, bin) pairs are processed in parallel
+    cdef:
+        Py_ssize_t n_bins = o_histo.shape[1]
+        Py_ssize_t index, frame, bin_idx, j
+        weights_t value
+        cnumpy.uint32_t count
+        cumul_t cumul
+
+    for index in prange(i_weights.shape[0] * n_bins, nogil=True,
+                        num_threads=num_threads, schedule='guided'):
+        frame = index // n_bins
+        bin_idx = index % n_bins
+        count = 0
+        cumul = 0
+        for j in range(i_indptr[bin_idx], i_indptr[bin_idx + 1]):
+            value = i_weights[frame, i_indices[j]]
+            if i_filt_min_weights and value < i_weight_min:
+                continue
+            if i_filt_max_weights and value > i_weight_max:
+                continue
+            count = count + 1
+            cumul = cumul + <cumul_t>value
+        o_histo[frame, bin_idx] += count
+        o_weighted_histo[frame, bin_idx] += cumul
+
+
+# =====================
+# =====================
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+def _histogramnd_lut_csr_count_fused(lut_t[::1] i_lut,
+                                     cnumpy.int64_t[::1] o_indptr):
+    # Stores the number of samples of bin i in o_indptr[i + 1]
+    cdef:
+        Py_ssize_t i
+
+    with nogil:
+        for i in range(i_lut.shape[0]):
+            if i_lut[i] >= 0:
+                o_indptr[i_lut[i] + 1] += 1
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+def _histogramnd_lut_csr_fill_fused(lut_t[::1] i_lut,
+                                    cnumpy.int64_t[::1] io_offsets,
+                                    index_t[::1] o_indices):
+    # io_offsets is the position of the next sample of each bin in o_indices
+    cdef:
+        Py_ssize_t i
+
+    with nogil:
+        for i in range(i_lut.shape[0]):
+            if i_lut[i] >= 0:
+                o_indices[io_offsets[i_lut[i]]] = i
+                io_offsets[i_lut[i]] += 1
 
 
 # =====================
@@ -364,14 +725,14 @@ def _histogramnd_get_lut_fused(sample_t[:] i_sample,
                                double[:] i_histo_range,
                                int[:] i_n_bins,
                                lut_t[:] o_lut,
-                               cnumpy.uint32_t[:] o_histo,
+                               cnumpy.uint32_t[:, ::1] o_histo,
                                bint last_bin_closed):
-
+    # o_histo holds one histogram per thread
     cdef:
         int i = 0
         long elem_idx = 0
-        long max_idx = 0
-        long lut_idx = -1
+        Py_ssize_t lut_idx = 0
+        int n_threads = o_histo.shape[0]
 
         # computed bin index (i_sample -> grid)
         long bin_idx = 0
@@ -387,49 +748,45 @@ def _histogramnd_get_lut_fused(sample_t[:] i_sample,
         g_max[i] = i_histo_range[2*i+1]
         bins_range[i] = g_max[i] - g_min[i]
 
-    elem_idx = 0 - i_n_dims
-    max_idx = i_n_elems * i_n_dims - i_n_dims
-
-    with nogil:
-        while elem_idx < max_idx:
-            elem_idx += i_n_dims
-            lut_idx += 1
-
-            bin_idx = 0
-
-            for i in range(i_n_dims):
-                elem_coord = i_sample[elem_idx+i]
-                # =====================
-                # Element is rejected if any of the following is NOT true :
-                # 1. coordinate is >= than the minimum value
-                # 2. coordinate is <= than the maximum value
-                # 3. coordinate==maximum value and last_bin_closed is True
-                # =====================
-                if elem_coord < g_min[i]:
+    for lut_idx in prange(i_n_elems, nogil=True, num_threads=n_threads,
+                          schedule='static'):
+        elem_idx = lut_idx * i_n_dims
+
+        bin_idx = 0
+
+        for i in range(i_n_dims):
+            elem_coord = i_sample[elem_idx+i]
+            # =====================
+            # Element is rejected if any of the following is NOT true :
+            # 1. coordinate is >= than the minimum value
+            # 2. coordinate is <= than the maximum value
+            # 3. coordinate==maximum value and last_bin_closed is True
+            # =====================
+            if elem_coord < g_min[i]:
+                bin_idx = -1
+                break
+
+            # Here we make the assumption that most of the time
+            # there will be more coordinates inside the grid interval
+            #  (one test)
+            #  than coordinates higher or equal to the max
+            #  (two tests)
+            if elem_coord < g_max[i]:
+                bin_idx = <long>(bin_idx * i_n_bins[i] +  # noqa
+                                 (((elem_coord - g_min[i]) * i_n_bins[i]) /
+                                  bins_range[i]))
+            else:
+                # if equal and the last bin is closed :
+                #  put it in the last bin
+                # else : discard
+                if last_bin_closed and elem_coord == g_max[i]:
+                    bin_idx = (bin_idx + 1) * i_n_bins[i] - 1
+                else:
                     bin_idx = -1
                     break
 
-                # Here we make the assumption that most of the time
-                # there will be more coordinates inside the grid interval
-                #  (one test)
-                #  than coordinates higher or equal to the max
-                #  (two tests)
-                if elem_coord < g_max[i]:
-                    bin_idx = <long>(bin_idx * i_n_bins[i] +  # noqa
-                                     (((elem_coord - g_min[i]) * i_n_bins[i]) /
-                                      bins_range[i]))
-                else:
-                    # if equal and the last bin is closed :
-                    #  put it in the last bin
-                    # else : discard
-                    if last_bin_closed and elem_coord == g_max[i]:
-                        bin_idx = (bin_idx + 1) * i_n_bins[i] - 1
-                    else:
-                        bin_idx = -1
-                        break
-
-            o_lut[lut_idx] = bin_idx
-            if bin_idx >= 0:
-                o_histo[bin_idx] += 1
+        o_lut[lut_idx] = bin_idx
+        if bin_idx >= 0:
+            o_histo[threadid(), bin_idx] += 1
 
     return 0
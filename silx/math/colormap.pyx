@@ -27,7 +27,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "16/05/2018"
+__date__ = "17/10/2026"
 
 
 import os
@@ -105,51 +105,68 @@ ctypedef double (*NormalizationFunction)(double) nogil
 cdef class Normalization:
     """Base class for colormap normalization"""
 
-    def apply(self, data, double vmin, double vmax):
+    def apply(self, data, double vmin, double vmax, out=None):
         """Apply normalization.
 
         :param Union[float,numpy.ndarray] data:
         :param float vmin: Lower bound of the range
         :param float vmax: Upper bound of the range
+        :param Union[numpy.ndarray,None] out:
+            Optional float64 array of the same shape as data where to
+            store the result.
         :rtype: Union[float,numpy.ndarray]
         """
-        cdef int length
-        cdef double[:] result
-
         if isinstance(data, numbers.Real):
             return self.apply_double(<double> data, vmin, vmax)
         else:
-            data = numpy.array(data, copy=False)
-            length = <int> data.size
-            result = numpy.empty(length, dtype=numpy.float64)
-            data1d = numpy.ravel(data)
-            for index in range(length):
-                result[index] = self.apply_double(
-                    <double> data1d[index], vmin, vmax)
-            return numpy.array(result).reshape(data.shape)
-
-    def revert(self, data, double vmin, double vmax):
+            return self._process_array(data, vmin, vmax, False, out)
+
+    def revert(self, data, double vmin, double vmax, out=None):
         """Revert normalization.
 
         :param Union[float,numpy.ndarray] data:
         :param float vmin: Lower bound of the range
         :param float vmax: Upper bound of the range
+        :param Union[numpy.ndarray,None] out:
+            Optional float64 array of the same shape as data where to
+            store the result.
         :rtype: Union[float,numpy.ndarray]
         """
-        cdef int length
-        cdef double[:] result
-
         if isinstance(data, numbers.Real):
             return self.revert_double(<double> data, vmin, vmax)
         else:
-            data = numpy.array(data, copy=False)
-            length = <int> data.size
-            result = numpy.empty(length, dtype=numpy.float64)
-            data1d = numpy.ravel(data)
-            for index in range(length):
-                result[index] = self.revert_double(
-                    <double> data1d[index], vmin, vmax)
-            return numpy.array(result).reshape(data.shape)
+            return self._process_array(data, vmin, vmax, True, out)
+
+    def _process_array(self, data, double vmin, double vmax, bint revert, out):
+        """Apply or revert normalization on an array.
+
+        :param numpy.ndarray data:
+        :param float vmin: Lower bound of the range
+        :param float vmax: Upper bound of the range
+        :param bool revert: True to revert normalization, False to apply it
+        :param Union[numpy.ndarray,None] out: Array where to store the result
+        :rtype: numpy.ndarray
+        """
+        data = _native_data(data)
+
+        if out is None:
+            out = numpy.empty(data.shape, dtype=numpy.float64)
+        else:
+            if out.shape != data.shape:
+                raise ValueError(
+                    'out shape %s does not match data shape %s' % (
+                        str(out.shape), str(data.shape)))
+            if out.dtype != numpy.float64 or not out.flags['C_CONTIGUOUS']:
+                raise ValueError('out must be a C-contiguous float64 array')
+
+        if data.size != 0:
+            _normalize(numpy.ravel(data),
+                       out.reshape(-1),
+                       self,
+                       vmin,
+                       vmax,
+                       revert)
+        return out
 
     cdef double apply_double(self, double value, double vmin, double vmax) nogil:
         """Apply normalization to a floating point value
@@ -286,6 +303,59 @@ cdef class PowerNormalization(Normalization):
             return vmin + (vmax - vmin) * value**(1.0/self.gamma)
 
 
+def _native_data(data):
+    """Returns data as an array of a supported native endian type.
+
+    float16 is converted to float32 and unsupported types (e.g., bool)
+    to float64, other types are returned without copy.
+
+    :param numpy.ndarray data:
+    :rtype: numpy.ndarray
+    """
+    data = numpy.array(data, copy=False)
+    native_endian_dtype = data.dtype.newbyteorder('N')
+    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
+        native_endian_dtype = "=f4"  # Use native float32 instead of float16
+    elif native_endian_dtype.kind not in 'uif':
+        native_endian_dtype = numpy.float64
+    return numpy.array(data, copy=False, dtype=native_endian_dtype)
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def _normalize(data_types[:] data,
+               double[::1] output,
+               Normalization normalization,
+               double vmin,
+               double vmax,
+               bint revert):
+    """Apply or revert normalization of data to output.
+
+    :param data: Input data
+    :param output: Array where to store the result, same size as data
+    :param normalization: Normalization to apply
+    :param vmin: Lower bound of the range
+    :param vmax: Upper bound of the range
+    :param revert: True to revert normalization, False to apply it
+    """
+    cdef Py_ssize_t index, length
+
+    length = data.shape[0]
+    assert output.shape[0] == length
+
+    with nogil:
+        if revert:
+            for index in prange(length, num_threads=DEFAULT_NUM_THREADS):
+                output[index] = normalization.revert_double(
+                    <double> data[index], vmin, vmax)
+        else:
+            for index in prange(length, num_threads=DEFAULT_NUM_THREADS):
+                output[index] = normalization.apply_double(
+                    <double> data[index], vmin, vmax)
+
+
 # Colormap
 
 @cython.wraparound(False)
@@ -503,11 +573,7 @@ def cmap(data,
     cdef Normalization norm
 
     # Make data a numpy array of native endian type (no need for contiguity)
-    data = numpy.array(data, copy=False)
-    native_endian_dtype = data.dtype.newbyteorder('N')
-    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
-        native_endian_dtype = "=f4"  # Use native float32 instead of float16
-    data = numpy.array(data, copy=False, dtype=native_endian_dtype)
+    data = _native_data(data)
 
     # Make colors a contiguous array of native endian type
     colors = numpy.array(colors, copy=False)
@@ -24,21 +24,40 @@
 # ###########################################################################*/
 """This module provides combination of statistics as single operation.
 
-For now it provides min/max (and optionally positive min) and indices
-of first occurrences (i.e., argmin/argmax) in a single pass.
+For now it provides min/max (and optionally positive min, mean and
+standard deviation) and indices of first occurrences (i.e., argmin/argmax)
+in a single pass, optionally along given axes or by chunks.
 """
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "24/04/2018"
+__date__ = "17/10/2026"
 
+import os
 cimport cython
-from .math_compatibility cimport isnan, isfinite, INFINITY
+from cython.parallel import prange
+from libc.math cimport sqrt
+from .math_compatibility cimport isnan, isfinite, INFINITY, NAN
 
 
+import numbers
+
 import numpy
 
 
+cdef int DEFAULT_NUM_THREADS
+if hasattr(os, 'sched_getaffinity'):
+    DEFAULT_NUM_THREADS = min(4, len(os.sched_getaffinity(0)))
+elif os.cpu_count() is not None:
+    DEFAULT_NUM_THREADS = min(4, os.cpu_count())
+else:  # Fallback
+    DEFAULT_NUM_THREADS = 1
+# Number of threads to use for the computation (initialized to up to 4)
+
+cdef Py_ssize_t PARALLEL_MIN_SIZE = 2 ** 16
+# Arrays smaller than this are processed by a single thread
+
+
 # All supported types
 ctypedef fused _number:
     float
@@ -67,7 +86,8 @@ class _MinMaxResult(object):
     """Object storing result from :func:`min_max`"""
 
     def __init__(self, minimum, min_pos, maximum,
-                 argmin, argmin_pos, argmax):
+                 argmin, argmin_pos, argmax,
+                 mean=None, std=None, count=None, has_zero=None):
         self._minimum = minimum
         self._min_positive = min_pos
         self._maximum = maximum
@@ -76,6 +96,11 @@ class _MinMaxResult(object):
         self._argmin_positive = argmin_pos
         self._argmax = argmax
 
+        self._mean = mean
+        self._std = std
+        self._count = count  # Number of values used for mean and std
+        self._has_zero = has_zero
+
     minimum = property(
         lambda self: self._minimum,
         doc="Minimum value of the array")
@@ -102,6 +127,22 @@ class _MinMaxResult(object):
 
         It is None if no value is strictly positive.
         It is the index of the first occurrence.""")
+    has_zero = property(
+        lambda self: self._has_zero,
+        doc="""Whether the array contains zeros
+
+        It is None if not computed, i.e., if min_positive was False.""")
+
+    mean = property(
+        lambda self: self._mean,
+        doc="""Mean of the array
+
+        It is None if not computed.""")
+    std = property(
+        lambda self: self._std,
+        doc="""Standard deviation of the array
+
+        It is None if not computed.""")
 
     def __getitem__(self, key):
         if key == 0:
@@ -115,155 +156,898 @@ class _MinMaxResult(object):
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _min_max(_number[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation including infinite values
+cdef void _min_max_core(_number *data,
+                        Py_ssize_t length,
+                        bint min_positive,
+                        _number *minimum,
+                        _number *min_pos,
+                        _number *maximum,
+                        Py_ssize_t *argmin,
+                        Py_ssize_t *argmin_pos,
+                        Py_ssize_t *argmax,
+                        unsigned char *has_zero) nogil:
+    """Compute min/max of data including infinite values.
 
-    See :func:`min_max` for documentation.
+    If all data is NaN, minimum and maximum are NaN.
+    If there is no strictly positive value, min_pos is 0.
+
+    :param data: Pointer to the data, length MUST be > 0
+    :param length: Number of elements in data
+    :param min_positive: True to compute min_pos, argmin_pos and has_zero
     """
     cdef:
-        _number value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
+        _number value, minimum_, min_pos_, maximum_
+        Py_ssize_t index = 0
+        Py_ssize_t min_index = 0
+        Py_ssize_t min_pos_index = 0
+        Py_ssize_t max_index = 0
+        unsigned char has_zero_ = 0
 
-    length = len(data)
+    # Init starting values
+    value = data[0]
+    minimum_ = value
+    maximum_ = value
+    if min_positive and value > 0:
+        min_pos_ = value
+    else:
+        min_pos_ = 0
 
-    if length == 0:
-        raise ValueError('Zero-size array')
+    if _number in _floating:
+        # For floating, loop until first not NaN value
+        for index in range(length):
+            value = data[index]
+            if not isnan(value):
+                minimum_ = value
+                min_index = index
+                maximum_ = value
+                max_index = index
+                break
 
-    with nogil:
-        # Init starting values
-        value = data[0]
-        minimum = value
-        maximum = value
-        if min_positive and value > 0:
-            min_pos = value
-        else:
-            min_pos = 0
+    if not min_positive:
+        for index in range(index, length):
+            value = data[index]
+            if value > maximum_:
+                maximum_ = value
+                max_index = index
+            elif value < minimum_:
+                minimum_ = value
+                min_index = index
 
-        if _number in _floating:
-            # For floating, loop until first not NaN value
-            for index in range(length):
-                value = data[index]
-                if not isnan(value):
-                    minimum = value
+    else:
+        # Loop until min_pos is defined
+        for index in range(index, length):
+            value = data[index]
+            if value > maximum_:
+                maximum_ = value
+                max_index = index
+            elif value < minimum_:
+                minimum_ = value
+                min_index = index
+
+            if value > 0:
+                min_pos_ = value
+                min_pos_index = index
+                break
+            elif value == 0:
+                has_zero_ = 1
+
+        # Loop until the end
+        for index in range(index + 1, length):
+            value = data[index]
+            if value > maximum_:
+                maximum_ = value
+                max_index = index
+            else:
+                if value < minimum_:
+                    minimum_ = value
                     min_index = index
-                    maximum = value
-                    max_index = index
-                    break
 
-        if not min_positive:
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
+                if 0 < value < min_pos_:
+                    min_pos_ = value
+                    min_pos_index = index
+
+            if value == 0:
+                has_zero_ = 1
+
+    minimum[0] = minimum_
+    min_pos[0] = min_pos_
+    maximum[0] = maximum_
+    argmin[0] = min_index
+    argmin_pos[0] = min_pos_index
+    argmax[0] = max_index
+    has_zero[0] = has_zero_
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _finite_min_max_core(_floating *data,
+                               Py_ssize_t length,
+                               bint min_positive,
+                               _floating *minimum,
+                               _floating *min_pos,
+                               _floating *maximum,
+                               Py_ssize_t *argmin,
+                               Py_ssize_t *argmin_pos,
+                               Py_ssize_t *argmax,
+                               unsigned char *has_zero) nogil:
+    """Compute min/max of data skipping infinite values.
+
+    If there is no finite value, minimum is +inf and maximum is -inf.
+    If there is no strictly positive value, min_pos is +inf.
+
+    :param data: Pointer to the data
+    :param length: Number of elements in data
+    :param min_positive: True to compute min_pos, argmin_pos and has_zero
+    """
+    cdef:
+        _floating value, minimum_, min_pos_, maximum_
+        Py_ssize_t index = 0
+        Py_ssize_t min_index = 0
+        Py_ssize_t min_pos_index = 0
+        Py_ssize_t max_index = 0
+        unsigned char has_zero_ = 0
+
+    minimum_ = INFINITY
+    maximum_ = -INFINITY
+    min_pos_ = INFINITY
+
+    if not min_positive:
+        for index in range(length):
+            value = data[index]
+            if isfinite(value):
+                if value > maximum_:
+                    maximum_ = value
                     max_index = index
-                elif value < minimum:
-                    minimum = value
+                if value < minimum_:
+                    minimum_ = value
                     min_index = index
 
-        else:
-            # Loop until min_pos is defined
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
+    else:
+        for index in range(length):
+            value = data[index]
+            if isfinite(value):
+                if value > maximum_:
+                    maximum_ = value
                     max_index = index
-                elif value < minimum:
-                    minimum = value
+                if value < minimum_:
+                    minimum_ = value
                     min_index = index
 
-                if value > 0:
-                    min_pos = value
+                if 0. < value < min_pos_:
+                    min_pos_ = value
                     min_pos_index = index
-                    break
+                elif value == 0.:
+                    has_zero_ = 1
 
-            # Loop until the end
-            for index in range(index + 1, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
+    minimum[0] = minimum_
+    min_pos[0] = min_pos_
+    maximum[0] = maximum_
+    argmin[0] = min_index
+    argmin_pos[0] = min_pos_index
+    argmax[0] = max_index
+    has_zero[0] = has_zero_
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _min_max_stats_core(_number *data,
+                              Py_ssize_t length,
+                              bint min_positive,
+                              bint finite,
+                              _number *minimum,
+                              _number *min_pos,
+                              _number *maximum,
+                              Py_ssize_t *argmin,
+                              Py_ssize_t *argmin_pos,
+                              Py_ssize_t *argmax,
+                              unsigned char *has_zero,
+                              Py_ssize_t *count,
+                              double *mean,
+                              double *m2) nogil:
+    """Compute min/max, mean and sum of squared deviations in one pass.
+
+    Mean and deviations are computed from data shifted by its first value
+    to limit the loss of precision.
+
+    Returned min/max follow the conventions of :func:`_min_max_core` or of
+    :func:`_finite_min_max_core` if finite is True.
+
+    :param data: Pointer to the data, length MUST be > 0
+    :param length: Number of elements in data
+    :param min_positive: True to compute min_pos, argmin_pos and has_zero
+    :param finite: True to only take finite values into account
+    """
+    cdef:
+        _number value, minimum_, min_pos_, maximum_
+        unsigned char has_zero_ = 0
+        Py_ssize_t index
+        Py_ssize_t count_ = 0
+        Py_ssize_t nb_finite = 0
+        Py_ssize_t nb_positive_inf = 0
+        Py_ssize_t nb_negative_inf = 0
+        Py_ssize_t min_index = 0
+        Py_ssize_t min_pos_index = 0
+        Py_ssize_t max_index = 0
+        double shift = 0., delta, sum_ = 0., sum_squares = 0.
+
+    minimum_ = data[0]
+    maximum_ = data[0]
+    min_pos_ = 0
+    if _number in _floating:
+        if finite:
+            minimum_ = INFINITY
+            maximum_ = -INFINITY
+            min_pos_ = INFINITY
+
+    for index in range(length):
+        value = data[index]
+        if _number in _floating:
+            if finite:
+                if not isfinite(value):
+                    continue
+            elif isnan(value):
+                continue
+
+        if count_ == 0:
+            minimum_ = value
+            min_index = index
+            maximum_ = value
+            max_index = index
+        elif value > maximum_:
+            maximum_ = value
+            max_index = index
+        elif value < minimum_:
+            minimum_ = value
+            min_index = index
+
+        if min_positive and value > 0 and (min_pos_ <= 0 or value < min_pos_):
+            min_pos_ = value
+            min_pos_index = index
+        elif min_positive and value == 0:
+            has_zero_ = 1
+
+        count_ += 1
+
+        if _number in _floating:
+            if not isfinite(value):  # Only when finite is False
+                if value > 0:
+                    nb_positive_inf += 1
                 else:
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
+                    nb_negative_inf += 1
+                continue
+
+        if nb_finite == 0:
+            shift = <double> value
+        nb_finite += 1
+        delta = <double> value - shift
+        sum_ += delta
+        sum_squares += delta * delta
 
-                    if 0 < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
+    minimum[0] = minimum_
+    min_pos[0] = min_pos_
+    maximum[0] = maximum_
+    argmin[0] = min_index
+    argmin_pos[0] = min_pos_index
+    argmax[0] = max_index
+    has_zero[0] = has_zero_
+    count[0] = count_
+    if nb_positive_inf > 0 or nb_negative_inf > 0:
+        if nb_positive_inf > 0 and nb_negative_inf > 0:
+            mean[0] = NAN
+        elif nb_positive_inf > 0:
+            mean[0] = INFINITY
+        else:
+            mean[0] = -INFINITY
+        m2[0] = NAN
+    elif nb_finite == 0:
+        mean[0] = 0.
+        m2[0] = 0.
+    else:
+        mean[0] = shift + sum_ / nb_finite
+        m2[0] = sum_squares - sum_ * sum_ / nb_finite
+        if m2[0] < 0.:  # Rounding errors
+            m2[0] = 0.
 
-    return _MinMaxResult(minimum,
-                         min_pos if min_pos > 0 else None,
-                         maximum,
-                         min_index,
-                         min_pos_index if min_pos > 0 else None,
-                         max_index)
+
+cdef inline bint _isnan_value(_number value) nogil:
+    """Returns True if value is NaN"""
+    if _number in _floating:
+        return isnan(value)
+    else:
+        return False
+
+
+@cython.cdivision(True)
+cdef void _merge(_number *minimum,
+                 _number *min_pos,
+                 _number *maximum,
+                 Py_ssize_t *argmin,
+                 Py_ssize_t *argmin_pos,
+                 Py_ssize_t *argmax,
+                 unsigned char *has_zero,
+                 Py_ssize_t *count,
+                 double *mean,
+                 double *m2,
+                 _number other_minimum,
+                 _number other_min_pos,
+                 _number other_maximum,
+                 Py_ssize_t other_argmin,
+                 Py_ssize_t other_argmin_pos,
+                 Py_ssize_t other_argmax,
+                 unsigned char other_has_zero,
+                 Py_ssize_t other_count,
+                 double other_mean,
+                 double other_m2) nogil:
+    """Merge the result of a following part of the data into a result.
+
+    It supports the conventions of all the min/max core functions.
+    Indices MUST be relative to the same origin.
+    """
+    cdef Py_ssize_t total
+    cdef double delta
+
+    if ((_isnan_value(minimum[0]) and not _isnan_value(other_minimum)) or
+            other_minimum < minimum[0]):
+        minimum[0] = other_minimum
+        argmin[0] = other_argmin
+
+    if ((_isnan_value(maximum[0]) and not _isnan_value(other_maximum)) or
+            other_maximum > maximum[0]):
+        maximum[0] = other_maximum
+        argmax[0] = other_argmax
+
+    if other_min_pos > 0 and (min_pos[0] == 0 or other_min_pos < min_pos[0]):
+        min_pos[0] = other_min_pos
+        argmin_pos[0] = other_argmin_pos
+
+    if other_has_zero:
+        has_zero[0] = 1
+
+    # Merge statistics (Chan et al.)
+    if other_count > 0:
+        if count[0] == 0:
+            mean[0] = other_mean
+            m2[0] = other_m2
+        elif not isfinite(mean[0]) or not isfinite(other_mean):
+            mean[0] = mean[0] + other_mean  # Handles infinite values
+            m2[0] = NAN
+        else:
+            total = count[0] + other_count
+            delta = other_mean - mean[0]
+            mean[0] += delta * other_count / total
+            m2[0] += other_m2 + delta * delta * count[0] * other_count / total
+        count[0] += other_count
+
+
+cdef void _compute(_number *data,
+                   Py_ssize_t length,
+                   bint min_positive,
+                   bint finite,
+                   bint stats,
+                   _number *minimum,
+                   _number *min_pos,
+                   _number *maximum,
+                   Py_ssize_t *argmin,
+                   Py_ssize_t *argmin_pos,
+                   Py_ssize_t *argmax,
+                   unsigned char *has_zero,
+                   Py_ssize_t *count,
+                   double *mean,
+                   double *m2) nogil:
+    """Call the right min/max core function depending on the arguments"""
+    if stats:
+        _min_max_stats_core(data, length, min_positive, finite,
+                            minimum, min_pos, maximum,
+                            argmin, argmin_pos, argmax, has_zero,
+                            count, mean, m2)
+        return
+
+    count[0] = 0
+    mean[0] = 0.
+    m2[0] = 0.
+    if _number in _floating:
+        if finite:
+            _finite_min_max_core(data, length, min_positive,
+                                 minimum, min_pos, maximum,
+                                 argmin, argmin_pos, argmax, has_zero)
+            return
+
+    _min_max_core(data, length, min_positive,
+                  minimum, min_pos, maximum,
+                  argmin, argmin_pos, argmax, has_zero)
 
 
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _finite_min_max(_floating[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation for floats skipping infinite values
+@cython.cdivision(True)
+def _min_max(_number[::1] data,
+             bint min_positive=False,
+             bint finite=False,
+             bint stats=False):
+    """:func:`min_max` implementation
+
+    The data is split in parts processed in parallel and then merged.
 
     See :func:`min_max` for documentation.
     """
     cdef:
-        _floating value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
+        _number[::1] minimum, min_pos, maximum
+        Py_ssize_t[::1] min_index, min_pos_index, max_index, count
+        unsigned char[::1] has_zero
+        double[::1] mean, m2
+        Py_ssize_t length, part_size, start, part
+        int nb_parts
 
     length = len(data)
 
     if length == 0:
         raise ValueError('Zero-size array')
 
+    nb_parts = 1 if length < PARALLEL_MIN_SIZE else DEFAULT_NUM_THREADS
+    part_size = (length + nb_parts - 1) // nb_parts
+    nb_parts = <int> ((length + part_size - 1) // part_size)
+
+    dtype = numpy.array(data, copy=False).dtype
+    minimum = numpy.empty((nb_parts,), dtype=dtype)
+    min_pos = numpy.empty((nb_parts,), dtype=dtype)
+    maximum = numpy.empty((nb_parts,), dtype=dtype)
+    min_index = numpy.empty((nb_parts,), dtype=numpy.intp)
+    min_pos_index = numpy.empty((nb_parts,), dtype=numpy.intp)
+    max_index = numpy.empty((nb_parts,), dtype=numpy.intp)
+    has_zero = numpy.empty((nb_parts,), dtype=numpy.uint8)
+    count = numpy.empty((nb_parts,), dtype=numpy.intp)
+    mean = numpy.empty((nb_parts,), dtype=numpy.float64)
+    m2 = numpy.empty((nb_parts,), dtype=numpy.float64)
+
+    with nogil:
+        for part in prange(nb_parts, num_threads=nb_parts):
+            start = part * part_size
+            _compute(&data[start], min(part_size, length - start),
+                     min_positive, finite, stats,
+                     &minimum[part], &min_pos[part], &maximum[part],
+                     &min_index[part], &min_pos_index[part], &max_index[part],
+                     &has_zero[part], &count[part], &mean[part], &m2[part])
+            min_index[part] += start
+            min_pos_index[part] += start
+            max_index[part] += start
+
+        # Merge parts in order to keep indices of first occurrence
+        for part in range(1, nb_parts):
+            _merge(&minimum[0], &min_pos[0], &maximum[0],
+                   &min_index[0], &min_pos_index[0], &max_index[0],
+                   &has_zero[0], &count[0], &mean[0], &m2[0],
+                   minimum[part], min_pos[part], maximum[part],
+                   min_index[part], min_pos_index[part], max_index[part],
+                   has_zero[part], count[part], mean[part], m2[part])
+
+    found = True
+    found_pos = min_pos[0] > 0
+    if _number in _floating:
+        if finite:
+            found = isfinite(minimum[0])
+            found_pos = isfinite(min_pos[0])
+
+    if not stats:
+        mean_result, std_result, count_result = None, None, None
+    else:
+        count_result = count[0]
+        if count_result > 0:
+            mean_result = mean[0]
+            std_result = sqrt(m2[0] / count_result)
+        elif found:
+            mean_result, std_result = numpy.nan, numpy.nan
+        else:
+            mean_result, std_result = None, None
+
+    return _MinMaxResult(minimum[0] if found else None,
+                         min_pos[0] if found_pos else None,
+                         maximum[0] if found else None,
+                         min_index[0] if found else None,
+                         min_pos_index[0] if found_pos else None,
+                         max_index[0] if found else None,
+                         mean_result,
+                         std_result,
+                         count_result,
+                         bool(has_zero[0]) if min_positive else None)
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _min_max_rows(_number[:, ::1] data,
+                  bint min_positive=False,
+                  bint finite=False,
+                  bint stats=False):
+    """:func:`min_max` implementation computing min/max of each row
+
+    Rows are processed in parallel.
+
+    See :func:`min_max` for documentation.
+
+    :returns: (minimum, min_positive, maximum,
+               argmin, argmin_positive, argmax,
+               mean, std, count, has_zero) arrays
+    """
+    cdef:
+        _number[::1] minimum, min_pos, maximum
+        Py_ssize_t[::1] min_index, min_pos_index, max_index, count
+        unsigned char[::1] has_zero
+        double[::1] mean, m2
+        Py_ssize_t nb_rows, length, row
+
+    nb_rows = data.shape[0]
+    length = data.shape[1]
+
+    if length == 0:
+        raise ValueError('Zero-size array')
+
+    dtype = numpy.array(data, copy=False).dtype
+    minimum = numpy.empty((nb_rows,), dtype=dtype)
+    min_pos = numpy.empty((nb_rows,), dtype=dtype)
+    maximum = numpy.empty((nb_rows,), dtype=dtype)
+    min_index = numpy.empty((nb_rows,), dtype=numpy.intp)
+    min_pos_index = numpy.empty((nb_rows,), dtype=numpy.intp)
+    max_index = numpy.empty((nb_rows,), dtype=numpy.intp)
+    has_zero = numpy.empty((nb_rows,), dtype=numpy.uint8)
+    count = numpy.empty((nb_rows,), dtype=numpy.intp)
+    mean = numpy.empty((nb_rows,), dtype=numpy.float64)
+    m2 = numpy.empty((nb_rows,), dtype=numpy.float64)
+
     with nogil:
-        minimum = INFINITY
-        maximum = -INFINITY
-        min_pos = INFINITY
-
-        if not min_positive:
-            for index in range(length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
+        for row in prange(nb_rows, num_threads=DEFAULT_NUM_THREADS):
+            _compute(&data[row, 0], length, min_positive, finite, stats,
+                     &minimum[row], &min_pos[row], &maximum[row],
+                     &min_index[row], &min_pos_index[row], &max_index[row],
+                     &has_zero[row], &count[row], &mean[row], &m2[row])
+
+    minimum_array = numpy.array(minimum, copy=False)
+    min_pos_array = numpy.array(min_pos, copy=False)
+    maximum_array = numpy.array(maximum, copy=False)
+    argmin_array = numpy.array(min_index, copy=False)
+    argmin_pos_array = numpy.array(min_pos_index, copy=False)
+    argmax_array = numpy.array(max_index, copy=False)
+
+    # Use NaN and -1 for rows without result
+    if finite and dtype.kind == 'f':
+        missing = numpy.logical_not(numpy.isfinite(minimum_array))
+        minimum_array[missing] = numpy.nan
+        maximum_array[missing] = numpy.nan
+        argmin_array[missing] = -1
+        argmax_array[missing] = -1
+        missing_pos = numpy.logical_not(numpy.isfinite(min_pos_array))
+    else:
+        missing_pos = numpy.logical_not(min_pos_array > 0)
+    min_pos_array[missing_pos] = 0
+    argmin_pos_array[missing_pos] = -1
+
+    if not min_positive:
+        min_pos_array, argmin_pos_array = None, None
+        has_zero_array = None
+    else:
+        has_zero_array = numpy.array(has_zero, copy=False).astype(numpy.bool_)
+
+    if not stats:
+        mean_array, std_array, count_array = None, None, None
+    else:
+        count_array = numpy.array(count, copy=False)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            mean_array = numpy.where(
+                count_array > 0, numpy.array(mean, copy=False), numpy.nan)
+            std_array = numpy.sqrt(numpy.array(m2, copy=False) / count_array)
+
+    return (minimum_array, min_pos_array, maximum_array,
+            argmin_array, argmin_pos_array, argmax_array,
+            mean_array, std_array, count_array, has_zero_array)
+
+
+def _native_array(data):
+    """Returns data as a contiguous array of native supported type.
+
+    :param data: Array-like dataset
+    :rtype: numpy.ndarray
+    """
+    data = numpy.array(data, copy=False)
+    native_endian_dtype = data.dtype.newbyteorder('N')
+    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
+        # Use native float32 instead of float16
+        native_endian_dtype = "=f4"
+    return numpy.ascontiguousarray(data, dtype=native_endian_dtype)
+
+
+def _normalize_axis(axis, ndim):
+    """Returns axis as a sorted tuple of positive indices.
+
+    :param Union[int,List[int]] axis: Axis or axes
+    :param int ndim: Number of dimensions of the data
+    :rtype: Tuple[int]
+    :raises ValueError: For out of range axis
+    """
+    if isinstance(axis, numbers.Integral):
+        axis = (axis,)
+    normalized = set()
+    for index in axis:
+        if not -ndim <= index < ndim:
+            raise ValueError("axis %d is out of bounds for array of dimension %d" % (index, ndim))
+        normalized.add(index % ndim)
+    return tuple(sorted(normalized))
+
+
+def _is_dataset(data):
+    """Returns True if data looks like a h5py-like dataset.
+
+    :param data: Array-like dataset
+    :rtype: bool
+    """
+    return (not isinstance(data, numpy.ndarray) and
+            hasattr(data, 'shape') and
+            hasattr(data, 'dtype') and
+            hasattr(data, 'chunks'))
+
+
+_DATASET_BLOCK_SIZE = 64 * 1024 ** 2
+"""Size in bytes of blocks read from datasets by :func:`min_max`"""
+
+
+def _dataset_blocks(dataset, block_size=None):
+    """Generator of blocks of a dataset along its first dimension.
+
+    The blocks are aligned on the dataset chunks along the first dimension.
+
+    :param dataset: h5py-like dataset
+    :param Union[int,None] block_size:
+        Approximate size in bytes of the blocks.
+        Default: :data:`_DATASET_BLOCK_SIZE`
+    """
+    if block_size is None:
+        block_size = _DATASET_BLOCK_SIZE
+
+    shape = dataset.shape
+    if len(shape) == 0:
+        yield dataset[()]
+        return
+
+    step = dataset.chunks[0] if dataset.chunks else 1
+    row_size = dataset.dtype.itemsize * int(numpy.prod(shape[1:]))
+    nb_rows = max(1, block_size // max(1, row_size * step)) * step
+    for start in range(0, shape[0], nb_rows):
+        yield dataset[start:start + nb_rows]
+
+
+def _is_nan(value):
+    """Returns True if value is NaN, False otherwise (including None)"""
+    return value is not None and value != value
+
+
+def _merge_stats(first, second):
+    """Merge mean and std of results of :func:`min_max` computed on 2 parts.
+
+    :param _MinMaxResult first: Result for the first part
+    :param _MinMaxResult second: Result for the second part
+    :returns: (mean, std, count) of the merged parts as arrays,
+        mean and std are NaN if count is 0.
+    """
+    def stats(result):
+        count = numpy.asarray(result._count)
+        mean = numpy.asarray(
+            numpy.nan if result.mean is None else result.mean,
+            dtype=numpy.float64)
+        std = numpy.asarray(
+            numpy.nan if result.std is None else result.std,
+            dtype=numpy.float64)
+        return count, numpy.where(count > 0, mean, 0.), numpy.where(count > 0, std, 0.)
+
+    count1, mean1, std1 = stats(first)
+    count2, mean2, std2 = stats(second)
+    count = count1 + count2
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        delta = mean2 - mean1
+        mean = numpy.where(
+            numpy.logical_and(numpy.isfinite(mean1), numpy.isfinite(mean2)),
+            mean1 + delta * count2 / count,
+            mean1 + mean2)  # Handles infinite values
+        m2 = (std1 ** 2 * count1 + std2 ** 2 * count2 +
+              delta ** 2 * count1 * count2 / count)
+        std = numpy.sqrt(m2 / count)
+    return mean, std, count
+
+
+def _merge_results(first, second, offset):
+    """Merge results of :func:`min_max` computed on 2 consecutive parts.
+
+    :param _MinMaxResult first: Result for the first part
+    :param _MinMaxResult second: Result for the second part
+    :param int offset: Offset of the first index of the second part
+    :rtype: _MinMaxResult
+    """
+    minimum, argmin = first.minimum, first.argmin
+    if second.minimum is not None and not _is_nan(second.minimum):
+        if minimum is None or _is_nan(minimum) or second.minimum < minimum:
+            minimum, argmin = second.minimum, second.argmin + offset
+
+    maximum, argmax = first.maximum, first.argmax
+    if second.maximum is not None and not _is_nan(second.maximum):
+        if maximum is None or _is_nan(maximum) or second.maximum > maximum:
+            maximum, argmax = second.maximum, second.argmax + offset
+
+    min_pos, argmin_pos = first.min_positive, first.argmin_positive
+    if second.min_positive is not None:
+        if min_pos is None or second.min_positive < min_pos:
+            min_pos = second.min_positive
+            argmin_pos = second.argmin_positive + offset
+
+    has_zero = first.has_zero
+    if has_zero is not None:
+        has_zero = has_zero or second.has_zero
+
+    if first._count is None:
+        mean, std, count = None, None, None
+    else:
+        mean, std, count = _merge_stats(first, second)
+        count = int(count)
+        if count == 0 and first.mean is None and second.mean is None:
+            mean, std = None, None
+        else:
+            mean, std = float(mean), float(std)
+
+    return _MinMaxResult(minimum, min_pos, maximum,
+                         argmin, argmin_pos, argmax,
+                         mean, std, count, has_zero)
+
+
+def _merge_array_results(first, second, offset):
+    """Merge results of :func:`min_max` with axis computed on 2 parts.
+
+    :param _MinMaxResult first: Result for the first part
+    :param _MinMaxResult second: Result for the second part
+    :param int offset: Offset of the first index of the second part
+    :rtype: _MinMaxResult
+    """
+    minimum = numpy.array(first.minimum, copy=True)
+    maximum = numpy.array(first.maximum, copy=True)
+    argmin = numpy.array(first.argmin, copy=True)
+    argmax = numpy.array(first.argmax, copy=True)
+
+    first_nan = minimum != minimum
+    second_nan = second.minimum != second.minimum
+    with numpy.errstate(invalid='ignore'):
+        take_second = numpy.logical_or(
+            numpy.logical_and(first_nan, ~second_nan),
+            second.minimum < minimum)
+    minimum[take_second] = second.minimum[take_second]
+    argmin[take_second] = second.argmin[take_second] + offset
+
+    with numpy.errstate(invalid='ignore'):
+        take_second = numpy.logical_or(
+            numpy.logical_and(first_nan, ~second_nan),
+            second.maximum > maximum)
+    maximum[take_second] = second.maximum[take_second]
+    argmax[take_second] = second.argmax[take_second] + offset
+
+    if first.min_positive is None:
+        min_pos, argmin_pos = None, None
+    else:
+        min_pos = numpy.array(first.min_positive, copy=True)
+        argmin_pos = numpy.array(first.argmin_positive, copy=True)
+        with numpy.errstate(invalid='ignore'):
+            take_second = numpy.logical_and(
+                second.min_positive > 0,
+                numpy.logical_or(min_pos == 0, second.min_positive < min_pos))
+        min_pos[take_second] = second.min_positive[take_second]
+        argmin_pos[take_second] = second.argmin_positive[take_second] + offset
+
+    if first.has_zero is None:
+        has_zero = None
+    else:
+        has_zero = numpy.logical_or(first.has_zero, second.has_zero)
+
+    if first._count is None:
+        mean, std, count = None, None, None
+    else:
+        mean, std, count = _merge_stats(first, second)
+
+    return _MinMaxResult(minimum, min_pos, maximum,
+                         argmin, argmin_pos, argmax,
+                         mean, std, count, has_zero)
+
+
+def chunked_min_max(chunks,
+                    bint min_positive=False,
+                    bint finite=False,
+                    axis=None,
+                    bint stats=False):
+    """Returns min, max and optionally strictly positive min of chunked data.
+
+    This allows to compute :func:`min_max` of data which does not fit
+    in memory by providing it as consecutive chunks.
+
+    If *axis* is None, chunks can be of any shape and
+    indices are those in the concatenation of the flattened chunks.
+    Otherwise, chunks are the consecutive parts of the data
+    along its first dimension.
+
+    >>> import numpy
+    >>> chunks = (numpy.arange(10), numpy.arange(-5, 5))
+    >>> result = chunked_min_max(chunks)
+    >>> result.minimum, result.argmin
+    (-5, 10)
+
+    :param Iterable chunks: Iterable of array-like chunks
+    :param bool min_positive: True to compute the positive min and argmin
+                              Default: False.
+    :param bool finite: True to compute min/max from finite data only
+                        Default: False.
+    :param Union[int,List[int],None] axis:
+        Axis or axes along which to compute min/max, see :func:`min_max`.
+    :param bool stats: True to also compute mean and standard deviation
+                       Default: False.
+    :returns: An object with minimum, maximum and min_positive attributes
+              and the indices of first occurrence: argmin, argmax and
+              argmin_positive attributes. See :func:`min_max`.
+    :raises: ValueError if data is empty
+    """
+    cdef Py_ssize_t offset = 0
+
+    result = None
+    concatenated = []
+    for chunk in chunks:
+        chunk = numpy.array(chunk, copy=False)
+        if chunk.size == 0:
+            continue
+
+        if axis is None:
+            partial = min_max(chunk, min_positive, finite, stats=stats)
+            if result is None:
+                result = partial
+            else:
+                result = _merge_results(result, partial, offset)
+            offset += chunk.size
 
         else:
-            for index in range(index, length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
-
-                    if 0. < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
-
-    return _MinMaxResult(minimum if isfinite(minimum) else None,
-                         min_pos if isfinite(min_pos) else None,
-                         maximum if isfinite(maximum) else None,
-                         min_index if isfinite(minimum) else None,
-                         min_pos_index if isfinite(min_pos) else None,
-                         max_index if isfinite(maximum) else None)
-
-
-def min_max(data not None, bint min_positive=False, bint finite=False):
+            normalized_axis = _normalize_axis(axis, chunk.ndim)
+            partial = min_max(
+                chunk, min_positive, finite, normalized_axis, stats)
+            if 0 not in normalized_axis:  # Results are along the first axis
+                concatenated.append(partial)
+                continue
+
+            if result is None:
+                result = partial
+            else:
+                result = _merge_array_results(result, partial, offset)
+            # Offset in the flattened reduced dimensions
+            offset += int(numpy.prod(
+                [chunk.shape[index] for index in normalized_axis]))
+
+    if concatenated:
+        def concatenate(name):
+            arrays = [getattr(partial, name) for partial in concatenated]
+            return None if arrays[0] is None else numpy.concatenate(arrays)
+
+        result = _MinMaxResult(concatenate('minimum'),
+                               concatenate('min_positive'),
+                               concatenate('maximum'),
+                               concatenate('argmin'),
+                               concatenate('argmin_positive'),
+                               concatenate('argmax'),
+                               concatenate('mean'),
+                               concatenate('std'),
+                               concatenate('_count'),
+                               concatenate('has_zero'))
+
+    if result is None:
+        raise ValueError('Zero-size array')
+    return result
+
+
+def min_max(data not None,
+            bint min_positive=False,
+            bint finite=False,
+            axis=None,
+            bint stats=False):
     """Returns min, max and optionally strictly positive min of data.
 
     It also computes the indices of first occurrence of min/max.
@@ -305,25 +1089,69 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
     Then, all result fields (include minimum and maximum) can be None
     when all data is infinity or NaN.
 
+    If *axis* is provided, min/max information is computed along
+    the given axis or axes and the result fields are arrays with the shape
+    of the data without those axes.
+    Indices are then those in the flattened reduced axes.
+    Missing values are represented by NaN for minimum and maximum,
+    0 for min_positive and -1 for indices.
+
+    >>> stack = numpy.arange(24).reshape(2, 3, 4)
+    >>> result = min_max(stack, axis=(1, 2))  # min/max of each frame
+    >>> result.minimum, result.maximum
+    array([ 0, 12]), array([11, 23])
+
+    If *stats* is True, the mean and the standard deviation are computed
+    in the same pass, from the values used for min/max
+    (i.e., ignoring NaNs and, if *finite* is True, infinite values).
+
+    >>> result = min_max(data, stats=True)
+    >>> result.mean, result.std
+    4.5, 2.8722813232690143
+
+    The computation is done in parallel for large arrays.
+
+    h5py-like datasets are read by blocks aligned on their chunks
+    along the first dimension rather than loaded at once,
+    see :func:`chunked_min_max`.
+
     :param data: Array-like dataset
     :param bool min_positive: True to compute the positive min and argmin
                               Default: False.
     :param bool finite: True to compute min/max from finite data only
                         Default: False.
+    :param Union[int,List[int],None] axis:
+        Axis or axes along which to compute min/max.
+        Default: None for min/max of the whole data.
+    :param bool stats: True to also compute mean and standard deviation
+                       Default: False.
     :returns: An object with minimum, maximum and min_positive attributes
               and the indices of first occurrence in the flattened data:
               argmin, argmax and argmin_positive attributes.
               If all data is <= 0 or min_positive argument is False, then
               min_positive and argmin_positive are None.
+              If min_positive is True, it also has a has_zero attribute
+              telling whether data contains zeros.
+              If stats is True, it also has mean and std attributes.
     :raises: ValueError if data is empty
     """
-    data = numpy.array(data, copy=False)
-    native_endian_dtype = data.dtype.newbyteorder('N')
-    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
-        # Use native float32 instead of float16
-        native_endian_dtype = "=f4"
-    data = numpy.ascontiguousarray(data, dtype=native_endian_dtype).ravel()
-    if finite and data.dtype.kind == 'f':
-        return _finite_min_max(data, min_positive)
-    else:
-        return _min_max(data, min_positive)
+    if _is_dataset(data):
+        return chunked_min_max(
+            _dataset_blocks(data), min_positive, finite, axis, stats)
+
+    data = _native_array(data)
+
+    if axis is None:
+        return _min_max(data.ravel(), min_positive, finite, stats)
+
+    # Move reduced axes to the end and compute min/max of each row
+    axis = _normalize_axis(axis, data.ndim)
+    kept_axis = tuple(index for index in range(data.ndim) if index not in axis)
+    shape = tuple(data.shape[index] for index in kept_axis)
+    reduced_size = int(numpy.prod([data.shape[index] for index in axis]))
+    data = numpy.ascontiguousarray(numpy.transpose(data, kept_axis + axis))
+    data = data.reshape(int(numpy.prod(shape)), reduced_size)
+
+    results = _min_max_rows(data, min_positive, finite, stats)
+    return _MinMaxResult(
+        *[None if array is None else array.reshape(shape) for array in results])
@@ -55,7 +55,7 @@ from . import bgtheories
 
 __authors__ = ["V.A. Sole", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "16/01/2017"
+__date__ = "17/10/2026"
 
 _logger = logging.getLogger(__name__)
 
@@ -841,13 +841,18 @@ class FitManager(object):
         ywork = self.ydata[self._finite_mask]
         xwork = self.xdata[self._finite_mask]
 
+        if self.theories[self.selectedtheory].derivative is not None:
+            model_deriv = self.fitderivative
+        else:
+            model_deriv = None
+
         try:
             params, covariance_matrix, infodict = leastsq(
                     self.fitfunction,  # bg + actual model function
                     xwork, ywork, param_val,
                     sigma=self.sigmay,
                     constraints=param_constraints,
-                    model_deriv=self.theories[self.selectedtheory].derivative,
+                    model_deriv=model_deriv,
                     full_output=True, left_derivative=True)
         except LinAlgError:
             self.state = 'Fit failed'
@@ -902,6 +907,41 @@ class FitManager(object):
 
         return result
 
+    def fitderivative(self, x, pars, index):
+        """Derivative of :meth:`fitfunction` with respect to a parameter.
+
+        The derivative of the selected fit model function is used for the
+        peak function parameters. The derivative with respect to background
+        parameters is computed numerically, using only the background
+        function.
+
+        :param x: Independent variable where the derivative is calculated.
+        :param pars: Sequence of all fit parameters, background parameters
+            first.
+        :param int index: Index in ``pars`` of the parameter with respect to
+            which the derivative is calculated.
+        :return: Array of derivatives at each ``x`` coordinate.
+        """
+        if self.selectedbg is not None:
+            nb_bg_pars = len(self.bgtheories[self.selectedbg].parameters)
+        else:
+            nb_bg_pars = 0
+
+        if index >= nb_bg_pars:
+            derivative = self.theories[self.selectedtheory].derivative
+            return derivative(x, pars[nb_bg_pars:], index - nb_bg_pars)
+
+        # central difference on the background function only
+        bgfun = self.bgtheories[self.selectedbg].function
+        bg_pars = numpy.array(pars[0:nb_bg_pars], dtype=numpy.float64)
+        delta = (bg_pars[index] + (bg_pars[index] == 0.)) * \
+            numpy.sqrt(numpy.finfo(numpy.float64).eps)
+        bg_pars[index] += delta
+        f1 = bgfun(x, self.ydata, *bg_pars)
+        bg_pars[index] -= 2 * delta
+        f2 = bgfun(x, self.ydata, *bg_pars)
+        return (f1 - f2) / (2.0 * delta)
+
     def estimate_bkg(self, x, y):
         """Estimate background parameters using the function defined in
         the current fit configuration.
@@ -93,7 +93,7 @@ _logger = logging.getLogger(__name__)
 
 __authors__ = ["V.A. Sole", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "15/05/2017"
+__date__ = "17/10/2026"
 
 
 DEFAULT_CONFIG = {
@@ -198,6 +198,20 @@ class FitTheories(object):
                                        gaussian_term=g_term, st_term=st_term,
                                        lt_term=lt_term, step_term=step_term)
 
+    def ahypermet_derivative(self, x, pars, index):
+        """
+        Derivative of :meth:`ahypermet` with respect to ``pars[index]``,
+        wrapping :func:`silx.math.fit.functions.sum_ahypermet_derivative`.
+        """
+        g_term = self.config['HypermetTails'] & 1
+        st_term = (self.config['HypermetTails'] >> 1) & 1
+        lt_term = (self.config['HypermetTails'] >> 2) & 1
+        step_term = (self.config['HypermetTails'] >> 3) & 1
+        return functions.sum_ahypermet_derivative(
+            x, pars, index,
+            gaussian_term=g_term, st_term=st_term,
+            lt_term=lt_term, step_term=step_term)
+
     def poly(self, x, *pars):
         """Order n polynomial.
         The order of the polynomial is defined by the number of
@@ -207,6 +221,14 @@ class FitTheories(object):
         p = numpy.poly1d(pars)
         return p(x)
 
+    @staticmethod
+    def poly_derivative(x, pars, index):
+        """Derivative of :meth:`poly` with respect to ``pars[index]``.
+
+        """
+        return numpy.power(numpy.asarray(x, dtype=numpy.float64),
+                           len(pars) - 1 - index)
+
     @staticmethod
     def estimate_poly(x, y, n=2):
         """Estimate polynomial coefficients for a degree n polynomial.
@@ -1217,36 +1239,42 @@ THEORY = OrderedDict((
                   function=functions.sum_gauss,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
+                  derivative=functions.sum_gauss_derivative,
                   configure=fitfuns.configure)),
     ('Lorentz',
         FitTheory(description='Lorentzian functions',
                   function=functions.sum_lorentz,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
+                  derivative=functions.sum_lorentz_derivative,
                   configure=fitfuns.configure)),
     ('Area Gaussians',
         FitTheory(description='Gaussian functions (area)',
                   function=functions.sum_agauss,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_agauss,
+                  derivative=functions.sum_agauss_derivative,
                   configure=fitfuns.configure)),
     ('Area Lorentz',
         FitTheory(description='Lorentzian functions (area)',
                   function=functions.sum_alorentz,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_alorentz,
+                  derivative=functions.sum_alorentz_derivative,
                   configure=fitfuns.configure)),
     ('Pseudo-Voigt Line',
         FitTheory(description='Pseudo-Voigt functions',
                   function=functions.sum_pvoigt,
                   parameters=('Height', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_pvoigt,
+                  derivative=functions.sum_pvoigt_derivative,
                   configure=fitfuns.configure)),
     ('Area Pseudo-Voigt',
         FitTheory(description='Pseudo-Voigt functions (area)',
                   function=functions.sum_apvoigt,
                   parameters=('Area', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_apvoigt,
+                  derivative=functions.sum_apvoigt_derivative,
                   configure=fitfuns.configure)),
     ('Split Gaussian',
         FitTheory(description='Asymmetric gaussian functions',
@@ -1254,12 +1282,14 @@ THEORY = OrderedDict((
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
+                  derivative=functions.sum_splitgauss_derivative,
                   configure=fitfuns.configure)),
     ('Split Lorentz',
         FitTheory(description='Asymmetric lorentzian functions',
                   function=functions.sum_splitlorentz,
                   parameters=('Height', 'Position', 'LowFWHM', 'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
+                  derivative=functions.sum_splitlorentz_derivative,
                   configure=fitfuns.configure)),
     ('Split Pseudo-Voigt',
         FitTheory(description='Asymmetric pseudo-Voigt functions',
@@ -1267,30 +1297,35 @@ THEORY = OrderedDict((
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM', 'Eta'),
                   estimate=fitfuns.estimate_splitpvoigt,
+                  derivative=functions.sum_splitpvoigt_derivative,
                   configure=fitfuns.configure)),
     ('Step Down',
         FitTheory(description='Step down function',
                   function=functions.sum_stepdown,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepdown,
+                  derivative=functions.sum_stepdown_derivative,
                   configure=fitfuns.configure)),
     ('Step Up',
         FitTheory(description='Step up function',
                   function=functions.sum_stepup,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepup,
+                  derivative=functions.sum_stepup_derivative,
                   configure=fitfuns.configure)),
     ('Slit',
         FitTheory(description='Slit function',
                   function=functions.sum_slit,
                   parameters=('Height', 'Position', 'FWHM', 'BeamFWHM'),
                   estimate=fitfuns.estimate_slit,
+                  derivative=functions.sum_slit_derivative,
                   configure=fitfuns.configure)),
     ('Atan',
         FitTheory(description='Arctan step up function',
                   function=functions.atan_stepup,
                   parameters=('Height', 'Position', 'Width'),
                   estimate=fitfuns.estimate_stepup,
+                  derivative=functions.atan_stepup_derivative,
                   configure=fitfuns.configure)),
     ('Hypermet',
         FitTheory(description='Hypermet functions',
@@ -1298,6 +1333,7 @@ THEORY = OrderedDict((
                   parameters=('G_Area', 'Position', 'FWHM', 'ST_Area',
                               'ST_Slope', 'LT_Area', 'LT_Slope', 'Step_H'),
                   estimate=fitfuns.estimate_ahypermet,
+                  derivative=fitfuns.ahypermet_derivative,
                   configure=fitfuns.configure)),
     # ('Periodic Gaussians',
     #     FitTheory(description='Periodic gaussian functions',
@@ -1310,25 +1346,29 @@ THEORY = OrderedDict((
                               '\ny = a*x^2 + b*x +c',
                   function=fitfuns.poly,
                   parameters=['a', 'b', 'c'],
-                  estimate=fitfuns.estimate_quadratic)),
+                  estimate=fitfuns.estimate_quadratic,
+                  derivative=fitfuns.poly_derivative)),
     ('Degree 3 Polynomial',
         FitTheory(description='Degree 3 polynomial'
                               '\ny = a*x^3 + b*x^2 + c*x + d',
                   function=fitfuns.poly,
                   parameters=['a', 'b', 'c', 'd'],
-                  estimate=fitfuns.estimate_cubic)),
+                  estimate=fitfuns.estimate_cubic,
+                  derivative=fitfuns.poly_derivative)),
     ('Degree 4 Polynomial',
         FitTheory(description='Degree 4 polynomial'
                               '\ny = a*x^4 + b*x^3 + c*x^2 + d*x + e',
                   function=fitfuns.poly,
                   parameters=['a', 'b', 'c', 'd', 'e'],
-                  estimate=fitfuns.estimate_quartic)),
+                  estimate=fitfuns.estimate_quartic,
+                  derivative=fitfuns.poly_derivative)),
     ('Degree 5 Polynomial',
         FitTheory(description='Degree 5 polynomial'
                               '\ny = a*x^5 + b*x^4 + c*x^3 + d*x^2 + e*x + f',
                   function=fitfuns.poly,
                   parameters=['a', 'b', 'c', 'd', 'e', 'f'],
-                  estimate=fitfuns.estimate_quintic)),
+                  estimate=fitfuns.estimate_quintic,
+                  derivative=fitfuns.poly_derivative)),
 ))
 """Dictionary of fit theories: fit functions and their associated estimation
 function, parameters list, configuration function and description.
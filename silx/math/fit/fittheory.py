@@ -30,7 +30,7 @@ models.
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "09/08/2016"
+__date__ = "17/10/2026"
 
 
 class FitTheory(object):
@@ -128,7 +128,10 @@ class FitTheory(object):
         ``model_deriv(xdata, parameters, index)``, where parameters is a
         sequence with the current values of the fitting parameters, index is
         the fitting parameter index for which the the derivative has to be
-        provided in the supplied array of xdata points."""
+        provided in the supplied array of xdata points.
+
+        When used through :class:`FitManager`, *parameters* only contains the
+        parameters of this theory, without the background parameters."""
 
         self.description = description
         """Optional description string for this particular fit theory."""
@@ -46,6 +46,31 @@ List of fit functions:
     - :func:`sum_ahypermet`
     - :func:`sum_fastahypermet`
 
+    - :func:`atan_stepup`
+
+Derivatives of the fit functions, usable as ``model_deriv`` in
+:func:`silx.math.fit.leastsq`:
+------------------------------------------------------------------
+
+    - :func:`sum_gauss_derivative`
+    - :func:`sum_agauss_derivative`
+    - :func:`sum_splitgauss_derivative`
+
+    - :func:`sum_apvoigt_derivative`
+    - :func:`sum_pvoigt_derivative`
+    - :func:`sum_splitpvoigt_derivative`
+
+    - :func:`sum_lorentz_derivative`
+    - :func:`sum_alorentz_derivative`
+    - :func:`sum_splitlorentz_derivative`
+
+    - :func:`sum_stepdown_derivative`
+    - :func:`sum_stepup_derivative`
+    - :func:`sum_slit_derivative`
+
+    - :func:`sum_ahypermet_derivative`
+    - :func:`atan_stepup_derivative`
+
 Full documentation:
 -------------------
 
@@ -53,7 +78,7 @@ Full documentation:
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "16/08/2017"
+__date__ = "17/10/2026"
 
 import logging
 import numpy
@@ -938,6 +963,313 @@ def sum_fastahypermet(x, *params,
     return numpy.asarray(y_c).reshape(x.shape)
 
 
+ctypedef int (*derivative_function)(double*, int, double*, int, int, double*)
+
+
+cdef _derivative(derivative_function function, x, params, int index):
+    """Call a C function computing the derivative of a sum of functions
+    with respect to the parameter ``params[index]``"""
+    cdef:
+        double[::1] x_c
+        double[::1] params_c
+        double[::1] y_c
+        int status
+
+    if not hasattr(x, "shape"):
+        x = numpy.asarray(x)
+
+    x_c = numpy.array(x,
+                      copy=False,
+                      dtype=numpy.float64,
+                      order='C').reshape(-1)
+    params_c = numpy.array(params,
+                           copy=False,
+                           dtype=numpy.float64,
+                           order='C').reshape(-1)
+    if not params_c.size:
+        raise IndexError("No parameters specified.")
+    y_c = numpy.empty(shape=(x_c.size,),
+                      dtype=numpy.float64)
+
+    status = function(&x_c[0], x_c.size,
+                      &params_c[0], params_c.size,
+                      index, &y_c[0])
+
+    if status:
+        raise IndexError("Wrong number of parameters for function " +
+                         "or parameter index out of range")
+
+    return numpy.asarray(y_c).reshape(x.shape)
+
+
+def sum_gauss_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_gauss` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of gaussian parameters, as for :func:`sum_gauss`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_gauss_derivative,
+                       x, params, index)
+
+
+def sum_agauss_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_agauss` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of gaussian parameters, as for :func:`sum_agauss`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_agauss_derivative,
+                       x, params, index)
+
+
+def sum_splitgauss_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_splitgauss` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of split gaussian parameters, as for :func:`sum_splitgauss`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_splitgauss_derivative,
+                       x, params, index)
+
+
+def sum_apvoigt_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_apvoigt` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of pseudo-Voigt parameters, as for :func:`sum_apvoigt`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_apvoigt_derivative,
+                       x, params, index)
+
+
+def sum_pvoigt_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_pvoigt` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of pseudo-Voigt parameters, as for :func:`sum_pvoigt`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_pvoigt_derivative,
+                       x, params, index)
+
+
+def sum_splitpvoigt_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_splitpvoigt` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of split pseudo-Voigt parameters, as for :func:`sum_splitpvoigt`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_splitpvoigt_derivative,
+                       x, params, index)
+
+
+def sum_lorentz_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_lorentz` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of lorentz parameters, as for :func:`sum_lorentz`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_lorentz_derivative,
+                       x, params, index)
+
+
+def sum_alorentz_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_alorentz` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of lorentz parameters, as for :func:`sum_alorentz`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_alorentz_derivative,
+                       x, params, index)
+
+
+def sum_splitlorentz_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_splitlorentz` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of split lorentz parameters, as for :func:`sum_splitlorentz`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_splitlorentz_derivative,
+                       x, params, index)
+
+
+def sum_stepdown_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_stepdown` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of stepdown parameters, as for :func:`sum_stepdown`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_stepdown_derivative,
+                       x, params, index)
+
+
+def sum_stepup_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_stepup` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of stepup parameters, as for :func:`sum_stepup`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_stepup_derivative,
+                       x, params, index)
+
+
+def sum_slit_derivative(x, params, index):
+    """Return the partial derivative of :func:`sum_slit` with respect to
+    the parameter ``params[index]``.
+
+    The signature is the one expected for the ``model_deriv`` argument of
+    :func:`silx.math.fit.leastsq`.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of slit parameters, as for :func:`sum_slit`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    return _derivative(functions_wrapper.sum_slit_derivative,
+                       x, params, index)
+
+
+def sum_ahypermet_derivative(x, params, index,
+                             gaussian_term=True, st_term=True,
+                             lt_term=True, step_term=True):
+    """Return the partial derivative of :func:`sum_ahypermet` with respect
+    to the parameter ``params[index]``.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy.ndarray
+    :param params: Array of hypermet parameters, as for
+        :func:`sum_ahypermet`
+    :param int index: Index of the parameter in ``params``
+    :param gaussian_term: If ``True``, enable gaussian term. Default ``True``
+    :param st_term: If ``True``, enable short tail term. Default ``True``
+    :param lt_term: If ``True``, enable long tail term. Default ``True``
+    :param step_term: If ``True``, enable step term. Default ``True``
+    :return: Array of derivatives at each ``x`` coordinate
+    """
+    cdef:
+        double[::1] x_c
+        double[::1] params_c
+        double[::1] y_c
+
+    if not hasattr(x, "shape"):
+        x = numpy.asarray(x)
+
+    params_c = numpy.array(params,
+                           copy=False,
+                           dtype=numpy.float64,
+                           order='C').reshape(-1)
+    if not params_c.size:
+        raise IndexError("No parameters specified. " +
+                         "At least 8 parameters are required.")
+
+    # Sum binary flags to activate various terms of the equation
+    tail_flags = 1 if gaussian_term else 0
+    if st_term:
+        tail_flags += 2
+    if lt_term:
+        tail_flags += 4
+    if step_term:
+        tail_flags += 8
+
+    x_c = numpy.array(x,
+                      copy=False,
+                      dtype=numpy.float64,
+                      order='C').reshape(-1)
+    y_c = numpy.empty(shape=(x_c.size,),
+                      dtype=numpy.float64)
+
+    status = functions_wrapper.sum_ahypermet_derivative(&x_c[0],
+                            x_c.size,
+                            &params_c[0],
+                            params_c.size,
+                            index,
+                            &y_c[0],
+                            tail_flags)
+
+    if status:
+        raise IndexError("Wrong number of parameters for function " +
+                         "or parameter index out of range")
+
+    return numpy.asarray(y_c).reshape(x.shape)
+
+
 def atan_stepup(x, a, b, c):
     """
     Step up function using an inverse tangent.
@@ -956,6 +1288,31 @@ def atan_stepup(x, a, b, c):
     return a * (0.5 + (numpy.arctan((1.0 * x - b) / c) / numpy.pi))
 
 
+def atan_stepup_derivative(x, params, index):
+    """Return the partial derivative of :func:`atan_stepup` with respect
+    to the parameter ``params[index]``.
+
+    :param x: Independent variable where the derivative is calculated
+    :type x: numpy array
+    :param params: Parameters *(a, b, c)* of :func:`atan_stepup`
+    :param int index: Index of the parameter in ``params``
+    :return: Array of derivatives at each ``x`` coordinate
+    :rtype: numpy array
+    """
+    if len(params) != 3:
+        raise IndexError("Wrong number of parameters for function")
+    if not 0 <= index < 3:
+        raise IndexError("Parameter index out of range")
+    a, b, c = params
+    x = numpy.asarray(x)
+    t = (1.0 * x - b) / c
+    if index == 0:
+        return 0.5 + numpy.arctan(t) / numpy.pi
+    elif index == 1:
+        return - a / (numpy.pi * c * (1 + t * t))
+    return - a * t / (numpy.pi * c * (1 + t * t))
+
+
 def periodic_gauss(x, *pars):
     """
     Return a sum of gaussian functions defined by
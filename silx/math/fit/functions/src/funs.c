@@ -1234,6 +1234,605 @@ int sum_fastahypermet(double* x, int len_x, double* phypermet, int len_phypermet
     return(0);
 }
 
+/*  Derivatives of the fit functions
+
+    The following functions compute the partial derivative of a sum
+    of functions with respect to a single parameter, identified by its
+    index in the parameters array. As each function of the sum only
+    depends on its own parameters, only one function needs to be
+    evaluated.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - params: Array of function parameters, with the same layout as for
+          the corresponding sum_* function.
+        - len_params: Number of elements in the params array.
+        - index: Index in params of the parameter with respect to which
+          the derivative is computed.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int test_index(int len_params, int index, char* fun_name)
+{
+    if ((index < 0) || (index >= len_params)) {
+        printf("[%s]Error: Parameter index %d out of range [0, %d[.\n",
+               fun_name, index, len_params);
+        return(1);
+    }
+    return(0);
+}
+
+int sum_gauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y)
+{
+    int j, ipar;
+    double dhelp, g, inv_two_sqrt_two_log2, sigma;
+    double fwhm, centroid, height;
+
+    if (test_params(len_pgauss, 3, "sum_gauss_derivative", "height, centroid, fwhm") ||
+        test_index(len_pgauss, index, "sum_gauss_derivative")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    ipar = index % 3;
+    height = pgauss[index - ipar];
+    centroid = pgauss[index - ipar + 1];
+    fwhm = pgauss[index - ipar + 2];
+
+    sigma = fwhm * inv_two_sqrt_two_log2;
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid) / sigma;
+        if (dhelp <= 20) {
+            g = exp (-0.5 * dhelp * dhelp);
+            switch (ipar) {
+                case 0:
+                    y[j] = g;
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / sigma;
+                    break;
+                default:
+                    y[j] = height * g * dhelp * dhelp / fwhm;
+            }
+        }
+    }
+    return(0);
+}
+
+int sum_agauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y)
+{
+    int j, ipar;
+    double dhelp, g, height, sqrt2PI, sigma, inv_two_sqrt_two_log2;
+    double fwhm, centroid, area;
+
+    if (test_params(len_pgauss, 3, "sum_agauss_derivative", "area, centroid, fwhm") ||
+        test_index(len_pgauss, index, "sum_agauss_derivative")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+    sqrt2PI = sqrt(2.0*M_PI);
+
+    ipar = index % 3;
+    area = pgauss[index - ipar];
+    centroid = pgauss[index - ipar + 1];
+    fwhm = pgauss[index - ipar + 2];
+
+    sigma = fwhm * inv_two_sqrt_two_log2;
+    height = area / (sigma * sqrt2PI);
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid) / sigma;
+        if (dhelp <= 35) {
+            g = exp (-0.5 * dhelp * dhelp);
+            switch (ipar) {
+                case 0:
+                    y[j] = g / (sigma * sqrt2PI);
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / sigma;
+                    break;
+                default:
+                    y[j] = height * g * (dhelp * dhelp - 1.0) / fwhm;
+            }
+        }
+    }
+    return(0);
+}
+
+int sum_splitgauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y)
+{
+    int j, ipar, right;
+    double dhelp, g, inv_two_sqrt_two_log2, sigma1, sigma2;
+    double fwhm1, fwhm2, centroid, height;
+
+    if (test_params(len_pgauss, 4, "sum_splitgauss_derivative", "height, centroid, fwhm1, fwhm2") ||
+        test_index(len_pgauss, index, "sum_splitgauss_derivative")) {
+        return(1);
+    }
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    ipar = index % 4;
+    height = pgauss[index - ipar];
+    centroid = pgauss[index - ipar + 1];
+    fwhm1 = pgauss[index - ipar + 2];
+    fwhm2 = pgauss[index - ipar + 3];
+
+    sigma1 = fwhm1 * inv_two_sqrt_two_log2;
+    sigma2 = fwhm2 * inv_two_sqrt_two_log2;
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid);
+        right = dhelp > 0;
+        dhelp = right ? dhelp / sigma2 : dhelp / sigma1;
+
+        if (dhelp <= 20) {
+            g = exp (-0.5 * dhelp * dhelp);
+            switch (ipar) {
+                case 0:
+                    y[j] = g;
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / (right ? sigma2 : sigma1);
+                    break;
+                case 2:
+                    if (!right) {
+                        y[j] = height * g * dhelp * dhelp / fwhm1;
+                    }
+                    break;
+                default:
+                    if (right) {
+                        y[j] = height * g * dhelp * dhelp / fwhm2;
+                    }
+            }
+        }
+    }
+    return(0);
+}
+
+/* Derivative of one pseudo-Voigt function, defined by (height, centroid, fwhm, eta),
+   with respect to parameter ipar, at a single point x.
+   If is_area is not 0, the first parameter is the area of the function
+   instead of its height. */
+static double pvoigt_derivative(double x, double height, double centroid,
+                                double fwhm, double eta, int ipar, int is_area)
+{
+    double dhelp, u, lorentz, g, sigma, kl, kg;
+
+    /*  Lorentzian term */
+    u = (x - centroid) / (0.5 * fwhm);
+    lorentz = 1.0 / (1.0 + u * u);
+    /* Amplitude of the Lorentzian term */
+    kl = is_area ? height / (0.5 * M_PI * fwhm) : height;
+
+    /* Gaussian term */
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+    dhelp = (x - centroid) / sigma;
+    g = (dhelp <= 35) ? exp (-0.5 * dhelp * dhelp) : 0.;
+    /* Amplitude of the Gaussian term */
+    kg = is_area ? height / (sigma * sqrt(2.0 * M_PI)) : height;
+
+    switch (ipar) {
+        case 0:
+            return(eta * kl / height * lorentz + (1.0 - eta) * kg / height * g);
+        case 1:
+            return(eta * kl * 4.0 * u * lorentz * lorentz / fwhm +
+                   (1.0 - eta) * kg * g * dhelp / sigma);
+        case 2:
+            if (is_area) {
+                return(eta * kl * (u * u - 1.0) * lorentz * lorentz / fwhm +
+                       (1.0 - eta) * kg * g * (dhelp * dhelp - 1.0) / fwhm);
+            }
+            return(eta * kl * 2.0 * u * u * lorentz * lorentz / fwhm +
+                   (1.0 - eta) * kg * g * dhelp * dhelp / fwhm);
+        default:
+            return(kl * lorentz - kg * g);
+    }
+}
+
+int sum_apvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y)
+{
+    int j, ipar;
+    double *p, area;
+
+    if (test_params(len_pvoigt, 4, "sum_apvoigt_derivative", "area, centroid, fwhm, eta") ||
+        test_index(len_pvoigt, index, "sum_apvoigt_derivative")) {
+        return(1);
+    }
+
+    ipar = index % 4;
+    p = pvoigt + index - ipar;
+
+    /* the amplitude derivative does not depend on the area:
+       compute it for a unit area to support area = 0 */
+    area = (ipar == 0) ? 1.0 : p[0];
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = pvoigt_derivative(x[j], area, p[1], p[2], p[3], ipar, 1);
+    }
+    return(0);
+}
+
+int sum_pvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y)
+{
+    int j, ipar;
+    double *p, height;
+
+    if (test_params(len_pvoigt, 4, "sum_pvoigt_derivative", "height, centroid, fwhm, eta") ||
+        test_index(len_pvoigt, index, "sum_pvoigt_derivative")) {
+        return(1);
+    }
+
+    ipar = index % 4;
+    p = pvoigt + index - ipar;
+    height = (ipar == 0) ? 1.0 : p[0];
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = pvoigt_derivative(x[j], height, p[1], p[2], p[3], ipar, 0);
+    }
+    return(0);
+}
+
+int sum_splitpvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y)
+{
+    int j, ipar, right;
+    double *p, height;
+
+    if (test_params(len_pvoigt, 5, "sum_splitpvoigt_derivative", "height, centroid, fwhm1, fwhm2, eta") ||
+        test_index(len_pvoigt, index, "sum_splitpvoigt_derivative")) {
+        return(1);
+    }
+
+    ipar = index % 5;
+    p = pvoigt + index - ipar;
+    height = (ipar == 0) ? 1.0 : p[0];
+
+    for (j=0; j<len_x;  j++) {
+        /* Use fwhm2 when x > centroid, fwhm1 otherwise */
+        right = (x[j] - p[1]) > 0;
+        switch (ipar) {
+            case 2:
+                y[j] = right ? 0. : pvoigt_derivative(x[j], height, p[1], p[2], p[4], 2, 0);
+                break;
+            case 3:
+                y[j] = right ? pvoigt_derivative(x[j], height, p[1], p[3], p[4], 2, 0) : 0.;
+                break;
+            default:
+                y[j] = pvoigt_derivative(x[j], height, p[1], right ? p[3] : p[2], p[4],
+                                         (ipar == 4) ? 3 : ipar, 0);
+        }
+    }
+    return(0);
+}
+
+int sum_lorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y)
+{
+    int ipar;
+    double *p;
+    double pvoigt[4];
+
+    if (test_params(len_plorentz, 3, "sum_lorentz_derivative", "height, centroid, fwhm") ||
+        test_index(len_plorentz, index, "sum_lorentz_derivative")) {
+        return(1);
+    }
+
+    /* A Lorentzian is a pseudo-Voigt function with eta = 1 */
+    ipar = index % 3;
+    p = plorentz + index - ipar;
+    pvoigt[0] = p[0];
+    pvoigt[1] = p[1];
+    pvoigt[2] = p[2];
+    pvoigt[3] = 1.0;
+    return(sum_pvoigt_derivative(x, len_x, pvoigt, 4, ipar, y));
+}
+
+int sum_alorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y)
+{
+    int ipar;
+    double *p;
+    double pvoigt[4];
+
+    if (test_params(len_plorentz, 3, "sum_alorentz_derivative", "area, centroid, fwhm") ||
+        test_index(len_plorentz, index, "sum_alorentz_derivative")) {
+        return(1);
+    }
+
+    ipar = index % 3;
+    p = plorentz + index - ipar;
+    pvoigt[0] = p[0];
+    pvoigt[1] = p[1];
+    pvoigt[2] = p[2];
+    pvoigt[3] = 1.0;
+    return(sum_apvoigt_derivative(x, len_x, pvoigt, 4, ipar, y));
+}
+
+int sum_splitlorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y)
+{
+    int ipar;
+    double *p;
+    double pvoigt[5];
+
+    if (test_params(len_plorentz, 4, "sum_splitlorentz_derivative", "height, centroid, fwhm1, fwhm2") ||
+        test_index(len_plorentz, index, "sum_splitlorentz_derivative")) {
+        return(1);
+    }
+
+    ipar = index % 4;
+    p = plorentz + index - ipar;
+    pvoigt[0] = p[0];
+    pvoigt[1] = p[1];
+    pvoigt[2] = p[2];
+    pvoigt[3] = p[3];
+    pvoigt[4] = 1.0;
+    return(sum_splitpvoigt_derivative(x, len_x, pvoigt, 5, ipar, y));
+}
+
+/* Derivative of a step down (sign = -1) or step up (sign = 1) function */
+static int step_derivative(double* x, int len_x, double* pstep, int len_pstep,
+                           int index, double* y, int sign, char* fun_name)
+{
+    int j, ipar;
+    double dhelp, width, inv_sqrt_pi;
+    double height, centroid, fwhm;
+
+    if (test_params(len_pstep, 3, fun_name, "height, centroid, fwhm") ||
+        test_index(len_pstep, index, fun_name)) {
+        return(1);
+    }
+
+    inv_sqrt_pi = 1.0 / sqrt(M_PI);
+
+    ipar = index % 3;
+    height = pstep[index - ipar];
+    centroid = pstep[index - ipar + 1];
+    fwhm = pstep[index - ipar + 2];
+
+    width = fwhm * sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        dhelp = (x[j] - centroid) / width;
+        switch (ipar) {
+            case 0:
+                y[j] = (sign > 0) ? 0.5 * (1.0 + erf(dhelp)) : 0.5 * erfc(dhelp);
+                break;
+            case 1:
+                y[j] = -sign * height * inv_sqrt_pi * exp(-dhelp * dhelp) / width;
+                break;
+            default:
+                y[j] = -sign * height * inv_sqrt_pi * exp(-dhelp * dhelp) * dhelp / fwhm;
+        }
+    }
+    return(0);
+}
+
+int sum_stepdown_derivative(double* x, int len_x, double* pdstep, int len_pdstep, int index, double* y)
+{
+    return(step_derivative(x, len_x, pdstep, len_pdstep, index, y, -1,
+                           "sum_stepdown_derivative"));
+}
+
+int sum_stepup_derivative(double* x, int len_x, double* pustep, int len_pustep, int index, double* y)
+{
+    return(step_derivative(x, len_x, pustep, len_pustep, index, y, 1,
+                           "sum_stepup_derivative"));
+}
+
+int sum_slit_derivative(double* x, int len_x, double* pslit, int len_pslit, int index, double* y)
+{
+    int j, ipar;
+    double width, dhelp1, dhelp2, erf1, erfc2, gauss1, gauss2, two_inv_sqrt_pi;
+    double height, position, fwhm, beamfwhm;
+
+    if (test_params(len_pslit, 4, "sum_slit_derivative", "height, centroid, fwhm, beamfwhm") ||
+        test_index(len_pslit, index, "sum_slit_derivative")) {
+        return(1);
+    }
+
+    two_inv_sqrt_pi = 2.0 / sqrt(M_PI);
+
+    ipar = index % 4;
+    height = pslit[index - ipar];
+    position = pslit[index - ipar + 1];
+    fwhm = pslit[index - ipar + 2];
+    beamfwhm = pslit[index - ipar + 3];
+
+    width = beamfwhm * sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        dhelp1 = (x[j] - position + 0.5 * fwhm) / width;
+        dhelp2 = (x[j] - position - 0.5 * fwhm) / width;
+        erf1 = 1.0 + erf(dhelp1);
+        erfc2 = erfc(dhelp2);
+        /* derivatives of erf(dhelp1) and -erfc(dhelp2) */
+        gauss1 = two_inv_sqrt_pi * exp(-dhelp1 * dhelp1);
+        gauss2 = two_inv_sqrt_pi * exp(-dhelp2 * dhelp2);
+        switch (ipar) {
+            case 0:
+                y[j] = 0.25 * erf1 * erfc2;
+                break;
+            case 1:
+                y[j] = height * 0.25 * (erf1 * gauss2 - gauss1 * erfc2) / width;
+                break;
+            case 2:
+                y[j] = height * 0.125 * (gauss1 * erfc2 + erf1 * gauss2) / width;
+                break;
+            default:
+                y[j] = height * 0.25 * (erf1 * gauss2 * dhelp2 - gauss1 * dhelp1 * erfc2) / beamfwhm;
+        }
+    }
+    return(0);
+}
+
+/* Derivatives of a hypermet tail term
+   area * area_r / slope_r * 0.5 * erfc(u) * exp(v)
+   with u = x_minus_position / (sigma * sqrt(2)) + sigma / (slope_r * sqrt(2))
+   and v = 0.5 * (sigma / slope_r)**2 + x_minus_position / slope_r,
+   with respect to area, position, sigma, area_r and slope_r. */
+static void hypermet_tail_derivatives(double x_minus_position, double sigma,
+                                      double area, double area_r, double slope_r,
+                                      double* derivatives)
+{
+    double u, v, q, dq_du, sqrt2;
+
+    sqrt2 = 1.4142135623730950488;
+    u = x_minus_position / (sigma * sqrt2) + sigma / (slope_r * sqrt2);
+    v = 0.5 * (sigma / slope_r) * (sigma / slope_r) + x_minus_position / slope_r;
+    q = 0.5 * erfc(u) * exp(v);
+    dq_du = - exp(v - u * u) / sqrt(M_PI);
+
+    derivatives[0] = area_r * q / slope_r;
+    derivatives[1] = (area * area_r / slope_r) *
+                     (- dq_du / (sigma * sqrt2) - q / slope_r);
+    derivatives[2] = (area * area_r / slope_r) *
+                     (dq_du * (1.0 / (slope_r * sqrt2) - x_minus_position / (sigma * sigma * sqrt2)) +
+                      q * sigma / (slope_r * slope_r));
+    derivatives[3] = area * q / slope_r;
+    derivatives[4] = (area * area_r / slope_r) *
+                     (- q / slope_r -
+                      dq_du * sigma / (slope_r * slope_r * sqrt2) -
+                      q * (sigma * sigma / (slope_r * slope_r * slope_r) +
+                           x_minus_position / (slope_r * slope_r)));
+}
+
+int sum_ahypermet_derivative(double* x, int len_x, double* phypermet, int len_phypermet,
+                             int index, double* y, int tail_flags)
+{
+    int j, ipar;
+    int g_term_flag, st_term_flag, lt_term_flag, step_term_flag;
+    double sigma, sqrt2PI, sqrt2, x_minus_position, epsilon, g, step, gauss, dsigma_dfwhm;
+    double area, position, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r;
+    double tail[5];
+
+    if (test_params(len_phypermet, 8, "sum_ahypermet_derivative",
+                    "height, centroid, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r") ||
+        test_index(len_phypermet, index, "sum_ahypermet_derivative")) {
+        return(1);
+    }
+
+    g_term_flag    = tail_flags & 1;
+    st_term_flag   = (tail_flags>>1) & 1;
+    lt_term_flag   = (tail_flags>>2) & 1;
+    step_term_flag = (tail_flags>>3) & 1;
+
+    /* define epsilon to compare floating point values with 0. */
+    epsilon = 0.00000000001;
+
+    sqrt2PI = sqrt(2.0 * M_PI);
+    sqrt2 = 1.4142135623730950488;
+    dsigma_dfwhm = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    ipar = index % 8;
+    area = phypermet[index - ipar];
+    position = phypermet[index - ipar + 1];
+    fwhm = phypermet[index - ipar + 2];
+    st_area_r = phypermet[index - ipar + 3];
+    st_slope_r =  phypermet[index - ipar + 4];
+    lt_area_r = phypermet[index - ipar + 5];
+    lt_slope_r = phypermet[index - ipar + 6];
+    step_height_r = phypermet[index - ipar + 7];
+
+    sigma = fwhm * dsigma_dfwhm;
+
+    /* Prevent division by 0 */
+    if (sigma == 0) {
+        printf("fwhm must not be equal to 0");
+        return(1);
+    }
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        x_minus_position = x[j] - position;
+        /* normalized gaussian and step shapes */
+        g = exp(-0.5 * x_minus_position * x_minus_position / (sigma * sigma));
+        gauss = g / (sigma * sqrt2PI);
+        step = 0.5 * erfc(x_minus_position / (sigma * sqrt2));
+
+        /* gaussian term */
+        if (g_term_flag) {
+            switch (ipar) {
+                case 0:
+                    y[j] += gauss;
+                    break;
+                case 1:
+                    y[j] += area * gauss * x_minus_position / (sigma * sigma);
+                    break;
+                case 2:
+                    y[j] += area * gauss / sigma * dsigma_dfwhm *
+                            (x_minus_position * x_minus_position / (sigma * sigma) - 1.0);
+                    break;
+            }
+        }
+
+        /* st term */
+        if (st_term_flag && (fabs(st_slope_r) > epsilon)) {
+            hypermet_tail_derivatives(x_minus_position, sigma,
+                                      area, st_area_r, st_slope_r, tail);
+            switch (ipar) {
+                case 0:
+                case 1:
+                    y[j] += tail[ipar];
+                    break;
+                case 2:
+                    y[j] += tail[2] * dsigma_dfwhm;
+                    break;
+                case 3:
+                case 4:
+                    y[j] += tail[ipar];
+                    break;
+            }
+        }
+
+        /* lt term */
+        if (lt_term_flag && (fabs(lt_slope_r) > epsilon)) {
+            hypermet_tail_derivatives(x_minus_position, sigma,
+                                      area, lt_area_r, lt_slope_r, tail);
+            switch (ipar) {
+                case 0:
+                case 1:
+                    y[j] += tail[ipar];
+                    break;
+                case 2:
+                    y[j] += tail[2] * dsigma_dfwhm;
+                    break;
+                case 5:
+                case 6:
+                    y[j] += tail[ipar - 2];
+                    break;
+            }
+        }
+
+        /* step term */
+        if (step_term_flag) {
+            switch (ipar) {
+                case 0:
+                    y[j] += step_height_r * step / (sigma * sqrt2PI);
+                    break;
+                case 1:
+                    y[j] += step_height_r * area / (sigma * sqrt2PI) *
+                            g / (sqrt(M_PI) * sigma * sqrt2);
+                    break;
+                case 2:
+                    y[j] += step_height_r * area / (sigma * sqrt2PI) / sigma * dsigma_dfwhm *
+                            (g * x_minus_position / (sqrt(M_PI) * sigma * sqrt2) - step);
+                    break;
+                case 7:
+                    y[j] += area * step / (sigma * sqrt2PI);
+                    break;
+            }
+        }
+    }
+    return(0);
+}
+
 void pileup(double* x, long len_x, double* ret, int input2, double zero, double gain)
 {
     //int    input2=0;
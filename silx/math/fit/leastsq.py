@@ -34,7 +34,7 @@ This module is a refactored version of PyMca Gefit.py module.
 """
 __authors__ = ["V.A. Sole"]
 __license__ = "MIT"
-__date__ = "15/05/2017"
+__date__ = "17/10/2026"
 __copyright__ = "European Synchrotron Radiation Facility, Grenoble, France"
 
 import numpy
@@ -124,6 +124,8 @@ def leastsq(model, xdata, ydata, p0, sigma=None,
         It will be called as model_deriv(xdata, parameters, index) where parameters is a sequence with the current
         values of the fitting parameters, index is the fitting parameter index for which the the derivative has
         to be provided in the supplied array of xdata points.
+        The derivatives with respect to parameters depending on a fitted parameter through a FACTOR, DELTA or SUM
+        constraint are added to the derivative with respect to the fitted parameter.
     :type model_deriv: *optional*, None or callable
 
 
@@ -294,41 +296,7 @@ def leastsq(model, xdata, ydata, p0, sigma=None,
         epsfcn = max(epsfcn, numpy.finfo(numpy.float).eps)
 
     # check if constraints have been passed as text
-    constrained_fit = False
-    if constraints is not None:
-        # make sure we work with a list of lists
-        input_constraints = constraints
-        tmp_constraints = [None] * len(input_constraints)
-        for i in range(nparameters):
-            tmp_constraints[i] = list(input_constraints[i])
-        constraints = tmp_constraints
-        for i in range(nparameters):
-            if hasattr(constraints[i][0], "upper"):
-                txt = constraints[i][0].upper()
-                if txt == "FREE":
-                    constraints[i][0] = CFREE
-                elif txt == "POSITIVE":
-                    constraints[i][0] = CPOSITIVE
-                elif txt == "QUOTED":
-                    constraints[i][0] = CQUOTED
-                elif txt == "FIXED":
-                    constraints[i][0] = CFIXED
-                elif txt == "FACTOR":
-                    constraints[i][0] = CFACTOR
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "DELTA":
-                    constraints[i][0] = CDELTA
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "SUM":
-                    constraints[i][0] = CSUM
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt in ["IGNORED", "IGNORE"]:
-                    constraints[i][0] = CIGNORED
-                else:
-                    #I should raise an exception
-                    raise ValueError("Unknown constraint %s" % constraints[i][0])
-            if constraints[i][0] > 0:
-                constrained_fit = True
+    constraints, constrained_fit = _parse_constraints(constraints, nparameters)
     if constrained_fit:
         if full_output is None:
             _logger.info("Recommended to set full_output to True when using constraints")
@@ -659,6 +627,12 @@ def chisq_alpha_beta(model, parameters, x, y, weight, constraints=None,
     if n_free == 0:
         raise ValueError("No free parameters to fit")
     function_calls = 0
+    if model_deriv is not None:
+        # the derivatives must be computed with the dependent parameters
+        # up to date, and they must account for the parameters tied to
+        # the fitted ones
+        pderiv = numpy.array(_get_parameters(pwork.tolist(), constraints))
+        tied = _get_tied_parameters(constraints)
     if not left_derivative:
         if last_evaluation is not None:
             f2 = last_evaluation
@@ -689,7 +663,9 @@ def chisq_alpha_beta(model, parameters, x, y, weight, constraints=None,
             #removed I resize outside the loop:
             #help0 = numpy.resize(help0, (1, nr))
         else:
-            help0 = model_deriv(x, pwork, free_index[i])
+            help0 = model_deriv(x, pderiv, free_index[i])
+            for j, factor in tied.get(free_index[i], ()):
+                help0 = help0 + factor * model_deriv(x, pderiv, j)
             help0 = help0 * derivfactor[i]
 
         if i == 0:
@@ -739,6 +715,80 @@ def chisq_alpha_beta(model, parameters, x, y, weight, constraints=None,
         return chisq, alpha, beta
 
 
+def _parse_constraints(constraints, nparameters):
+    """
+    Convert constraints provided as text to their numerical codes.
+
+    :param constraints: None or 2D sequence of dimension (n_parameters, 3)
+    :param int nparameters: Number of fitted parameters
+    :return: The constraints as a list of lists (or None) and a flag telling
+        if at least one parameter is constrained
+    """
+    constrained_fit = False
+    if constraints is None:
+        return None, constrained_fit
+    # make sure we work with a list of lists
+    input_constraints = constraints
+    tmp_constraints = [None] * len(input_constraints)
+    for i in range(nparameters):
+        tmp_constraints[i] = list(input_constraints[i])
+    constraints = tmp_constraints
+    for i in range(nparameters):
+        if hasattr(constraints[i][0], "upper"):
+            txt = constraints[i][0].upper()
+            if txt == "FREE":
+                constraints[i][0] = CFREE
+            elif txt == "POSITIVE":
+                constraints[i][0] = CPOSITIVE
+            elif txt == "QUOTED":
+                constraints[i][0] = CQUOTED
+            elif txt == "FIXED":
+                constraints[i][0] = CFIXED
+            elif txt == "FACTOR":
+                constraints[i][0] = CFACTOR
+                constraints[i][1] = int(constraints[i][1])
+            elif txt == "DELTA":
+                constraints[i][0] = CDELTA
+                constraints[i][1] = int(constraints[i][1])
+            elif txt == "SUM":
+                constraints[i][0] = CSUM
+                constraints[i][1] = int(constraints[i][1])
+            elif txt in ["IGNORED", "IGNORE"]:
+                constraints[i][0] = CIGNORED
+            else:
+                #I should raise an exception
+                raise ValueError("Unknown constraint %s" % constraints[i][0])
+        if constraints[i][0] > 0:
+            constrained_fit = True
+    return constraints, constrained_fit
+
+
+def _get_tied_parameters(constraints):
+    """
+    Find the parameters depending on other parameters through a FACTOR,
+    DELTA or SUM constraint.
+
+    Return a dictionary mapping the index of a parameter to a list of
+    ``(index, factor)`` tuples, one per parameter depending on it, *factor*
+    being the derivative of the dependent parameter with respect to the
+    parameter it depends on.
+    """
+    tied = {}
+    if constraints is None:
+        return tied
+    for i in range(len(constraints)):
+        if constraints[i][0] == CFACTOR:
+            factor = constraints[i][2]
+        elif constraints[i][0] == CDELTA:
+            factor = 1.0
+        elif constraints[i][0] == CSUM:
+            factor = -1.0
+        else:
+            continue
+        tied.setdefault(int(constraints[i][1]), []).append((i, factor))
+    return tied
+
+
 def _get_parameters(parameters, constraints):
     """
     Apply constraints to input parameters.
@@ -834,6 +884,520 @@ def _get_sigma_parameters(parameters, sigma0, constraints):
     return sigma_par
 
 
+def leastsq_batch(model, xdata, ydata, p0, sigma=None,
+                  constraints=None, model_deriv=None, epsfcn=None,
+                  deltachi=None, full_output=False,
+                  check_finite=True, max_iter=100,
+                  vectorized=False, block_size=1024, nprocs=None):
+    """
+    Fit K independent spectra sharing the same model and constraints with
+    the constrained Levenberg-Marquardt algorithm of :func:`leastsq`.
+
+    The spectra are processed by blocks: the model derivatives, the alpha
+    and beta matrices and the parameter updates of all the spectra of a
+    block are computed at once on stacked arrays, each spectrum keeping its
+    own damping factor and convergence status.
+
+    :param model: callable
+        The model function, f(x, ...), as for :func:`leastsq`.
+        If vectorized is True, each parameter is provided as a (K, 1) array
+        and the model must return a (K, M) array.
+
+    :param xdata: An M-length sequence.
+        The independent variable shared by all spectra.
+
+    :param ydata: A (K, M) array
+        The K spectra to fit.
+
+    :param p0: N-length sequence or (K, N) array
+        Initial guess for the parameters, either shared by all spectra or
+        one per spectrum.
+
+    :param sigma: None, M-length sequence or (K, M) array, optional
+        If not None, the uncertainties in the ydata array.
+        If None, the uncertainties are assumed to be 1
+
+    :param constraints:
+        Constraints shared by all the spectra, see :func:`leastsq`.
+        Initial values of CQUOTED parameters are clipped to their limits.
+    :type constraints: *optional*, None or 2D sequence
+
+    :param model_deriv:
+        None (default) or function providing the derivatives of the fitting
+        function, see :func:`leastsq`. It is called for each spectrum.
+    :type model_deriv: *optional*, None or callable
+
+    :param epsfcn: See :func:`leastsq`
+    :type epsfcn: *optional*, float
+
+    :param deltachi: See :func:`leastsq`
+    :type deltachi: *optional*, float
+
+    :param bool full_output: True to return also a dictionary of outputs
+
+    :param bool check_finite:
+        If True (the default), check that the input arrays do not contain
+        nans of infs, and raise a ValueError if they do.
+        If False, non-finite points are ignored in the spectra they belong to.
+
+    :param int max_iter: Maximum number of iterations for each spectrum
+
+    :param bool vectorized:
+        True if model can be evaluated for all spectra of a block in a
+        single call (see model), False (the default) to call it once per
+        spectrum.
+
+    :param int block_size:
+        Number of spectra processed together.
+        Memory usage is proportional to block_size * N * M.
+
+    :param nprocs: Number of processes among which blocks are distributed.
+        Default (None) fits all the blocks in the current process.
+        When used, model and model_deriv must be picklable.
+    :type nprocs: *optional*, None or int
+
+    :return: Returns a tuple of length 2 (or 3 if full_ouput is True) with:
+
+         ``popt``: (K, N) array
+           Optimal values of the parameters for each spectrum
+         ``pcov``: (K, N, N) array
+           Covariance of popt for each spectrum, as returned by
+           :func:`leastsq`
+         ``infodict``: dict
+           a dictionary of optional outputs with the keys:
+
+            ``uncertainties``
+                (K, N) array of the actual uncertainties on the optimized
+                parameters.
+            ``chisq``
+                (K,) array of the chi square of each spectrum
+            ``reduced_chisq``
+                (K,) array of the chi square of each spectrum divided by its
+                number of degrees of freedom
+            ``niter``
+                (K,) array of the number of iterations of each spectrum
+            ``nfev``
+                The total number of spectrum evaluations
+    """
+    if check_finite:
+        xdata = numpy.asarray_chkfinite(xdata)
+        ydata = numpy.asarray_chkfinite(ydata)
+        if sigma is not None:
+            sigma = numpy.asarray_chkfinite(sigma)
+    else:
+        xdata = numpy.asarray(xdata)
+        ydata = numpy.asarray(ydata)
+        if sigma is not None:
+            sigma = numpy.asarray(sigma)
+
+    ydata = numpy.array(ydata, dtype=numpy.float64, ndmin=2, copy=False)
+    ydata = ydata.reshape(len(ydata), -1)
+    nspectra = len(ydata)
+    if nspectra == 0:
+        raise ValueError("No spectrum to fit")
+
+    if sigma is None:
+        sigma = numpy.ones(ydata.shape, dtype=numpy.float64)
+    else:
+        sigma = numpy.broadcast_to(
+            numpy.array(sigma, dtype=numpy.float64, copy=False),
+            ydata.shape)
+    weight = 1.0 / (sigma + numpy.equal(sigma, 0))
+    weight = weight * weight
+
+    # Ignore non-finite points by giving them a null weight
+    valid = numpy.logical_and(numpy.isfinite(ydata), numpy.isfinite(weight))
+    if not numpy.all(valid):
+        ydata = numpy.where(valid, ydata, 0.)
+        weight = numpy.where(valid, weight, 0.)
+
+    if numpy.isscalar(p0):
+        p0 = [p0]
+    parameters = numpy.array(p0, dtype=numpy.float64, ndmin=1)
+    if parameters.ndim == 1:
+        parameters = numpy.tile(parameters, (nspectra, 1))
+    if parameters.shape[0] != nspectra:
+        raise ValueError("p0 must provide parameters for each spectrum")
+    nparameters = parameters.shape[1]
+
+    constraints = _parse_constraints(constraints, nparameters)[0]
+    if constraints is not None:
+        for i in range(nparameters):
+            if constraints[i][0] == CQUOTED:
+                pmax = max(constraints[i][1], constraints[i][2])
+                pmin = min(constraints[i][1], constraints[i][2])
+                parameters[:, i] = numpy.clip(parameters[:, i], pmin, pmax)
+
+    if epsfcn is None:
+        epsfcn = numpy.finfo(numpy.float64).eps
+    else:
+        epsfcn = max(epsfcn, numpy.finfo(numpy.float64).eps)
+    if deltachi is None:
+        deltachi = 0.001
+
+    block_size = max(1, int(block_size))
+    blocks = [slice(start, start + block_size)
+              for start in range(0, nspectra, block_size)]
+    arguments = [(model, xdata, ydata[block], weight[block],
+                  parameters[block], constraints, model_deriv,
+                  epsfcn, deltachi, max_iter, vectorized)
+                 for block in blocks]
+
+    if nprocs is not None and nprocs > 1 and len(blocks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=nprocs) as executor:
+            results = list(executor.map(_leastsq_block, *zip(*arguments)))
+    else:
+        results = [_leastsq_block(*args) for args in arguments]
+
+    fittedpar = numpy.concatenate([r["fittedpar"] for r in results])
+    cov = numpy.concatenate([r["covariance"] for r in results])
+    if not full_output:
+        return fittedpar, cov
+
+    n_points = numpy.sum(weight != 0, axis=1)
+    n_free = results[0]["n_free"]
+    chisq = numpy.concatenate([r["chisq"] for r in results])
+    ddict = {}
+    ddict["chisq"] = chisq
+    ddict["reduced_chisq"] = chisq / (n_points - n_free)
+    ddict["uncertainties"] = numpy.concatenate(
+        [r["uncertainties"] for r in results])
+    ddict["niter"] = numpy.concatenate([r["niter"] for r in results])
+    ddict["nfev"] = sum(r["nfev"] for r in results)
+    return fittedpar, cov, ddict
+
+
+def _leastsq_block(model, x, y, weight, parameters, constraints, model_deriv,
+                   epsfcn, deltachi, max_iter, vectorized):
+    """
+    Run Levenberg-Marquardt iterations on a block of spectra.
+
+    See :func:`leastsq_batch` for the arguments.
+    y, weight and parameters are 2D arrays with one row per spectrum.
+
+    :return: dict with fittedpar, covariance, uncertainties, chisq, niter,
+        nfev and n_free
+    """
+    nspectra, nparameters = parameters.shape
+    free_index, noigno = _get_free_layout(constraints, nparameters)
+    n_free = len(free_index)
+    if n_free == 0:
+        raise ValueError("No free parameters to fit")
+
+    nfev = [0]
+
+    def evaluate(params):
+        nfev[0] += len(params)
+        return _evaluate_batch(model, x, params[:, noigno], vectorized)
+
+    fittedpar = numpy.array(_get_parameters_batch(parameters, constraints))
+    yfit = evaluate(fittedpar)
+    chisq0 = numpy.sum(weight * (y - yfit) ** 2, axis=1)
+
+    fitparam = numpy.zeros((nspectra, n_free), dtype=numpy.float64)
+    alpha0 = numpy.zeros((nspectra, n_free, n_free), dtype=numpy.float64)
+    beta = numpy.zeros((nspectra, n_free), dtype=numpy.float64)
+    flambda = numpy.full((nspectra,), 0.001)
+    iiter = numpy.full((nspectra,), max_iter)
+    niter = numpy.zeros((nspectra,), dtype=numpy.int64)
+    active = numpy.ones((nspectra,), dtype=bool)
+    update_alpha = numpy.ones((nspectra,), dtype=bool)
+    identity = numpy.identity(n_free)
+
+    while numpy.any(active):
+        # Compute alpha and beta of spectra which parameters changed
+        indices = numpy.nonzero(numpy.logical_and(active, update_alpha))[0]
+        if len(indices) > 0:
+            fitparam[indices], alpha0[indices], beta[indices] = \
+                _alpha_beta_batch(evaluate, model_deriv, x,
+                                  y[indices], weight[indices],
+                                  fittedpar[indices], yfit[indices],
+                                  constraints, free_index, epsfcn)
+            niter[indices] += 1
+            update_alpha[indices] = False
+
+        # Try a step for all active spectra
+        indices = numpy.nonzero(active)[0]
+        alpha = alpha0[indices] * (1.0 + flambda[indices, None, None] * identity)
+        deltapar = _solve_batch(alpha, beta[indices])
+        newpar = _update_parameters_batch(
+            fittedpar[indices], fitparam[indices], deltapar,
+            constraints, free_index)
+        newfit = evaluate(newpar)
+        chisq = numpy.sum(weight[indices] * (y[indices] - newfit) ** 2, axis=1)
+        absdeltachi = chisq0[indices] - chisq
+
+        # Rejected steps (including NaN) increase damping
+        rejected = numpy.logical_not(absdeltachi >= 0)
+        flambda[indices[rejected]] *= 10.0
+        active[indices[numpy.logical_and(
+            rejected, flambda[indices] > 1000)]] = False
+
+        accepted = numpy.logical_not(rejected)
+        accepted_indices = indices[accepted]
+        fittedpar[accepted_indices] = newpar[accepted]
+        yfit[accepted_indices] = newfit[accepted]
+        chisq = chisq[accepted]
+        absdeltachi = absdeltachi[accepted]
+        lastdeltachi = 100 * (absdeltachi / (chisq + (chisq == 0)))
+        converged = numpy.logical_and(
+            niter[accepted_indices] >= 2,  # the fit *has* to be improved
+            numpy.logical_or(lastdeltachi < deltachi,
+                             absdeltachi < numpy.sqrt(epsfcn)))
+        active[accepted_indices[converged]] = False
+        chisq0[accepted_indices] = chisq
+        flambda[accepted_indices] /= 10.0
+        update_alpha[accepted_indices] = True
+
+        iiter[indices] -= 1
+        active[indices[iiter[indices] <= 0]] = False
+
+    # this is the covariance matrix of the actually fitted parameters
+    cov0 = _inv_batch(alpha0)
+    if constraints is None:
+        cov = cov0
+    else:
+        # All the parameters are free except those that are FIXED or IGNORED
+        # and that will be assigned a 100 % uncertainty.
+        new_constraints = copy.deepcopy(constraints)
+        for idx, constraint in enumerate(constraints):
+            if constraint[0] not in [CFIXED, CIGNORED]:
+                new_constraints[idx] = [CFREE, 0, 0]
+        all_free_index = _get_free_layout(new_constraints, nparameters)[0]
+        alpha = _alpha_beta_batch(evaluate, model_deriv, x, y, weight,
+                                  fittedpar, yfit, new_constraints,
+                                  all_free_index, epsfcn)[1]
+        cov = numpy.zeros((nspectra, nparameters, nparameters),
+                          dtype=numpy.float64)
+        cov[:, all_free_index[:, None], all_free_index] = _inv_batch(alpha)
+        for idx, constraint in enumerate(constraints):
+            if constraint[0] in [CFIXED, CIGNORED]:
+                cov[:, idx, idx] = fittedpar[:, idx] * fittedpar[:, idx]
+
+    sigma0 = numpy.sqrt(abs(numpy.diagonal(cov0, axis1=1, axis2=2)))
+    return {
+        "fittedpar": fittedpar,
+        "covariance": cov,
+        "uncertainties": _get_sigma_parameters_batch(
+            fittedpar, sigma0, constraints),
+        "chisq": chisq0,
+        "niter": niter,
+        "nfev": nfev[0],
+        "n_free": n_free,
+    }
+
+
+def _get_free_layout(constraints, nparameters):
+    """
+    Returns the indices of the fitted parameters and of the parameters
+    provided to the model.
+
+    :return: (free_index, noigno) arrays of indices
+    """
+    if constraints is None:
+        indices = numpy.arange(nparameters)
+        return indices, indices
+    free_index = []
+    noigno = []
+    for i in range(nparameters):
+        code = constraints[i][0]
+        if code != CIGNORED:
+            noigno.append(i)
+        if code in (CFREE, CPOSITIVE):
+            free_index.append(i)
+        elif code == CQUOTED and abs(constraints[i][1] - constraints[i][2]) > 0:
+            free_index.append(i)
+    return (numpy.array(free_index, dtype=numpy.intp),
+            numpy.array(noigno, dtype=numpy.intp))
+
+
+def _quoted_limits(constraint):
+    """Returns center and half-width of the range of a CQUOTED parameter"""
+    pmax = max(constraint[1], constraint[2])
+    pmin = min(constraint[1], constraint[2])
+    return 0.5 * (pmax + pmin), 0.5 * (pmax - pmin)
+
+
+def _evaluate_batch(model, x, parameters, vectorized):
+    """
+    Evaluate the model for each row of parameters.
+
+    :return: (K, M) array
+    """
+    if vectorized:
+        result = model(x, *[p[:, None] for p in parameters.T])
+        result = numpy.array(result, dtype=numpy.float64, copy=False)
+        return result.reshape(len(parameters), -1)
+    else:
+        result = [numpy.ravel(model(x, *p)) for p in parameters]
+        return numpy.array(result, dtype=numpy.float64).reshape(
+            len(parameters), -1)
+
+
+def _alpha_beta_batch(evaluate, model_deriv, x, y, weight, parameters, yfit,
+                      constraints, free_index, epsfcn):
+    """
+    Batch version of :func:`chisq_alpha_beta`.
+
+    :param callable evaluate: Function evaluating the model for rows of
+        parameters before discarding IGNORED ones.
+    :param parameters: (K, N) array of parameters with constraints applied
+    :param yfit: (K, M) array of the model evaluated for parameters
+    :return: (fitparam, alpha, beta) as (K, n_free), (K, n_free, n_free)
+        and (K, n_free) arrays
+    """
+    nspectra = len(parameters)
+    fitparam = parameters[:, free_index]
+    derivfactor = numpy.ones(fitparam.shape, dtype=numpy.float64)
+    if constraints is not None:
+        for j, i in enumerate(free_index):
+            if constraints[i][0] == CPOSITIVE:
+                fitparam[:, j] = abs(fitparam[:, j])
+            elif constraints[i][0] == CQUOTED:
+                A, B = _quoted_limits(constraints[i])
+                derivfactor[:, j] = B * numpy.cos(numpy.arcsin(
+                    numpy.clip((fitparam[:, j] - A) / B, -1., 1.)))
+    delta = (fitparam + numpy.equal(fitparam, 0.0)) * numpy.sqrt(epsfcn)
+
+    pwork = numpy.array(parameters, copy=True)
+    pwork[:, free_index] = fitparam
+    tied = _get_tied_parameters(constraints)
+    deriv = numpy.empty((nspectra, len(free_index), y.shape[1]),
+                        dtype=numpy.float64)
+    for j, i in enumerate(free_index):
+        if model_deriv is None:
+            pwork[:, i] = fitparam[:, j] + delta[:, j]
+            f1 = evaluate(_get_parameters_batch(pwork, constraints))
+            pwork[:, i] = fitparam[:, j]
+            deriv[:, j] = (f1 - yfit) / delta[:, j, None]
+        else:
+            for k in range(nspectra):
+                deriv[k, j] = numpy.ravel(model_deriv(x, pwork[k], i))
+                for t, factor in tied.get(i, ()):
+                    deriv[k, j] += factor * numpy.ravel(
+                        model_deriv(x, pwork[k], t))
+        deriv[:, j] *= derivfactor[:, j, None]
+
+    weighted_deriv = deriv * weight[:, None, :]
+    beta = numpy.matmul(weighted_deriv, (y - yfit)[:, :, None])[:, :, 0]
+    alpha = numpy.matmul(weighted_deriv, deriv.transpose(0, 2, 1))
+    return fitparam, alpha, beta
+
+
+def _update_parameters_batch(parameters, fitparam, deltapar,
+                             constraints, free_index):
+    """
+    Apply an increment to the fitted parameters of rows of parameters.
+
+    :return: (K, N) array of updated parameters with constraints applied
+    """
+    newpar = numpy.array(parameters, copy=True)
+    for j, i in enumerate(free_index):
+        if constraints is not None and constraints[i][0] == CQUOTED:
+            A, B = _quoted_limits(constraints[i])
+            newpar[:, i] = A + B * numpy.sin(numpy.arcsin(
+                numpy.clip((fitparam[:, j] - A) / B, -1., 1.)) + deltapar[:, j])
+        else:
+            newpar[:, i] = fitparam[:, j] + deltapar[:, j]
+    return _get_parameters_batch(newpar, constraints)
+
+
+def _solve_batch(alpha, beta):
+    """
+    Solve alpha . x = beta for a stack of matrices.
+
+    Rows for which alpha is singular are filled with NaN.
+    """
+    try:
+        return numpy.linalg.solve(alpha, beta[:, :, None])[:, :, 0]
+    except LinAlgError:
+        result = numpy.full(beta.shape, numpy.nan)
+        for k in range(len(alpha)):
+            try:
+                result[k] = numpy.linalg.solve(alpha[k], beta[k])
+            except LinAlgError:
+                pass
+        return result
+
+
+def _inv_batch(alpha):
+    """
+    Inverse a stack of matrices.
+
+    Matrices that are singular are filled with NaN.
+    """
+    try:
+        return inv(alpha)
+    except LinAlgError:
+        result = numpy.full(alpha.shape, numpy.nan)
+        for k in range(len(alpha)):
+            try:
+                result[k] = inv(alpha[k])
+            except LinAlgError:
+                _logger.warning("Error calculating covariance matrix")
+        return result
+
+
+def _get_parameters_batch(parameters, constraints):
+    """
+    Batch version of :func:`_get_parameters` for (K, N) arrays of parameters.
+    """
+    newparam = numpy.array(parameters, dtype=numpy.float64, copy=True)
+    if constraints is None:
+        return newparam
+    for i in range(len(constraints)):
+        if constraints[i][0] == CPOSITIVE:
+            newparam[:, i] = abs(parameters[:, i])
+    for i in range(len(constraints)):
+        if constraints[i][0] == CFACTOR:
+            newparam[:, i] = constraints[i][2] * newparam[:, int(constraints[i][1])]
+        elif constraints[i][0] == CDELTA:
+            newparam[:, i] = constraints[i][2] + newparam[:, int(constraints[i][1])]
+        elif constraints[i][0] == CIGNORED:
+            newparam[:, i] = 0
+        elif constraints[i][0] == CSUM:
+            newparam[:, i] = constraints[i][2] - newparam[:, int(constraints[i][1])]
+    return newparam
+
+
+def _get_sigma_parameters_batch(parameters, sigma0, constraints):
+    """
+    Batch version of :func:`_get_sigma_parameters` for (K, N) arrays of
+    parameters and (K, n_free) arrays of sigma0.
+    """
+    if constraints is None:
+        return sigma0
+    n_free = 0
+    sigma_par = numpy.zeros(parameters.shape, numpy.float64)
+    for i in range(len(constraints)):
+        if constraints[i][0] in (CFREE, CPOSITIVE):
+            sigma_par[:, i] = sigma0[:, n_free]
+            n_free += 1
+        elif constraints[i][0] == CQUOTED:
+            pmax = max(constraints[i][1], constraints[i][2])
+            pmin = min(constraints[i][1], constraints[i][2])
+            B = 0.5 * (pmax - pmin)
+            if B > 0:
+                inside = numpy.logical_and(parameters[:, i] < pmax,
+                                           parameters[:, i] > pmin)
+                sigma_par[:, i] = numpy.where(
+                    inside,
+                    abs(B * numpy.cos(parameters[:, i]) * sigma0[:, n_free]),
+                    parameters[:, i])
+                n_free += 1
+            else:
+                sigma_par[:, i] = parameters[:, i]
+        elif abs(constraints[i][0]) == CFIXED:
+            sigma_par[:, i] = parameters[:, i]
+    for i in range(len(constraints)):
+        if constraints[i][0] == CFACTOR:
+            sigma_par[:, i] = constraints[i][2] * sigma_par[:, int(constraints[i][1])]
+        elif constraints[i][0] in (CDELTA, CSUM):
+            sigma_par[:, i] = sigma_par[:, int(constraints[i][1])]
+    return sigma_par
+
+
 def main(argv=None):
     if argv is None:
         npoints = 10000
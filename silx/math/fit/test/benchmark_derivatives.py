@@ -0,0 +1,134 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2026 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of analytical derivatives against numerical derivatives
+in leastsq"""
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "17/10/2026"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.utils.testutils import ParametricTestCase
+from silx.math.fit import functions
+from silx.math.fit.leastsq import leastsq, CFIXED
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkDerivatives(ParametricTestCase):
+    """Benchmark of multi-peak fits with and without analytical derivatives"""
+
+    FUNCTIONS = 'gauss', 'agauss', 'lorentz', 'pvoigt', 'ahypermet'
+
+    NPEAKS = 1, 10, 30
+
+    NPOINTS = 2000
+
+    @staticmethod
+    def _peak_parameters(name, npeaks, npoints):
+        """Return parameters of evenly spaced peaks"""
+        positions = (numpy.arange(npeaks) + 0.5) * npoints / npeaks
+        params = []
+        for index, position in enumerate(positions):
+            amplitude = 1000. + 100. * index
+            if name == 'pvoigt':
+                params += [amplitude, position, 10., 0.4]
+            elif name == 'ahypermet':
+                params += [10. * amplitude, position, 10.,
+                           0.05, 5., 0.02, 20., 0.001]
+            else:
+                params += [amplitude, position, 10.]
+        return numpy.array(params)
+
+    def test_benchmark_fit(self):
+        """Compare leastsq fit duration with numerical derivatives and
+        with analytical derivatives.
+        """
+        x = numpy.arange(self.NPOINTS, dtype=numpy.float64)
+
+        for name in self.FUNCTIONS:
+            function = getattr(functions, 'sum_' + name)
+            derivative = getattr(functions, 'sum_' + name + '_derivative')
+            for npeaks in self.NPEAKS:
+                with self.subTest(function=name, npeaks=npeaks):
+                    params = self._peak_parameters(name, npeaks, self.NPOINTS)
+                    y = function(x, *params)
+                    # start slightly off the solution
+                    p0 = params * numpy.tile(
+                        numpy.array([1.05, 1.001, 1.05] +
+                                    [1.] * (len(params) // npeaks - 3)),
+                        npeaks)
+
+                    constraints = numpy.zeros((len(params), 3))
+                    if name == 'ahypermet':
+                        # tails are usually not fitted, as they are badly
+                        # determined
+                        for index in range(npeaks):
+                            constraints[8 * index + 3:8 * index + 8, 0] = CFIXED
+
+                    durations = {}
+                    results = {}
+                    for key, model_deriv in (('numerical', None),
+                                             ('analytical', derivative)):
+                        start = time.time()
+                        fitted, _, infodict = leastsq(
+                            function, x, y, p0,
+                            constraints=constraints,
+                            model_deriv=model_deriv,
+                            full_output=True)
+                        durations[key] = time.time() - start
+                        results[key] = fitted
+                        niter = infodict['niter']
+                        _logger.info(
+                            '%s x%d %s: %.3f s, %d iterations, %.4f s/it',
+                            name, npeaks, key, durations[key], niter,
+                            durations[key] / max(niter, 1))
+
+                    _logger.info('%s x%d speed-up: x%.2f',
+                                 name, npeaks,
+                                 durations['numerical'] / durations['analytical'])
+
+                    self.assertTrue(numpy.allclose(
+                        results['analytical'], params, rtol=1e-3))
+                    self.assertTrue(numpy.allclose(
+                        results['numerical'], results['analytical'],
+                        rtol=1e-3))
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkDerivatives))
+    return test_suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
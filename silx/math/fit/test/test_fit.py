@@ -372,7 +372,113 @@ class Test_leastsq(unittest.TestCase):
                                        parameters_estimate[i])
 
 
-test_cases = (Test_leastsq,)
+def _gauss(x, height, position, fwhm, background):
+    """Gaussian on a constant background, supporting broadcasting"""
+    dummy = 2.3548200450309493 * (x - position) / fwhm
+    return background + height * numpy.exp(-0.5 * dummy * dummy)
+
+
+class Test_leastsq_batch(unittest.TestCase):
+    """
+    Unit tests of the leastsq_batch function.
+    """
+
+    def setUp(self):
+        from silx.math.fit import leastsq_batch
+        self.leastsq_batch = leastsq_batch
+
+        self.x = numpy.arange(200.)
+        nspectra = 12
+        self.parameters = numpy.column_stack((
+            numpy.linspace(500., 1500., nspectra),
+            numpy.linspace(90., 110., nspectra),
+            numpy.linspace(15., 25., nspectra),
+            numpy.linspace(5., 15., nspectra)))
+        self.ydata = _gauss(self.x, *[p[:, None] for p in self.parameters.T])
+        self.p0 = [1000., 100., 20., 0.]
+
+    def testUnconstrainedFit(self):
+        for vectorized in (False, True):
+            with self.subTest(vectorized=vectorized):
+                fittedpar, cov = self.leastsq_batch(
+                    _gauss, self.x, self.ydata, self.p0,
+                    vectorized=vectorized)
+                self.assertEqual(fittedpar.shape, self.parameters.shape)
+                self.assertEqual(cov.shape, (12, 4, 4))
+                self.assertTrue(numpy.allclose(fittedpar, self.parameters))
+
+    def testBlocksAndProcesses(self):
+        """Test that splitting in blocks does not change the result"""
+        sigma = numpy.sqrt(self.ydata)
+        ref = self.leastsq_batch(_gauss, self.x, self.ydata, self.p0,
+                                 sigma=sigma, full_output=True)
+        for nprocs in (None, 2):
+            with self.subTest(nprocs=nprocs):
+                result = self.leastsq_batch(
+                    _gauss, self.x, self.ydata, self.p0, sigma=sigma,
+                    full_output=True, vectorized=True,
+                    block_size=5, nprocs=nprocs)
+                self.assertTrue(numpy.allclose(result[0], ref[0]))
+                self.assertTrue(numpy.allclose(result[1], ref[1]))
+                for key in ('uncertainties', 'chisq', 'niter'):
+                    self.assertTrue(numpy.allclose(result[2][key], ref[2][key]))
+
+    def testConstrainedFit(self):
+        from silx.math.fit import CFIXED, CQUOTED, CPOSITIVE
+        constraints = [[CPOSITIVE, 0, 0],
+                       [CQUOTED, 80, 120],
+                       [0, 0, 0],
+                       [CFIXED, 0, 0]]
+        p0 = numpy.array(self.p0)
+        p0[3] = 10.
+        fittedpar, cov, info = self.leastsq_batch(
+            _gauss, self.x, self.ydata, p0,
+            constraints=constraints, full_output=True, vectorized=True)
+
+        self.assertTrue(numpy.all(fittedpar[:, 3] == 10.))
+        self.assertTrue(numpy.all(fittedpar[:, 1] >= 80.))
+        self.assertTrue(numpy.all(fittedpar[:, 1] <= 120.))
+        # Only spectrum with background 10 is perfectly fitted
+        self.assertTrue(numpy.allclose(fittedpar[5:7, :3],
+                                       self.parameters[5:7, :3], rtol=1e-2))
+        # FIXED parameters have a 100% uncertainty
+        self.assertTrue(numpy.allclose(info['uncertainties'][:, 3], 10.))
+        self.assertTrue(numpy.allclose(cov[:, 3, 3], 100.))
+        self.assertEqual(info['chisq'].shape, (12,))
+        self.assertEqual(info['reduced_chisq'].shape, (12,))
+
+    def testDerivativeFunction(self):
+        def deriv(x, params, index):
+            height, position, fwhm, _background = params
+            if index == 3:
+                return numpy.ones(len(x))
+            dummy = 2.3548200450309493 * (x - position) / fwhm
+            gaussian = numpy.exp(-0.5 * dummy * dummy)
+            if index == 0:
+                return gaussian
+            elif index == 1:
+                return height * gaussian * dummy * 2.3548200450309493 / fwhm
+            else:
+                return height * gaussian * dummy * dummy / fwhm
+
+        fittedpar, cov = self.leastsq_batch(
+            _gauss, self.x, self.ydata, self.p0, model_deriv=deriv)
+        self.assertTrue(numpy.allclose(fittedpar, self.parameters))
+
+    def testDataWithNaN(self):
+        ydata = numpy.array(self.ydata)
+        ydata[:, 10] = numpy.nan
+        with self.assertRaises(ValueError):
+            self.leastsq_batch(_gauss, self.x, ydata, self.p0)
+
+        fittedpar, cov, info = self.leastsq_batch(
+            _gauss, self.x, ydata, self.p0,
+            check_finite=False, full_output=True)
+        self.assertTrue(numpy.allclose(fittedpar, self.parameters))
+        self.assertTrue(numpy.all(numpy.isfinite(info['chisq'])))
+
+
+test_cases = (Test_leastsq, Test_leastsq_batch)
 
 def suite():
     loader = unittest.defaultTestLoader
@@ -33,7 +33,7 @@ from silx.math.fit import functions
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "21/07/2016"
+__date__ = "17/10/2026"
 
 class Test_functions(unittest.TestCase):
     """
@@ -244,6 +244,96 @@ class Test_functions(unittest.TestCase):
                         1)
 
 
+class Test_derivatives(unittest.TestCase):
+    """
+    Compare the derivatives of the fit functions to finite differences.
+    """
+    def setUp(self):
+        # avoid sampling exactly the centroids, where split functions
+        # are not twice differentiable
+        self.x = numpy.linspace(-20, 40, 600)
+
+    def _checkDerivative(self, function, derivative, params, **kwargs):
+        for index in range(len(params)):
+            delta = 1e-6 * max(abs(params[index]), 1.)
+            p_plus = list(params)
+            p_plus[index] += delta
+            p_minus = list(params)
+            p_minus[index] -= delta
+            expected = (function(self.x, *p_plus, **kwargs) -
+                        function(self.x, *p_minus, **kwargs)) / (2 * delta)
+
+            result = derivative(self.x, params, index, **kwargs)
+            self.assertEqual(result.shape, self.x.shape)
+            scale = max(numpy.abs(expected).max(), 1.)
+            self.assertTrue(
+                numpy.allclose(result, expected, rtol=0., atol=1e-5 * scale),
+                "Wrong derivative for parameter %d" % index)
+
+    def testPeakDerivatives(self):
+        """Derivatives of peak functions defined by 3 parameters"""
+        params = [10., 5., 3., 4., 12., 2.]
+        for name in ("gauss", "agauss", "lorentz", "alorentz",
+                     "stepdown", "stepup"):
+            with self.subTest(function=name):
+                self._checkDerivative(
+                    getattr(functions, "sum_" + name),
+                    getattr(functions, "sum_" + name + "_derivative"),
+                    params)
+
+    def testSplitDerivatives(self):
+        """Derivatives of split functions"""
+        params = [10., 5., 3., 5., 4., 12., 2., 1.]
+        for name in ("splitgauss", "splitlorentz"):
+            with self.subTest(function=name):
+                self._checkDerivative(
+                    getattr(functions, "sum_" + name),
+                    getattr(functions, "sum_" + name + "_derivative"),
+                    params)
+
+        self._checkDerivative(functions.sum_splitpvoigt,
+                              functions.sum_splitpvoigt_derivative,
+                              [10., 5., 3., 5., .3, 4., 12., 2., 1., .7])
+
+    def testPVoigtDerivatives(self):
+        """Derivatives of pseudo-Voigt functions"""
+        params = [10., 5., 3., .3, 4., 12., 2., .7]
+        self._checkDerivative(functions.sum_pvoigt,
+                              functions.sum_pvoigt_derivative,
+                              params)
+        self._checkDerivative(functions.sum_apvoigt,
+                              functions.sum_apvoigt_derivative,
+                              params)
+
+    def testSlitDerivative(self):
+        self._checkDerivative(functions.sum_slit,
+                              functions.sum_slit_derivative,
+                              [10., 5., 8., 2.])
+
+    def testAtanStepUpDerivative(self):
+        self._checkDerivative(functions.atan_stepup,
+                              functions.atan_stepup_derivative,
+                              [3., 2., 1.5])
+
+    def testHypermetDerivative(self):
+        params = [100., 5., 3., .1, 2., .05, 6., .01]
+        for flags in (15, 1, 2, 4, 8):
+            kwargs = {"gaussian_term": bool(flags & 1),
+                      "st_term": bool(flags & 2),
+                      "lt_term": bool(flags & 4),
+                      "step_term": bool(flags & 8)}
+            with self.subTest(**kwargs):
+                self._checkDerivative(functions.sum_ahypermet,
+                                      functions.sum_ahypermet_derivative,
+                                      params, **kwargs)
+
+    def testWrongIndex(self):
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_derivative(self.x, [1., 2., 3.], 3)
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_derivative(self.x, [1., 2., 3., 4.], 0)
+
+
 def _numerical_derivative(f, x, params=[], delta_factor=0.0001):
     """Compute the numerical derivative of ``f`` for all values of ``x``.
 
@@ -258,7 +348,7 @@ def _numerical_derivative(f, x, params=[], delta_factor=0.0001):
 
     return (y_plus - y_minus) / (2 * deltax)
 
-test_cases = (Test_functions,)
+test_cases = (Test_functions, Test_derivatives)
 
 def suite():
     loader = unittest.defaultTestLoader
@@ -119,6 +119,20 @@ Second call with weights_2
 
 >>> histo, w_histo = histo_lut.apply_lut(weights_2, histo=histo, weighted_histo=w_histo)
 
+The histograms of a stack of weights can also be computed at once (in
+parallel), each one being stored along the first dimension of the results:
+
+>>> stack = np.array((weights_1, weights_2))
+>>> histo_lut = HistogramndLut(sample, ranges, n_bins, num_threads=None)
+>>> histos, w_histos = histo_lut.apply_lut(stack)
+
+For this use, the LUT can be stored in compressed sparse row form, i.e., the
+indices of the samples of each bin. It does not store samples outside of the
+histogram and allows to compute the histograms in parallel over the bins:
+
+>>> histo_lut = HistogramndLut(sample, ranges, n_bins, lut_format='csr')
+>>> indptr, indices = histo_lut.csr_lut
+
 Bin edges
 ---------
 When computing an histogram the caller is asked to provide the histogram
@@ -140,12 +154,14 @@ bins ranges will be :
 
 __authors__ = ["D. Naudet"]
 __license__ = "MIT"
-__date__ = "02/10/2017"
+__date__ = "17/10/2026"
 
 import numpy as np
 from .chistogramnd import chistogramnd as _chistogramnd  # noqa
 from .chistogramnd_lut import histogramnd_get_lut as _histo_get_lut
 from .chistogramnd_lut import histogramnd_from_lut as _histo_from_lut
+from .chistogramnd_lut import histogramnd_lut_to_csr as _histo_lut_to_csr
+from .chistogramnd_lut import histogramnd_from_csr as _histo_from_csr
 
 
 class Histogramnd(object):
@@ -161,7 +177,8 @@ class Histogramnd(object):
                  weight_min=None,
                  weight_max=None,
                  last_bin_closed=False,
-                 wh_dtype=None):
+                 wh_dtype=None,
+                 num_threads=1):
         """
         :param sample:
             The data to be histogrammed.
@@ -231,12 +248,20 @@ class Histogramnd(object):
             of type numpy.double. Allowed values are : `numpy.double` and
             `numpy.float32`
         :type wh_dtype: *optional*, numpy data type
+
+        :param num_threads: Number of threads used to compute the histograms
+            (in this call and in :meth:`accumulate`), or None to use all
+            available cores.
+            With more than one thread, weights are summed in a different
+            order, so the weighted histogram can differ by rounding errors.
+        :type num_threads: *optional*, int or None
         """
 
         self.__histo_range = histo_range
         self.__n_bins = n_bins
         self.__last_bin_closed = last_bin_closed
         self.__wh_dtype = wh_dtype
+        self.__num_threads = num_threads
 
         if sample is None:
             self.__data = [None, None, None]
@@ -248,7 +273,8 @@ class Histogramnd(object):
                                         weight_min=weight_min,
                                         weight_max=weight_max,
                                         last_bin_closed=self.__last_bin_closed,
-                                        wh_dtype=self.__wh_dtype)
+                                        wh_dtype=self.__wh_dtype,
+                                        num_threads=self.__num_threads)
 
     def __getitem__(self, key):
         """
@@ -325,7 +351,8 @@ class Histogramnd(object):
                                last_bin_closed=self.__last_bin_closed,
                                histo=self.__data[0],
                                weighted_histo=self.__data[1],
-                               wh_dtype=self.__wh_dtype)
+                               wh_dtype=self.__wh_dtype,
+                               num_threads=self.__num_threads)
         if self.__data[0] is None:
             self.__data = result
         elif self.__data[1] is None and result[1] is not None:
@@ -363,7 +390,9 @@ class HistogramndLut(object):
                  histo_range,
                  n_bins,
                  last_bin_closed=False,
-                 dtype=None):
+                 dtype=None,
+                 num_threads=1,
+                 lut_format='dense'):
         """
         :param sample:
             The coordinates of the data to be histogrammed.
@@ -397,21 +426,50 @@ class HistogramndLut(object):
             Set this parameter to true if you want
             the LAST bin to be closed.
         :type last_bin_closed: *optional*, :class:`python.boolean`
+
+        :param num_threads: Number of threads used to compute the LUT and
+            the histograms, or None to use all available cores.
+            With more than one thread, weights are summed in a different
+            order, so the weighted histogram can differ by rounding errors.
+        :type num_threads: *optional*, int or None
+
+        :param lut_format:
+            How the LUT is stored:
+
+            - 'dense': the bin index of each sample.
+            - 'csr': the indices of the samples of each bin, in compressed
+              sparse row form (see :attr:`csr_lut`). Samples out of the
+              histogram are not stored, and weighted histograms are summed
+              in the same order whatever the number of threads.
+        :type lut_format: *optional*, str
         """
+        if lut_format not in ('dense', 'csr'):
+            raise ValueError('Unsupported <lut_format>: {0}.'
+                             ''.format(lut_format))
+
         lut, histo, edges = _histo_get_lut(sample,
                                            histo_range,
                                            n_bins,
-                                           last_bin_closed=last_bin_closed)
+                                           last_bin_closed=last_bin_closed,
+                                           num_threads=num_threads)
 
         self.__n_bins = np.array(histo.shape)
         self.__histo_range = histo_range
-        self.__lut = lut
+        self.__n_elems = lut.size
+        self.__lut_dtype = lut.dtype
+        if lut_format == 'csr':
+            self.__lut = None
+            self.__csr_lut = _histo_lut_to_csr(lut, histo.size)
+        else:
+            self.__lut = lut
+            self.__csr_lut = None
         self.__histo = None
         self.__weighted_histo = None
         self.__edges = edges
         self.__dtype = dtype
         self.__shape = histo.shape
         self.__last_bin_closed = last_bin_closed
+        self.__num_threads = num_threads
         self.clear()
 
     def clear(self):
@@ -426,8 +484,34 @@ class HistogramndLut(object):
         """
         Copy of the Lut
         """
+        if self.__lut is None:  # Rebuild the dense LUT from the CSR one
+            indptr, indices = self.__csr_lut
+            lut = np.full(self.__n_elems, -1, dtype=self.__lut_dtype)
+            lut[indices] = np.repeat(
+                np.arange(len(indptr) - 1, dtype=self.__lut_dtype),
+                np.diff(indptr))
+            return lut
         return self.__lut.copy()
 
+    @property
+    def lut_format(self):
+        """
+        How the LUT is stored: 'dense' or 'csr'.
+        """
+        return 'dense' if self.__csr_lut is None else 'csr'
+
+    @property
+    def csr_lut(self):
+        """
+        Copy of the Lut in compressed sparse row form: (indptr, indices).
+
+        The indices of the samples falling in the bin *i* (of the flattened
+        histogram) are ``indices[indptr[i]:indptr[i+1]]``.
+        """
+        if self.__csr_lut is None:
+            return _histo_lut_to_csr(self.__lut, int(self.__n_bins.prod()))
+        return tuple(array.copy() for array in self.__csr_lut)
+
     def histo(self, copy=True):
         """
         Histogram (a copy of it), or None if `~accumulate` has not been called yet
@@ -514,14 +598,12 @@ class HistogramndLut(object):
         if self.__dtype is None:
             self.__dtype = weights.dtype
 
-        histo, w_histo = _histo_from_lut(weights,
-                                         self.__lut,
-                                         histo=self.__histo,
-                                         weighted_histo=self.__weighted_histo,
-                                         shape=self.__shape,
-                                         dtype=self.__dtype,
-                                         weight_min=weight_min,
-                                         weight_max=weight_max)
+        histo, w_histo = self.__apply(weights,
+                                      histo=self.__histo,
+                                      weighted_histo=self.__weighted_histo,
+                                      dtype=self.__dtype,
+                                      weight_min=weight_min,
+                                      weight_max=weight_max)
 
         if self.__histo is None:
             self.__histo = histo
@@ -529,6 +611,23 @@ class HistogramndLut(object):
         if self.__weighted_histo is None:
             self.__weighted_histo = w_histo
 
+    def __apply(self, weights, **kwargs):
+        """Computes the histograms with the dense or the CSR LUT"""
+        if self.__csr_lut is not None:
+            indptr, indices = self.__csr_lut
+            return _histo_from_csr(weights,
+                                   indptr,
+                                   indices,
+                                   self.__n_elems,
+                                   shape=self.__shape,
+                                   num_threads=self.__num_threads,
+                                   **kwargs)
+        return _histo_from_lut(weights,
+                               self.__lut,
+                               shape=self.__shape,
+                               num_threads=self.__num_threads,
+                               **kwargs)
+
     def apply_lut(self,
                   weights,
                   histo=None,
@@ -544,6 +643,10 @@ class HistogramndLut(object):
             A numpy array of values associated with each sample. The number of
             elements in the array must be the same as the number of samples
             provided at instantiation time.
+            It can also be a stack of K such arrays (i.e., an array of shape
+            (K, ...)), in which case the K histograms are computed at once,
+            in parallel, and the returned histograms have a (K,) + shape
+            shape.
         :type histo_range: array_like
 
         :param histo:
@@ -578,14 +681,12 @@ class HistogramndLut(object):
                 as *weights*.
         :type weight_max: *optional*, scalar
         """
-        histo, w_histo = _histo_from_lut(weights,
-                                         self.__lut,
-                                         histo=histo,
-                                         weighted_histo=weighted_histo,
-                                         shape=self.__shape,
-                                         dtype=self.__dtype,
-                                         weight_min=weight_min,
-                                         weight_max=weight_max)
+        histo, w_histo = self.__apply(weights,
+                                      histo=histo,
+                                      weighted_histo=weighted_histo,
+                                      dtype=self.__dtype,
+                                      weight_min=weight_min,
+                                      weight_max=weight_max)
         self.__dtype = w_histo.dtype
         return histo, w_histo
 
@@ -43,6 +43,11 @@ typedef enum {
     HISTO_LAST_BIN_CLOSED   = 1<<2  /**< Last bin is closed. */
 } histo_opt_type;
 
+/** Maximum total number of bins of the thread-private histograms.
+ * Above it, threads update the output histograms with atomic operations.
+ */
+#define HISTO_MAX_PRIVATE_BINS (1L << 24)
+
 /** Return codees for the histogramnd function. 
  */
 typedef enum {
@@ -66,7 +71,8 @@ int histogramnd_double_double_double(double *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      double i_weight_min,
-                                     double i_weight_max);
+                                     double i_weight_max,
+                                     int i_n_threads);
                                 
 int histogramnd_double_float_double(double *i_sample,
                                     float *i_weigths,
@@ -79,7 +85,8 @@ int histogramnd_double_float_double(double *i_sample,
                                     double *o_bin_edges,
                                     int i_opt_flags,
                                     float i_weight_min,
-                                    float i_weight_max);
+                                    float i_weight_max,
+                                    int i_n_threads);
                                 
 int histogramnd_double_int32_t_double(double *i_sample,
                                       int32_t *i_weigths,
@@ -92,7 +99,8 @@ int histogramnd_double_int32_t_double(double *i_sample,
                                       double *o_bin_edges,
                                       int i_opt_flags,
                                       int32_t i_weight_min,
-                                      int32_t i_weight_max);
+                                      int32_t i_weight_max,
+                                      int i_n_threads);
                         
 /*=====================
  * float sample, double cumul
@@ -109,7 +117,8 @@ int histogramnd_float_double_double(float *i_sample,
                                     double *o_bin_edges,
                                     int i_opt_flags,
                                     double i_weight_min,
-                                    double i_weight_max);
+                                    double i_weight_max,
+                                    int i_n_threads);
                                 
 int histogramnd_float_float_double(float *i_sample,
                                    float *i_weigths,
@@ -122,7 +131,8 @@ int histogramnd_float_float_double(float *i_sample,
                                    double *o_bin_edges,
                                    int i_opt_flags,
                                    float i_weight_min,
-                                   float i_weight_max);
+                                   float i_weight_max,
+                                   int i_n_threads);
                                 
 int histogramnd_float_int32_t_double(float *i_sample,
                                      int32_t *i_weigths,
@@ -135,7 +145,8 @@ int histogramnd_float_int32_t_double(float *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      int32_t i_weight_min,
-                                     int32_t i_weight_max);
+                                     int32_t i_weight_max,
+                                     int i_n_threads);
 
 /*=====================
  * int32_t sample, double cumul
@@ -152,7 +163,8 @@ int histogramnd_int32_t_double_double(int32_t *i_sample,
                                       double *o_bin_edges,
                                       int i_opt_flags,
                                       double i_weight_min,
-                                      double i_weight_max);
+                                      double i_weight_max,
+                                      int i_n_threads);
                                 
 int histogramnd_int32_t_float_double(int32_t *i_sample,
                                      float *i_weigths,
@@ -165,7 +177,8 @@ int histogramnd_int32_t_float_double(int32_t *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      float i_weight_min,
-                                     float i_weight_max);
+                                     float i_weight_max,
+                                     int i_n_threads);
                                 
 int histogramnd_int32_t_int32_t_double(int32_t *i_sample,
                                        int32_t *i_weigths,
@@ -178,7 +191,8 @@ int histogramnd_int32_t_int32_t_double(int32_t *i_sample,
                                        double *o_bin_edges,
                                        int i_opt_flags,
                                        int32_t i_weight_min,
-                                       int32_t i_weight_max);
+                                       int32_t i_weight_max,
+                                       int i_n_threads);
                                        
 /*=====================
  * double sample, float cumul
@@ -196,7 +210,8 @@ int histogramnd_double_double_float(double *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      double i_weight_min,
-                                     double i_weight_max);
+                                     double i_weight_max,
+                                     int i_n_threads);
                                 
 int histogramnd_double_float_float(double *i_sample,
                                     float *i_weigths,
@@ -209,7 +224,8 @@ int histogramnd_double_float_float(double *i_sample,
                                     double *o_bin_edges,
                                     int i_opt_flags,
                                     float i_weight_min,
-                                    float i_weight_max);
+                                    float i_weight_max,
+                                    int i_n_threads);
                                 
 int histogramnd_double_int32_t_float(double *i_sample,
                                       int32_t *i_weigths,
@@ -222,7 +238,8 @@ int histogramnd_double_int32_t_float(double *i_sample,
                                       double *o_bin_edges,
                                       int i_opt_flags,
                                       int32_t i_weight_min,
-                                      int32_t i_weight_max);
+                                      int32_t i_weight_max,
+                                      int i_n_threads);
                         
 /*=====================
  * float sample, float cumul
@@ -239,7 +256,8 @@ int histogramnd_float_double_float(float *i_sample,
                                     double *o_bin_edges,
                                     int i_opt_flags,
                                     double i_weight_min,
-                                    double i_weight_max);
+                                    double i_weight_max,
+                                    int i_n_threads);
                                 
 int histogramnd_float_float_float(float *i_sample,
                                    float *i_weigths,
@@ -252,7 +270,8 @@ int histogramnd_float_float_float(float *i_sample,
                                    double *o_bin_edges,
                                    int i_opt_flags,
                                    float i_weight_min,
-                                   float i_weight_max);
+                                   float i_weight_max,
+                                   int i_n_threads);
                                 
 int histogramnd_float_int32_t_float(float *i_sample,
                                      int32_t *i_weigths,
@@ -265,7 +284,8 @@ int histogramnd_float_int32_t_float(float *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      int32_t i_weight_min,
-                                     int32_t i_weight_max);
+                                     int32_t i_weight_max,
+                                     int i_n_threads);
 
 /*=====================
  * int32_t sample, double cumul
@@ -282,7 +302,8 @@ int histogramnd_int32_t_double_float(int32_t *i_sample,
                                       double *o_bin_edges,
                                       int i_opt_flags,
                                       double i_weight_min,
-                                      double i_weight_max);
+                                      double i_weight_max,
+                                      int i_n_threads);
                                 
 int histogramnd_int32_t_float_float(int32_t *i_sample,
                                      float *i_weigths,
@@ -295,7 +316,8 @@ int histogramnd_int32_t_float_float(int32_t *i_sample,
                                      double *o_bin_edges,
                                      int i_opt_flags,
                                      float i_weight_min,
-                                     float i_weight_max);
+                                     float i_weight_max,
+                                     int i_n_threads);
                                 
 int histogramnd_int32_t_int32_t_float(int32_t *i_sample,
                                        int32_t *i_weigths,
@@ -308,6 +330,7 @@ int histogramnd_int32_t_int32_t_float(int32_t *i_sample,
                                        double *o_bin_edges,
                                        int i_opt_flags,
                                        int32_t i_weight_min,
-                                       int32_t i_weight_max);
+                                       int32_t i_weight_max,
+                                       int i_n_threads);
                         
 #endif /* #define HISTOGRAMND_C_H */
@@ -28,6 +28,10 @@
 #include <math.h>
 #include <stdarg.h>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 #ifdef HISTO_SAMPLE_T
 #ifdef HISTO_WEIGHT_T
 #ifdef HISTO_CUMUL_T
@@ -44,22 +48,29 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
                          double *o_bin_edges,
                          int i_opt_flags,
                          HISTO_WEIGHT_T i_weight_min,
-                         HISTO_WEIGHT_T i_weight_max)
+                         HISTO_WEIGHT_T i_weight_max,
+                         int i_n_threads)
 {
     /* some counters */
     int i = 0, j = 0;
-    long elem_idx = 0;
-    
-    HISTO_WEIGHT_T * weight_ptr = 0;
-    HISTO_SAMPLE_T elem_coord = 0.;
     
     /* computed bin index (i_sample -> grid) */
     long bin_idx = 0;
     
+    /* total number of bins in the grid */
+    long n_bins_total = 1;
+    
     double * g_min = 0;
     double * g_max = 0;
     double * range = 0;
     
+    /* thread-private histograms, merged at the end of the computation,
+     * or NULL if the threads update the output arrays atomically.
+     */
+    uint32_t * priv_histo = 0;
+    HISTO_CUMUL_T * priv_cumul = 0;
+    int use_private = 0;
+    
     /* ================================
      * Parsing options, if any.
      * ================================
@@ -109,6 +120,7 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         g_min[i] = i_bin_ranges[i*2];
         g_max[i] = i_bin_ranges[i*2+1];
         range[i] = g_max[i]-g_min[i];
+        n_bins_total *= i_n_bins[i];
         
         for(bin_idx=0; bin_idx<i_n_bins[i]; j++, bin_idx++)
         {
@@ -118,8 +130,6 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         o_bin_edges[j++] = g_max[i];
     }
     
-    weight_ptr = i_weights;
-    
     if(!i_weights)
     {
         /* if weights are not provided there no point in trying to filter them
@@ -136,114 +146,217 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
         o_cumul = 0;
     }
     
-    /* tried to use pointers instead of indices here, but it didn't
-     * seem any faster (probably because the compiler 
-     * optimizes stuff anyway),
-     * so i'm keeping the "indices" version, for the sake of clarity
-    */
-    for(elem_idx=0;
-        elem_idx<i_n_elem*i_n_dim;
-        elem_idx+=i_n_dim, weight_ptr++)
+#ifdef _OPENMP
+    if(i_n_threads < 1)
     {
-        /* no testing the validity of weight_ptr here, because if it is NULL
-         * then filt_min_weight/filt_max_weight will be 0.
-         * (see code above)
-         */
-        if(filt_min_weight && *weight_ptr<i_weight_min)
+        i_n_threads = omp_get_max_threads();
+    }
+    
+    /* Each thread fills its own copy of the histograms as long as they
+     * are small compared to the sample and fit in memory.
+     * Otherwise (or if the allocation fails) the threads update the
+     * output histograms with atomic operations.
+     */
+    if(i_n_threads > 1 &&
+       (long) i_n_threads * n_bins_total <= i_n_elem &&
+       (long) i_n_threads * n_bins_total <= HISTO_MAX_PRIVATE_BINS)
+    {
+        priv_histo = (uint32_t *) calloc((size_t) i_n_threads * n_bins_total,
+                                         sizeof(uint32_t));
+        if(o_cumul)
         {
-            continue;
+            priv_cumul = (HISTO_CUMUL_T *) calloc(
+                    (size_t) i_n_threads * n_bins_total,
+                    sizeof(HISTO_CUMUL_T));
         }
-        if(filt_max_weight && *weight_ptr>i_weight_max)
+        use_private = priv_histo && (!o_cumul || priv_cumul);
+        if(!use_private)
         {
-            continue;
+            free(priv_histo);
+            free(priv_cumul);
+            priv_histo = 0;
+            priv_cumul = 0;
         }
-
-        bin_idx = 0;
+    }
+#else
+    i_n_threads = 1;
+#endif
+    
+    #pragma omp parallel num_threads(i_n_threads) if(i_n_threads > 1)
+    {
+        long elem_idx = 0;
+        long thread_bin_idx = 0;
+        int dim = 0;
+        int thread_idx = 0;
+        HISTO_SAMPLE_T elem_coord = 0.;
+        uint32_t * histo = o_histo;
+        HISTO_CUMUL_T * cumul = o_cumul;
+        int atomic = 0;
         
-        for(i=0; i<i_n_dim; i++)
+#ifdef _OPENMP
+        if(use_private)
         {
-            elem_coord = i_sample[elem_idx+i];
-            
-            /* =====================
-             * Element is rejected if any of the following is NOT true :
-             * 1. coordinate is >= than the minimum value
-             * 2. coordinate is <= than the maximum value
-             * 3. coordinate==maximum value and last_bin_closed is True
-             * =====================
+            histo = priv_histo + (long) omp_get_thread_num() * n_bins_total;
+            if(cumul)
+            {
+                cumul = priv_cumul +
+                        (long) omp_get_thread_num() * n_bins_total;
+            }
+        }
+        else
+        {
+            atomic = omp_get_num_threads() > 1;
+        }
+#endif
+        
+        #pragma omp for schedule(static)
+        for(elem_idx=0; elem_idx<i_n_elem; elem_idx++)
+        {
+            /* no testing the validity of i_weights here, because if it is
+             * NULL then filt_min_weight/filt_max_weight will be 0.
+             * (see code above)
              */
-            if(elem_coord<g_min[i])
+            if(filt_min_weight && i_weights[elem_idx]<i_weight_min)
+            {
+                continue;
+            }
+            if(filt_max_weight && i_weights[elem_idx]>i_weight_max)
             {
-                bin_idx = -1;
-                break;
+                continue;
             }
             
-            /* Here we make the assumption that most of the time
-             * there will be more coordinates inside the grid interval
-             *  (one test)
-             *  than coordinates higher or equal to the max
-             *  (two tests)
-             */
-            if(elem_coord<g_max[i])
+            thread_bin_idx = 0;
+            
+            for(dim=0; dim<i_n_dim; dim++)
             {
-                /* Warning : the following factorization seems to
-                 *  increase the effect of precision error.
-                 * bin_idx = (long)floor(
-                 *                   (bin_idx +
-                 *                   (elem_coord-g_min[i])/range[i]) *
-                 *               i_n_bins[i]
-                 *           );
+                elem_coord = i_sample[elem_idx*i_n_dim+dim];
+                
+                /* =====================
+                 * Element is rejected if any of the following is NOT true :
+                 * 1. coordinate is >= than the minimum value
+                 * 2. coordinate is <= than the maximum value
+                 * 3. coordinate==maximum value and last_bin_closed is True
+                 * =====================
                  */
+                if(elem_coord<g_min[dim])
+                {
+                    thread_bin_idx = -1;
+                    break;
+                }
                 
-                /* Not using floor to speed up things.
-                 * We don't (?) need all the error checking provided by
-                 * the built-in floor().
-                 * Also the value is supposed to be always positive.
+                /* Here we make the assumption that most of the time
+                 * there will be more coordinates inside the grid interval
+                 *  (one test)
+                 *  than coordinates higher or equal to the max
+                 *  (two tests)
                  */
-                bin_idx = bin_idx * i_n_bins[i] +
-                        (long)(
-                                ((elem_coord-g_min[i]) * i_n_bins[i]) /
-                                range[i]
-                              );
+                if(elem_coord<g_max[dim])
+                {
+                    /* Warning : the following factorization seems to
+                     *  increase the effect of precision error.
+                     * bin_idx = (long)floor(
+                     *                   (bin_idx +
+                     *                   (elem_coord-g_min[i])/range[i]) *
+                     *               i_n_bins[i]
+                     *           );
+                     */
+                    
+                    /* Not using floor to speed up things.
+                     * We don't (?) need all the error checking provided by
+                     * the built-in floor().
+                     * Also the value is supposed to be always positive.
+                     */
+                    thread_bin_idx = thread_bin_idx * i_n_bins[dim] +
+                            (long)(
+                                    ((elem_coord-g_min[dim]) * i_n_bins[dim]) /
+                                    range[dim]
+                                  );
+                }
+                else /* ===> elem_coord>=g_max[i] */
+                {
+                    /* if equal and the last bin is closed :
+                     *  put it in the last bin
+                     * else : discard
+                     */
+                    if(last_bin_closed && elem_coord==g_max[dim])
+                    {
+                        thread_bin_idx = (thread_bin_idx + 1) *
+                                         i_n_bins[dim] - 1;
+                    }
+                    else
+                    {
+                        thread_bin_idx = -1;
+                        break;
+                    }
+                } /* if(elem_coord<g_max[i]) */
+                
+            } /* for(dim=0; dim<i_n_dim; dim++) */
+            
+            /* element is out of the grid */
+            if(thread_bin_idx==-1)
+            {
+                continue;
             }
-            else /* ===> elem_coord>=g_max[i] */
+            
+            if(atomic)
             {
-                /* if equal and the last bin is closed :
-                 *  put it in the last bin
-                 * else : discard
-                 */
-                if(last_bin_closed && elem_coord==g_max[i])
+                if(histo)
                 {
-                    bin_idx = (bin_idx + 1) * i_n_bins[i] - 1;
+                    #pragma omp atomic
+                    histo[thread_bin_idx] += 1;
                 }
-                else
+                if(cumul)
                 {
-                    bin_idx = -1;
-                    break;
+                    #pragma omp atomic
+                    cumul[thread_bin_idx] +=
+                            (HISTO_CUMUL_T) i_weights[elem_idx];
+                }
+            }
+            else
+            {
+                if(histo)
+                {
+                    histo[thread_bin_idx] += 1;
                 }
-            } /* if(elem_coord<g_max[i]) */
+                if(cumul)
+                {
+                    /* not testing the pointer since o_cumul is null if
+                     * i_weights is null.
+                     */
+                    cumul[thread_bin_idx] +=
+                            (HISTO_CUMUL_T) i_weights[elem_idx];
+                }
+            }
             
-        } /* for(i=0; i<i_n_dim; i++) */
-        
-        /* element is out of the grid */
-        if(bin_idx==-1)
-        {
-            continue;
-        }
+        } /* for(elem_idx=0; elem_idx<i_n_elem; elem_idx++) */
         
-        if(o_histo)
+        if(use_private)
         {
-            o_histo[bin_idx] += 1;
-        }
-        if(o_cumul)
-        {
-            /* not testing the pointer since o_cumul is null if 
-             * i_weights is null. 
-             */
-            o_cumul[bin_idx] += (HISTO_CUMUL_T) *weight_ptr;
+            /* merging the thread-private histograms */
+            #pragma omp for schedule(static)
+            for(thread_bin_idx=0;
+                thread_bin_idx<n_bins_total;
+                thread_bin_idx++)
+            {
+                for(thread_idx=0; thread_idx<i_n_threads; thread_idx++)
+                {
+                    if(o_histo)
+                    {
+                        o_histo[thread_bin_idx] += priv_histo[
+                            thread_idx*n_bins_total + thread_bin_idx];
+                    }
+                    if(o_cumul)
+                    {
+                        o_cumul[thread_bin_idx] += priv_cumul[
+                            thread_idx*n_bins_total + thread_bin_idx];
+                    }
+                }
+            }
         }
-        
-    } /* for(elem_idx=0; elem_idx<i_n_elem*i_n_dim; elem_idx+=i_n_dim) */
+    } /* omp parallel */
     
+    free(priv_histo);
+    free(priv_cumul);
     free(g_min);
     free(g_max);
     free(range);
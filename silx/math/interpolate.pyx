@@ -22,12 +22,13 @@
 # THE SOFTWARE.
 #
 # ############################################################################*/
-"""This module provides :func:`interp3d` to perform trilinear interpolation.
+"""This module provides :func:`interp3d` to perform nearest, trilinear and
+tricubic interpolation.
 """
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "11/07/2019"
+__date__ = "17/10/2026"
 
 
 import cython
@@ -39,7 +40,15 @@ from libc.math cimport floor
 cimport numpy as cnumpy
 
 
-ctypedef fused _floating:
+ctypedef fused _values:
+    cnumpy.int8_t
+    cnumpy.uint8_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
+    cnumpy.int32_t
+    cnumpy.uint32_t
+    cnumpy.int64_t
+    cnumpy.uint64_t
     float
     double
 
@@ -48,18 +57,74 @@ ctypedef fused _floating_pts:
     double
 
 
+cdef enum _method:
+    NEAREST
+    LINEAR
+    CUBIC
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint is_outside(
+    _values[:, :, :, :] values,
+    _floating_pts pos0,
+    _floating_pts pos1,
+    _floating_pts pos2) nogil:
+    """Returns True if the position is outside the volumes
+
+    :param values: Stack of 3D datasets
+    :param pos0: Dimension 0 coordinate
+    :param pos1: Dimension 1 coordinate
+    :param pos2: Dimension 2 coordinate
+    """
+    return (not (pos0 >= 0. and pos0 <= (values.shape[1] -1)) or
+            not (pos1 >= 0. and pos1 <= (values.shape[2] -1)) or
+            not (pos2 >= 0. and pos2 <= (values.shape[3] -1)))
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double nearest_interpolation(
+    _values[:, :, :, :] values,
+    Py_ssize_t index,
+    _floating_pts pos0,
+    _floating_pts pos1,
+    _floating_pts pos2,
+    double fill_value) nogil:
+    """Evaluate the nearest interpolation at a given position
+
+    :param values: Stack of 3D datasets from which to do the interpolation
+    :param index: Index of the 3D dataset in values
+    :param pos0: Dimension 0 coordinate at which to evaluate the interpolation
+    :param pos1: Dimension 1 coordinate at which to evaluate the interpolation
+    :param pos2: Dimension 2 coordinate at which to evaluate the interpolation
+    :param fill_value: Value to return for points outside data
+    """
+    if is_outside(values, pos0, pos1, pos2):
+        return fill_value
+
+    return <double> values[index,
+                           <int> floor(pos0 + 0.5),
+                           <int> floor(pos1 + 0.5),
+                           <int> floor(pos2 + 0.5)]
+
+
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
 cdef inline double trilinear_interpolation(
-    _floating[:, :, :] values,
+    _values[:, :, :, :] values,
+    Py_ssize_t index,
     _floating_pts pos0,
     _floating_pts pos1,
     _floating_pts pos2,
     double fill_value) nogil:
     """Evaluate the trilinear interpolation at a given position
 
-    :param values: 3D dataset from which to do the interpolation
+    :param values: Stack of 3D datasets from which to do the interpolation
+    :param index: Index of the 3D dataset in values
     :param pos0: Dimension 0 coordinate at which to evaluate the interpolation
     :param pos1: Dimension 1 coordinate at which to evaluate the interpolation
     :param pos2: Dimension 2 coordinate at which to evaluate the interpolation
@@ -72,9 +137,7 @@ cdef inline double trilinear_interpolation(
         double c00, c01, c10, c11, c0, c1
         double c
 
-    if (pos0 < 0. or pos0 > (values.shape[0] -1) or
-            pos1 < 0. or pos1 > (values.shape[1] -1) or
-            pos2 < 0. or pos2 > (values.shape[2] -1)):
+    if is_outside(values, pos0, pos1, pos2):
         return fill_value
 
     i0 = < int > floor(pos0)
@@ -83,21 +146,21 @@ cdef inline double trilinear_interpolation(
 
     # Clip i+1 indices to data volume
     # In this case, corresponding dX is 0.
-    i0_plus1 = min(i0 + 1, values.shape[0] - 1)
-    i1_plus1 = min(i1 + 1, values.shape[1] - 1)
-    i2_plus1 = min(i2 + 1, values.shape[2] - 1)
+    i0_plus1 = min(i0 + 1, values.shape[1] - 1)
+    i1_plus1 = min(i1 + 1, values.shape[2] - 1)
+    i2_plus1 = min(i2 + 1, values.shape[3] - 1)
 
     if pos2 == i2:  # Avoids multiplication by 0 (which yields to NaN with inf)
-        c00 = <double> values[i0, i1, i2]
-        c10 = <double> values[i0, i1_plus1, i2]
-        c01 = <double> values[i0_plus1, i1, i2]
-        c11 = <double> values[i0_plus1, i1_plus1, i2]
+        c00 = <double> values[index, i0, i1, i2]
+        c10 = <double> values[index, i0, i1_plus1, i2]
+        c01 = <double> values[index, i0_plus1, i1, i2]
+        c11 = <double> values[index, i0_plus1, i1_plus1, i2]
     else:
         delta = pos2 - i2
-        c00 = (<double> values[i0, i1, i2]) * (1. - delta) + (<double> values[i0, i1, i2_plus1]) * delta
-        c10 = (<double> values[i0, i1_plus1, i2]) * (1. - delta) + (<double> values[i0, i1_plus1, i2_plus1]) * delta
-        c01 = (<double> values[i0_plus1, i1, i2]) * (1. - delta) + (<double> values[i0_plus1, i1, i2_plus1]) * delta
-        c11 = (<double> values[i0_plus1, i1_plus1, i2]) * (1. - delta) + (<double> values[i0_plus1, i1_plus1, i2_plus1]) * delta
+        c00 = (<double> values[index, i0, i1, i2]) * (1. - delta) + (<double> values[index, i0, i1, i2_plus1]) * delta
+        c10 = (<double> values[index, i0, i1_plus1, i2]) * (1. - delta) + (<double> values[index, i0, i1_plus1, i2_plus1]) * delta
+        c01 = (<double> values[index, i0_plus1, i1, i2]) * (1. - delta) + (<double> values[index, i0_plus1, i1, i2_plus1]) * delta
+        c11 = (<double> values[index, i0_plus1, i1_plus1, i2]) * (1. - delta) + (<double> values[index, i0_plus1, i1_plus1, i2_plus1]) * delta
 
     if pos1 == i1:  # Avoids multiplication by 0 (which yields to NaN with inf)
         c0 = c00
@@ -116,50 +179,224 @@ cdef inline double trilinear_interpolation(
     return c
 
 
+@cython.cdivision(True)
+cdef inline void cubic_weights(double delta, double *weights) nogil:
+    """Compute the weights of the cubic convolution kernel (Catmull-Rom)
+
+    :param delta: Distance in [0, 1) from the sample before the position
+    :param weights: Array of the 4 weights of samples at -1, 0, 1, 2
+    """
+    cdef double delta2 = delta * delta
+    cdef double delta3 = delta2 * delta
+    weights[0] = (- delta3 + 2. * delta2 - delta) / 2.
+    weights[1] = (3. * delta3 - 5. * delta2 + 2.) / 2.
+    weights[2] = (- 3. * delta3 + 4. * delta2 + delta) / 2.
+    weights[3] = (delta3 - delta2) / 2.
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline double tricubic_interpolation(
+    _values[:, :, :, :] values,
+    Py_ssize_t index,
+    _floating_pts pos0,
+    _floating_pts pos1,
+    _floating_pts pos2,
+    double fill_value) nogil:
+    """Evaluate the tricubic interpolation at a given position
+
+    It uses the Catmull-Rom cubic convolution kernel and
+    replicates the borders of the volume.
+
+    :param values: Stack of 3D datasets from which to do the interpolation
+    :param index: Index of the 3D dataset in values
+    :param pos0: Dimension 0 coordinate at which to evaluate the interpolation
+    :param pos1: Dimension 1 coordinate at which to evaluate the interpolation
+    :param pos2: Dimension 2 coordinate at which to evaluate the interpolation
+    :param fill_value: Value to return for points outside data
+    """
+    cdef:
+        int i0, i1, i2  # Indices of the sample before the position
+        int[4] indices0, indices1, indices2
+        double[4] weights0, weights1, weights2
+        int j0, j1, j2
+        double c0, c1, c
+
+    if is_outside(values, pos0, pos1, pos2):
+        return fill_value
+
+    i0 = < int > floor(pos0)
+    i1 = < int > floor(pos1)
+    i2 = < int > floor(pos2)
+
+    cubic_weights(pos0 - i0, weights0)
+    cubic_weights(pos1 - i1, weights1)
+    cubic_weights(pos2 - i2, weights2)
+
+    # Clip indices to data volume
+    for j0 in range(4):
+        indices0[j0] = min(max(i0 + j0 - 1, 0), values.shape[1] - 1)
+        indices1[j0] = min(max(i1 + j0 - 1, 0), values.shape[2] - 1)
+        indices2[j0] = min(max(i2 + j0 - 1, 0), values.shape[3] - 1)
+
+    # Samples with a 0 weight are skipped
+    # to avoid multiplication by 0 (which yields to NaN with inf)
+    c = 0.
+    for j0 in range(4):
+        if weights0[j0] == 0.:
+            continue
+        c0 = 0.
+        for j1 in range(4):
+            if weights1[j1] == 0.:
+                continue
+            c1 = 0.
+            for j2 in range(4):
+                if weights2[j2] != 0.:
+                    c1 += weights2[j2] * (<double> values[
+                        index, indices0[j0], indices1[j1], indices2[j2]])
+            c0 += weights1[j1] * c1
+        c += weights0[j0] * c0
+
+    return c
+
+
+@cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def interp3d(_floating[:, :, :] values not None,
-             _floating_pts[:, :] xi not None,
-             str method='linear',
-             double fill_value=numpy.nan):
-    """Trilinear interpolation in a regular grid.
+cdef inline double interpolation(
+    _values[:, :, :, :] values,
+    Py_ssize_t index,
+    _floating_pts pos0,
+    _floating_pts pos1,
+    _floating_pts pos2,
+    _method method,
+    double fill_value) nogil:
+    """Evaluate the interpolation at a given position with given method"""
+    if method == NEAREST:
+        return nearest_interpolation(
+            values, index, pos0, pos1, pos2, fill_value)
+    elif method == CUBIC:
+        return tricubic_interpolation(
+            values, index, pos0, pos1, pos2, fill_value)
+    else:
+        return trilinear_interpolation(
+            values, index, pos0, pos1, pos2, fill_value)
+
+
+_METHODS = {
+    'nearest': NEAREST,
+    'linear': LINEAR,
+    'cubic': CUBIC,
+}
 
-    Perform trilinear interpolation of the 3D dataset at given points
 
-    :param numpy.ndarray values: 3D dataset of floating point values
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _interp3d(_values[:, :, :, :] values,
+              _floating_pts[:, :] xi,
+              result,
+              int c_method,
+              bint use_omp,
+              double fill_value):
+    """Interpolate a stack of 3D datasets at given points in result
+
+    :param values: (K, D0, D1, D2) stack of 3D datasets
+    :param xi: (N, 3) sampling points
+    :param numpy.ndarray result: (K, N) float32 or float64 array to fill
+    :param int c_method: The interpolation method
+    :param bool use_omp: True to use OpenMP parallelism
+    :param float fill_value: Value to use for points outside the volume
+    """
+    cdef:
+        Py_ssize_t nvolumes = values.shape[0]
+        Py_ssize_t npoints = xi.shape[0]
+        Py_ssize_t index, volume, point
+        float[:, :] result_float
+        double[:, :] result_double
+        bint is_float = result.dtype == numpy.float32
+        _method method = <_method> c_method
+        double value
+
+    if is_float:
+        result_float = result
+    else:
+        result_double = result
+
+    if use_omp:
+        for index in prange(nvolumes * npoints, nogil=True):
+            volume = index // npoints
+            point = index % npoints
+            value = interpolation(values, volume,
+                                  xi[point, 0], xi[point, 1], xi[point, 2],
+                                  method, fill_value)
+            if is_float:
+                result_float[volume, point] = <float> value
+            else:
+                result_double[volume, point] = value
+    else:
+        with nogil:
+            for volume in range(nvolumes):
+                for point in range(npoints):
+                    value = interpolation(values, volume,
+                                          xi[point, 0], xi[point, 1], xi[point, 2],
+                                          method, fill_value)
+                    if is_float:
+                        result_float[volume, point] = <float> value
+                    else:
+                        result_double[volume, point] = value
+
+
+def interp3d(values, xi, str method='linear', double fill_value=numpy.nan):
+    """Interpolation in a regular grid.
+
+    Perform nearest, trilinear or tricubic interpolation of the 3D dataset
+    (or of each 3D dataset of a stack of 3D datasets) at given points.
+
+    Integer datasets are interpolated without being converted to floats first.
+
+    :param numpy.ndarray values:
+        3D dataset or (K, D0, D1, D2) stack of K 3D datasets
+        of floating point or integer values
     :param numpy.ndarray xi: (N, 3) sampling points
     :param str method: Interpolation method to use in:
+        - 'nearest': Nearest neighbour
         - 'linear': Trilinear interpolation
-        - 'linear_omp': Trilinear interpolation with OpenMP parallelism
+        - 'cubic': Tricubic interpolation (Catmull-Rom cubic convolution)
+        Suffix '_omp' (e.g., 'linear_omp') to use OpenMP parallelism.
     :param float fill_value:
         Value to use for points outside the volume (default: nan)
-    :return: Values evaluated at given input points.
+    :return: Values evaluated at given input points as a (N,) array for a
+        3D dataset or as a (K, N) array for a stack of 3D datasets.
+        It is float32 for float32 and up to 16 bits integer values,
+        float64 otherwise.
     :rtype: numpy.ndarray
     """
-    if _floating is cnumpy.float32_t:
-        dtype = numpy.float32
-    elif _floating is cnumpy.float64_t:
-        dtype = numpy.float64
-    else:  # This should not happen
-        raise ValueError("Unsupported input dtype")
+    use_omp = method.endswith('_omp')
+    try:
+        c_method = _METHODS[method[:-4] if use_omp else method]
+    except KeyError:
+        raise ValueError("Unsupported method: %s" % method)
 
-    cdef:
-        int npoints = xi.shape[0]
-        _floating[:] result = numpy.empty((npoints,), dtype=dtype)
-        int index
-        double c_fill_value = fill_value
+    values = numpy.asarray(values)
+    if values.ndim not in (3, 4):
+        raise ValueError(
+            "Unsupported number of dimensions: %d" % values.ndim)
+    if values.dtype.kind not in 'iu' and values.dtype not in (
+            numpy.float32, numpy.float64):
+        raise ValueError("Unsupported input dtype: %s" % values.dtype)
 
-    if method == 'linear':
-        with nogil:
-            for index in range(npoints):
-                result[index] = < _floating > trilinear_interpolation(
-                    values, xi[index, 0], xi[index, 1], xi[index, 2], c_fill_value)
-
-    elif method == 'linear_omp':
-        for index in prange(npoints, nogil=True):
-            result[index] = < _floating > trilinear_interpolation(
-                values, xi[index, 0], xi[index, 1], xi[index, 2], c_fill_value)
-    else:
-        raise ValueError("Unsupported method: %s" % method)
+    xi = numpy.asarray(xi)
+    if xi.ndim != 2 or xi.shape[1] != 3:
+        raise ValueError("xi must be a (N, 3) array")
+    if xi.dtype not in (numpy.float32, numpy.float64):
+        xi = xi.astype(numpy.float64)
+
+    stack = values if values.ndim == 4 else values[numpy.newaxis]
+    result = numpy.empty(
+        (stack.shape[0], len(xi)),
+        dtype=numpy.promote_types(values.dtype, numpy.float32))
+
+    _interp3d(stack, xi, result, c_method, use_omp, fill_value)
 
-    return numpy.array(result, copy=False)
\ No newline at end of file
+    return result if values.ndim == 4 else result[0]
@@ -26,16 +26,24 @@
 
 It provides a :class:`MarchingCubes` class allowing to build an isosurface
 from data provided as a 3D data set or slice by slice.
+It also provides :func:`marching_cubes` which processes a 3D data set by slabs
+in multiple threads.
 """
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "16/08/2017"
+__date__ = "17/10/2026"
 
 
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import os
+
 import numpy
 cimport numpy as cnumpy
 cimport cython
+from libcpp.vector cimport vector as std_vector
+from libc.string cimport memcpy
 
 cimport silx.math.mc as mc
 
@@ -230,17 +238,209 @@ cdef class MarchingCubes:
 
         Order is dim0, dim1, dim2 (i.e., z, y, x if dim0 is depth).
         """
-        return numpy.array(self.c_mc.vertices).reshape(-1, 3)
+        return _float_vector_to_array(self.c_mc.vertices).reshape(-1, 3)
 
     def get_normals(self):
         """Normals currently computed (ndarray of dim NbVertices x 3)
 
         Order is dim0, dim1, dim2 (i.e., z, y, x if dim0 is depth).
         """
-        return numpy.array(self.c_mc.normals).reshape(-1, 3)
+        return _float_vector_to_array(self.c_mc.normals).reshape(-1, 3)
 
     def get_indices(self):
         """Triangle indices currently computed (ndarray of dim NbTriangles x 3)
         """
-        return numpy.array(self.c_mc.indices,
-                           dtype=numpy.uint32).reshape(-1, 3)
+        return _uint_vector_to_array(self.c_mc.indices).reshape(-1, 3)
+
+
+cdef _float_vector_to_array(std_vector[float] & vector):
+    """Returns a copy of a vector as a numpy.ndarray of float32"""
+    cdef float[::1] array = numpy.empty(vector.size(), dtype=numpy.float32)
+    if vector.size() > 0:
+        memcpy(&array[0], vector.data(), vector.size() * sizeof(float))
+    return numpy.asarray(array)
+
+
+cdef _uint_vector_to_array(std_vector[unsigned int] & vector):
+    """Returns a copy of a vector as a numpy.ndarray of uint32"""
+    cdef unsigned int[::1] array = numpy.empty(vector.size(), dtype=numpy.uint32)
+    if vector.size() > 0:
+        memcpy(&array[0], vector.data(), vector.size() * sizeof(unsigned int))
+    return numpy.asarray(array)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef bint _has_crossing(float[:, :, ::1] data,
+                        float isolevel,
+                        unsigned int sampling0,
+                        unsigned int sampling1,
+                        unsigned int sampling2) nogil:
+    """Returns True if sampled data has values on both sides of isolevel"""
+    cdef:
+        unsigned int i, j, k
+        bint below
+
+    below = data[0, 0, 0] <= isolevel
+    i = 0
+    while i < data.shape[0]:
+        j = 0
+        while j < data.shape[1]:
+            k = 0
+            while k < data.shape[2]:
+                if (data[i, j, k] <= isolevel) != below:
+                    return True
+                k += sampling2
+            j += sampling1
+        i += sampling0
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _process_slab(data, float isolevel, bint invert_normals, sampling):
+    """Compute the isosurface of a slab of a data set.
+
+    Vertices of the last slice of the slab are the first vertices of the
+    isosurface of the next slab.
+
+    :param numpy.ndarray data: 3D contiguous array of native float32
+    :param float isolevel: The value for which to generate the isosurface
+    :param bool invert_normals: True to use gradient descent as normals
+    :param sampling: Sampling along each dimension (depth, height, width)
+    :return: (vertices, normals, indices, indices of vertices of the last
+        slice) or None if there is no isosurface in this slab
+    """
+    cdef:
+        float[:, :, ::1] c_data = data
+        mc.MarchingCubes[float, float] * c_mc
+        std_vector[unsigned int] last_slice_vertices
+        unsigned int index, nb_slices
+        unsigned int sampling0 = sampling[0]
+        unsigned int sampling1 = sampling[1]
+        unsigned int sampling2 = sampling[2]
+        bint has_crossing
+
+    with nogil:
+        has_crossing = _has_crossing(
+            c_data, isolevel, sampling0, sampling1, sampling2)
+    if not has_crossing:
+        return None
+
+    c_mc = new mc.MarchingCubes[float, float](isolevel)
+    try:
+        c_mc.invert_normals = invert_normals
+        c_mc.sampling[0] = sampling0
+        c_mc.sampling[1] = sampling1
+        c_mc.sampling[2] = sampling2
+        c_mc.set_slice_size(c_data.shape[1], c_data.shape[2])
+
+        nb_slices = (c_data.shape[0] - 1) // sampling0
+        with nogil:
+            for index in range(nb_slices):
+                c_mc.process_slice(&c_data[index * sampling0, 0, 0],
+                                   &c_data[(index + 1) * sampling0, 0, 0])
+            c_mc.get_last_slice_vertices(last_slice_vertices)
+
+        return (_float_vector_to_array(c_mc.vertices).reshape(-1, 3),
+                _float_vector_to_array(c_mc.normals).reshape(-1, 3),
+                _uint_vector_to_array(c_mc.indices).reshape(-1, 3),
+                _uint_vector_to_array(last_slice_vertices))
+    finally:
+        del c_mc
+
+
+def marching_cubes(data, isolevel, invert_normals=True, sampling=(1, 1, 1),
+                   slab_size=None, max_workers=None):
+    """Compute an isosurface using multiple threads.
+
+    The data set is split along the first dimension in slabs sharing their
+    boundary slices. Slabs are processed in parallel and their isosurfaces
+    are merged, sharing vertices on the boundary slices.
+    Slabs without values on both sides of the iso-level are skipped.
+
+    Data is read slab by slab, so it can be a :class:`h5py.Dataset`: only
+    a few slabs are loaded in memory at once.
+
+    The result is the same as with :class:`MarchingCubes` except for the
+    order of the vertices and triangles and rounding errors.
+
+    >>> vertices, normals, indices = marching_cubes(data, isolevel=1.)
+
+    :param data: 3D dataset, numpy.ndarray or h5py.Dataset
+    :param float isolevel: The value for which to generate the isosurface
+    :param bool invert_normals:
+        True (default) for normals oriented in direction of gradient descent
+    :param sampling: Sampling along each dimension (depth, height, width)
+    :param Union[int,None] slab_size:
+        Number of slices processed at once by a thread
+        or None (default) to use slabs of at most 2**24 voxels
+        with at least one slab per thread.
+    :param Union[int,None] max_workers:
+        Maximum number of threads or None (default) for the number of CPUs.
+    :return: (vertices, normals, indices) arrays of dim NbVertices x 3,
+        NbVertices x 3 and NbTriangles x 3
+    :rtype: List[numpy.ndarray]
+    """
+    depth, height, width = data.shape
+    sampling = tuple(int(value) for value in sampling)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Slab boundaries are slices processed by the marching cubes
+    last_slice = ((depth - 1) // sampling[0]) * sampling[0]
+    if slab_size is None:
+        slab_size = min(2 ** 24 // max(1, height * width),
+                        -(-last_slice // max_workers))
+    slab_size = max(1, int(slab_size) // sampling[0]) * sampling[0]
+    starts = list(range(0, last_slice, slab_size))
+
+    def read_slab(start):
+        end = min(start + slab_size, last_slice) + 1
+        return numpy.ascontiguousarray(data[start:end], dtype='=f4')
+
+    # Limit the number of slabs loaded in memory
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque()
+        for start in starts:
+            if len(pending) >= 2 * max_workers:
+                results.append(pending.popleft().result())
+            pending.append(executor.submit(
+                _process_slab, read_slab(start),
+                isolevel, invert_normals, sampling))
+        results.extend(future.result() for future in pending)
+
+    # Merge slabs sharing vertices of boundary slices
+    all_vertices, all_normals, all_indices = [], [], []
+    nb_vertices = 0
+    previous_slice_vertices = numpy.zeros((0,), dtype=numpy.uint32)
+    for start, result in zip(starts, results):
+        if result is None:  # No crossing in the slab, including boundaries
+            previous_slice_vertices = numpy.zeros((0,), dtype=numpy.uint32)
+            continue
+        vertices, normals, indices, last_slice_vertices = result
+        nb_shared = len(previous_slice_vertices)
+        nb_new = len(vertices) - nb_shared
+
+        mapping = numpy.empty((len(vertices),), dtype=numpy.uint32)
+        mapping[:nb_shared] = previous_slice_vertices
+        mapping[nb_shared:] = numpy.arange(
+            nb_vertices, nb_vertices + nb_new, dtype=numpy.uint32)
+
+        vertices = vertices[nb_shared:]
+        vertices[:, 0] += start
+        all_vertices.append(vertices)
+        all_normals.append(normals[nb_shared:])
+        all_indices.append(mapping[indices])
+        previous_slice_vertices = mapping[last_slice_vertices]
+        nb_vertices += nb_new
+
+    if nb_vertices == 0:
+        return (numpy.zeros((0, 3), dtype=numpy.float32),
+                numpy.zeros((0, 3), dtype=numpy.float32),
+                numpy.zeros((0, 3), dtype=numpy.uint32))
+
+    return (numpy.concatenate(all_vertices),
+            numpy.concatenate(all_normals),
+            numpy.concatenate(all_indices))
@@ -126,6 +126,20 @@ public:
     void process_slice(const FloatIn * slice0,
                        const FloatIn * slice1);
 
+    /** Get the vertices lying in the plane of the last processed slice.
+     *
+     * Those are the vertices of the edges in the plane of the last slice
+     * provided to process_slice, ordered by row, column and edge direction.
+     * This is the same order as the vertices of the first slice when it is
+     * processed first: It allows to merge isosurfaces computed on
+     * consecutive parts of a data set sharing a slice.
+     *
+     * It MUST be called before finish_process.
+     *
+     * @param result Vector filled with the indices of the vertices
+     */
+    void get_last_slice_vertices(std::vector<unsigned int> & result);
+
     /** Clear marching cube processing internal cache. */
     void finish_process();
 
@@ -264,6 +278,29 @@ MarchingCubes<FloatIn, FloatOut>::reset()
     }
 }
 
+template <typename FloatIn, typename FloatOut>
+void
+MarchingCubes<FloatIn, FloatOut>::get_last_slice_vertices(
+    std::vector<unsigned int> & result)
+{
+    result.clear();
+    if (this->edge_indices == 0) {
+        return;
+    }
+
+    /* Edge indices are sorted by depth, row, column and direction and
+     * edges along depth (direction 2) are those between the 2 last slices.
+     */
+    std::map<unsigned int, unsigned int>::iterator it;
+    for (it = this->edge_indices->begin();
+         it != this->edge_indices->end();
+         it++) {
+        if (it->first % 3 != 2) {
+            result.push_back(it->second);
+        }
+    }
+}
+
 template <typename FloatIn, typename FloatOut>
 void
 MarchingCubes<FloatIn, FloatOut>::finish_process()
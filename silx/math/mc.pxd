@@ -36,7 +36,8 @@ cdef extern from "mc.hpp":
         void set_slice_size(unsigned int height,
                             unsigned int width)
         void process_slice(FloatIn * slice0,
-                           FloatIn * slice1) except +
+                           FloatIn * slice1) nogil except +
+        void get_last_slice_vertices(std_vector[unsigned int] & result) nogil
         void finish_process()
         void reset()
 
@@ -35,6 +35,7 @@
 #include <iostream>
 #include <cmath>
 #include <cfloat>
+#include <limits>
 
 /* Needed for pytohn2.7 on Windows... */
 #ifndef INFINITY
@@ -281,4 +282,368 @@ void median_filter(
     }
 }
 
+
+// return the index into 0, (length_max - 1) for the given border mode
+// valid is set to false if the index falls outside the data and must be
+// either ignored (shrink mode) or replaced by cval (constant mode)
+inline int border_index(int index, int length_max, MODE mode, bool& valid){
+    valid = true;
+    if(index >= 0 && index < length_max){
+        return index;
+    }
+    switch(mode){
+        case NEAREST:
+            return std::min(std::max(index, 0), length_max - 1);
+        case REFLECT:
+            return reflect(index, length_max);
+        case MIRROR:
+            // deal with 1d case
+            if(length_max == 1){
+                return 0;
+            }
+            return mirror(index, length_max);
+        case SHRINK:
+        case CONSTANT:
+        default:
+            valid = false;
+            return 0;
+    }
+}
+
+
+// Histogram of the values of the sliding window for integer types.
+// The histogram has 2 levels: a coarse level counting values sharing the
+// same most significant bits and a fine level with one bin per value,
+// so that finding the median only visits a few hundreds of bins.
+template<typename T>
+class WindowHistogram{
+public:
+    WindowHistogram():
+        fine_bins(1 << (8 * sizeof(T))),
+        coarse_shift(4 * sizeof(T)),
+        fine(fine_bins, 0),
+        coarse(fine_bins >> coarse_shift, 0),
+        count(0){
+    }
+
+    inline void add(T value){
+        int bin = to_bin(value);
+        fine[bin] += 1;
+        coarse[bin >> coarse_shift] += 1;
+        count += 1;
+    }
+
+    inline void remove(T value){
+        int bin = to_bin(value);
+        fine[bin] -= 1;
+        coarse[bin >> coarse_shift] -= 1;
+        count -= 1;
+    }
+
+    inline int size() const{
+        return count;
+    }
+
+    // Returns the value of the given rank (0-based) in the sorted window
+    inline T value_at_rank(int rank) const{
+        int cumulated = 0;
+        int coarse_bin = 0;
+        while(cumulated + coarse[coarse_bin] <= rank){
+            cumulated += coarse[coarse_bin];
+            coarse_bin++;
+        }
+        int bin = coarse_bin << coarse_shift;
+        while(cumulated + fine[bin] <= rank){
+            cumulated += fine[bin];
+            bin++;
+        }
+        return from_bin(bin);
+    }
+
+    // Same as median: the highest of the 2 central values for even size
+    inline T median() const{
+        return value_at_rank(count / 2);
+    }
+
+    inline T minimum() const{
+        return value_at_rank(0);
+    }
+
+    inline T maximum() const{
+        return value_at_rank(count - 1);
+    }
+
+private:
+    inline int to_bin(T value) const{
+        return static_cast<int>(value) - static_cast<int>(std::numeric_limits<T>::min());
+    }
+
+    inline T from_bin(int bin) const{
+        return static_cast<T>(bin + static_cast<int>(std::numeric_limits<T>::min()));
+    }
+
+    const int fine_bins;
+    const int coarse_shift;
+    std::vector<int> fine;
+    std::vector<int> coarse;
+    int count;
+};
+
+
+// Returns the offsets of the lines of the volume covered by the window
+// of the pixels of line (z_pixel, y_pixel) and whether they are inside the
+// volume or not.
+inline void window_lines(
+    int* kernel_dim,        // three values : 0:depth, 1:height, 2:width
+    int* image_dim,         // three values : 0:depth, 1:height, 2:width
+    int z_pixel,
+    int y_pixel,
+    MODE mode,
+    std::vector<long>& offsets,
+    std::vector<bool>& valid_lines) {
+
+    int halfKernel_z = (kernel_dim[0] - 1) / 2;
+    int halfKernel_y = (kernel_dim[1] - 1) / 2;
+
+    offsets.resize(kernel_dim[0] * kernel_dim[1]);
+    valid_lines.resize(kernel_dim[0] * kernel_dim[1]);
+
+    int index = 0;
+    for(int win_z=z_pixel-halfKernel_z; win_z <= z_pixel+halfKernel_z; win_z++){
+        bool valid_z;
+        int index_z = border_index(win_z, image_dim[0], mode, valid_z);
+        for(int win_y=y_pixel-halfKernel_y; win_y <= y_pixel+halfKernel_y; win_y++){
+            bool valid_y;
+            int index_y = border_index(win_y, image_dim[1], mode, valid_y);
+            offsets[index] = (static_cast<long>(index_z) * image_dim[1] + index_y) * image_dim[2];
+            valid_lines[index] = valid_z && valid_y;
+            index++;
+        }
+    }
+}
+
+
+// Add (sign=1) or remove (sign=-1) a column of the window to the histogram
+template<typename T>
+inline void update_histogram_column(
+    WindowHistogram<T>& histogram,
+    const T* input,
+    int width,
+    const std::vector<long>& offsets,
+    const std::vector<bool>& valid_lines,
+    int column,
+    MODE mode,
+    T cval,
+    int sign) {
+
+    bool valid_column;
+    int index_x = border_index(column, width, mode, valid_column);
+
+    for(size_t index=0; index < offsets.size(); index++){
+        T value;
+        if(valid_column && valid_lines[index]){
+            value = input[offsets[index] + index_x];
+        }else if(mode == CONSTANT){
+            value = cval;
+        }else{  // SHRINK: Ignore values outside the image
+            continue;
+        }
+        if(sign > 0){
+            histogram.add(value);
+        }else{
+            histogram.remove(value);
+        }
+    }
+}
+
+
+// Process a line of a volume with a sliding window histogram (Huang's
+// algorithm): Moving the window from one pixel to the next only updates
+// the histogram with the leaving and entering columns, which costs
+// O(kernel_depth * kernel_height) per pixel whatever the kernel width.
+// Only available for 8 and 16 bits integer types.
+template<typename T>
+void median_filter_histogram_3d(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // three values : 0:depth, 1:height, 2:width
+    int* image_dim,         // three values : 0:depth, 1:height, 2:width
+    int z_pixel,            // the frame of the line to process
+    int y_pixel,            // the row of the line to process
+    bool conditional,
+    int pMode,
+    T cval) {
+
+    assert(sizeof(T) <= 2);
+    assert(kernel_dim[0] > 0);
+    assert(kernel_dim[1] > 0);
+    assert(kernel_dim[2] > 0);
+    assert(image_dim[0] > 0);
+    assert(image_dim[1] > 0);
+    assert(image_dim[2] > 0);
+    assert(z_pixel >= 0 && z_pixel < image_dim[0]);
+    assert(y_pixel >= 0 && y_pixel < image_dim[1]);
+    // kernel odd assertion
+    assert((kernel_dim[0] - 1)%2 == 0);
+    assert((kernel_dim[1] - 1)%2 == 0);
+    assert((kernel_dim[2] - 1)%2 == 0);
+
+    int halfKernel_x = (kernel_dim[2] - 1) / 2;
+    int width = image_dim[2];
+
+    MODE mode = static_cast<MODE>(pMode);
+
+    std::vector<long> offsets;
+    std::vector<bool> valid_lines;
+    window_lines(kernel_dim, image_dim, z_pixel, y_pixel, mode,
+                 offsets, valid_lines);
+
+    // Initialize the histogram with the window of the first pixel
+    WindowHistogram<T> histogram;
+    for(int column=-halfKernel_x; column <= halfKernel_x; column++){
+        update_histogram_column(histogram, input, width,
+                                offsets, valid_lines, column, mode, cval, 1);
+    }
+
+    const long line_offset = (static_cast<long>(z_pixel) * image_dim[1] + y_pixel) * width;
+    for(int x_pixel=0; x_pixel < width; x_pixel++){
+        if(x_pixel > 0){  // Slide the window by one pixel
+            update_histogram_column(histogram, input, width,
+                                    offsets, valid_lines, x_pixel - halfKernel_x - 1,
+                                    mode, cval, -1);
+            update_histogram_column(histogram, input, width,
+                                    offsets, valid_lines, x_pixel + halfKernel_x,
+                                    mode, cval, 1);
+        }
+
+        // The window is never empty: it always contains the current pixel
+        const long index = line_offset + x_pixel;
+        if (conditional == true){
+            const T currentPixelValue = input[index];
+            if ((currentPixelValue == histogram.maximum()) ||
+                    (currentPixelValue == histogram.minimum())){
+                output[index] = histogram.median();
+            }else{
+                output[index] = currentPixelValue;
+            }
+        }else{
+            output[index] = histogram.median();
+        }
+    }
+}
+
+
+// Process a row of an image with a sliding window histogram.
+// See median_filter_histogram_3d.
+template<typename T>
+void median_filter_histogram(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // two values : 0:height, 1:width
+    int* image_dim,         // two values : 0:height, 1:width
+    int y_pixel,            // the row to process
+    bool conditional,
+    int pMode,
+    T cval) {
+
+    int kernel_dim_3d[3] = {1, kernel_dim[0], kernel_dim[1]};
+    int image_dim_3d[3] = {1, image_dim[0], image_dim[1]};
+    median_filter_histogram_3d<T>(input, output, kernel_dim_3d, image_dim_3d,
+                                  0, y_pixel, conditional, pMode, cval);
+}
+
+
+// Process a line of a volume by selecting the median of the window of
+// each pixel. Same behavior as median_filter but for 3D data.
+template<typename T>
+void median_filter_3d(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // three values : 0:depth, 1:height, 2:width
+    int* image_dim,         // three values : 0:depth, 1:height, 2:width
+    int z_pixel,            // the frame of the line to process
+    int y_pixel,            // the row of the line to process
+    bool conditional,
+    int pMode,
+    T cval) {
+
+    assert(kernel_dim[0] > 0);
+    assert(kernel_dim[1] > 0);
+    assert(kernel_dim[2] > 0);
+    assert(image_dim[0] > 0);
+    assert(image_dim[1] > 0);
+    assert(image_dim[2] > 0);
+    assert(z_pixel >= 0 && z_pixel < image_dim[0]);
+    assert(y_pixel >= 0 && y_pixel < image_dim[1]);
+    // kernel odd assertion
+    assert((kernel_dim[0] - 1)%2 == 0);
+    assert((kernel_dim[1] - 1)%2 == 0);
+    assert((kernel_dim[2] - 1)%2 == 0);
+
+    int halfKernel_x = (kernel_dim[2] - 1) / 2;
+    int width = image_dim[2];
+
+    MODE mode = static_cast<MODE>(pMode);
+
+    std::vector<long> offsets;
+    std::vector<bool> valid_lines;
+    window_lines(kernel_dim, image_dim, z_pixel, y_pixel, mode,
+                 offsets, valid_lines);
+
+    // init buffer
+    std::vector<T> window_values(kernel_dim[0]*kernel_dim[1]*kernel_dim[2]);
+
+    const long line_offset = (static_cast<long>(z_pixel) * image_dim[1] + y_pixel) * width;
+    for(int x_pixel=0; x_pixel < width; x_pixel++){
+        typename std::vector<T>::iterator it = window_values.begin();
+
+        // fill the vector
+        for(int win_x = x_pixel-halfKernel_x; win_x <= x_pixel+halfKernel_x; win_x++){
+            bool valid_column;
+            int index_x = border_index(win_x, width, mode, valid_column);
+
+            for(size_t index=0; index < offsets.size(); index++){
+                T value;
+                if(valid_column && valid_lines[index]){
+                    value = input[offsets[index] + index_x];
+                }else if(mode == CONSTANT){
+                    value = cval;
+                }else{  // SHRINK: Ignore values outside the image
+                    continue;
+                }
+                if (value == value) {  // Ignore NaNs
+                    *it = value;
+                    ++it;
+                }
+            }
+        }
+
+        //window_size can be smaller than kernel size in shrink mode or if there is NaNs
+        int window_size = std::distance(window_values.begin(), it);
+
+        const long index = line_offset + x_pixel;
+        if (window_size == 0) {
+            // Window is empty, this is the case when all values are NaNs
+            output[index] = NotANumber<T>();
+        } else {
+            // apply the median value if needed for this pixel
+            const T currentPixelValue = input[index];
+            if (conditional == true){
+                typename std::vector<T>::iterator window_end = window_values.begin() + window_size;
+                T min = 0;
+                T max = 0;
+                getMinMax(window_values, min, max, window_end);
+                // NaNs are propagated through unchanged
+                if ((currentPixelValue == max) || (currentPixelValue == min)){
+                    output[index] = median<T>(window_values, window_size);
+                }else{
+                    output[index] = currentPixelValue;
+                }
+            }else{
+                output[index] = median<T>(window_values, window_size);
+            }
+        }
+    }
+}
+
 #endif // MEDIAN_FILTER
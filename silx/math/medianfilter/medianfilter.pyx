@@ -27,7 +27,7 @@
 
 __authors__ = ["H. Payno", "J. Kieffer"]
 __license__ = "MIT"
-__date__ = "02/05/2017"
+__date__ = "17/10/2026"
 
 
 from cython.parallel import prange
@@ -42,16 +42,39 @@ import numbers
 ctypedef unsigned long uint64
 ctypedef unsigned int uint32
 ctypedef unsigned short uint16
+ctypedef unsigned char uint8
+
+
+# Data types supported by the 3D median filter
+ctypedef fused filter_types:
+    float
+    double
+    cnumpy.int64_t
+    cnumpy.uint64_t
+    cnumpy.int32_t
+    cnumpy.uint32_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
+
+
+# Data types supported by the 3D histogram median filter
+ctypedef fused histogram_types:
+    cnumpy.uint8_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
 
 
 MODES = {'nearest': 0, 'reflect': 1, 'mirror': 2, 'shrink': 3, 'constant': 4}
 
+METHODS = ('select', 'histogram')
+
 
 def medfilt1d(data,
               kernel_size=3,
               bool conditional=False,
               mode='nearest',
-              cval=0):
+              cval=0,
+              method='select'):
     """Function computing the median filter of the given input.
 
     Behavior at boundaries: the algorithm is reducing the size of the
@@ -73,17 +96,24 @@ def medfilt1d(data,
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param str method: The algorithm used to compute the median:
+
+        - 'select' (default): Selection of the median in the window
+          of each pixel, its cost grows with the kernel area.
+        - 'histogram': Sliding window histogram, its cost grows with the
+          kernel height only. Only available for uint8, int16 and uint16.
 
     :returns: the array with the median value for each pixel.
     """
-    return medfilt(data, kernel_size, conditional, mode, cval)
+    return medfilt(data, kernel_size, conditional, mode, cval, method)
 
 
 def medfilt2d(image,
               kernel_size=3,
               bool conditional=False,
               mode='nearest',
-              cval=0):
+              cval=0,
+              method='select'):
     """Function computing the median filter of the given input.
     Behavior at boundaries: the algorithm is reducing the size of the
     window/kernel for pixels at boundaries (there is no mirroring).
@@ -105,17 +135,24 @@ def medfilt2d(image,
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param str method: The algorithm used to compute the median:
+
+        - 'select' (default): Selection of the median in the window
+          of each pixel, its cost grows with the kernel area.
+        - 'histogram': Sliding window histogram, its cost grows with the
+          kernel height only. Only available for uint8, int16 and uint16.
 
     :returns: the array with the median value for each pixel.
     """
-    return medfilt(image, kernel_size, conditional, mode, cval)
+    return medfilt(image, kernel_size, conditional, mode, cval, method)
 
 
 def medfilt(data,
             kernel_size=3,
             bool conditional=False,
             mode='nearest',
-            cval=0):
+            cval=0,
+            method='select'):
     """Function computing the median filter of the given input.
     Behavior at boundaries: the algorithm is reducing the size of the
     window/kernel for pixels at boundaries (there is no mirroring).
@@ -127,16 +164,30 @@ def medfilt(data,
     because of NaN values or on image border in shrink mode),
     the highest of the 2 central sorted values is taken.
 
+    For 3d data, each frame is filtered independently with a 2d kernel
+    if kernel_size is a (kernel_height, kernel_width) tuple, otherwise
+    a 3d kernel is used.
+    Frames and rows are processed in parallel.
+
     :param numpy.ndarray data: the array for which we want to apply
-        the median filter. Should be 1d or 2d.
+        the median filter. Should be 1d, 2d or 3d.
     :param kernel_size: the dimension of the kernel.
     :type kernel_size: For 1D should be an int for 2D should be a tuple or
-        a list of (kernel_height, kernel_width)
+        a list of (kernel_height, kernel_width), for 3D should be a tuple
+        or a list of (kernel_depth, kernel_height, kernel_width) or of
+        (kernel_height, kernel_width) to filter each frame
     :param bool conditional: True if we want to apply a conditional median
         filtering.
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param str method: The algorithm used to compute the median:
+
+        - 'select' (default): Selection of the median in the window
+          of each pixel, its cost grows with the kernel area.
+        - 'histogram': Sliding window histogram, its cost grows with the
+          kernel height (and depth) only.
+          Only available for uint8, int16 and uint16.
 
     :returns: the array with the median value for each pixel.
     """
@@ -144,13 +195,19 @@ def medfilt(data,
         err = 'Requested mode %s is unknown.' % mode
         raise ValueError(err)
 
-    if data.ndim > 2:
+    if method not in METHODS:
+        raise ValueError('Requested method %s is unknown.' % method)
+
+    if data.ndim > 3:
         raise ValueError(
-            "Invalid data shape. Dimension of the array should be 1 or 2")
+            "Invalid data shape. Dimension of the array should be 1, 2 or 3")
 
     # Handle case of scalar kernel size
     if isinstance(kernel_size, numbers.Integral):
         kernel_size = [kernel_size] * data.ndim
+    elif data.ndim == 3 and len(kernel_size) == 2:
+        # Filter each frame independently
+        kernel_size = [1] + list(kernel_size)
 
     assert len(kernel_size) == data.ndim
 
@@ -161,13 +218,37 @@ def medfilt(data,
         kernel_size = [1, kernel_size[0]]
         reshaped = True
 
-    # simple median filter apply into a 2D buffer
+    # simple median filter apply into a 2D or 3D buffer
     output_buffer = numpy.zeros_like(data)
     check(data, output_buffer)
 
     ker_dim = numpy.array(kernel_size, dtype=numpy.int32)
 
-    if data.dtype == numpy.float64:
+    if data.ndim == 3:
+        if method == 'histogram':
+            if data.dtype not in (numpy.uint8, numpy.int16, numpy.uint16):
+                raise ValueError(
+                    "%s type is not managed by the histogram median filter" % data.dtype)
+            medfilterfc = _median_filter_histogram_3d
+        else:
+            if data.dtype not in (numpy.float64, numpy.float32,
+                                  numpy.int64, numpy.uint64,
+                                  numpy.int32, numpy.uint32,
+                                  numpy.int16, numpy.uint16):
+                raise ValueError("%s type is not managed by the median filter" % data.dtype)
+            medfilterfc = _median_filter_3d
+
+    elif method == 'histogram':
+        if data.dtype == numpy.uint8:
+            medfilterfc = _median_filter_histogram_uint8
+        elif data.dtype == numpy.int16:
+            medfilterfc = _median_filter_histogram_int16
+        elif data.dtype == numpy.uint16:
+            medfilterfc = _median_filter_histogram_uint16
+        else:
+            raise ValueError(
+                "%s type is not managed by the histogram median filter" % data.dtype)
+    elif data.dtype == numpy.float64:
         medfilterfc = _median_filter_float64
     elif data.dtype == numpy.float32:
         medfilterfc = _median_filter_float32
@@ -208,11 +289,11 @@ def check(input_buffer, output_buffer):
     if (output_buffer.flags['C_CONTIGUOUS'] is False):
         raise ValueError('<output_buffer> must be a C_CONTIGUOUS numpy array.')
 
-    if not (len(input_buffer.shape) <= 2):
-        raise ValueError('<input_buffer> dimension must mo higher than 2.')
+    if not (len(input_buffer.shape) <= 3):
+        raise ValueError('<input_buffer> dimension must mo higher than 3.')
 
-    if not (len(output_buffer.shape) <= 2):
-        raise ValueError('<output_buffer> dimension must mo higher than 2.')
+    if not (len(output_buffer.shape) <= 3):
+        raise ValueError('<output_buffer> dimension must mo higher than 3.')
 
     if not(input_buffer.dtype == output_buffer.dtype):
         raise ValueError('input buffer and output_buffer must be of the same type')
@@ -494,3 +575,154 @@ def _median_filter_uint16(
                                                 conditional,
                                                 mode,
                                                 cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_histogram_uint8(
+      cnumpy.uint8_t[:, ::1] input_buffer not None,
+      cnumpy.uint8_t[:, ::1] output_buffer not None,
+      cnumpy.int32_t[::1] kernel_size not None,
+      bool conditional,
+      int mode,
+      cnumpy.uint8_t cval):
+
+    cdef:
+        int y = 0
+        int[2] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+
+    for y in prange(input_buffer.shape[0], nogil=True):
+            median_filter.median_filter_histogram[uint8](<uint8*> & input_buffer[0, 0],
+                                                         <uint8*> & output_buffer[0, 0],
+                                                         <int*>&kernel_size[0],
+                                                         <int*>buffer_shape,
+                                                         y,
+                                                         conditional,
+                                                         mode,
+                                                         cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_histogram_int16(
+      cnumpy.int16_t[:, ::1] input_buffer not None,
+      cnumpy.int16_t[:, ::1] output_buffer not None,
+      cnumpy.int32_t[::1] kernel_size not None,
+      bool conditional,
+      int mode,
+      cnumpy.int16_t cval):
+
+    cdef:
+        int y = 0
+        int[2] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+
+    for y in prange(input_buffer.shape[0], nogil=True):
+            median_filter.median_filter_histogram[short](<short*> & input_buffer[0, 0],
+                                                         <short*> & output_buffer[0, 0],
+                                                         <int*>&kernel_size[0],
+                                                         <int*>buffer_shape,
+                                                         y,
+                                                         conditional,
+                                                         mode,
+                                                         cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_histogram_uint16(
+      cnumpy.uint16_t[:, ::1] input_buffer not None,
+      cnumpy.uint16_t[:, ::1] output_buffer not None,
+      cnumpy.int32_t[::1] kernel_size not None,
+      bool conditional,
+      int mode,
+      cnumpy.uint16_t cval):
+
+    cdef:
+        int y = 0
+        int[2] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+
+    for y in prange(input_buffer.shape[0], nogil=True):
+            median_filter.median_filter_histogram[uint16](<uint16*> & input_buffer[0, 0],
+                                                          <uint16*> & output_buffer[0, 0],
+                                                          <int*>&kernel_size[0],
+                                                          <int*>buffer_shape,
+                                                          y,
+                                                          conditional,
+                                                          mode,
+                                                          cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_3d(filter_types[:, :, ::1] input_buffer not None,
+                      filter_types[:, :, ::1] output_buffer not None,
+                      cnumpy.int32_t[::1] kernel_size not None,
+                      bool conditional,
+                      int mode,
+                      filter_types cval):
+
+    cdef:
+        int line = 0
+        int nb_lines = input_buffer.shape[0] * input_buffer.shape[1]
+        int[3] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+    buffer_shape[2] = input_buffer.shape[2]
+
+    # Process all lines of all frames in parallel
+    for line in prange(nb_lines, nogil=True):
+            median_filter.median_filter_3d(& input_buffer[0, 0, 0],
+                                           & output_buffer[0, 0, 0],
+                                           <int*>&kernel_size[0],
+                                           <int*>buffer_shape,
+                                           line // buffer_shape[1],
+                                           line % buffer_shape[1],
+                                           conditional,
+                                           mode,
+                                           cval)
+
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.initializedcheck(False)
+def _median_filter_histogram_3d(histogram_types[:, :, ::1] input_buffer not None,
+                                histogram_types[:, :, ::1] output_buffer not None,
+                                cnumpy.int32_t[::1] kernel_size not None,
+                                bool conditional,
+                                int mode,
+                                histogram_types cval):
+
+    cdef:
+        int line = 0
+        int nb_lines = input_buffer.shape[0] * input_buffer.shape[1]
+        int[3] buffer_shape
+    buffer_shape[0] = input_buffer.shape[0]
+    buffer_shape[1] = input_buffer.shape[1]
+    buffer_shape[2] = input_buffer.shape[2]
+
+    # Process all lines of all frames in parallel
+    for line in prange(nb_lines, nogil=True):
+            median_filter.median_filter_histogram_3d(& input_buffer[0, 0, 0],
+                                                     & output_buffer[0, 0, 0],
+                                                     <int*>&kernel_size[0],
+                                                     <int*>buffer_shape,
+                                                     line // buffer_shape[1],
+                                                     line % buffer_shape[1],
+                                                     conditional,
+                                                     mode,
+                                                     cval)
@@ -29,7 +29,7 @@ __date__ = "17/01/2018"
 
 import unittest
 import numpy
-from silx.math.medianfilter import medfilt2d, medfilt1d
+from silx.math.medianfilter import medfilt2d, medfilt1d, medfilt
 from silx.math.medianfilter.medianfilter import reflect, mirror
 from silx.math.medianfilter.medianfilter import MODES as silx_mf_modes
 from silx.utils.testutils import ParametricTestCase
@@ -647,6 +647,116 @@ class TestGeneralExecution(ParametricTestCase):
                     numpy.any(out_isnan[numpy.logical_not(nan_mask)]))
 
 
+class TestHistogramMethod(ParametricTestCase):
+    """Compare the 'histogram' method with the default 'select' method"""
+
+    def testVsSelect(self):
+        """Test that both methods give the same result"""
+        for dtype in (numpy.int16, numpy.uint16):
+            data = numpy.random.randint(
+                -1000, 1000, size=(23, 31)).astype(dtype)
+            for mode in silx_mf_modes:
+                for kernel in ((1, 1), (3, 3), (5, 1), (1, 7), (7, 5), (25, 35)):
+                    for conditional in (False, True):
+                        with self.subTest(dtype=dtype, mode=mode,
+                                          kernel=kernel,
+                                          conditional=conditional):
+                            expected = medfilt2d(data,
+                                                 kernel_size=kernel,
+                                                 conditional=conditional,
+                                                 mode=mode,
+                                                 cval=7)
+                            result = medfilt2d(data,
+                                               kernel_size=kernel,
+                                               conditional=conditional,
+                                               mode=mode,
+                                               cval=7,
+                                               method='histogram')
+                            self.assertTrue(numpy.array_equal(result, expected))
+
+    def testUInt8(self):
+        """Test histogram method on uint8 data"""
+        data = numpy.arange(100, dtype=numpy.uint8).reshape(10, 10)
+        result = medfilt2d(data, kernel_size=3, method='histogram')
+        self.assertEqual(result.dtype, numpy.uint8)
+        self.assertTrue(numpy.array_equal(
+            result,
+            medfilt2d(data.astype(numpy.uint16), kernel_size=3)))
+
+    def test1D(self):
+        """Test histogram method with 1D data"""
+        for mode in silx_mf_modes:
+            with self.subTest(mode=mode):
+                data = RANDOM_INT_MAT[0].astype(numpy.uint16)
+                self.assertTrue(numpy.array_equal(
+                    medfilt1d(data, kernel_size=5, mode=mode,
+                              method='histogram'),
+                    medfilt1d(data, kernel_size=5, mode=mode)))
+
+    def testErrors(self):
+        """Test histogram method with unsupported type and method"""
+        with self.assertRaises(ValueError):
+            medfilt2d(RANDOM_FLOAT_MAT, method='histogram')
+        with self.assertRaises(ValueError):
+            medfilt2d(RANDOM_FLOAT_MAT, method='unknown')
+
+
+class TestMedianFilter3D(ParametricTestCase):
+    """Test median filter on stacks of images"""
+
+    def testStackOf2D(self):
+        """Test that filtering a stack with a 2D kernel filters each frame"""
+        stack = numpy.random.random((4, 15, 17)).astype(numpy.float32)
+        stack[1, 3, 4] = numpy.nan
+        for mode in silx_mf_modes:
+            for method, dtype in (('select', numpy.float32),
+                                  ('histogram', numpy.uint16)):
+                with self.subTest(mode=mode, method=method):
+                    data = numpy.nan_to_num(stack * 1000).astype(dtype)
+                    result = medfilt(data,
+                                     kernel_size=(3, 5),
+                                     mode=mode,
+                                     cval=2,
+                                     method=method)
+                    self.assertEqual(result.shape, data.shape)
+                    self.assertEqual(result.dtype, data.dtype)
+                    for frame, image in zip(result, data):
+                        expected = medfilt2d(
+                            image, kernel_size=(3, 5), mode=mode, cval=2)
+                        numpy.testing.assert_array_equal(frame, expected)
+
+    def testHistogramVsSelect(self):
+        """Test that both methods give the same result with 3D kernels"""
+        data = numpy.random.randint(
+            0, 1000, size=(6, 9, 11)).astype(numpy.uint16)
+        for mode in silx_mf_modes:
+            for conditional in (False, True):
+                with self.subTest(mode=mode, conditional=conditional):
+                    expected = medfilt(data,
+                                       kernel_size=(3, 5, 3),
+                                       conditional=conditional,
+                                       mode=mode,
+                                       cval=7)
+                    result = medfilt(data,
+                                     kernel_size=(3, 5, 3),
+                                     conditional=conditional,
+                                     mode=mode,
+                                     cval=7,
+                                     method='histogram')
+                    numpy.testing.assert_array_equal(result, expected)
+
+    @unittest.skipUnless(scipy is not None, "scipy not available")
+    def testVsScipy(self):
+        """Compare 3D kernel with scipy.ndimage.median_filter"""
+        data = numpy.random.random((7, 8, 9))
+        for mode in _getScipyAndSilxCommonModes():
+            with self.subTest(mode=mode):
+                expected = scipy.ndimage.median_filter(
+                    data, size=(3, 3, 5), mode=mode)
+                result = medfilt(data, kernel_size=(3, 3, 5), mode=mode)
+                numpy.testing.assert_array_equal(result, expected)
+
+
 def _getScipyAndSilxCommonModes():
     """return the mode which are comparable between silx and scipy"""
     modes = silx_mf_modes.copy()
@@ -725,6 +835,8 @@ class TestVsScipy(ParametricTestCase):
 def suite():
     test_suite = unittest.TestSuite()
     for test in [TestGeneralExecution,
+                 TestHistogramMethod,
+                 TestMedianFilter3D,
                  TestVsScipy,
                  TestMedianFilterNearest,
                  TestMedianFilterReflect,
@@ -24,7 +24,7 @@
 
 __authors__ = ["D. Naudet"]
 __license__ = "MIT"
-__date__ = "27/03/2017"
+__date__ = "17/10/2026"
 
 import os.path
 
@@ -51,7 +51,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('chistogramnd',
                          sources=histo_src,
                          include_dirs=histo_inc,
-                         language='c')
+                         language='c',
+                         extra_link_args=['-fopenmp'],
+                         extra_compile_args=['-fopenmp'])
 
     # =====================================
     # histogramnd_lut
@@ -59,7 +61,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('chistogramnd_lut',
                          sources=['chistogramnd_lut.pyx'],
                          include_dirs=histo_inc,
-                         language='c')
+                         language='c',
+                         extra_link_args=['-fopenmp'],
+                         extra_compile_args=['-fopenmp'])
     # =====================================
     # marching cubes
     # =====================================
@@ -74,7 +78,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('combo',
                          sources=['combo.pyx'],
                          include_dirs=['include'],
-                         language='c')
+                         language='c',
+                         extra_link_args=['-fopenmp'],
+                         extra_compile_args=['-fopenmp'])
 
     config.add_extension('colormap',
                          sources=["colormap.pyx"],
@@ -29,7 +29,8 @@ import numpy as np
 
 import time
 
-from silx.math import histogramnd
+from silx.math.chistogramnd import chistogramnd as histogramnd
+from silx.math.histogram import Histogramnd, HistogramndLut
 
 
 def print_times(t0s, t1s, t2s, t3s):
@@ -119,7 +120,7 @@ def benchmark(n_loops,
     if do_weights:
         weights = np.random.randint(int_min,
                                     high=int_max,
-                                    size=(ssetup.pyample_shape[0],))
+                                    size=(sample_shape[0],))
         weights = weights.astype(np.double)
         weights = (weights_rng[0] +
                    (weights - int_min) *
@@ -260,6 +261,80 @@ def run_benchmark(dtype=np.double,
               do_weights=True,
               do_numpy=do_numpy)
 
+
+def benchmark_threads(n_loops,
+                      sample_shape,
+                      histo_range,
+                      n_bins,
+                      num_threads=(1, 2, 4, 8, 16, 32),
+                      dtype=np.double):
+    """Histogramnd and HistogramndLut throughput vs number of threads."""
+    sample = np.random.random(sample_shape).astype(dtype) * 100.
+    weights = np.random.random(sample_shape[0])
+
+    ref_histo = None
+    lut_histo = None
+    for n_threads in num_threads:
+        times = []
+        for i in range(n_loops):
+            t0 = time.time()
+            result = Histogramnd(sample,
+                                 histo_range,
+                                 n_bins,
+                                 weights=weights,
+                                 num_threads=n_threads)
+            times.append(time.time() - t0)
+        if ref_histo is None:
+            ref_histo = result.histo
+        hits_cmp = np.array_equal(ref_histo, result.histo)
+
+        histo_lut = HistogramndLut(sample,
+                                   histo_range,
+                                   n_bins,
+                                   num_threads=n_threads)
+        lut_times = []
+        for i in range(n_loops):
+            t0 = time.time()
+            histo, w_histo = histo_lut.apply_lut(weights)
+            lut_times.append(time.time() - t0)
+        if lut_histo is None:
+            lut_histo = histo
+        lut_cmp = np.array_equal(lut_histo, histo)
+
+        print('\t{0: >3} threads : '
+              'Histogramnd {1: <7.3f}s ({2: <7.1f} Msamples/s, {3}); '
+              'apply_lut {4: <7.3f}s ({5: <7.1f} Msamples/s, {6})'
+              ''.format(n_threads,
+                        min(times),
+                        sample_shape[0] / min(times) / 1e6,
+                        'OK' if hits_cmp else 'NOK',
+                        min(lut_times),
+                        sample_shape[0] / min(lut_times) / 1e6,
+                        'OK' if lut_cmp else 'NOK'))
+
+
+def run_benchmark_threads(dtype=np.double):
+    n_loops = 3
+
+    print('==========================')
+    print(' 3D threads [{0}]'.format(dtype))
+    print('==========================')
+    benchmark_threads(n_loops,
+                      (10**7, 3),
+                      [[0., 100.], [0., 100.], [0., 100.]],
+                      30,
+                      dtype=dtype)
+
+    print('==========================')
+    print(' 2D threads, many bins [{0}]'.format(dtype))
+    print('==========================')
+    benchmark_threads(n_loops,
+                      (10**7, 2),
+                      [[0., 100.], [0., 100.]],
+                      4096,
+                      dtype=dtype)
+
+
 if __name__ == '__main__':
     types = (np.double, np.int32, np.float32,)
 
@@ -267,3 +342,6 @@ if __name__ == '__main__':
         run_benchmark(t,
                       do_weights=True,
                       do_numpy=True)
+
+    for t in types:
+        run_benchmark_threads(t)
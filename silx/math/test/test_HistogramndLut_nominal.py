@@ -565,6 +565,142 @@ class TestHistogramndLut_nominal_3d(_TestHistogramndLut_nominal):
     ndims = 3
 
 
+class TestHistogramndLut_num_threads(unittest.TestCase):
+    """
+    Tests of the HistogramndLut class with several threads.
+    """
+
+    def test_num_threads(self):
+        rng = np.random.RandomState(0)
+        sample = rng.random_sample((10000, 3)) * 12. - 1.
+        weights = rng.random_sample(10000) * 100.
+        histo_range = [[0., 10.], [0., 10.], [0., 10.]]
+
+        expected = HistogramndLut(sample, histo_range, 5)
+        expected.accumulate(weights, weight_max=90.)
+
+        for num_threads in (2, 5, None):
+            histo_inst = HistogramndLut(sample,
+                                        histo_range,
+                                        5,
+                                        num_threads=num_threads)
+            self.assertTrue(np.array_equal(histo_inst.lut, expected.lut))
+
+            histo_inst.accumulate(weights, weight_max=90.)
+            self.assertTrue(np.array_equal(histo_inst.histo(),
+                                           expected.histo()))
+            self.assertTrue(np.allclose(histo_inst.weighted_histo(),
+                                        expected.weighted_histo()))
+
+            histo, w_histo = histo_inst.apply_lut(weights, weight_max=90.)
+            self.assertTrue(np.array_equal(histo, expected.histo()))
+            self.assertTrue(np.allclose(w_histo, expected.weighted_histo()))
+
+
+class TestHistogramndLut_stack(unittest.TestCase):
+    """
+    Tests of the HistogramndLut class with CSR LUT and stacks of weights.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.sample = rng.random_sample((1000, 2)) * 12. - 1.
+        self.weights = rng.random_sample((6, 1000)) * 100.
+        self.histo_range = [[0., 10.], [0., 10.]]
+        self.n_bins = [4, 5]
+
+    def test_csr_lut(self):
+        dense = HistogramndLut(self.sample, self.histo_range, self.n_bins)
+        csr = HistogramndLut(self.sample,
+                             self.histo_range,
+                             self.n_bins,
+                             lut_format='csr')
+        self.assertEqual(dense.lut_format, 'dense')
+        self.assertEqual(csr.lut_format, 'csr')
+
+        lut = dense.lut
+        self.assertTrue(np.array_equal(csr.lut, lut))
+        self.assertEqual(csr.lut.dtype, lut.dtype)
+
+        for indptr, indices in (dense.csr_lut, csr.csr_lut):
+            self.assertEqual(len(indptr), 4 * 5 + 1)
+            self.assertEqual(indptr[-1], np.count_nonzero(lut >= 0))
+            for bin_idx in range(4 * 5):
+                bin_indices = indices[indptr[bin_idx]:indptr[bin_idx + 1]]
+                self.assertTrue(np.array_equal(
+                    bin_indices, np.nonzero(lut == bin_idx)[0]))
+
+        with self.assertRaises(ValueError):
+            HistogramndLut(self.sample,
+                           self.histo_range,
+                           self.n_bins,
+                           lut_format='coo')
+
+    def test_apply_lut_stack(self):
+        for lut_format in ('dense', 'csr'):
+            for num_threads in (1, 3):
+                histo_inst = HistogramndLut(self.sample,
+                                            self.histo_range,
+                                            self.n_bins,
+                                            num_threads=num_threads,
+                                            lut_format=lut_format)
+                histo, w_histo = histo_inst.apply_lut(self.weights,
+                                                      weight_min=10.)
+                self.assertEqual(histo.shape, (6, 4, 5))
+                self.assertEqual(w_histo.shape, (6, 4, 5))
+
+                for index, weights in enumerate(self.weights):
+                    expected = histo_inst.apply_lut(weights, weight_min=10.)
+                    self.assertTrue(np.array_equal(histo[index], expected[0]))
+                    self.assertTrue(np.allclose(w_histo[index],
+                                                expected[1]))
+
+                # Accumulate into provided histograms
+                expected_histo = 2 * histo
+                expected_w_histo = 2 * w_histo
+                histo_inst.apply_lut(self.weights,
+                                     histo=histo,
+                                     weighted_histo=w_histo,
+                                     weight_min=10.)
+                self.assertTrue(np.array_equal(histo, expected_histo))
+                self.assertTrue(np.allclose(w_histo, expected_w_histo))
+
+    def test_apply_lut_single_frame_stack(self):
+        for lut_format in ('dense', 'csr'):
+            histo_inst = HistogramndLut(self.sample,
+                                        self.histo_range,
+                                        self.n_bins,
+                                        lut_format=lut_format)
+            histo, w_histo = histo_inst.apply_lut(self.weights[:1])
+            self.assertEqual(histo.shape, (1, 4, 5))
+            self.assertEqual(w_histo.shape, (1, 4, 5))
+
+            expected = histo_inst.apply_lut(self.weights[0])
+            self.assertTrue(np.array_equal(histo[0], expected[0]))
+            self.assertTrue(np.allclose(w_histo[0], expected[1]))
+
+    def test_accumulate_csr(self):
+        dense = HistogramndLut(self.sample, self.histo_range, self.n_bins)
+        csr = HistogramndLut(self.sample,
+                             self.histo_range,
+                             self.n_bins,
+                             lut_format='csr')
+        for histo_inst in (dense, csr):
+            histo_inst.accumulate(self.weights[0], weight_max=90.)
+            histo_inst.accumulate(self.weights[1], weight_max=90.)
+        self.assertTrue(np.array_equal(csr.histo(), dense.histo()))
+        self.assertTrue(np.allclose(csr.weighted_histo(),
+                                    dense.weighted_histo()))
+
+    def test_stack_size_mismatch(self):
+        histo_inst = HistogramndLut(self.sample,
+                                    self.histo_range,
+                                    self.n_bins,
+                                    lut_format='csr')
+        with self.assertRaises(ValueError):
+            histo_inst.apply_lut(self.weights[:, :-1])
+
+
 # ==============================================================
 # ==============================================================
 # ==============================================================
@@ -572,7 +708,9 @@ class TestHistogramndLut_nominal_3d(_TestHistogramndLut_nominal):
 
 test_cases = (TestHistogramndLut_nominal_1d,
               TestHistogramndLut_nominal_2d,
-              TestHistogramndLut_nominal_3d,)
+              TestHistogramndLut_nominal_3d,
+              TestHistogramndLut_num_threads,
+              TestHistogramndLut_stack,)
 
 
 def suite():
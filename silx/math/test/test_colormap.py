@@ -102,6 +102,52 @@ class TestNormalization(ParametricTestCase):
         self.assertEqual(normalization.apply(numpy.inf, 0., 100.), numpy.inf)
         self.assertEqual(normalization.apply(0, 0., 100.), 0.)
 
+    def testArrayDTypes(self):
+        """Test apply/revert on arrays of different dtypes"""
+        normalizations = (
+            colormap.LinearNormalization(),
+            colormap.LogarithmicNormalization(),
+            colormap.ArcsinhNormalization(),
+            colormap.SqrtNormalization(),
+            colormap.PowerNormalization(2.))
+        dtypes = ('>i2', '<u2', 'int8', 'uint32', 'int64',
+                  'float16', '>f4', 'float64', 'bool')
+
+        for normalization in normalizations:
+            for dtype in dtypes:
+                with self.subTest(normalization=normalization, dtype=dtype):
+                    data = numpy.arange(12).reshape(3, 4).astype(dtype)
+                    for method in ('apply', 'revert'):
+                        function = getattr(normalization, method)
+                        result = function(data, 1., 10.)
+                        self.assertEqual(result.shape, data.shape)
+                        self.assertEqual(result.dtype, numpy.float64)
+
+                        expected = numpy.array(
+                            [function(float(v), 1., 10.) for v in data.ravel()])
+                        self.assertTrue(numpy.allclose(
+                            result.ravel(), expected, equal_nan=True))
+
+    def testArrayOut(self):
+        """Test apply/revert with a provided output array"""
+        normalization = colormap.SqrtNormalization()
+        data = numpy.arange(10, dtype=numpy.uint16)[::2]  # Not contiguous
+        out = numpy.zeros(data.shape, dtype=numpy.float64)
+
+        result = normalization.apply(data, 0., 1., out=out)
+        self.assertIs(result, out)
+        self.assertTrue(numpy.allclose(out, numpy.sqrt(data)))
+
+        result = normalization.revert(out, 0., 1., out=out)
+        self.assertIs(result, out)
+        self.assertTrue(numpy.allclose(out, data))
+
+        with self.assertRaises(ValueError):  # Wrong shape
+            normalization.apply(data, 0., 1., out=numpy.zeros(3))
+        with self.assertRaises(ValueError):  # Wrong dtype
+            normalization.apply(
+                data, 0., 1., out=numpy.zeros(data.shape, numpy.float32))
+
 
 class TestColormap(ParametricTestCase):
     """Test silx.math.colormap.cmap"""
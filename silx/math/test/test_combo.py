@@ -27,7 +27,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "17/01/2018"
+__date__ = "17/10/2026"
 
 
 import unittest
@@ -36,7 +36,14 @@ import numpy
 
 from silx.utils.testutils import ParametricTestCase
 
-from silx.math.combo import min_max
+from silx.math import combo
+from silx.math.combo import min_max, chunked_min_max
+from silx.test.utils import temp_dir
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
 
 
 class TestMinMax(ParametricTestCase):
@@ -114,6 +121,10 @@ class TestMinMax(ParametricTestCase):
         self.assertSimilar(argmin, result.argmin)
         self.assertSimilar(argmin_pos, result.argmin_positive)
         self.assertSimilar(argmax, result.argmax)
+        if min_positive:
+            self.assertEqual(result.has_zero, bool(numpy.any(data == 0)))
+        else:
+            self.assertIsNone(result.has_zero)
 
     def assertSimilar(self, a, b):
         """Assert that a and b are both None or NaN or that a == b."""
@@ -206,11 +217,190 @@ class TestMinMax(ParametricTestCase):
                     data = numpy.array(data, dtype=dtype)
                     self._test_min_max(data, min_positive=True, finite=True)
 
+    def test_stats(self):
+        """Test min_max with stats=True against numpy"""
+        data = numpy.random.random(100000) - 0.5
+        data[:10] = numpy.nan
+        data[200] = numpy.inf
+
+        for dtype in self.DTYPES:
+            for finite in (False, True):
+                with self.subTest(dtype=dtype, finite=finite):
+                    array = (data * 100).astype(dtype) if dtype not in \
+                        self.FLOATING_DTYPES else data.astype(dtype)
+                    if dtype in self.FLOATING_DTYPES:
+                        valid = numpy.isfinite(array) if finite else \
+                            numpy.logical_not(numpy.isnan(array))
+                        values = array[valid].astype(numpy.float64)
+                    else:
+                        values = array.astype(numpy.float64)
+
+                    result = min_max(array, min_positive=True,
+                                     finite=finite, stats=True)
+                    self._test_min_max(array, min_positive=True, finite=finite)
+                    with numpy.errstate(invalid='ignore'):
+                        expected_mean, expected_std = values.mean(), values.std()
+                    numpy.testing.assert_allclose(
+                        result.mean, expected_mean, rtol=1e-6)
+                    numpy.testing.assert_allclose(
+                        result.std, expected_std, rtol=1e-6)
+
+    def test_has_zero(self):
+        """Test min_max has_zero with zeros before and after min positive"""
+        tests = [
+            (0, 1, 2),  # Zero first
+            (-1, 0),  # Zero as maximum
+            (2, -1, 1, 0),  # Zero after min positive
+            (-2, -1, 3),  # No zero
+        ]
+        for dtype in self.FLOATING_DTYPES + self.SIGNED_INT_DTYPES:
+            for data in tests:
+                for finite in (False, True):
+                    with self.subTest(dtype=dtype, data=data, finite=finite):
+                        data = numpy.array(data, dtype=dtype)
+                        for stats in (False, True):
+                            result = min_max(data, min_positive=True,
+                                             finite=finite, stats=stats)
+                            self.assertEqual(
+                                result.has_zero, bool(numpy.any(data == 0)))
+
+    def test_stats_no_value(self):
+        """Test min_max with stats=True and no valid value"""
+        data = numpy.array((numpy.nan, numpy.inf))
+        result = min_max(data, finite=True, stats=True)
+        self.assertIsNone(result.mean)
+        self.assertIsNone(result.std)
+
+        result = min_max(data[:1], finite=False, stats=True)
+        self.assertTrue(numpy.isnan(result.mean))
+
+        result = min_max(data)
+        self.assertIsNone(result.mean)
+        self.assertIsNone(result.std)
+
+
+class TestMinMaxAxis(ParametricTestCase):
+    """Tests of min max combo along axes"""
+
+    def _assertResultsEqual(self, result, expected):
+        """Compare _MinMaxResult fields"""
+        for name in ('minimum', 'min_positive', 'maximum',
+                     'argmin', 'argmin_positive', 'argmax', 'has_zero'):
+            numpy.testing.assert_array_equal(
+                getattr(result, name), getattr(expected, name),
+                err_msg=name)
+
+    def test_axis(self):
+        """Test min_max with axis against min_max on each row"""
+        data = numpy.random.random((4, 5, 6)) - 0.5
+        data[0, 1, 2] = numpy.nan
+        data[1] = numpy.nan  # All NaN frame
+        data[2, :, 3] = numpy.inf
+
+        for axis, finite in ((2, False), (-1, True), ((1, 2), False),
+                             ((1, 2), True), (0, False), ((0, 2), True)):
+            with self.subTest(axis=axis, finite=finite):
+                result = min_max(data, min_positive=True, finite=finite, axis=axis)
+
+                axes = (axis,) if isinstance(axis, int) else axis
+                axes = tuple(sorted(a % data.ndim for a in axes))
+                kept = tuple(a for a in range(data.ndim) if a not in axes)
+                rows = numpy.transpose(data, kept + axes).reshape(
+                    int(numpy.prod([data.shape[a] for a in kept])), -1)
+                shape = tuple(data.shape[a] for a in kept)
+                self.assertEqual(result.minimum.shape, shape)
+
+                for index, row in enumerate(rows):
+                    expected = min_max(row, min_positive=True, finite=finite)
+                    position = numpy.unravel_index(index, shape)
+                    for name, missing in (('minimum', numpy.nan),
+                                          ('maximum', numpy.nan),
+                                          ('min_positive', 0),
+                                          ('argmin', -1),
+                                          ('argmax', -1),
+                                          ('argmin_positive', -1),
+                                          ('has_zero', False)):
+                        value = getattr(expected, name)
+                        numpy.testing.assert_array_equal(
+                            getattr(result, name)[position],
+                            missing if value is None else value,
+                            err_msg=name)
+
+    def test_axis_stats(self):
+        """Test min_max with axis and stats=True"""
+        data = numpy.random.random((3, 4, 5))
+        data[1] = numpy.nan
+        result = min_max(data, finite=True, axis=(1, 2), stats=True)
+        with numpy.errstate(invalid='ignore'):
+            numpy.testing.assert_allclose(
+                result.mean, numpy.nanmean(data, axis=(1, 2)))
+            numpy.testing.assert_allclose(
+                result.std, numpy.nanstd(data, axis=(1, 2)))
+
+    def test_axis_no_min_positive(self):
+        """Test min_max with axis without positive min"""
+        data = numpy.arange(24, dtype=numpy.uint16).reshape(2, 3, 4)
+        result = min_max(data, axis=(1, 2))
+        numpy.testing.assert_array_equal(result.minimum, (0, 12))
+        numpy.testing.assert_array_equal(result.maximum, (11, 23))
+        numpy.testing.assert_array_equal(result.argmin, (0, 0))
+        numpy.testing.assert_array_equal(result.argmax, (11, 11))
+        self.assertIsNone(result.min_positive)
+        self.assertIsNone(result.argmin_positive)
+
+        with self.assertRaises(ValueError):
+            min_max(data, axis=3)
+
+    def test_chunked(self):
+        """Test chunked_min_max against min_max"""
+        data = numpy.random.random((10, 7)) - 0.5
+        data[:3] = numpy.nan
+        data[5, 2] = - numpy.inf
+        for finite in (False, True):
+            for axis in (None, 0, 1, (0, 1)):
+                with self.subTest(finite=finite, axis=axis):
+                    chunks = data[:4], data[4:4], data[4:9], data[9:]
+                    result = chunked_min_max(
+                        chunks, min_positive=True, finite=finite,
+                        axis=axis, stats=True)
+                    expected = min_max(
+                        data, min_positive=True, finite=finite,
+                        axis=axis, stats=True)
+                    self._assertResultsEqual(result, expected)
+                    numpy.testing.assert_allclose(result.mean, expected.mean)
+                    numpy.testing.assert_allclose(result.std, expected.std)
+
+        with self.assertRaises(ValueError):
+            chunked_min_max([])
+
+    @unittest.skipIf(h5py is None, "h5py is required")
+    def test_dataset(self):
+        """Test min_max with a chunked HDF5 dataset"""
+        data = numpy.random.random((20, 5, 6)) - 0.5
+        with temp_dir() as tmp:
+            with h5py.File(tmp + '/data.h5', 'w') as h5file:
+                dataset = h5file.create_dataset(
+                    'data', data=data, chunks=(3, 5, 6))
+                block_size = combo._DATASET_BLOCK_SIZE
+                combo._DATASET_BLOCK_SIZE = 1000  # Read in multiple blocks
+                try:
+                    results = [min_max(dataset, min_positive=True, axis=axis)
+                               for axis in (None, 0, (1, 2))]
+                finally:
+                    combo._DATASET_BLOCK_SIZE = block_size
+
+                for axis, result in zip((None, 0, (1, 2)), results):
+                    with self.subTest(axis=axis):
+                        expected = min_max(data, min_positive=True, axis=axis)
+                        self._assertResultsEqual(result, expected)
+
 
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTests(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestMinMax))
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestMinMaxAxis))
     return test_suite
 
 
@@ -923,6 +923,66 @@ class Test_Histogramnd_nominal_3d(_Test_Histogramnd_nominal):
     ndims = 3
 
 
+class Test_chistogramnd_num_threads(unittest.TestCase):
+    """
+    Tests of the histogramnd function with several threads.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.sample = rng.random_sample((10000, 2)) * 12. - 1.
+        self.weights = rng.random_sample(10000) * 100.
+        self.histo_range = [[0., 10.], [0., 10.]]
+
+    def _test_num_threads(self, n_bins):
+        expected = histogramnd(self.sample,
+                               self.histo_range,
+                               n_bins,
+                               weights=self.weights,
+                               weight_min=10.,
+                               last_bin_closed=True)
+
+        for num_threads in (2, 5, None):
+            result = histogramnd(self.sample,
+                                 self.histo_range,
+                                 n_bins,
+                                 weights=self.weights,
+                                 weight_min=10.,
+                                 last_bin_closed=True,
+                                 num_threads=num_threads)
+            self.assertTrue(np.array_equal(result[0], expected[0]))
+            self.assertTrue(np.allclose(result[1], expected[1]))
+            for edges, expected_edges in zip(result[2], expected[2]):
+                self.assertTrue(np.array_equal(edges, expected_edges))
+
+    def test_private_histo(self):
+        """Few bins: each thread fills its own histogram"""
+        self._test_num_threads(10)
+
+    def test_atomic_histo(self):
+        """Many bins: threads update the histogram atomically"""
+        self._test_num_threads(500)
+
+    def test_accumulate(self):
+        histo_inst = Histogramnd(self.sample,
+                                 self.histo_range,
+                                 10,
+                                 weights=self.weights,
+                                 num_threads=3)
+        histo_inst.accumulate(self.sample, weights=self.weights)
+        expected = histogramnd(self.sample,
+                               self.histo_range,
+                               10,
+                               weights=self.weights)
+        self.assertTrue(np.array_equal(histo_inst.histo, 2 * expected[0]))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    2 * expected[1]))
+
+    def test_invalid_num_threads(self):
+        with self.assertRaises(ValueError):
+            histogramnd(self.sample, self.histo_range, 10, num_threads=0)
+
+
 # ==============================================================
 # ==============================================================
 # ==============================================================
@@ -932,6 +992,7 @@ test_cases = (Test_chistogram_nominal_1d,
               Test_chistogram_nominal_2d,
               Test_chistogram_nominal_3d,
               Test_Histogramnd_nominal_1d,
+              Test_chistogramnd_num_threads,
               # Test_Histogramnd_nominal_2d,
               # Test_Histogramnd_nominal_3d
               )
@@ -26,7 +26,7 @@
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "11/07/2019"
+__date__ = "17/10/2026"
 
 
 import unittest
@@ -45,18 +45,23 @@ from silx.math import interpolate
 class TestInterp3d(ParametricTestCase):
     """Test silx.math.interpolate.interp3d"""
 
+    METHODS = (u'nearest', u'nearest_omp',
+               u'linear', u'linear_omp',
+               u'cubic', u'cubic_omp')
+
     @staticmethod
-    def ref_interp3d(data, points):
+    def ref_interp3d(data, points, method='linear'):
         """Reference implementation of interp3d based on scipy
 
         :param numpy.ndarray data: 3D floating dataset
         :param numpy.ndarray points: Array of points of shape (N, 3)
+        :param str method: 'linear' or 'nearest'
         """
         return interpn(
             [numpy.arange(dim, dtype=data.dtype) for dim in data.shape],
             data,
             points,
-            method='linear')
+            method=method)
 
     def test_random_data(self):
         """Test interp3d with random data"""
@@ -76,6 +81,62 @@ class TestInterp3d(ParametricTestCase):
                     result = interpolate.interp3d(data, points, method=method)
                     self.assertTrue(numpy.allclose(ref_result, result))
 
+    def test_nearest(self):
+        """Test interp3d nearest method with random data"""
+        size = 32
+        npoints = 10
+
+        data = numpy.random.random((size, size, size))
+        points = numpy.random.random(npoints*3).reshape(npoints, 3) * (size -1)
+        ref_result = self.ref_interp3d(data, points, method='nearest')
+
+        for method in (u'nearest', u'nearest_omp'):
+            with self.subTest(method=method):
+                result = interpolate.interp3d(data, points, method=method)
+                self.assertTrue(numpy.array_equal(ref_result, result))
+
+    def test_cubic(self):
+        """Test interp3d cubic method with a linear ramp"""
+        data = numpy.indices((8, 8, 8)).sum(axis=0).astype(numpy.float64)
+        points = 1. + numpy.random.random(10*3).reshape(10, 3) * 5.
+
+        for method in (u'cubic', u'cubic_omp'):
+            with self.subTest(method=method):
+                result = interpolate.interp3d(data, points, method=method)
+                # Cubic convolution reproduces linear functions
+                self.assertTrue(numpy.allclose(result, points.sum(axis=1)))
+
+    def test_integer_data(self):
+        """Test interp3d with integer datasets"""
+        ref_data = numpy.random.randint(0, 100, size=(8, 8, 8))
+        points = numpy.random.random(10*3).reshape(10, 3) * 7.
+
+        for dtype in (numpy.uint8, numpy.int16, numpy.int32, numpy.uint64):
+            data = ref_data.astype(dtype)
+            ref_dtype = numpy.promote_types(dtype, numpy.float32)
+            for method in self.METHODS:
+                with self.subTest(method=method, dtype=dtype):
+                    ref_result = interpolate.interp3d(
+                        ref_data.astype(ref_dtype), points, method=method)
+                    result = interpolate.interp3d(data, points, method=method)
+                    self.assertEqual(result.dtype, ref_dtype)
+                    self.assertTrue(numpy.array_equal(ref_result, result))
+
+    def test_stack(self):
+        """Test interp3d with a stack of 3D datasets"""
+        data = numpy.random.random((3, 8, 9, 10)).astype(numpy.float32)
+        points = numpy.random.random(10*3).reshape(10, 3) * (7, 8, 9)
+
+        for method in self.METHODS:
+            with self.subTest(method=method):
+                result = interpolate.interp3d(data, points, method=method)
+                self.assertEqual(result.shape, (3, 10))
+                self.assertEqual(result.dtype, numpy.float32)
+                for volume, volume_result in zip(data, result):
+                    self.assertTrue(numpy.array_equal(
+                        volume_result,
+                        interpolate.interp3d(volume, points, method=method)))
+
     def test_notfinite_data(self):
         """Test interp3d with NaN and inf"""
         data = numpy.ones((3, 3, 3), dtype=numpy.float64)
@@ -99,7 +160,7 @@ class TestInterp3d(ParametricTestCase):
                               (-0.1, 1., 1.),
                               (1., 1., 3.1)])
 
-        for method in (u'linear', u'linear_omp'):
+        for method in self.METHODS:
             for fill_value in (numpy.nan, 0., -1.):
                 with self.subTest(method=method):
                     result = interpolate.interp3d(
@@ -119,7 +180,7 @@ class TestInterp3d(ParametricTestCase):
 
         ref_result = data[tuple(points.T.astype(numpy.int32))]
 
-        for method in (u'linear', u'linear_omp'):
+        for method in self.METHODS:
             with self.subTest(method=method):
                 result = interpolate.interp3d(data, points, method=method)
                 self.assertTrue(numpy.allclose(ref_result, result))
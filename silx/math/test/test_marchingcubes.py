@@ -27,7 +27,7 @@ from __future__ import division
 
 __authors__ = ["T. Vincent"]
 __license__ = "MIT"
-__date__ = "17/01/2018"
+__date__ = "17/10/2026"
 
 import unittest
 
@@ -174,7 +174,72 @@ class TestMarchingCubes(ParametricTestCase):
                                     atol=0., rtol=0.)
 
 
-test_cases = (TestMarchingCubes,)
+class TestMarchingCubesFunction(ParametricTestCase):
+    """Tests of marching_cubes function processing data by slabs"""
+
+    @staticmethod
+    def _sortedMesh(vertices, normals, indices):
+        """Returns mesh with vertices and triangles in a comparable order"""
+        # Vertices are on edges of the grid: sort by cell and coordinates
+        cells = numpy.floor(vertices + 1e-3)
+        keys = numpy.concatenate((cells, vertices), axis=1)
+        order = numpy.lexsort(keys.T[::-1])
+        rank = numpy.empty(len(vertices), dtype=numpy.int64)
+        rank[order] = numpy.arange(len(vertices))
+        triangles = numpy.sort(rank[indices], axis=1)
+        triangles = triangles[numpy.lexsort(triangles.T[::-1])]
+        return vertices[order], normals[order], triangles
+
+    def test_compare_marching_cubes_class(self):
+        """Test that slabs give the same result as MarchingCubes"""
+        data = numpy.random.random((37, 20, 23)).astype(numpy.float32)
+        data[10:20] = 0.  # Slabs without isosurface
+
+        for sampling in ((1, 1, 1), (2, 1, 3), (3, 2, 1)):
+            for slab_size in (1, 3, 4, None):
+                with self.subTest(sampling=sampling, slab_size=slab_size):
+                    ref = marchingcubes.MarchingCubes(
+                        data, 0.5, sampling=sampling)
+                    result = marchingcubes.marching_cubes(
+                        data, 0.5, sampling=sampling,
+                        slab_size=slab_size, max_workers=3)
+
+                    self.assertEqual(result[0].shape, ref.get_vertices().shape)
+                    self.assertEqual(result[2].shape, ref.get_indices().shape)
+
+                    vertices, normals, triangles = self._sortedMesh(*result)
+                    ref_vertices, ref_normals, ref_triangles = self._sortedMesh(
+                        ref.get_vertices(), ref.get_normals(), ref.get_indices())
+                    self.assertTrue(numpy.allclose(vertices, ref_vertices))
+                    self.assertTrue(numpy.allclose(normals, ref_normals,
+                                                   atol=1e-5))
+                    self.assertTrue(numpy.array_equal(triangles, ref_triangles))
+
+    def test_no_isosurface(self):
+        """Test with data without isosurface"""
+        for shape in ((1, 4, 4), (2, 4, 4), (10, 4, 4)):
+            with self.subTest(shape=shape):
+                data = numpy.zeros(shape, dtype=numpy.float32)
+                vertices, normals, indices = marchingcubes.marching_cubes(
+                    data, 1., slab_size=2)
+                self.assertEqual(vertices.shape, (0, 3))
+                self.assertEqual(normals.shape, (0, 3))
+                self.assertEqual(indices.shape, (0, 3))
+                self.assertEqual(indices.dtype, numpy.uint32)
+
+    def test_cube(self):
+        """Test with a single cube"""
+        cube = numpy.array(
+            (((0., 0.), (0., 0.)),
+             ((1., 1.), (1., 1.))), dtype=numpy.float32)
+        vertices, normals, indices = marchingcubes.marching_cubes(
+            cube, 0.5, invert_normals=False)
+        self.assertTrue(numpy.allclose(vertices[:, 0], 0.5))
+        self.assertTrue(numpy.allclose(normals, (1., 0., 0.)))
+        self.assertEqual(len(indices), 2)
+
+
+test_cases = (TestMarchingCubes, TestMarchingCubesFunction)
 
 
 def suite():